@@ -0,0 +1,142 @@
+// Multi-core entry point: runs CLUSTER_WORKERS copies of server.js (default: one per core)
+// sharing the port.
+//
+// The primary holds what the workers must agree on and talks to them over IPC:
+//   - the shared store (cache, dashboard summary, rate limit counters) unless SHARED_STORE=redis
+//   - live events, numbered here and sent to every worker's SSE clients
+//   - each worker's metrics, sent back to all of them for GET /metrics
+// Background jobs (reconciliation, retention, thumbnail migration) run in worker slot 0 only.
+//
+//   npm run start:cluster
+//   kill -HUP <primary pid>    rolling restart, one worker at a time
+//   kill -TERM <primary pid>   drain every worker and exit
+const cluster = require('cluster');
+const os = require('os');
+const path = require('path');
+require('dotenv').config();
+
+const { MemoryStore, handleClusterRequest } = require('./src/utils/sharedStore');
+
+const WORKERS = parseInt(process.env.CLUSTER_WORKERS) ||
+  (os.availableParallelism ? os.availableParallelism() : os.cpus().length);
+const SHUTDOWN_TIMEOUT_MS = 30 * 1000;
+const MAX_RESPAWN_DELAY_MS = 30 * 1000;
+
+const store = new MemoryStore();
+const slots = new Map();      // worker id -> slot number
+const workerMetrics = {};     // slot -> last metrics reported
+let nextEventId = 1;
+let shuttingDown = false;
+let restarting = false;
+let respawnDelay = 1000;
+
+const broadcast = (message) => {
+  Object.values(cluster.workers).forEach(worker => {
+    if (worker && worker.isConnected()) {
+      worker.send(message);
+    }
+  });
+};
+
+const fork = (slot) => {
+  const worker = cluster.fork({
+    WORKER_SLOT: String(slot),
+    CLUSTER_JOBS: slot === 0 ? '1' : '0'
+  });
+  slots.set(worker.id, slot);
+
+  worker.on('message', (message) => {
+    if (!message || !message.type) {
+      return;
+    }
+    if (message.type === 'store') {
+      handleClusterRequest(store, worker, message)
+        .catch(error => console.error(' CLUSTER: Error answering store request:', error.message));
+    } else if (message.type === 'live-event') {
+      broadcast({ type: 'live-event', event: { id: nextEventId++, ...message.event } });
+    } else if (message.type === 'metrics') {
+      workerMetrics[slot] = message.metrics;
+      broadcast({ type: 'cluster-metrics', workers: workerMetrics });
+    }
+  });
+
+  worker.on('listening', () => {
+    respawnDelay = 1000;
+  });
+  return worker;
+};
+
+// Ask a worker to drain and exit, killing it if it takes too long
+const retire = (worker) => new Promise(resolve => {
+  const timer = setTimeout(() => {
+    console.log(` CLUSTER: Worker ${worker.process.pid} did not exit in time, killing it`);
+    worker.process.kill('SIGKILL');
+  }, SHUTDOWN_TIMEOUT_MS);
+  worker.once('exit', () => {
+    clearTimeout(timer);
+    resolve();
+  });
+  if (worker.isConnected()) {
+    worker.send({ type: 'shutdown' });
+  }
+});
+
+// Replace workers one at a time, so the port keeps being served throughout
+const rollingRestart = async () => {
+  if (restarting || shuttingDown) {
+    return;
+  }
+  restarting = true;
+  console.log(' CLUSTER: Rolling restart');
+  for (const worker of Object.values(cluster.workers)) {
+    const slot = slots.get(worker.id);
+    slots.delete(worker.id);
+    const replacement = fork(slot);
+    await new Promise(resolve => {
+      replacement.once('listening', resolve);
+      replacement.once('exit', resolve);
+    });
+    await retire(worker);
+  }
+  restarting = false;
+  console.log(' CLUSTER: Rolling restart finished');
+};
+
+const shutdown = async (signal) => {
+  if (shuttingDown) {
+    return;
+  }
+  shuttingDown = true;
+  console.log(` CLUSTER: ${signal} received, draining ${Object.keys(cluster.workers).length} workers...`);
+  await Promise.all(Object.values(cluster.workers).map(retire));
+  process.exit(0);
+};
+
+cluster.setupPrimary({ exec: path.join(__dirname, 'server.js') });
+
+cluster.on('exit', (worker, code, signal) => {
+  const slot = slots.get(worker.id);
+  slots.delete(worker.id);
+  // Retired workers have their replacement already; crashed ones are respawned with backoff
+  if (shuttingDown || slot === undefined || worker.exitedAfterDisconnect) {
+    return;
+  }
+  console.error(` CLUSTER: Worker ${worker.process.pid} (slot ${slot}) exited (${signal || code}), ` +
+    `restarting in ${respawnDelay / 1000}s`);
+  delete workerMetrics[slot];
+  setTimeout(() => {
+    if (!shuttingDown) {
+      fork(slot);
+    }
+  }, respawnDelay);
+  respawnDelay = Math.min(respawnDelay * 2, MAX_RESPAWN_DELAY_MS);
+});
+
+console.log(` CLUSTER: Primary ${process.pid} starting ${WORKERS} workers`);
+for (let slot = 0; slot < WORKERS; slot++) {
+  fork(slot);
+}
+
+process.on('SIGHUP', rollingRestart);
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
@@ -0,0 +1,185 @@
+// Detection ingest load test: posts synthetic detection packages to /api/detections as fast as
+// a fixed number of concurrent robots can, and reports throughput and latency.
+//
+// Against a running server:
+//   node scripts/loadTest.js --url http://localhost:5001 --duration 30
+// Or start cluster.js once per worker count and compare (needs MongoDB, as for npm start):
+//   node scripts/loadTest.js --workers 1,2,4 --duration 20 --concurrency 64
+// The rate limit is lifted for servers it starts; a server given with --url must allow the load.
+const http = require('http');
+const path = require('path');
+const crypto = require('crypto');
+const { spawn } = require('child_process');
+
+const args = process.argv.slice(2);
+const option = (name, fallback) => {
+  const index = args.indexOf(`--${name}`);
+  return index >= 0 ? args[index + 1] : fallback;
+};
+
+const durationMs = parseFloat(option('duration', '20')) * 1000;
+const concurrency = parseInt(option('concurrency', '32'));
+const units = parseInt(option('units', '10'));
+const detectionsPerPackage = parseInt(option('detections', '10'));
+const thumbnailBytes = parseInt(option('thumbnail-bytes', '6000'));
+const basePort = parseInt(option('port', '5101'));
+
+const ACTIONS = ['sitting', 'standing', 'walking', 'sitting_down', 'getting_up'];
+const agent = new http.Agent({ keepAlive: true, maxSockets: concurrency });
+
+// One base64 JPEG-sized blob per unit, so the blob store deduplicates like real repeat frames would
+const thumbnails = Array.from({ length: units }, () => crypto.randomBytes(thumbnailBytes).toString('base64'));
+let frameNumber = 0;
+
+const makePackage = (unit) => {
+  const now = Date.now();
+  return {
+    package_id: crypto.randomUUID(),
+    unit_id: `loadtest-${unit}`,
+    unit_name: `Load Test Unit ${unit}`,
+    rtsp_uris: [`rtsp://loadtest-${unit}/stream`],
+    timestamp: new Date(now).toISOString(),
+    detections: Array.from({ length: detectionsPerPackage }, (_, i) => ({
+      timestamp: new Date(now - (detectionsPerPackage - i) * 100).toISOString(),
+      action_type: ACTIONS[(frameNumber + i) % ACTIONS.length],
+      confidence: 0.6 + Math.random() * 0.4,
+      person_id: i % 4,
+      frame_number: frameNumber++,
+      normalized_bbox: { x: 0.1, y: 0.2, width: 0.3, height: 0.6 },
+      thumbnail: i === 0 ? thumbnails[unit] : null
+    }))
+  };
+};
+
+const request = (url, method, body) => new Promise((resolve, reject) => {
+  const payload = body ? JSON.stringify(body) : null;
+  const req = http.request(url, {
+    method,
+    agent,
+    headers: payload ? { 'Content-Type': 'application/json', 'Content-Length': Buffer.byteLength(payload) } : {}
+  }, (res) => {
+    res.resume();
+    res.on('end', () => resolve(res.statusCode));
+  });
+  req.on('error', reject);
+  req.setTimeout(30 * 1000, () => req.destroy(new Error('timed out')));
+  req.end(payload);
+});
+
+const waitForHealth = async (baseUrl, timeoutMs = 60 * 1000) => {
+  const deadline = Date.now() + timeoutMs;
+  while (Date.now() < deadline) {
+    try {
+      if (await request(`${baseUrl}/health`, 'GET') === 200) {
+        return;
+      }
+    } catch (error) {
+      // Not listening yet
+    }
+    await new Promise(resolve => setTimeout(resolve, 500));
+  }
+  throw new Error(`${baseUrl} did not become healthy`);
+};
+
+const percentile = (sorted, p) => (sorted.length === 0 ? 0 : sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))]);
+
+// Each robot posts its next package as soon as the previous one is answered
+const run = async (baseUrl) => {
+  const latencies = [];
+  const result = { packages: 0, errors: 0, throttled: 0 };
+  const deadline = Date.now() + durationMs;
+  const started = Date.now();
+
+  await Promise.all(Array.from({ length: concurrency }, async (_, robot) => {
+    while (Date.now() < deadline) {
+      const sent = process.hrtime.bigint();
+      try {
+        const status = await request(`${baseUrl}/api/detections`, 'POST', makePackage(robot % units));
+        latencies.push(Number(process.hrtime.bigint() - sent) / 1e6);
+        if (status === 429) {
+          result.throttled++;
+        } else if (status >= 200 && status < 300) {
+          result.packages++;
+        } else {
+          result.errors++;
+        }
+      } catch (error) {
+        result.errors++;
+      }
+    }
+  }));
+
+  const seconds = (Date.now() - started) / 1000;
+  latencies.sort((a, b) => a - b);
+  return {
+    ...result,
+    packages_per_second: Math.round(result.packages / seconds),
+    detections_per_second: Math.round(result.packages * detectionsPerPackage / seconds),
+    p50_ms: Math.round(percentile(latencies, 0.5) * 10) / 10,
+    p99_ms: Math.round(percentile(latencies, 0.99) * 10) / 10
+  };
+};
+
+const startCluster = (workers, port) => {
+  const child = spawn(process.execPath, [path.join(__dirname, '..', 'cluster.js')], {
+    cwd: path.join(__dirname, '..'),
+    env: {
+      ...process.env,
+      PORT: String(port),
+      CLUSTER_WORKERS: String(workers),
+      RATE_LIMIT_MAX_REQUESTS: '1000000000'
+    },
+    stdio: ['ignore', 'ignore', 'inherit']
+  });
+  return child;
+};
+
+const stopCluster = (child) => new Promise(resolve => {
+  child.once('exit', resolve);
+  child.kill('SIGTERM');
+});
+
+const report = (label, result) => {
+  console.log(` LOAD TEST: ${label}: ${result.packages_per_second} packages/s, ${result.detections_per_second} detections/s, ` +
+    `p50 ${result.p50_ms} ms, p99 ${result.p99_ms} ms, ${result.errors} errors, ${result.throttled} throttled`);
+};
+
+const main = async () => {
+  console.log(` LOAD TEST: ${concurrency} robots over ${units} units, ${detectionsPerPackage} detections per package, ` +
+    `${durationMs / 1000}s per run`);
+
+  const url = option('url', null);
+  if (url) {
+    await waitForHealth(url);
+    report(url, await run(url));
+    return;
+  }
+
+  const counts = option('workers', '1,2,4').split(',').map(count => parseInt(count));
+  const results = [];
+  for (const [index, workers] of counts.entries()) {
+    const port = basePort + index;
+    const child = startCluster(workers, port);
+    try {
+      await waitForHealth(`http://127.0.0.1:${port}`);
+      const result = await run(`http://127.0.0.1:${port}`);
+      report(`${workers} workers`, result);
+      results.push({ workers, ...result });
+    } finally {
+      await stopCluster(child);
+    }
+  }
+
+  const baseline = results[0].detections_per_second || 1;
+  console.log('\n workers | detections/s | scaling | p50 ms | p99 ms');
+  results.forEach(result => {
+    console.log(` ${String(result.workers).padStart(7)} | ${String(result.detections_per_second).padStart(12)} | ` +
+      `${(result.detections_per_second / baseline).toFixed(2).padStart(6)}x | ${String(result.p50_ms).padStart(6)} | ` +
+      `${String(result.p99_ms).padStart(6)}`);
+  });
+};
+
+main().catch(error => {
+  console.error(' LOAD TEST: Error:', error.message);
+  process.exit(1);
+});
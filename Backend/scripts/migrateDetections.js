@@ -0,0 +1,107 @@
+// Moves detections embedded in Robot documents into the detection_records collection.
+//
+// Usage: node scripts/migrateDetections.js [--dry-run] [--keep-embedded] [--batch-size=1000]
+//
+// Detections keep their _id, so thumbnail URLs and client sync cursors stay valid, and the
+// copy is an upsert: the script can be interrupted and re-run, also while the server is
+// ingesting. A robot's embedded array is only removed once every batch of it was copied.
+require('dotenv').config();
+const mongoose = require('mongoose');
+
+const connectDB = require('../src/config/database');
+const Robot = require('../src/models/Robot');
+const DetectionRecord = require('../src/models/DetectionRecord');
+
+const LEGACY_INDEXES = ['detections.timestamp_-1', 'detections.action_type_1'];
+
+const args = process.argv.slice(2);
+const dryRun = args.includes('--dry-run');
+const keepEmbedded = args.includes('--keep-embedded');
+const batchArg = args.find(arg => arg.startsWith('--batch-size='));
+const batchSize = batchArg ? parseInt(batchArg.split('=')[1]) : 1000;
+
+const migrateRobot = async (robotId, unitId) => {
+  let copied = 0;
+  let complete = true;
+
+  for (let skip = 0; ; skip += batchSize) {
+    // $slice reads one batch at a time instead of the whole (possibly 16 MB) array
+    const robot = await Robot.collection.findOne(
+      { _id: robotId },
+      { projection: { unit_id: 1, detections: { $slice: [skip, batchSize] } } }
+    );
+    const batch = robot?.detections || [];
+    if (batch.length === 0) {
+      break;
+    }
+
+    if (!dryRun) {
+      const operations = batch.map(({ _id, ...fields }) => ({
+        updateOne: {
+          filter: { _id },
+          update: { $setOnInsert: { ...fields, unit_id: unitId } },
+          upsert: true
+        }
+      }));
+      const result = await DetectionRecord.collection.bulkWrite(operations, { ordered: false });
+      if (result.upsertedCount + result.matchedCount !== batch.length) {
+        complete = false;
+      }
+    }
+    copied += batch.length;
+    console.log(` MIGRATION: ${unitId}: ${copied} detections ${dryRun ? 'found' : 'copied'}`);
+  }
+
+  if (!dryRun && !keepEmbedded && complete) {
+    await Robot.collection.updateOne({ _id: robotId }, { $unset: { detections: '' } });
+  } else if (!complete) {
+    console.log(` MIGRATION: ${unitId}: not every detection was copied, keeping the embedded array`);
+  }
+  return { copied, complete };
+};
+
+const run = async () => {
+  await connectDB();
+  console.log(` MIGRATION: Starting${dryRun ? ' (dry run)' : ''}, batch size ${batchSize}`);
+
+  if (!dryRun) {
+    await DetectionRecord.createIndexes();
+  }
+
+  const robots = await Robot.collection
+    .find({ 'detections.0': { $exists: true } }, { projection: { unit_id: 1 } })
+    .toArray();
+  console.log(` MIGRATION: ${robots.length} robots have embedded detections`);
+
+  let total = 0;
+  let incomplete = 0;
+  for (const robot of robots) {
+    const { copied, complete } = await migrateRobot(robot._id, robot.unit_id);
+    total += copied;
+    if (!complete) {
+      incomplete++;
+    }
+  }
+
+  if (!dryRun && !keepEmbedded && incomplete === 0) {
+    for (const name of LEGACY_INDEXES) {
+      try {
+        await Robot.collection.dropIndex(name);
+        console.log(` MIGRATION: Dropped legacy index ${name}`);
+      } catch (err) {
+        // Index might not exist, which is fine
+      }
+    }
+  }
+
+  console.log(` MIGRATION: Done. ${total} detections ${dryRun ? 'would be moved' : 'moved'} from ${robots.length} robots` +
+    (incomplete > 0 ? `, ${incomplete} robots incomplete (re-run to retry)` : ''));
+  await mongoose.disconnect();
+  process.exit(incomplete > 0 ? 1 : 0);
+};
+
+run().catch(async (error) => {
+  console.error(' MIGRATION: Failed:', error);
+  await mongoose.disconnect();
+  process.exit(1);
+});
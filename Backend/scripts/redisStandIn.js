@@ -0,0 +1,182 @@
+// Local stand-in for a Redis server, for trying INGEST_QUEUE=redis or SHARED_STORE=redis
+// without installing Redis.
+//
+// Speaks enough of the RESP protocol for the ingest queue and the shared store: PING, RPUSH,
+// LPUSH, LPOP [count], LMOVE, LREM, LLEN on lists and GET, SET [PX ms], INCR, DECR, PEXPIRE, PTTL on strings,
+// plus DEL on either, all kept in memory (lost when it stops). Usage:
+//   node scripts/redisStandIn.js --port 6380
+//   INGEST_MODE=queue INGEST_QUEUE=redis REDIS_URL=redis://127.0.0.1:6380 npm start
+//   SHARED_STORE=redis REDIS_URL=redis://127.0.0.1:6380 npm run start:cluster
+const net = require('net');
+
+const args = process.argv.slice(2);
+const option = (name, fallback) => {
+  const index = args.indexOf(`--${name}`);
+  return index >= 0 ? args[index + 1] : fallback;
+};
+
+const port = parseInt(option('port', '6380'));
+const lists = new Map();
+const strings = new Map(); // key -> { value, expires }
+
+const simple = (value) => `+${value}\r\n`;
+const error = (message) => `-ERR ${message}\r\n`;
+const integer = (value) => `:${value}\r\n`;
+const bulk = (value) => (value === null ? '$-1\r\n' : `$${Buffer.byteLength(value)}\r\n${value}\r\n`);
+const array = (values) => (values === null ? '*-1\r\n' : `*${values.length}\r\n${values.map(bulk).join('')}`);
+
+const list = (key) => {
+  if (!lists.has(key)) {
+    lists.set(key, []);
+  }
+  return lists.get(key);
+};
+
+// A string entry, or undefined once it has expired
+const string = (key) => {
+  const entry = strings.get(key);
+  if (entry && entry.expires && entry.expires <= Date.now()) {
+    strings.delete(key);
+    return undefined;
+  }
+  return entry;
+};
+
+const addTo = (key, delta) => {
+  const entry = string(key) || { value: '0', expires: null };
+  const value = parseInt(entry.value);
+  if (isNaN(value)) {
+    return error('value is not an integer or out of range');
+  }
+  entry.value = String(value + delta);
+  strings.set(key, entry);
+  return integer(entry.value);
+};
+
+const commands = {
+  PING: ([message]) => (message === undefined ? simple('PONG') : bulk(message)),
+  RPUSH: ([key, ...values]) => integer(list(key).push(...values)),
+  LPUSH: ([key, ...values]) => {
+    const items = list(key);
+    values.forEach(value => items.unshift(value));
+    return integer(items.length);
+  },
+  LPOP: ([key, count]) => {
+    const items = lists.get(key) || [];
+    if (count === undefined) {
+      return bulk(items.length > 0 ? items.shift() : null);
+    }
+    return array(items.length > 0 ? items.splice(0, parseInt(count)) : null);
+  },
+  LMOVE: ([source, destination, from, to]) => {
+    const items = lists.get(source) || [];
+    if (items.length === 0) {
+      return bulk(null);
+    }
+    const value = from.toUpperCase() === 'LEFT' ? items.shift() : items.pop();
+    if (to.toUpperCase() === 'LEFT') {
+      list(destination).unshift(value);
+    } else {
+      list(destination).push(value);
+    }
+    return bulk(value);
+  },
+  // Positive counts only (from the head), which is all the ingest queue uses
+  LREM: ([key, count, value]) => {
+    const items = lists.get(key) || [];
+    let removed = 0;
+    for (let i = 0; i < items.length && (parseInt(count) === 0 || removed < parseInt(count));) {
+      if (items[i] === value) {
+        items.splice(i, 1);
+        removed++;
+      } else {
+        i++;
+      }
+    }
+    return integer(removed);
+  },
+  LLEN: ([key]) => integer((lists.get(key) || []).length),
+  GET: ([key]) => {
+    const entry = string(key);
+    return bulk(entry ? entry.value : null);
+  },
+  SET: ([key, value, ...options]) => {
+    const px = options.findIndex(option => option.toUpperCase() === 'PX');
+    strings.set(key, { value, expires: px >= 0 ? Date.now() + parseInt(options[px + 1]) : null });
+    return simple('OK');
+  },
+  INCR: ([key]) => addTo(key, 1),
+  DECR: ([key]) => addTo(key, -1),
+  PEXPIRE: ([key, ms]) => {
+    const entry = string(key);
+    if (!entry) {
+      return integer(0);
+    }
+    entry.expires = Date.now() + parseInt(ms);
+    return integer(1);
+  },
+  PTTL: ([key]) => {
+    const entry = string(key);
+    if (!entry) {
+      return integer(-2);
+    }
+    return integer(entry.expires ? entry.expires - Date.now() : -1);
+  },
+  DEL: (keys) => integer(keys.filter(key => {
+    const hadString = string(key) !== undefined && strings.delete(key);
+    return lists.delete(key) || hadString;
+  }).length)
+};
+
+// Parse complete RESP arrays of bulk strings from the buffer; returns [commands, rest]
+const parse = (buffer) => {
+  const parsed = [];
+  let offset = 0;
+  for (;;) {
+    if (buffer[offset] !== 0x2a) { // '*'
+      break;
+    }
+    const headerEnd = buffer.indexOf('\r\n', offset);
+    if (headerEnd < 0) {
+      break;
+    }
+    const count = parseInt(buffer.toString('utf8', offset + 1, headerEnd));
+    let position = headerEnd + 2;
+    const parts = [];
+    for (let i = 0; i < count; i++) {
+      const lengthEnd = buffer.indexOf('\r\n', position);
+      if (lengthEnd < 0) {
+        break;
+      }
+      const length = parseInt(buffer.toString('utf8', position + 1, lengthEnd));
+      if (buffer.length < lengthEnd + 2 + length + 2) {
+        break;
+      }
+      parts.push(buffer.toString('utf8', lengthEnd + 2, lengthEnd + 2 + length));
+      position = lengthEnd + 2 + length + 2;
+    }
+    if (parts.length < count) {
+      break;
+    }
+    parsed.push(parts);
+    offset = position;
+  }
+  return [parsed, buffer.subarray(offset)];
+};
+
+const server = net.createServer((socket) => {
+  let pending = Buffer.alloc(0);
+  socket.on('data', (chunk) => {
+    const [parsed, rest] = parse(Buffer.concat([pending, chunk]));
+    pending = rest;
+    parsed.forEach(([name, ...commandArgs]) => {
+      const handler = commands[name.toUpperCase()];
+      socket.write(handler ? handler(commandArgs) : error(`unknown command '${name}'`));
+    });
+  });
+  socket.on('error', () => socket.destroy());
+});
+
+server.listen(port, '127.0.0.1', () => {
+  console.log(` REDIS STAND-IN: Listening on redis://127.0.0.1:${port}`);
+});
@@ -0,0 +1,80 @@
+// Local stand-in for an S3-compatible object store, for trying THUMBNAIL_STORE=s3 without a cloud account.
+//
+// Serves path-style PUT/GET/HEAD/DELETE /<bucket>/<key> from a directory (default ./data/s3-stand-in)
+// and ignores request signatures. Usage:
+//   node scripts/s3StandIn.js --port 9300 --dir ./data/s3-stand-in
+//   THUMBNAIL_STORE=s3 S3_BUCKET=cora S3_ENDPOINT=http://127.0.0.1:9300 \
+//     AWS_ACCESS_KEY_ID=local AWS_SECRET_ACCESS_KEY=local npm start
+const crypto = require('crypto');
+const fs = require('fs');
+const http = require('http');
+const path = require('path');
+
+const args = process.argv.slice(2);
+const option = (name, fallback) => {
+  const index = args.indexOf(`--${name}`);
+  return index >= 0 ? args[index + 1] : fallback;
+};
+
+const port = parseInt(option('port', '9300'));
+const root = path.resolve(option('dir', path.join(process.cwd(), 'data', 's3-stand-in')));
+
+const objectPath = (url) => {
+  const { pathname } = new URL(url, 'http://localhost');
+  const [bucket, ...keyParts] = decodeURIComponent(pathname).split('/').filter(Boolean);
+  const key = keyParts.join('/');
+  if (!bucket || !key || key.split('/').includes('..')) {
+    return null;
+  }
+  return path.join(root, bucket, key);
+};
+
+const sendXmlError = (res, status, code) => {
+  res.writeHead(status, { 'Content-Type': 'application/xml' });
+  res.end(`<?xml version="1.0" encoding="UTF-8"?><Error><Code>${code}</Code></Error>`);
+};
+
+const server = http.createServer((req, res) => {
+  const file = objectPath(req.url);
+  if (!file) {
+    return sendXmlError(res, 400, 'InvalidRequest');
+  }
+
+  if (req.method === 'PUT') {
+    const chunks = [];
+    req.on('data', chunk => chunks.push(chunk));
+    req.on('end', () => {
+      const body = Buffer.concat(chunks);
+      fs.mkdirSync(path.dirname(file), { recursive: true });
+      fs.writeFileSync(file, body);
+      res.writeHead(200, { ETag: `"${crypto.createHash('md5').update(body).digest('hex')}"` });
+      res.end();
+      console.log(` S3 STAND-IN: PUT ${req.url} (${body.length} bytes)`);
+    });
+    return;
+  }
+
+  if (req.method === 'GET' || req.method === 'HEAD') {
+    if (!fs.existsSync(file)) {
+      return req.method === 'HEAD' ? res.writeHead(404).end() : sendXmlError(res, 404, 'NoSuchKey');
+    }
+    const size = fs.statSync(file).size;
+    res.writeHead(200, { 'Content-Type': 'image/jpeg', 'Content-Length': size });
+    if (req.method === 'HEAD') {
+      return res.end();
+    }
+    fs.createReadStream(file).pipe(res);
+    return;
+  }
+
+  if (req.method === 'DELETE') {
+    fs.rmSync(file, { force: true });
+    return res.writeHead(204).end();
+  }
+
+  sendXmlError(res, 405, 'MethodNotAllowed');
+});
+
+server.listen(port, '127.0.0.1', () => {
+  console.log(` S3 STAND-IN: Serving ${root} on http://127.0.0.1:${port}`);
+});
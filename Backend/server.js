@@ -1,4 +1,5 @@
 // Istiaq Hossain
+const cluster = require('cluster');
 const express = require('express');
 const cors = require('cors');
 const helmet = require('helmet');
@@ -7,7 +8,12 @@ require('dotenv').config();
 
 const connectDB = require('./src/config/database');
 const errorHandler = require('./src/middleware/errorHandler');
+const auth = require('./src/middleware/auth');
+const adminOnly = require('./src/middleware/adminOnly');
 const { sendSuccess } = require('./src/utils/response');
+const ingestQueue = require('./src/utils/ingestQueue');
+const metrics = require('./src/utils/metrics');
+const SharedRateLimitStore = require('./src/utils/rateLimitStore');
 
 // Connect to MongoDB
 connectDB();
@@ -17,10 +23,21 @@ const app = express();
 // Security middleware
 app.use(helmet());
 
+// Per-worker request counters and latency (GET /metrics)
+app.use(metrics.track);
+
+// Expose the server clock so robots can estimate their clock offset
+app.use((req, res, next) => {
+  res.set('X-Server-Time', Date.now().toString());
+  next();
+});
+
 // Rate limiting
 const limiter = rateLimit({
   windowMs: parseInt(process.env.RATE_LIMIT_WINDOW_MS) || 15 * 60 * 1000, // 15 minutes
   max: parseInt(process.env.RATE_LIMIT_MAX_REQUESTS) || 100, // limit each IP to 100 requests per windowMs
+  // Counted in the shared store so the limit holds across cluster workers
+  store: new SharedRateLimitStore(),
   message: {
     success: false,
     message: 'Too many requests from this IP, try again later.',
@@ -76,26 +93,38 @@ app.get('/', (req, res) => {
 });
 
 // Health check endpoint
-app.get('/health', (req, res) => {
+app.get('/health', async (req, res) => {
   sendSuccess(res, 'Server is running', {
     status: 'OK',
     timestamp: new Date().toISOString(),
-    environment: process.env.NODE_ENV || 'development'
+    environment: process.env.NODE_ENV || 'development',
+    ingest: await ingestQueue.getStats().catch(error => ({ error: error.message }))
   });
 });
 
+// Process metrics: this worker, and every worker when running under cluster.js (admins only)
+app.get('/metrics', auth, adminOnly, async (req, res) => {
+  sendSuccess(res, 'Server metrics', await metrics.getMetrics());
+});
+
 // API routes
 app.get('/api', (req, res) => {
   sendSuccess(res, 'CORA API is running', {
     version: '1.0.0',
     endpoints: {
       health: '/health',
+      metrics: '/metrics',
       api: '/api',
       auth: '/api/auth',
       users: '/api/users',
       robots: '/api/robots',
       robot_detections: '/api/detections',
-      robot_active: '/api/detections/active'
+      robot_summaries: '/api/detections/summaries',
+      robot_tracks: '/api/detections/tracks',
+      robot_stream: '/api/detections/stream',
+      robot_active: '/api/detections/active',
+      dashboard_summary: '/api/dashboard/summary',
+      thumbnails: '/api/thumbnails/:key'
     }
   });
 });
@@ -106,6 +135,8 @@ app.use('/api/users', require('./src/routes/users'));
 // Mount robot detection routes at dedicated path (no auth required for robots)
 app.use('/api/detections', require('./src/routes/detections'));
 app.use('/api/robots', require('./src/routes/robots'));
+app.use('/api/dashboard', require('./src/routes/dashboard'));
+app.use('/api/thumbnails', require('./src/routes/thumbnails'));
 
 // Error handling middleware (must be last)
 app.use(errorHandler);
@@ -138,10 +169,44 @@ app.use('*', (req, res) => {
 const PORT = process.env.PORT || 5001;
 
 // Start server with proper port binding for deployment
-app.listen(PORT, '0.0.0.0', () => {
+const server = app.listen(PORT, '0.0.0.0', () => {
   console.log(` CORA Server running in ${process.env.NODE_ENV || 'development'} mode`);
   console.log(` Server listening on port ${PORT}`);
   console.log(` Available at: http://localhost:${PORT}`);
   console.log(` Health check: http://localhost:${PORT}/health`);
   console.log(` API endpoints: http://localhost:${PORT}/api`);
+
+  // Report metrics to the cluster primary (no-op in a single process)
+  metrics.start();
+  // Write queued detection packages in batches (INGEST_MODE=queue)
+  ingestQueue.start(require('./src/controllers/detectionController').writePackages);
+
+  // Background jobs run once per deployment: in the single process, or in one cluster worker
+  if (cluster.isWorker && process.env.CLUSTER_JOBS !== '1') {
+    return;
+  }
+  // Move inline thumbnails left from before the blob store in the background
+  require('./src/utils/thumbnailMigration').start();
+  // Correct drift in the incremental detection counters
+  require('./src/utils/statsReconciliation').start();
+  // Expire thumbnails and roll up old detections per the retention tiers
+  require('./src/utils/retentionCompaction').start();
+});
+
+// Stop taking requests, then write whatever the ingest queue still holds before exiting
+const shutdown = (signal) => {
+  console.log(` ${signal} received, shutting down...`);
+  server.close();
+  ingestQueue.stop()
+    .catch(error => console.error(' INGEST QUEUE: Error draining on shutdown:', error.message))
+    .finally(() => process.exit(0));
+};
+
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
+// Sent by cluster.js to retire a worker during a rolling restart or cluster shutdown
+process.on('message', (message) => {
+  if (message && message.type === 'shutdown') {
+    shutdown('Shutdown message');
+  }
 });
\ No newline at end of file
@@ -0,0 +1,28 @@
+// Retention tiers for stored detections (days, fractions allowed):
+//   DETECTION_RETENTION_DAYS - raw detection documents (default 30)
+//   THUMBNAIL_RETENTION_DAYS - thumbnails of those detections, which expire before the metadata (default 7)
+//   ROLLUP_RETENTION_DAYS    - hourly per-unit, per-action rollups in detection_stats (default 365)
+// RAW_QUERY_MAX_HOURS is the longest range answered from raw detections; longer ranges read rollups.
+const DAY_SECONDS = 24 * 60 * 60;
+
+const days = (name, fallback) => {
+  const value = parseFloat(process.env[name]);
+  return value > 0 ? value : fallback;
+};
+
+const rawDays = days('DETECTION_RETENTION_DAYS', 30);
+const thumbnailDays = Math.min(days('THUMBNAIL_RETENTION_DAYS', 7), rawDays);
+const rollupDays = Math.max(days('ROLLUP_RETENTION_DAYS', 365), rawDays);
+const rawQueryMaxHours = Math.min(parseInt(process.env.RAW_QUERY_MAX_HOURS) || 48, rawDays * 24);
+
+module.exports = {
+  rawDays,
+  thumbnailDays,
+  rollupDays,
+  rawQueryMaxHours,
+  // The TTL on raw detections is only a backstop a day behind the compaction job,
+  // which rolls each hour up before deleting it
+  rawTtlSeconds: Math.round((rawDays + 1) * DAY_SECONDS),
+  rollupTtlSeconds: Math.round(rollupDays * DAY_SECONDS),
+  useRollups: (hours) => hours > rawQueryMaxHours
+};
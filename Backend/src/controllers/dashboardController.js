@@ -0,0 +1,21 @@
+const { sendServerError, sendCacheable } = require('../utils/response');
+const dashboardSummary = require('../utils/dashboardSummary');
+
+// @desc    Get the dashboard counters in one request
+// @route   GET /api/dashboard/summary
+// @access  Private
+const getDashboardSummary = async (req, res) => {
+  try {
+    const summary = await dashboardSummary.getSummary();
+
+    sendCacheable(req, res, 'Dashboard summary retrieved successfully', summary, summary.computed_at);
+
+  } catch (error) {
+    console.error(' DASHBOARD: Error getting dashboard summary:', error);
+    sendServerError(res, 'Error retrieving dashboard summary');
+  }
+};
+
+module.exports = {
+  getDashboardSummary
+};
@@ -1,5 +1,285 @@
+const mongoose = require('mongoose');
 const Robot = require('../models/Robot');
-const { sendSuccess, sendError, sendServerError } = require('../utils/response');
+const DetectionRecord = require('../models/DetectionRecord');
+const DetectionStats = require('../models/DetectionStats');
+const DetectionPackage = require('../models/Detection');
+const PoseSummary = require('../models/PoseSummary');
+const PersonTrack = require('../models/PersonTrack');
+const { sendSuccess, sendError, sendServerError, sendCacheable, latestUpdate } = require('../utils/response');
+const liveEvents = require('../utils/liveEvents');
+const dashboardSummary = require('../utils/dashboardSummary');
+const { putThumbnail, readThumbnail, sendThumbnail } = require('../utils/blobStore');
+const ingestQueue = require('../utils/ingestQueue');
+const ttlCache = require('../utils/ttlCache');
+const retention = require('../config/retention');
+
+// List responses carry a thumbnail URL instead of the inline base64 image.
+// Blob-stored thumbnails are addressed by content hash, older inline ones by detection id.
+const toListDetection = (unitId, detection, includeThumbnail = false) => {
+  const { thumbnail, ...fields } = detection.toObject ? detection.toObject() : detection;
+  const item = { ...fields, has_thumbnail: !!thumbnail || !!fields.thumbnail_id || !!fields.has_thumbnail };
+  if (item.has_thumbnail) {
+    item.thumbnail_url = fields.thumbnail_id
+      ? `/api/thumbnails/${fields.thumbnail_id}`
+      : `/api/detections/${unitId}/thumbnails/${fields._id}`;
+    if (includeThumbnail && thumbnail) {
+      item.thumbnail = thumbnail;
+    }
+  }
+  return item;
+};
+
+// Newest-first detection listing; thumbnails are left out unless asked for, but flagged
+const findDetections = (match, limit, includeThumbnails = false, sort = { timestamp: -1, _id: -1 }) => {
+  const pipeline = [
+    { $match: match },
+    { $sort: sort },
+    { $limit: limit },
+    { $addFields: { has_thumbnail: { $or: [{ $gt: ['$thumbnail', null] }, { $gt: ['$thumbnail_id', null] }] } } }
+  ];
+  if (!includeThumbnails) {
+    pipeline.push({ $project: { thumbnail: 0 } });
+    return DetectionRecord.aggregate(pipeline);
+  }
+  return DetectionRecord.aggregate(pipeline).then(inlineThumbnails);
+};
+
+// Clients asking for inline thumbnails get blob-stored ones read back as base64
+const inlineThumbnails = async (detections) => {
+  await Promise.all(detections.map(async (detection) => {
+    if (!detection.thumbnail && detection.thumbnail_id) {
+      try {
+        detection.thumbnail = await readThumbnail(detection.thumbnail_id);
+      } catch (error) {
+        console.error(` BLOB STORE: Could not read thumbnail ${detection.thumbnail_id}:`, error.message);
+      }
+    }
+  }));
+  return detections;
+};
+
+// Write incoming thumbnails to the blob store; on failure they stay inline for the background job
+const storeThumbnails = (detections) => Promise.all(detections.map(async (detection) => {
+  if (typeof detection.thumbnail !== 'string' || !detection.thumbnail) {
+    return;
+  }
+  try {
+    detection.thumbnail_id = await putThumbnail(detection.thumbnail);
+    detection.thumbnail = null;
+  } catch (error) {
+    console.error(' BLOB STORE: Could not store thumbnail, keeping it inline:', error.message);
+  }
+}));
+
+// Bulk write errors that are all unique index violations
+const isDuplicateKeyError = (error) => {
+  const writeErrors = error.writeErrors || [];
+  return writeErrors.length > 0 && writeErrors.every(writeError => (writeError.code ?? writeError.err?.code) === 11000);
+};
+
+// Insert detections whose ids may already exist (a retried package); returns the ones actually added
+const insertDetections = async (docs) => {
+  try {
+    return await DetectionRecord.insertMany(docs, { ordered: false });
+  } catch (error) {
+    if (isDuplicateKeyError(error)) {
+      return error.insertedDocs || [];
+    }
+    throw error;
+  }
+};
+
+const VALID_ACTIONS = ['sitting_down', 'getting_up', 'sitting', 'standing', 'walking', 'jumping', 'unknown'];
+
+// Validate each detection of a package; invalid ones are skipped rather than rejecting the batch
+const validateDetections = (detections, unitId) => {
+  const validatedDetections = [];
+  for (let i = 0; i < detections.length; i++) {
+    const detection = detections[i];
+    
+    // Validate required detection fields
+    if (!detection.timestamp || !detection.action_type || 
+        detection.confidence === undefined || detection.person_id === undefined ||
+        detection.frame_number === undefined || !detection.normalized_bbox) {
+      console.log(` ROBOT DATA: Invalid detection at index ${i}`);
+      continue;
+    }
+
+    // Validate action_type
+    if (!VALID_ACTIONS.includes(detection.action_type)) {
+      console.log(` ROBOT DATA: Invalid action_type: ${detection.action_type}`);
+      detection.action_type = 'unknown'; // Default to unknown
+    }
+
+    // Validate confidence range
+    if (detection.confidence < 0 || detection.confidence > 1) {
+      console.log(` ROBOT DATA: Invalid confidence: ${detection.confidence}`);
+      continue;
+    }
+
+    // Validate bounding box
+    const bbox = detection.normalized_bbox;
+    if (!bbox || bbox.x < 0 || bbox.x > 1 || bbox.y < 0 || bbox.y > 1 ||
+        bbox.width < 0 || bbox.width > 1 || bbox.height < 0 || bbox.height > 1) {
+      console.log(` ROBOT DATA: Invalid bounding box at index ${i}`);
+      continue;
+    }
+
+    // Convert timestamp to Date object
+    detection.timestamp = new Date(detection.timestamp);
+    detection.unit_id = unitId;
+
+    validatedDetections.push(detection);
+  }
+  return validatedDetections;
+};
+
+// Store validated detection packages: one robot upsert per unit and one insertMany for all
+// detections. The synchronous endpoint passes a single package, the ingest queue whole batches.
+// Returns the detections actually inserted and the packages that had already been stored.
+const writePackages = async (packages) => {
+  // Find or create each robot; last_seen/status mark it online
+  const units = new Map(packages.map(pkg => [pkg.unit_id, pkg]));
+  const robotOperations = [...units.values()].map(pkg => ({
+    updateOne: {
+      filter: { unit_id: pkg.unit_id },
+      update: { $set: { unit_name: pkg.unit_name, rtsp_uris: pkg.rtsp_uris || [], status: 'online', last_seen: new Date() } },
+      upsert: true
+    }
+  }));
+  try {
+    await Robot.bulkWrite(robotOperations, { ordered: false });
+  } catch (error) {
+    // First contact of a unit from two requests at once: one upsert loses on the unique
+    // unit_id, and repeating it updates the document the other one created
+    if (!isDuplicateKeyError(error)) {
+      throw error;
+    }
+    await Robot.bulkWrite(robotOperations, { ordered: false });
+  }
+
+  // Tag each detection with its package and position; a retry of an interrupted earlier
+  // attempt writes the same (package_id, package_index) pairs and the unique index drops the copies
+  const duplicates = [];
+  const claimed = await Promise.all(packages.map(async (pkg) => {
+    if (!pkg.package_id) {
+      return pkg.detections;
+    }
+    const claim = await DetectionPackage.claim(pkg.package_id, {
+      unit_id: pkg.unit_id,
+      unit_name: pkg.unit_name,
+      rtsp_uris: pkg.rtsp_uris || [],
+      timestamp: pkg.timestamp ? new Date(pkg.timestamp) : new Date(),
+      detection_count: pkg.detections.length
+    });
+    if (claim.package.processed) {
+      duplicates.push(pkg.package_id);
+      return [];
+    }
+    if (!claim.created) {
+      console.log(` ROBOT DATA: Package ${pkg.package_id} seen before, re-applying it idempotently`);
+    }
+    pkg.detections.forEach((detection, index) => {
+      detection.package_id = pkg.package_id;
+      detection.package_index = index;
+    });
+    return pkg.detections;
+  }));
+  const detections = claimed.flat();
+
+  await storeThumbnails(detections);
+
+  // Number each unit's detections for delta sync as they are written; clients only see a
+  // number once every write holding a lower one has finished (see Robot.getSyncWatermark)
+  const counts = new Map();
+  detections.forEach(detection => counts.set(detection.unit_id, (counts.get(detection.unit_id) || 0) + 1));
+  const reservations = await Promise.all([...counts.entries()].map(async ([unitId, count]) =>
+    [unitId, await Robot.reserveDetectionSeq(unitId, count)]
+  ));
+  const nextSeq = new Map(reservations);
+  detections.forEach(detection => {
+    detection.seq = nextSeq.get(detection.unit_id);
+    nextSeq.set(detection.unit_id, detection.seq + 1);
+  });
+  let inserted;
+  try {
+    inserted = await insertDetections(detections);
+  } finally {
+    await Promise.all(reservations.map(([unitId, start]) => Robot.releaseDetectionSeq(unitId, start)));
+  }
+
+  const insertedByUnit = new Map();
+  inserted.forEach(detection => {
+    if (!insertedByUnit.has(detection.unit_id)) {
+      insertedByUnit.set(detection.unit_id, []);
+    }
+    insertedByUnit.get(detection.unit_id).push(detection);
+  });
+  await Promise.all([...insertedByUnit.entries()].map(([unitId, unitDetections]) =>
+    DetectionStats.recordDetections(unitId, unitDetections)
+  ));
+
+  const packageIds = packages.map(pkg => pkg.package_id).filter(id => id && !duplicates.includes(id));
+  if (packageIds.length > 0) {
+    await DetectionPackage.updateMany(
+      { package_id: { $in: packageIds } },
+      { $set: { processed: true, processed_at: new Date() } }
+    );
+  }
+
+  if (inserted.length > 0) {
+    dashboardSummary.markDirty();
+  }
+
+  // Notify live clients; thumbnails stay out of the push and are fetched with the delta
+  insertedByUnit.forEach((unitDetections, unitId) => {
+    const added = unitDetections.map(det => toListDetection(unitId, det));
+    liveEvents.publish('detections', unitId, {
+      unit_name: units.get(unitId).unit_name,
+      count: added.length,
+      cursor: String(Math.max(...added.map(det => det.seq))),
+      detections: added
+    });
+  });
+
+  return { inserted, duplicates };
+};
+
+const STATS_CACHE_TTL_MS = parseInt(process.env.STATS_CACHE_TTL_MS) || 10 * 1000;
+
+// Statistics for a unit over the last `hours`: aggregated from raw detections for short ranges,
+// read from the hourly rollups for long ones (raw detections may have expired). Cached briefly,
+// since detail pages of busy units ask for them on every pushed update.
+const getRangeStats = (unitId, hours, actionType = null) => ttlCache.cached(
+  `stats:${unitId}:${hours}:${actionType || ''}`,
+  STATS_CACHE_TTL_MS,
+  async () => {
+    const since = new Date(Date.now() - hours * 60 * 60 * 1000);
+    if (retention.useRollups(hours) && !actionType) {
+      const [stats, hourly] = await Promise.all([
+        DetectionStats.getUnitStats(unitId, hours),
+        DetectionStats.getHourlyRollups(unitId, since)
+      ]);
+      return { ...stats, hourly, data_source: 'rollup' };
+    }
+    const [stats, robot] = await Promise.all([
+      DetectionRecord.aggregateStats(unitId, since, actionType),
+      Robot.findOne({ unit_id: unitId }, { detection_count: 1 }).lean()
+    ]);
+    return { total_detections: robot?.detection_count || 0, ...stats, data_source: 'raw' };
+  }
+);
+
+// Page cursors are "<timestamp ms>_<detection id>" of the last detection on the previous page
+const encodePageCursor = (detection) => `${new Date(detection.timestamp).getTime()}_${detection._id}`;
+
+const decodePageCursor = (cursor) => {
+  const [time, id] = cursor.split('_');
+  return { timestamp: new Date(parseInt(time)), id: new mongoose.Types.ObjectId(id) };
+};
+
+// Query timestamps may be epoch milliseconds or ISO 8601 strings
+const parseQueryDate = (value) => new Date(/^\d+$/.test(value) ? parseInt(value) : value);
 
 // @desc    Receive detection data from robot units
 // @route   POST /api/robots/detections
@@ -19,6 +299,7 @@ const receiveDetections = async (req, res) => {
     console.log(' ROBOT DATA: Detection count:', req.body.detections?.length || 0);
 
     const {
+      package_id,
       unit_id,
       unit_name,
       rtsp_uris,
@@ -45,131 +326,71 @@ const receiveDetections = async (req, res) => {
       return sendError(res, 'Detections must be a non-empty array', 400);
     }
 
-    // Find or create robot using atomic upsert for consistency
-    console.log(' DATABASE: Looking up or creating robot with unit_id:', unit_id);
-    
-    try {
-      // Use atomic upsert to handle race conditions and duplicate key errors
-      const robot = await Robot.upsertByUnitId(unit_id, {
-        unit_name,
-        rtsp_uris: rtsp_uris || [],
-        status: 'online',
-        $setOnInsert: { detections: [] }
-      });
-      
-      console.log('DATABASE: Robot upserted successfully:', {
-        id: robot._id,
-        unit_id: robot.unit_id,
-        unit_name: robot.unit_name,
-        existing_detections: robot.detections.length
-      });
-      
-      // Store robot for later use
-      req.robot = robot;
-      
-    } catch (upsertError) {
-      if (upsertError.code === 11000) {
-        console.log('DATABASE: Duplicate key error detected, attempting cleanup and retry...');
-        
-        // Try to clean up database and retry once
-        try {
-          await Robot.cleanupDatabase();
-          const robot = await Robot.upsertByUnitId(unit_id, {
-            unit_name,
-            rtsp_uris: rtsp_uris || [],
-            status: 'online',
-            $setOnInsert: { detections: [] }
-          });
-          
-          console.log('DATABASE: Robot upserted successfully after cleanup:', robot._id);
-          req.robot = robot;
-        } catch (retryError) {
-          console.error('DATABASE: Failed even after cleanup:', retryError);
-          throw retryError;
-        }
-      } else {
-        throw upsertError;
-      }
-    }
-
-    // Validate each detection
-    const validatedDetections = [];
-    for (let i = 0; i < detections.length; i++) {
-      const detection = detections[i];
-      
-      // Validate required detection fields
-      if (!detection.timestamp || !detection.action_type || 
-          detection.confidence === undefined || detection.person_id === undefined ||
-          detection.frame_number === undefined || !detection.normalized_bbox) {
-        console.log(` ROBOT DATA: Invalid detection at index ${i}`);
-        continue; // Skip invalid detections rather than rejecting entire batch
-      }
-
-      // Validate action_type
-      const validActions = ['sitting_down', 'getting_up', 'sitting', 'standing', 'walking', 'jumping', 'unknown'];
-      if (!validActions.includes(detection.action_type)) {
-        console.log(` ROBOT DATA: Invalid action_type: ${detection.action_type}`);
-        detection.action_type = 'unknown'; // Default to unknown
-      }
-
-      // Validate confidence range
-      if (detection.confidence < 0 || detection.confidence > 1) {
-        console.log(` ROBOT DATA: Invalid confidence: ${detection.confidence}`);
-        continue;
-      }
-
-      // Validate bounding box
-      const bbox = detection.normalized_bbox;
-      if (!bbox || bbox.x < 0 || bbox.x > 1 || bbox.y < 0 || bbox.y > 1 ||
-          bbox.width < 0 || bbox.width > 1 || bbox.height < 0 || bbox.height > 1) {
-        console.log(` ROBOT DATA: Invalid bounding box at index ${i}`);
-        continue;
+    // A retry of a package that was already stored: acknowledge it without storing anything
+    if (package_id) {
+      const existing = await DetectionPackage.findOne({ package_id }, { processed: 1, detection_count: 1 }).lean();
+      if (existing?.processed) {
+        console.log(` ROBOT DATA: Package ${package_id} already processed, skipping duplicate`);
+        return sendSuccess(res, 'Robot detection package already processed', {
+          unit_id,
+          unit_name,
+          package_id,
+          duplicate: true,
+          processed_detections: existing.detection_count,
+          total_detections: detections.length
+        });
       }
-
-      // Convert timestamp to Date object
-      detection.timestamp = new Date(detection.timestamp);
-
-      validatedDetections.push(detection);
     }
 
+    const validatedDetections = validateDetections(detections, unit_id);
     if (validatedDetections.length === 0) {
       console.log(' ROBOT DATA: No valid detections found');
       return sendError(res, 'No valid detections found in batch', 400);
     }
 
-    // Add detections to robot
-    console.log(' DATABASE: About to add detections to robot...');
+    const pkg = {
+      package_id: package_id || null,
+      unit_id,
+      unit_name,
+      rtsp_uris: rtsp_uris || [],
+      timestamp: timestamp ? new Date(timestamp) : new Date(),
+      detections: validatedDetections
+    };
+
+    // Write-behind mode: acknowledge once queued, the ingest queue writer stores it in a batch
+    if (ingestQueue.enabled()) {
+      const queued = await ingestQueue.enqueue(pkg);
+      if (!queued.accepted) {
+        console.log(` ROBOT DATA: Ingest queue full (${queued.depth}), asking ${unit_id} to retry in ${queued.retryAfter}s`);
+        res.set('Retry-After', String(queued.retryAfter));
+        return sendError(res, 'Detection queue is full, retry later', 429);
+      }
+      return sendSuccess(res, 'Robot detection data queued', {
+        unit_id,
+        unit_name,
+        package_id: package_id || null,
+        duplicate: false,
+        queued: true,
+        queue_depth: queued.depth,
+        processed_detections: validatedDetections.length,
+        total_detections: detections.length
+      }, 202);
+    }
+
+    // Store detections as their own documents
+    console.log(' DATABASE: About to store detections...');
     console.log(' DATABASE: Validated detections count:', validatedDetections.length);
     console.log(' DATABASE: Sample detection:', validatedDetections[0]);
+
+    const { inserted } = await writePackages([pkg]);
     
-    // Use atomic update to add detections and avoid race conditions
-    const updateResult = await Robot.findByIdAndUpdate(
-      req.robot._id,
-      { 
-        $push: { detections: { $each: validatedDetections } },
-        $set: { 
-          last_seen: new Date(),
-          status: 'online'
-        }
-      },
-      { new: true }
-    );
-    
-    if (!updateResult) {
-      throw new Error('Failed to update robot with new detections');
-    }
-    
-    const robot = updateResult;
-    
-    console.log(' DATABASE: Atomic update completed');
-    console.log(' DATABASE: Robot after update - total detections:', robot.detections.length);
-    console.log(' DATABASE: Robot ID after update:', robot._id);
+    console.log(' DATABASE: Insert completed');
 
     console.log(' ROBOT DATA: Successfully saved robot detections');
-    console.log(` ROBOT DATA: Saved ${validatedDetections.length}/${detections.length} detections`);
+    console.log(` ROBOT DATA: Saved ${inserted.length}/${detections.length} detections`);
 
-    // Get robot statistics
-    const stats = robot.getStats();
+    // Get robot statistics (read from the counters, not the detection history)
+    const stats = await DetectionStats.getUnitStats(unit_id);
 
     // Log detection summary
     console.log(' ROBOT DATA: Detection summary:', {
@@ -183,6 +404,8 @@ const receiveDetections = async (req, res) => {
     sendSuccess(res, 'Robot detection data processed successfully', {
       unit_id,
       unit_name,
+      package_id: package_id || null,
+      duplicate: false,
       processed_detections: validatedDetections.length,
       total_detections: detections.length,
       stats
@@ -207,6 +430,176 @@ const receiveDetections = async (req, res) => {
   }
 };
 
+// @desc    Receive time-bucketed pose summaries from robot units in aggregation mode
+// @route   POST /api/detections/summaries
+// @access  Public (robots authenticate in production)
+const receiveSummaries = async (req, res) => {
+  try {
+    const { unit_id, unit_name, rtsp_uris, summaries } = req.body;
+
+    console.log(` ROBOT SUMMARY DATA: Unit ${unit_id} sent ${summaries?.length || 0} summaries`);
+
+    if (!unit_id || !unit_name || !Array.isArray(summaries) || summaries.length === 0) {
+      return sendError(res, 'Missing required fields: unit_id, unit_name, summaries', 400);
+    }
+
+    // Keep the robot visible in listings even when only summaries arrive
+    await Robot.upsertByUnitId(unit_id, {
+      unit_name,
+      rtsp_uris: rtsp_uris || [],
+      status: 'online'
+    });
+
+    // Upsert on (unit_id, bucket_start) so retried uploads stay idempotent
+    const operations = summaries
+      .filter(summary => summary.bucket_start && summary.bucket_end)
+      .map(summary => ({
+        updateOne: {
+          filter: { unit_id, bucket_start: new Date(summary.bucket_start) },
+          update: {
+            $set: {
+              ...summary,
+              unit_id,
+              bucket_start: new Date(summary.bucket_start),
+              bucket_end: new Date(summary.bucket_end)
+            }
+          },
+          upsert: true
+        }
+      }));
+
+    if (operations.length === 0) {
+      return sendError(res, 'No valid summaries found in batch', 400);
+    }
+
+    await PoseSummary.bulkWrite(operations, { ordered: false });
+
+    console.log(` ROBOT SUMMARY DATA: Stored ${operations.length} summaries for unit ${unit_id}`);
+
+    liveEvents.publish('summaries', unit_id, { unit_name, count: operations.length });
+
+    sendSuccess(res, 'Robot summary data processed successfully', {
+      unit_id,
+      processed_summaries: operations.length
+    });
+
+  } catch (error) {
+    console.error(' ROBOT SUMMARY DATA: Error processing robot summaries:', error);
+    sendServerError(res, 'Error processing robot summary data');
+  }
+};
+
+// @desc    Get time-bucketed pose summaries for a specific robot unit
+// @route   GET /api/detections/:unitId/summaries
+// @access  Private
+const getSummariesByUnit = async (req, res) => {
+  try {
+    const { unitId } = req.params;
+    const { hours = 24 } = req.query;
+
+    const since = new Date(Date.now() - parseInt(hours) * 60 * 60 * 1000);
+    const summaries = await PoseSummary.getByUnit(unitId, since);
+
+    console.log(` ROBOT SUMMARY QUERY: Found ${summaries.length} summaries for unit ${unitId}`);
+
+    sendCacheable(req, res, 'Robot summary data retrieved successfully', {
+      unit_id: unitId,
+      time_range_hours: parseInt(hours),
+      summaries_count: summaries.length,
+      summaries
+    }, latestUpdate(summaries));
+
+  } catch (error) {
+    console.error(' ROBOT SUMMARY QUERY: Error getting robot summaries:', error);
+    sendServerError(res, 'Error retrieving robot summary data');
+  }
+};
+
+// @desc    Receive consolidated person track records from robot units in track mode
+// @route   POST /api/detections/tracks
+// @access  Public (robots authenticate in production)
+const receiveTracks = async (req, res) => {
+  try {
+    const { unit_id, unit_name, rtsp_uris, tracks } = req.body;
+
+    console.log(` ROBOT TRACK DATA: Unit ${unit_id} sent ${tracks?.length || 0} track records`);
+
+    if (!unit_id || !unit_name || !Array.isArray(tracks) || tracks.length === 0) {
+      return sendError(res, 'Missing required fields: unit_id, unit_name, tracks', 400);
+    }
+
+    await Robot.upsertByUnitId(unit_id, {
+      unit_name,
+      rtsp_uris: rtsp_uris || [],
+      status: 'online'
+    });
+
+    // Each record carries the full track state, so checkpoints simply overwrite.
+    // best_thumbnail is only sent when it improved and must not be cleared otherwise.
+    const operations = tracks
+      .filter(track => track.track_id && track.first_seen && track.last_seen)
+      .map(track => {
+        const { best_thumbnail, ...fields } = track;
+        const update = { ...fields, unit_id };
+        if (best_thumbnail) {
+          update.best_thumbnail = best_thumbnail;
+        }
+        return {
+          updateOne: {
+            filter: { unit_id, track_id: track.track_id },
+            update: { $set: update },
+            upsert: true
+          }
+        };
+      });
+
+    if (operations.length === 0) {
+      return sendError(res, 'No valid track records found in batch', 400);
+    }
+
+    await PersonTrack.bulkWrite(operations, { ordered: false });
+
+    console.log(` ROBOT TRACK DATA: Stored ${operations.length} track records for unit ${unit_id}`);
+
+    liveEvents.publish('tracks', unit_id, { unit_name, count: operations.length });
+
+    sendSuccess(res, 'Robot track data processed successfully', {
+      unit_id,
+      processed_tracks: operations.length
+    });
+
+  } catch (error) {
+    console.error(' ROBOT TRACK DATA: Error processing robot tracks:', error);
+    sendServerError(res, 'Error processing robot track data');
+  }
+};
+
+// @desc    Get consolidated person tracks for a specific robot unit
+// @route   GET /api/detections/:unitId/tracks
+// @access  Private
+const getTracksByUnit = async (req, res) => {
+  try {
+    const { unitId } = req.params;
+    const { hours = 24, limit = 100 } = req.query;
+
+    const since = new Date(Date.now() - parseInt(hours) * 60 * 60 * 1000);
+    const tracks = await PersonTrack.getByUnit(unitId, since, parseInt(limit));
+
+    console.log(` ROBOT TRACK QUERY: Found ${tracks.length} tracks for unit ${unitId}`);
+
+    sendCacheable(req, res, 'Robot track data retrieved successfully', {
+      unit_id: unitId,
+      time_range_hours: parseInt(hours),
+      tracks_count: tracks.length,
+      tracks
+    }, latestUpdate(tracks));
+
+  } catch (error) {
+    console.error(' ROBOT TRACK QUERY: Error getting robot tracks:', error);
+    sendServerError(res, 'Error retrieving robot track data');
+  }
+};
+
 // @desc    Get detection data for a specific robot unit
 // @route   GET /api/robots/:unitId/detections
 // @access  Private (requires authentication)
@@ -214,6 +607,7 @@ const getDetectionsByUnit = async (req, res) => {
   try {
     const { unitId } = req.params;
     const { hours = 24, limit = 100, action_type } = req.query;
+    const includeThumbnails = req.query.include_thumbnails === 'true';
 
     console.log(` ROBOT QUERY: Getting detections for unit ${unitId}`);
 
@@ -225,46 +619,204 @@ const getDetectionsByUnit = async (req, res) => {
     }
 
     // Calculate time filter
-    const since = new Date(Date.now() - parseInt(hours) * 60 * 60 * 1000);
+    const rangeHours = parseInt(hours) || 24;
+    const since = new Date(Date.now() - rangeHours * 60 * 60 * 1000);
     
-    // Get detections using robot method
-    let detections = robot.getDetectionsByTimeRange(since, new Date(), action_type);
-    
-    // Apply limit
-    if (limit && limit > 0) {
-      detections = detections.slice(0, parseInt(limit));
+    const match = { unit_id: unitId, timestamp: { $gte: since } };
+    if (action_type) {
+      match.action_type = action_type;
     }
+    // Statistics cover the whole range (computed in the database), not just the listed detections
+    const [detections, stats] = await Promise.all([
+      findDetections(match, parseInt(limit) || 100, includeThumbnails),
+      getRangeStats(unitId, rangeHours, action_type || null)
+    ]);
 
-    // Calculate statistics
-    let totalConfidence = 0;
-    const actionCounts = {};
+    console.log(` ROBOT QUERY: Found ${detections.length} detections for robot ${unitId} (${stats.data_source} statistics)`);
 
-    detections.forEach(det => {
-      totalConfidence += det.confidence;
-      
-      if (!actionCounts[det.action_type]) {
-        actionCounts[det.action_type] = 0;
-      }
-      actionCounts[det.action_type]++;
+    sendCacheable(req, res, 'Robot detection data retrieved successfully', {
+      unit_id: unitId,
+      unit_name: robot.unit_name,
+      rtsp_uris: robot.rtsp_uris,
+      data_source: stats.data_source,
+      total_detections: stats.window_detections,
+      avg_confidence: stats.avg_confidence,
+      action_counts: stats.action_counts,
+      stats,
+      detections: detections.map(det => toListDetection(unitId, det, includeThumbnails))
+    }, robot.updatedAt);
+
+  } catch (error) {
+    console.error(' ROBOT QUERY: Error getting robot detections:', error);
+    sendServerError(res, 'Error retrieving robot detection data');
+  }
+};
+
+// @desc    Get detections received after a cursor (the delta sync watermark of the previous call)
+// @route   GET /api/detections/:unitId/since
+// @access  Private
+const getDetectionsSince = async (req, res) => {
+  try {
+    const { unitId } = req.params;
+    const { since, hours = 24 } = req.query;
+    const limit = parseInt(req.query.limit) || 50;
+    const includeThumbnails = req.query.include_thumbnails === 'true';
+
+    const robot = await Robot.findByUnitId(unitId);
+    if (!robot) {
+      console.log(` ROBOT DELTA: Robot unit ${unitId} not found`);
+      return sendError(res, 'Robot unit not found', 404);
+    }
+
+    // Cursors are delta sync numbers: everything numbered above the cursor and up to the
+    // watermark is new. Anything else (none, an id from before sequence numbers, or ahead
+    // of this unit) starts over with a fresh window.
+    const watermark = await Robot.getSyncWatermark(unitId);
+    const known = since && /^\d+$/.test(since) && parseInt(since) <= watermark ? parseInt(since) : null;
+    let detections = known !== null
+      ? await findDetections({ unit_id: unitId, seq: { $gt: known, $lte: watermark } }, limit + 1, includeThumbnails, { seq: -1 })
+      : [];
+
+    let reset = false;
+    const cursor = String(watermark);
+    if (known === null || detections.length > limit) {
+      // Too many new detections: send a fresh window instead. Detections numbered above the
+      // watermark are left for the next delta, so none arrives twice.
+      reset = true;
+      const start = new Date(Date.now() - parseInt(hours) * 60 * 60 * 1000);
+      detections = await findDetections(
+        { unit_id: unitId, timestamp: { $gte: start }, seq: { $not: { $gt: watermark } } },
+        limit,
+        includeThumbnails
+      );
+    }
+
+    // A reset window doubles as the first page of the unfiltered listing
+    const nextCursor = reset && detections.length === limit ? encodePageCursor(detections[detections.length - 1]) : null;
+
+    console.log(` ROBOT DELTA: ${reset ? 'Reset with' : 'Found'} ${detections.length} detections for unit ${unitId}`);
+
+    sendSuccess(res, 'Robot detection delta retrieved successfully', {
+      unit_id: unitId,
+      unit_name: robot.unit_name,
+      rtsp_uris: robot.rtsp_uris,
+      cursor,
+      reset,
+      next_cursor: nextCursor,
+      new_count: detections.length,
+      detections: detections.map(det => toListDetection(unitId, det, includeThumbnails))
     });
 
-    const avgConfidence = detections.length > 0 ? totalConfidence / detections.length : 0;
+  } catch (error) {
+    console.error(' ROBOT DELTA: Error getting detection delta:', error);
+    sendServerError(res, 'Error retrieving robot detection delta');
+  }
+};
+
+// @desc    Get one page of a unit's detections, newest first, with server-side filters
+// @route   GET /api/detections/:unitId/page
+// @access  Private
+const getDetectionPage = async (req, res) => {
+  try {
+    const { unitId } = req.params;
+    const { cursor, action_type, min_confidence, person_id, from, to, hours } = req.query;
+    const pageSize = parseInt(req.query.page_size) || 50;
+    const includeThumbnails = req.query.include_thumbnails === 'true';
+
+    const robot = await Robot.findOne({ unit_id: unitId }, { unit_name: 1, rtsp_uris: 1 }).lean();
+    if (!robot) {
+      console.log(` ROBOT PAGE: Robot unit ${unitId} not found`);
+      return sendError(res, 'Robot unit not found', 404);
+    }
+
+    const filter = { unit_id: unitId };
+    if (from || hours) {
+      filter.timestamp = { $gte: from ? parseQueryDate(from) : new Date(Date.now() - parseInt(hours) * 60 * 60 * 1000) };
+    }
+    if (to) {
+      filter.timestamp = { ...filter.timestamp, $lte: parseQueryDate(to) };
+    }
+    if (action_type) {
+      filter.action_type = action_type;
+    }
+    if (min_confidence !== undefined) {
+      filter.confidence = { $gte: parseFloat(min_confidence) };
+    }
+    if (person_id !== undefined) {
+      filter.person_id = parseInt(person_id);
+    }
+    if (cursor) {
+      // Keyset pagination: strictly older than the last detection already sent
+      const after = decodePageCursor(cursor);
+      filter.$or = [
+        { timestamp: { $lt: after.timestamp } },
+        { timestamp: after.timestamp, _id: { $lt: after.id } }
+      ];
+    }
+
+    const rows = await findDetections(filter, pageSize + 1, includeThumbnails);
 
-    console.log(` ROBOT QUERY: Found ${detections.length} detections for robot ${unitId}`);
+    const hasMore = rows.length > pageSize;
+    const detections = rows.slice(0, pageSize);
+    const nextCursor = hasMore ? encodePageCursor(detections[detections.length - 1]) : null;
 
-    sendSuccess(res, 'Robot detection data retrieved successfully', {
+    console.log(` ROBOT PAGE: ${detections.length} detections for unit ${unitId}${hasMore ? ' (more available)' : ''}`);
+
+    sendSuccess(res, 'Robot detection page retrieved successfully', {
       unit_id: unitId,
       unit_name: robot.unit_name,
       rtsp_uris: robot.rtsp_uris,
-      total_detections: detections.length,
-      avg_confidence: avgConfidence,
-      action_counts: actionCounts,
-      detections
+      page_size: pageSize,
+      has_more: hasMore,
+      next_cursor: nextCursor,
+      detections: detections.map(det => toListDetection(unitId, det, includeThumbnails))
     });
 
   } catch (error) {
-    console.error(' ROBOT QUERY: Error getting robot detections:', error);
-    sendServerError(res, 'Error retrieving robot detection data');
+    console.error(' ROBOT PAGE: Error getting detection page:', error);
+    sendServerError(res, 'Error retrieving robot detection page');
+  }
+};
+
+// @desc    Get a detection thumbnail as a JPEG image
+// @route   GET /api/detections/:unitId/thumbnails/:detectionId
+// @access  Private
+const getThumbnail = async (req, res) => {
+  try {
+    const { unitId, detectionId } = req.params;
+
+    // A detection's thumbnail never changes, so its id is a sufficient validator
+    const etag = `"${detectionId}"`;
+    if (req.get('If-None-Match') === etag) {
+      return res.status(304).end();
+    }
+
+    const detection = await DetectionRecord.findOne(
+      { _id: detectionId, unit_id: unitId },
+      { thumbnail: 1, thumbnail_id: 1 }
+    ).lean();
+
+    if (detection?.thumbnail_id) {
+      // Moved to the blob store since the client got this URL
+      return await sendThumbnail(req, res, detection.thumbnail_id);
+    }
+
+    if (!detection || !detection.thumbnail) {
+      return sendError(res, 'Thumbnail not found', 404);
+    }
+
+    const image = Buffer.from(detection.thumbnail, 'base64');
+    res.set({
+      'Content-Type': 'image/jpeg',
+      'Content-Length': image.length,
+      'Cache-Control': 'private, max-age=31536000, immutable',
+      'ETag': etag
+    });
+    res.send(image);
+
+  } catch (error) {
+    console.error(' ROBOT THUMBNAIL: Error getting thumbnail:', error);
+    sendServerError(res, 'Error retrieving detection thumbnail');
   }
 };
 
@@ -285,20 +837,21 @@ const getDetectionSummary = async (req, res) => {
       return sendError(res, 'Robot unit not found', 404);
     }
 
-    // Get robot statistics
-    const stats = robot.getStats();
+    // Get robot statistics for the requested window
+    const rangeHours = parseInt(hours) || 24;
+    const stats = await getRangeStats(unitId, rangeHours);
 
-    console.log(` ROBOT SUMMARY: Generated summary for robot ${unitId}`);
+    console.log(` ROBOT SUMMARY: Generated summary for robot ${unitId} (${stats.data_source} statistics)`);
 
-    sendSuccess(res, 'Robot detection summary retrieved successfully', {
+    sendCacheable(req, res, 'Robot detection summary retrieved successfully', {
       unit_id: unitId,
       unit_name: robot.unit_name,
       rtsp_uris: robot.rtsp_uris,
       status: robot.status,
       last_seen: robot.last_seen,
-      time_range_hours: parseInt(hours),
+      time_range_hours: rangeHours,
       stats
-    });
+    }, robot.updatedAt);
 
   } catch (error) {
     console.error(' ROBOT SUMMARY: Error getting robot summary:', error);
@@ -306,6 +859,13 @@ const getDetectionSummary = async (req, res) => {
   }
 };
 
+// @desc    Stream live robot data events (Server-Sent Events)
+// @route   GET /api/detections/stream
+// @access  Private
+const streamEvents = (req, res) => {
+  liveEvents.subscribe(req, res, req.query.unit_id || null);
+};
+
 // @desc    Get all active robot units
 // @route   GET /api/robots/active
 // @access  Private
@@ -318,29 +878,36 @@ const getActiveUnits = async (req, res) => {
 
     // Get active robots using static method
     const activeRobots = await Robot.getActiveRobots(minutesThreshold);
+    const unitStats = await DetectionStats.getUnitStatsMany(activeRobots);
 
     // Format response data
-    const units = activeRobots.map(robot => ({
-      unit_id: robot.unit_id,
-      unit_name: robot.unit_name,
-      status: robot.status,
-      last_seen: robot.last_seen,
-      is_active: robot.is_active,
-      total_detections: robot.stats_cache.total_detections,
-      last_24h_detections: robot.stats_cache.last_24h_detections,
-      most_common_action: robot.stats_cache.most_common_action,
-      avg_confidence: robot.stats_cache.avg_confidence,
-      rtsp_uris: robot.rtsp_uris,
-      location: robot.location
-    }));
+    const units = activeRobots.map(robot => {
+      const stats = unitStats[robot.unit_id];
+      const [mostCommon] = Object.entries(stats.action_counts).sort((a, b) => b[1] - a[1]);
+      return {
+        unit_id: robot.unit_id,
+        unit_name: robot.unit_name,
+        status: robot.status,
+        last_seen: robot.last_seen,
+        last_detection_at: robot.last_detection_at,
+        is_active: Robot.isActive(robot),
+        detection_count: stats.total_detections,
+        total_detections: stats.total_detections,
+        last_24h_detections: stats.last_24h_detections,
+        most_common_action: mostCommon ? mostCommon[0] : 'unknown',
+        avg_confidence: stats.avg_confidence,
+        rtsp_uris: robot.rtsp_uris,
+        location: robot.location
+      };
+    });
 
     console.log(` ACTIVE ROBOTS: Found ${units.length} active robot units`);
 
-    sendSuccess(res, 'Active robot units retrieved successfully', {
+    sendCacheable(req, res, 'Active robot units retrieved successfully', {
       time_range_hours: parseInt(hours),
       units_count: units.length,
       units
-    });
+    }, latestUpdate(activeRobots));
 
   } catch (error) {
     console.error(' ACTIVE ROBOTS: Error getting active robots:', error);
@@ -350,7 +917,16 @@ const getActiveUnits = async (req, res) => {
 
 module.exports = {
   receiveDetections,
+  receiveSummaries,
+  receiveTracks,
   getDetectionsByUnit,
+  getDetectionsSince,
+  getDetectionPage,
+  getThumbnail,
   getDetectionSummary,
-  getActiveUnits
+  getSummariesByUnit,
+  getTracksByUnit,
+  getActiveUnits,
+  streamEvents,
+  writePackages
 };
\ No newline at end of file
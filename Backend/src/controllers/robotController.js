@@ -1,7 +1,11 @@
 const Robot = require('../models/Robot');
+const DetectionRecord = require('../models/DetectionRecord');
+const DetectionStats = require('../models/DetectionStats');
 const User = require('../models/User');
-const { sendSuccess, sendError, sendServerError } = require('../utils/response');
+const { sendSuccess, sendError, sendServerError, sendCacheable, latestUpdate } = require('../utils/response');
 const { validationResult } = require('express-validator');
+const dashboardSummary = require('../utils/dashboardSummary');
+const { releaseThumbnails } = require('../utils/retentionCompaction');
 
 // @desc    Get all robots for a user
 // @route   GET /api/robots
@@ -20,24 +24,24 @@ const getRobots = async (req, res) => {
       query.status = req.query.status;
     }
 
-    const robots = await Robot.find(query)
-      .sort({ last_seen: -1 })
-      .skip(skip)
-      .limit(limit)
-      .lean();
+    // Lean listing fields only; counts come from the denormalized detection_count
+    const [robots, total] = await Promise.all([
+      Robot.listRobots(query, skip, limit),
+      Robot.countDocuments(query)
+    ]);
 
     // Add computed fields for frontend compatibility
     const robotsWithStats = robots.map(robot => ({
       ...robot,
       _id: robot.unit_id, // Use unit_id as _id for frontend compatibility
-      packages_count: robot.detections?.length || 0,
-      total_detections: robot.detections?.length || 0,
+      detection_count: robot.detection_count || 0,
+      packages_count: robot.detection_count || 0,
+      total_detections: robot.detection_count || 0,
+      is_active: Robot.isActive(robot),
       units_count: 1 // For compatibility with frontend expectations
     }));
 
-    const total = await Robot.countDocuments(query);
-
-    sendSuccess(res, 'Robots retrieved successfully', {
+    sendCacheable(req, res, 'Robots retrieved successfully', {
       robots: robotsWithStats,
       pagination: {
         currentPage: page,
@@ -46,7 +50,7 @@ const getRobots = async (req, res) => {
         hasNext: page < Math.ceil(total / limit),
         hasPrev: page > 1
       }
-    });
+    }, latestUpdate(robots));
 
   } catch (error) {
     console.error('Get robots error:', error);
@@ -66,17 +70,21 @@ const getRobot = async (req, res) => {
       return sendError(res, 'Robot not found', 404);
     }
 
+    const twentyFourHoursAgo = new Date(Date.now() - 24 * 60 * 60 * 1000);
+    const totalDetections = robot.detection_count || 0;
+    const recentDetections = await robot.getDetectionsByTimeRange(twentyFourHoursAgo, new Date());
+
     // Add computed fields and format for frontend
     const robotWithStats = {
       ...robot.toObject(),
       _id: robot.unit_id, // Use unit_id as _id for frontend compatibility  
-      packages_count: robot.detections?.length || 0,
-      total_detections: robot.detections?.length || 0,
-      recent_detections: robot.recent_detections,
+      packages_count: totalDetections,
+      total_detections: totalDetections,
+      recent_detections: recentDetections,
       is_active: robot.is_active
     };
 
-    sendSuccess(res, 'Robot retrieved successfully', { robot: robotWithStats });
+    sendCacheable(req, res, 'Robot retrieved successfully', { robot: robotWithStats }, robot.updatedAt);
 
   } catch (error) {
     console.error('Get robot error:', error);
@@ -102,6 +110,7 @@ const createRobot = async (req, res) => {
 
     const robot = await Robot.create(robotData);
     await robot.populate('owner', 'name email');
+    dashboardSummary.markDirty();
 
     sendSuccess(res, 'Robot created successfully', { robot }, 201);
 
@@ -144,6 +153,7 @@ const updateRobot = async (req, res) => {
       return sendError(res, 'Robot not found or not authorized', 404);
     }
 
+    dashboardSummary.markDirty();
     sendSuccess(res, 'Robot updated successfully', { robot });
 
   } catch (error) {
@@ -170,6 +180,15 @@ const deleteRobot = async (req, res) => {
       return sendError(res, 'Robot not found or not authorized', 404);
     }
 
+    // Hand the unit's thumbnail blobs to retention's garbage collection before their
+    // references go, or blobs only this unit used would never be removed
+    await releaseThumbnails({ unit_id: robot.unit_id });
+    await Promise.all([
+      DetectionRecord.deleteMany({ unit_id: robot.unit_id }),
+      DetectionStats.deleteMany({ unit_id: robot.unit_id })
+    ]);
+
+    dashboardSummary.markDirty();
     sendSuccess(res, 'Robot deleted successfully');
 
   } catch (error) {
@@ -202,11 +221,12 @@ const addDetection = async (req, res) => {
       return sendError(res, 'Robot not found or not authorized', 404);
     }
 
-    await robot.addDetection(req.body);
+    const detection = await robot.addDetection(req.body);
+    dashboardSummary.markDirty();
 
     sendSuccess(res, 'Detection added successfully', { 
-      detectionId: robot.detections[robot.detections.length - 1]._id,
-      totalDetections: robot.detections.length 
+      detectionId: detection._id,
+      totalDetections: (robot.detection_count || 0) + 1
     }, 201);
 
   } catch (error) {
@@ -238,13 +258,15 @@ const getDetections = async (req, res) => {
     }
 
     // Sort detections by timestamp (newest first) and paginate
-    const sortedDetections = robot.detections
-      .sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp))
-      .slice(skip, skip + limit);
+    const sortedDetections = await DetectionRecord.find({ unit_id: robot.unit_id })
+      .sort({ timestamp: -1, _id: -1 })
+      .skip(skip)
+      .limit(limit)
+      .lean();
 
-    const total = robot.detections.length;
+    const total = robot.detection_count || 0;
 
-    sendSuccess(res, 'Detections retrieved successfully', {
+    sendCacheable(req, res, 'Detections retrieved successfully', {
       detections: sortedDetections,
       pagination: {
         currentPage: page,
@@ -253,7 +275,7 @@ const getDetections = async (req, res) => {
         hasNext: page < Math.ceil(total / limit),
         hasPrev: page > 1
       }
-    });
+    }, robot.updatedAt);
 
   } catch (error) {
     console.error('Get detections error:', error);
@@ -286,6 +308,7 @@ const addRtspStream = async (req, res) => {
     }
 
     await robot.addRtspStream(req.body);
+    dashboardSummary.markDirty();
 
     sendSuccess(res, 'RTSP stream added successfully', { 
       streamId: robot.rtspStreams[robot.rtspStreams.length - 1]._id,
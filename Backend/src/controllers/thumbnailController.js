@@ -0,0 +1,20 @@
+const { sendServerError } = require('../utils/response');
+const { sendThumbnail } = require('../utils/blobStore');
+
+// @desc    Stream a thumbnail from the blob store by content hash
+// @route   GET /api/thumbnails/:key
+// @access  Private
+const getThumbnailBlob = async (req, res) => {
+  try {
+    await sendThumbnail(req, res, req.params.key);
+  } catch (error) {
+    console.error(' THUMBNAILS: Error streaming thumbnail:', error);
+    if (!res.headersSent) {
+      sendServerError(res, 'Error retrieving thumbnail');
+    }
+  }
+};
+
+module.exports = {
+  getThumbnailBlob
+};
@@ -50,7 +50,8 @@ const detectionSchema = new mongoose.Schema({
   }
 });
 
-// Detection package schema (what the robot sends)
+// Detection package schema (what the robot sends).
+// Robots tag each upload with a package_id; recording it here makes retried uploads idempotent.
 const detectionPackageSchema = new mongoose.Schema({
   package_id: {
     type: String,
@@ -96,6 +97,8 @@ detectionPackageSchema.index({ unit_id: 1, timestamp: -1 });
 detectionPackageSchema.index({ 'detections.action_type': 1 });
 detectionPackageSchema.index({ 'detections.timestamp': -1 });
 detectionPackageSchema.index({ processed: 1 });
+// Packages only matter while a robot may still retry them
+detectionPackageSchema.index({ createdAt: 1 }, { expireAfterSeconds: 7 * 24 * 60 * 60 });
 
 // Virtual for getting recent detections
 detectionPackageSchema.virtual('recent_detections').get(function() {
@@ -141,6 +144,28 @@ detectionPackageSchema.methods.getStats = function() {
   return stats;
 };
 
+// Static method to claim a package id. Returns the package and whether this call created it;
+// an existing package means the upload is a retry (processed) or still in progress / was interrupted.
+detectionPackageSchema.statics.claim = async function(packageId, fields) {
+  try {
+    const existing = await this.findOneAndUpdate(
+      { package_id: packageId },
+      { $setOnInsert: { ...fields, package_id: packageId, processed: false } },
+      { upsert: true, new: false }
+    ).lean();
+    if (existing) {
+      return { package: existing, created: false };
+    }
+    return { package: { ...fields, package_id: packageId, processed: false }, created: true };
+  } catch (error) {
+    // Two concurrent upserts of the same id: the loser sees the unique index violation
+    if (error.code === 11000) {
+      return { package: await this.findOne({ package_id: packageId }).lean(), created: false };
+    }
+    throw error;
+  }
+};
+
 // Static method to get recent detections by unit
 detectionPackageSchema.statics.getRecentByUnit = function(unitId, hours = 24) {
   const since = new Date(Date.now() - hours * 60 * 60 * 1000);
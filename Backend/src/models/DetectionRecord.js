@@ -0,0 +1,192 @@
+const mongoose = require('mongoose');
+const retention = require('../config/retention');
+
+// One detection reported by a robot unit, stored as its own document.
+// Detections used to be embedded in the Robot document, which made busy units grow
+// toward the 16 MB document limit and loaded the whole history on every robot lookup.
+const detectionRecordSchema = new mongoose.Schema({
+  unit_id: {
+    type: String,
+    required: true
+  },
+  // Package the detection arrived in and its position there; a retried package maps onto
+  // the same (package_id, package_index) pairs, so the unique index below drops the copies
+  package_id: {
+    type: String,
+    default: null
+  },
+  package_index: {
+    type: Number,
+    default: null
+  },
+  // Per-unit delta sync number, assigned as the detection is written (see Robot.reserveDetectionSeq)
+  seq: {
+    type: Number,
+    default: null
+  },
+  timestamp: {
+    type: Date,
+    required: true
+  },
+  action_type: {
+    type: String,
+    enum: ['sitting_down', 'getting_up', 'sitting', 'standing', 'walking', 'jumping', 'unknown'],
+    required: true
+  },
+  confidence: {
+    type: Number,
+    required: true,
+    min: 0,
+    max: 1
+  },
+  person_id: {
+    type: Number,
+    required: true
+  },
+  frame_number: {
+    type: Number,
+    required: true
+  },
+  normalized_bbox: {
+    x: { type: Number, required: true, min: 0, max: 1 },
+    y: { type: Number, required: true, min: 0, max: 1 },
+    width: { type: Number, required: true, min: 0, max: 1 },
+    height: { type: Number, required: true, min: 0, max: 1 },
+    confidence: { type: Number, required: true, min: 0, max: 1 }
+  },
+  // Content hash of the thumbnail in the blob store (see utils/blobStore.js)
+  thumbnail_id: {
+    type: String,
+    default: null
+  },
+  // Inline base64 thumbnail; only until the background job moves it to the blob store
+  thumbnail: {
+    type: String,
+    default: null
+  },
+  tracking_info: {
+    is_tracked: { type: Boolean, default: false },
+    tracking_age: { type: Number, default: 0 }
+  },
+  pose_scores: {
+    sitting_down: { type: Number, default: 0 },
+    getting_up: { type: Number, default: 0 },
+    sitting: { type: Number, default: 0 },
+    standing: { type: Number, default: 0 },
+    walking: { type: Number, default: 0 },
+    jumping: { type: Number, default: 0 }
+  }
+}, {
+  collection: 'detection_records',
+  versionKey: false
+});
+
+// Listing and keyset paging (newest first), delta sync by sequence number, filtered views and fleet-wide windows
+detectionRecordSchema.index({ unit_id: 1, timestamp: -1, _id: -1 });
+detectionRecordSchema.index({ unit_id: 1, seq: 1 });
+detectionRecordSchema.index({ unit_id: 1, action_type: 1, timestamp: -1 });
+detectionRecordSchema.index({ unit_id: 1, person_id: 1, timestamp: -1 });
+// Idempotent package replays; detections sent without a package id are not deduplicated
+detectionRecordSchema.index(
+  { package_id: 1, package_index: 1 },
+  { unique: true, partialFilterExpression: { package_id: { $type: 'string' } } }
+);
+// Fleet-wide windows; also the TTL backstop for raw retention (see config/retention.js)
+detectionRecordSchema.index({ timestamp: -1 }, { expireAfterSeconds: retention.rawTtlSeconds });
+// Only detections still holding an inline thumbnail, for the blob store migration job
+detectionRecordSchema.index(
+  { timestamp: 1 },
+  { partialFilterExpression: { thumbnail: { $type: 'string' } } }
+);
+
+// Detections still holding a blob-stored thumbnail: thumbnail expiry and blob garbage collection
+detectionRecordSchema.index(
+  { timestamp: 1, thumbnail_id: 1 },
+  { partialFilterExpression: { thumbnail_id: { $type: 'string' } } }
+);
+detectionRecordSchema.index(
+  { thumbnail_id: 1 },
+  { partialFilterExpression: { thumbnail_id: { $type: 'string' } } }
+);
+
+const HOUR_MS = 60 * 60 * 1000;
+
+// Static method to compute statistics for a unit's detections since a date in one pipeline:
+// the indexed $match narrows to the range, $facet computes totals, per-action counts,
+// the confidence distribution ($bucket on the usual bands) and hourly counts ($bucket on hour starts).
+// Same shape as the rollup statistics in DetectionStats, plus tracking_rate and unique_persons.
+detectionRecordSchema.statics.aggregateStats = async function(unitId, since, actionType = null) {
+  const now = Date.now();
+  const match = { unit_id: unitId, timestamp: { $gte: since } };
+  if (actionType) {
+    match.action_type = actionType;
+  }
+  const hourStarts = [];
+  for (let hour = Math.floor(since.getTime() / HOUR_MS) * HOUR_MS; hour <= now; hour += HOUR_MS) {
+    hourStarts.push(new Date(hour));
+  }
+  hourStarts.push(new Date(hourStarts[hourStarts.length - 1].getTime() + HOUR_MS));
+
+  const [result] = await this.aggregate([
+    { $match: match },
+    {
+      $facet: {
+        totals: [{
+          $group: {
+            _id: null,
+            count: { $sum: 1 },
+            avg_confidence: { $avg: '$confidence' },
+            tracked: { $sum: { $cond: ['$tracking_info.is_tracked', 1, 0] } },
+            persons: { $addToSet: '$person_id' },
+            last_24h: { $sum: { $cond: [{ $gte: ['$timestamp', new Date(now - 24 * HOUR_MS)] }, 1, 0] } },
+            last_hour: { $sum: { $cond: [{ $gte: ['$timestamp', new Date(now - HOUR_MS)] }, 1, 0] } }
+          }
+        }, {
+          $project: { count: 1, avg_confidence: 1, tracked: 1, last_24h: 1, last_hour: 1, unique_persons: { $size: '$persons' } }
+        }],
+        actions: [{ $group: { _id: '$action_type', count: { $sum: 1 } } }],
+        confidence: [{
+          $bucket: { groupBy: '$confidence', boundaries: [0, 0.6, 0.8, 1.000001], default: 'out_of_range', output: { count: { $sum: 1 } } }
+        }],
+        hourly: [{
+          $bucket: { groupBy: '$timestamp', boundaries: hourStarts, default: 'out_of_range', output: { count: { $sum: 1 } } }
+        }]
+      }
+    }
+  ]);
+
+  const totals = result.totals[0] || {};
+  const count = totals.count || 0;
+  const bands = { 0: 'low', 0.6: 'medium', 0.8: 'high' };
+  const stats = {
+    window_hours: Math.round((now - since.getTime()) / HOUR_MS),
+    window_detections: count,
+    last_24h_detections: totals.last_24h || 0,
+    last_hour_detections: totals.last_hour || 0,
+    action_counts: {},
+    hourly_breakdown: {},
+    hourly: [],
+    avg_confidence: totals.avg_confidence || 0,
+    confidence_distribution: { low: 0, medium: 0, high: 0 },
+    tracking_rate: count > 0 ? totals.tracked / count : 0,
+    unique_persons: totals.unique_persons || 0
+  };
+  result.actions.forEach(action => {
+    stats.action_counts[action._id] = action.count;
+  });
+  result.confidence.forEach(bucket => {
+    if (bands[bucket._id]) {
+      stats.confidence_distribution[bands[bucket._id]] = bucket.count;
+    }
+  });
+  result.hourly.forEach(bucket => {
+    if (bucket._id instanceof Date) {
+      const hourOfDay = bucket._id.getHours();
+      stats.hourly.push({ hour: bucket._id, count: bucket.count });
+      stats.hourly_breakdown[hourOfDay] = (stats.hourly_breakdown[hourOfDay] || 0) + bucket.count;
+    }
+  });
+  return stats;
+};
+
+module.exports = mongoose.model('DetectionRecord', detectionRecordSchema);
@@ -0,0 +1,288 @@
+const mongoose = require('mongoose');
+const retention = require('../config/retention');
+
+const HOUR_MS = 60 * 60 * 1000;
+const ACTIONS = ['sitting_down', 'getting_up', 'sitting', 'standing', 'walking', 'jumping', 'unknown'];
+
+// Same bands the statistics have always used
+const confidenceBand = (confidence) => (confidence < 0.6 ? 'low' : confidence < 0.8 ? 'medium' : 'high');
+
+const hourStart = (time) => new Date(Math.floor(new Date(time).getTime() / HOUR_MS) * HOUR_MS);
+
+// Per-unit detection counters for one hour, incremented on ingest.
+// Statistics are read from these instead of scanning detections, and they are the
+// hourly rollups that outlive raw detections (see config/retention.js);
+// the all-time totals live in Robot.detection_count and Robot.action_counts.
+const detectionStatsSchema = new mongoose.Schema({
+  unit_id: {
+    type: String,
+    required: true
+  },
+  hour: {
+    type: Date,
+    required: true
+  },
+  count: { type: Number, default: 0 },
+  confidence_sum: { type: Number, default: 0 },
+  actions: {
+    type: Map,
+    of: Number,
+    default: {}
+  },
+  confidence: {
+    low: { type: Number, default: 0 },
+    medium: { type: Number, default: 0 },
+    high: { type: Number, default: 0 }
+  }
+}, {
+  collection: 'detection_stats',
+  versionKey: false
+});
+
+detectionStatsSchema.index({ unit_id: 1, hour: -1 }, { unique: true });
+detectionStatsSchema.index({ hour: 1 }, { expireAfterSeconds: retention.rollupTtlSeconds });
+
+// Counter increments for a set of detections, grouped by hour
+const hourlyIncrements = (detections) => {
+  const hours = new Map();
+  detections.forEach(detection => {
+    const hour = hourStart(detection.timestamp).getTime();
+    if (!hours.has(hour)) {
+      hours.set(hour, {});
+    }
+    const inc = hours.get(hour);
+    const action = ACTIONS.includes(detection.action_type) ? detection.action_type : 'unknown';
+    const band = `confidence.${confidenceBand(detection.confidence)}`;
+    inc.count = (inc.count || 0) + 1;
+    inc.confidence_sum = (inc.confidence_sum || 0) + detection.confidence;
+    inc[`actions.${action}`] = (inc[`actions.${action}`] || 0) + 1;
+    inc[band] = (inc[band] || 0) + 1;
+  });
+  return hours;
+};
+
+// Static method to count newly stored detections (one $inc per unit and hour)
+detectionStatsSchema.statics.recordDetections = async function(unitId, detections) {
+  if (detections.length === 0) {
+    return;
+  }
+  const operations = [];
+  const robotInc = { detection_count: detections.length };
+  let lastDetectionAt = null;
+  detections.forEach(detection => {
+    const timestamp = new Date(detection.timestamp);
+    if (!lastDetectionAt || timestamp > lastDetectionAt) {
+      lastDetectionAt = timestamp;
+    }
+    const action = `action_counts.${ACTIONS.includes(detection.action_type) ? detection.action_type : 'unknown'}`;
+    robotInc[action] = (robotInc[action] || 0) + 1;
+  });
+  hourlyIncrements(detections).forEach((inc, hour) => {
+    operations.push({
+      updateOne: {
+        filter: { unit_id: unitId, hour: new Date(hour) },
+        update: { $inc: inc },
+        upsert: true
+      }
+    });
+  });
+  await Promise.all([
+    this.bulkWrite(operations, { ordered: false }),
+    mongoose.model('Robot').updateOne(
+      { unit_id: unitId },
+      {
+        $inc: robotInc,
+        $max: { last_detection_at: lastDetectionAt },
+        $set: { 'stats_cache.last_updated': new Date() }
+      }
+    )
+  ]);
+};
+
+// Bucket counters as dotted paths, the form $inc takes them in
+const bucketFields = (bucket) => {
+  const fields = { count: bucket.count || 0, confidence_sum: bucket.confidence_sum || 0 };
+  Object.entries(bucket.actions || {}).forEach(([action, count]) => {
+    fields[`actions.${action}`] = count;
+  });
+  ['low', 'medium', 'high'].forEach(band => {
+    fields[`confidence.${band}`] = (bucket.confidence && bucket.confidence[band]) || 0;
+  });
+  return fields;
+};
+
+// Static method to rebuild a unit's hour buckets in [from, until) from the raw detections.
+// Used by the reconciliation job and by retention compaction before raw hours are deleted.
+// Corrections are applied as $inc of the difference from the buckets read, and only buckets
+// left empty are deleted, so counts that ingest adds meanwhile are kept rather than overwritten.
+detectionStatsSchema.statics.rebuildHours = async function(unitId, from, until) {
+  const [rows, stored] = await Promise.all([
+    mongoose.model('DetectionRecord').aggregate([
+      { $match: { unit_id: unitId, timestamp: { $gte: from, $lt: until } } },
+      {
+        $group: {
+          _id: {
+            hour: { $subtract: ['$timestamp', { $mod: [{ $toLong: '$timestamp' }, HOUR_MS] }] },
+            action_type: '$action_type'
+          },
+          count: { $sum: 1 },
+          confidence_sum: { $sum: '$confidence' },
+          low: { $sum: { $cond: [{ $lt: ['$confidence', 0.6] }, 1, 0] } },
+          high: { $sum: { $cond: [{ $gte: ['$confidence', 0.8] }, 1, 0] } }
+        }
+      }
+    ]),
+    this.find({ unit_id: unitId, hour: { $gte: from, $lt: until } }).lean()
+  ]);
+
+  // Rebuild the hour buckets from the per-action groups
+  const buckets = new Map();
+  rows.forEach(row => {
+    const key = new Date(row._id.hour).getTime();
+    if (!buckets.has(key)) {
+      buckets.set(key, { count: 0, confidence_sum: 0, actions: {}, confidence: { low: 0, medium: 0, high: 0 } });
+    }
+    const bucket = buckets.get(key);
+    bucket.count += row.count;
+    bucket.confidence_sum += row.confidence_sum;
+    bucket.actions[row._id.action_type] = row.count;
+    bucket.confidence.low += row.low;
+    bucket.confidence.high += row.high;
+    bucket.confidence.medium += row.count - row.low - row.high;
+  });
+
+  const current = new Map(stored.map(bucket => [new Date(bucket.hour).getTime(), bucketFields(bucket)]));
+  const operations = [];
+  new Set([...buckets.keys(), ...current.keys()]).forEach(hour => {
+    const target = buckets.has(hour) ? bucketFields(buckets.get(hour)) : {};
+    const seen = current.get(hour) || {};
+    const inc = {};
+    new Set([...Object.keys(target), ...Object.keys(seen)]).forEach(field => {
+      const delta = (target[field] || 0) - (seen[field] || 0);
+      if (Math.abs(delta) > 1e-9) {
+        inc[field] = delta;
+      }
+    });
+    if (Object.keys(inc).length > 0) {
+      operations.push({
+        updateOne: {
+          filter: { unit_id: unitId, hour: new Date(hour) },
+          update: { $inc: inc },
+          upsert: true
+        }
+      });
+    }
+  });
+  if (operations.length > 0) {
+    await this.bulkWrite(operations, { ordered: false });
+  }
+  await this.deleteMany({ unit_id: unitId, hour: { $gte: from, $lt: until }, count: { $lte: 0 } });
+  return buckets.size;
+};
+
+// Fold hour buckets into rolling-window statistics. The oldest bucket usually straddles
+// the window start and is counted by its overlap, so totals move smoothly hour to hour.
+// The window defaults to 24 hours; last_24h and last_hour counts are kept whatever its length.
+const windowStats = (buckets, totalDetections, hours = 24, now = Date.now()) => {
+  const windowStart = now - hours * HOUR_MS;
+  const dayStart = now - 24 * HOUR_MS;
+  const hourAgo = now - HOUR_MS;
+  const overlap = (bucketStart, windowStart) =>
+    Math.max(0, Math.min(1, (bucketStart + HOUR_MS - windowStart) / HOUR_MS));
+
+  const stats = {
+    total_detections: totalDetections,
+    window_hours: hours,
+    window_detections: 0,
+    last_24h_detections: 0,
+    last_hour_detections: 0,
+    action_counts: {},
+    hourly_breakdown: {},
+    avg_confidence: 0,
+    confidence_distribution: { low: 0, medium: 0, high: 0 }
+  };
+
+  let totalConfidence = 0;
+  let weightedCount = 0;
+
+  buckets.forEach(bucket => {
+    const start = new Date(bucket.hour).getTime();
+    const share = overlap(start, windowStart);
+    if (share === 0 && overlap(start, dayStart) === 0) {
+      return;
+    }
+    const scaled = (value) => Math.round(value * share);
+    const hourOfDay = new Date(start).getHours();
+
+    stats.window_detections += scaled(bucket.count);
+    stats.last_24h_detections += Math.round(bucket.count * overlap(start, dayStart));
+    stats.last_hour_detections += Math.round(bucket.count * overlap(start, hourAgo));
+    stats.hourly_breakdown[hourOfDay] = (stats.hourly_breakdown[hourOfDay] || 0) + scaled(bucket.count);
+
+    const actions = bucket.actions instanceof Map ? Object.fromEntries(bucket.actions) : (bucket.actions || {});
+    Object.entries(actions).forEach(([action, count]) => {
+      if (scaled(count) > 0) {
+        stats.action_counts[action] = (stats.action_counts[action] || 0) + scaled(count);
+      }
+    });
+    ['low', 'medium', 'high'].forEach(band => {
+      stats.confidence_distribution[band] += scaled(bucket.confidence?.[band] || 0);
+    });
+
+    totalConfidence += bucket.confidence_sum * share;
+    weightedCount += bucket.count * share;
+  });
+
+  Object.keys(stats.hourly_breakdown).forEach(hour => {
+    if (stats.hourly_breakdown[hour] === 0) {
+      delete stats.hourly_breakdown[hour];
+    }
+  });
+  stats.avg_confidence = weightedCount > 0 ? totalConfidence / weightedCount : 0;
+
+  return stats;
+};
+
+// Static method to get rolling window statistics (24 hours by default) for several units (one query)
+detectionStatsSchema.statics.getUnitStatsMany = async function(units, hours = 24) {
+  const since = new Date(Date.now() - (Math.max(hours, 24) + 1) * HOUR_MS);
+  const unitIds = units.map(unit => unit.unit_id);
+  const buckets = await this.find({ unit_id: { $in: unitIds }, hour: { $gte: since } }).lean();
+
+  const byUnit = {};
+  buckets.forEach(bucket => {
+    (byUnit[bucket.unit_id] = byUnit[bucket.unit_id] || []).push(bucket);
+  });
+
+  const result = {};
+  units.forEach(unit => {
+    result[unit.unit_id] = windowStats(byUnit[unit.unit_id] || [], unit.detection_count || 0, hours);
+  });
+  return result;
+};
+
+// Static method to get a unit's rolling window statistics plus its all-time total
+detectionStatsSchema.statics.getUnitStats = async function(unitId, hours = 24) {
+  const robot = await mongoose.model('Robot').findOne({ unit_id: unitId }, { unit_id: 1, detection_count: 1 }).lean();
+  const stats = await this.getUnitStatsMany([robot || { unit_id: unitId }], hours);
+  return stats[unitId];
+};
+
+// Static method to get a unit's hourly rollups since a date, oldest first
+detectionStatsSchema.statics.getHourlyRollups = async function(unitId, since) {
+  const buckets = await this.find({ unit_id: unitId, hour: { $gte: hourStart(since) } }, { _id: 0, unit_id: 0 })
+    .sort({ hour: 1 })
+    .lean();
+  return buckets.map(bucket => ({
+    hour: bucket.hour,
+    count: bucket.count,
+    avg_confidence: bucket.count > 0 ? bucket.confidence_sum / bucket.count : 0,
+    actions: bucket.actions || {},
+    confidence: bucket.confidence
+  }));
+};
+
+detectionStatsSchema.statics.hourStart = hourStart;
+detectionStatsSchema.statics.HOUR_MS = HOUR_MS;
+
+module.exports = mongoose.model('DetectionStats', detectionStatsSchema);
@@ -0,0 +1,89 @@
+const mongoose = require('mongoose');
+
+// Contiguous run of one pose class within a track
+const poseSegmentSchema = new mongoose.Schema({
+  action: {
+    type: String,
+    enum: ['sitting_down', 'getting_up', 'sitting', 'standing', 'walking', 'jumping', 'unknown'],
+    required: true
+  },
+  start: { type: Date, required: true },
+  end: { type: Date, required: true },
+  frames: { type: Number, default: 0 },
+  avg_confidence: { type: Number, default: 0, min: 0, max: 1 }
+}, { _id: false });
+
+// Downsampled, normalized bounding box position
+const trajectoryPointSchema = new mongoose.Schema({
+  timestamp: { type: Date, required: true },
+  x: { type: Number, min: 0, max: 1 },
+  y: { type: Number, min: 0, max: 1 },
+  width: { type: Number, min: 0, max: 1 },
+  height: { type: Number, min: 0, max: 1 }
+}, { _id: false });
+
+// One evolving document per person track, updated at checkpoints and when the track ends
+const personTrackSchema = new mongoose.Schema({
+  track_id: {
+    type: String,
+    required: true
+  },
+  unit_id: {
+    type: String,
+    required: true
+  },
+  person_id: {
+    type: Number,
+    required: true
+  },
+  status: {
+    type: String,
+    enum: ['active', 'ended'],
+    default: 'active'
+  },
+  first_seen: {
+    type: Date,
+    required: true
+  },
+  last_seen: {
+    type: Date,
+    required: true
+  },
+  duration_seconds: {
+    type: Number,
+    default: 0
+  },
+  first_frame: Number,
+  last_frame: Number,
+  observations: {
+    type: Number,
+    default: 0
+  },
+  dominant_action: {
+    type: String,
+    default: 'unknown'
+  },
+  pose_timeline: [poseSegmentSchema],
+  trajectory: [trajectoryPointSchema],
+  best_thumbnail: {
+    type: String, // Base64 encoded image, best bbox area x confidence
+    default: null
+  }
+}, {
+  timestamps: true
+});
+
+// Indexes for efficient querying
+personTrackSchema.index({ unit_id: 1, track_id: 1 }, { unique: true });
+personTrackSchema.index({ unit_id: 1, last_seen: -1 });
+personTrackSchema.index({ unit_id: 1, dominant_action: 1, last_seen: -1 });
+
+// Static method to get tracks for a unit that were seen within a time range
+personTrackSchema.statics.getByUnit = function(unitId, since, limit = 100) {
+  return this.find({
+    unit_id: unitId,
+    last_seen: { $gte: since }
+  }).sort({ last_seen: -1 }).limit(limit).lean();
+};
+
+module.exports = mongoose.model('PersonTrack', personTrackSchema);
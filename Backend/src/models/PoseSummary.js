@@ -0,0 +1,73 @@
+const mongoose = require('mongoose');
+
+// Per-action counters for a single summary bucket
+const actionSummarySchema = new mongoose.Schema({
+  count: { type: Number, default: 0, min: 0 },
+  persons: { type: Number, default: 0, min: 0 },
+  avg_confidence: { type: Number, default: 0, min: 0, max: 1 },
+  // 10 bins of width 0.1 over [0, 1]
+  confidence_histogram: [{ type: Number, min: 0 }]
+}, { _id: false });
+
+// Time-bucketed pose summary uploaded by robots in aggregation mode
+const poseSummarySchema = new mongoose.Schema({
+  unit_id: {
+    type: String,
+    required: true
+  },
+  bucket_start: {
+    type: Date,
+    required: true
+  },
+  bucket_end: {
+    type: Date,
+    required: true
+  },
+  bucket_seconds: {
+    type: Number,
+    required: true
+  },
+  frames: {
+    type: Number,
+    default: 0
+  },
+  occupancy: {
+    avg: { type: Number, default: 0 },
+    max: { type: Number, default: 0 }
+  },
+  actions: {
+    type: Map,
+    of: actionSummarySchema,
+    default: {}
+  },
+  transitions: {
+    type: Map,
+    of: Number,
+    default: {}
+  },
+  dwell: {
+    tracks_ended: { type: Number, default: 0 },
+    avg_seconds: { type: Number, default: 0 },
+    max_seconds: { type: Number, default: 0 },
+    open_tracks: { type: Number, default: 0 }
+  },
+  raw_detections_sent: {
+    type: Number,
+    default: 0
+  }
+}, {
+  timestamps: true
+});
+
+// One summary per unit and bucket; re-sent buckets overwrite instead of duplicating
+poseSummarySchema.index({ unit_id: 1, bucket_start: -1 }, { unique: true });
+
+// Static method to get summaries for a unit within a time range
+poseSummarySchema.statics.getByUnit = function(unitId, since) {
+  return this.find({
+    unit_id: unitId,
+    bucket_start: { $gte: since }
+  }).sort({ bucket_start: -1 }).lean();
+};
+
+module.exports = mongoose.model('PoseSummary', poseSummarySchema);
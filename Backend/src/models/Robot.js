@@ -1,54 +1,6 @@
 const mongoose = require('mongoose');
-
-// Individual detection schema
-const detectionSchema = new mongoose.Schema({
-  timestamp: {
-    type: Date,
-    required: true
-  },
-  action_type: {
-    type: String,
-    enum: ['sitting_down', 'getting_up', 'sitting', 'standing', 'walking', 'jumping', 'unknown'],
-    required: true
-  },
-  confidence: {
-    type: Number,
-    required: true,
-    min: 0,
-    max: 1
-  },
-  person_id: {
-    type: Number,
-    required: true
-  },
-  frame_number: {
-    type: Number,
-    required: true
-  },
-  normalized_bbox: {
-    x: { type: Number, required: true, min: 0, max: 1 },
-    y: { type: Number, required: true, min: 0, max: 1 },
-    width: { type: Number, required: true, min: 0, max: 1 },
-    height: { type: Number, required: true, min: 0, max: 1 },
-    confidence: { type: Number, required: true, min: 0, max: 1 }
-  },
-  thumbnail: {
-    type: String, // Base64 encoded image
-    default: null
-  },
-  tracking_info: {
-    is_tracked: { type: Boolean, default: false },
-    tracking_age: { type: Number, default: 0 }
-  },
-  pose_scores: {
-    sitting_down: { type: Number, default: 0 },
-    getting_up: { type: Number, default: 0 },
-    sitting: { type: Number, default: 0 },
-    standing: { type: Number, default: 0 },
-    walking: { type: Number, default: 0 },
-    jumping: { type: Number, default: 0 }
-  }
-});
+const DetectionRecord = require('./DetectionRecord');
+const DetectionStats = require('./DetectionStats');
 
 // Robot schema - represents a physical robot unit
 const robotSchema = new mongoose.Schema({
@@ -78,8 +30,13 @@ const robotSchema = new mongoose.Schema({
     type: String,
     default: 'Unknown'
   },
-  // Array of detection data - stores all detections for this robot
-  detections: [detectionSchema],
+  // Legacy embedded detections; they now live in the DetectionRecord collection
+  // (scripts/migrateDetections.js moves old arrays over). Never loaded by default.
+  detections: {
+    type: [mongoose.Schema.Types.Mixed],
+    select: false,
+    default: undefined
+  },
   // Metadata about the robot
   metadata: {
     model: { type: String, default: 'Unknown' },
@@ -87,9 +44,36 @@ const robotSchema = new mongoose.Schema({
     ip_address: { type: String, default: null },
     mac_address: { type: String, default: null }
   },
+  // Denormalized from the detection collection: incremented on ingest, corrected by the
+  // reconciliation job, so listings never have to count detections
+  detection_count: {
+    type: Number,
+    default: 0
+  },
+  // Same, per action type
+  action_counts: {
+    type: Map,
+    of: Number,
+    default: {}
+  },
+  last_detection_at: {
+    type: Date,
+    default: null
+  },
+  // Delta sync sequence: each write reserves the next numbers for its detections, and lists
+  // them in seq_pending until they are inserted (see reserveDetectionSeq)
+  detection_seq: {
+    type: Number,
+    default: 0
+  },
+  seq_pending: {
+    type: [{ _id: false, seq: Number, at: Date }],
+    select: false,
+    default: undefined
+  },
   // Statistics cache for performance
+  // (rolling 24 hour figures come from DetectionStats hour buckets)
   stats_cache: {
-    total_detections: { type: Number, default: 0 },
     last_24h_detections: { type: Number, default: 0 },
     most_common_action: { type: String, default: 'unknown' },
     avg_confidence: { type: Number, default: 0 },
@@ -103,158 +87,94 @@ const robotSchema = new mongoose.Schema({
 robotSchema.index({ unit_id: 1 });
 robotSchema.index({ status: 1 });
 robotSchema.index({ last_seen: -1 });
-robotSchema.index({ 'detections.timestamp': -1 });
-robotSchema.index({ 'detections.action_type': 1 });
 
-// Virtual for getting recent detections (last 24 hours)
-robotSchema.virtual('recent_detections').get(function() {
-  const twentyFourHoursAgo = new Date(Date.now() - 24 * 60 * 60 * 1000);
-  return this.detections.filter(det => new Date(det.timestamp) > twentyFourHoursAgo);
-});
+// Fields the listing endpoints return; the legacy detections array and metadata are never read
+const LIST_PROJECTION = {
+  unit_id: 1,
+  unit_name: 1,
+  status: 1,
+  last_seen: 1,
+  location: 1,
+  rtsp_uris: 1,
+  detection_count: 1,
+  last_detection_at: 1,
+  createdAt: 1,
+  updatedAt: 1
+};
+
+// A reservation older than this is taken to belong to a writer that died before releasing it
+const SEQ_PENDING_TIMEOUT_MS = 60 * 1000;
+
+// Active means seen in the last 5 minutes
+const isActive = (robot) => robot.last_seen > new Date(Date.now() - 5 * 60 * 1000);
 
 // Virtual for determining if robot is active (seen in last 5 minutes)
 robotSchema.virtual('is_active').get(function() {
-  const fiveMinutesAgo = new Date(Date.now() - 5 * 60 * 1000);
-  return this.last_seen > fiveMinutesAgo;
+  return isActive(this);
 });
 
 // Method to add new detection data
-robotSchema.methods.addDetection = function(detectionData) {
-  this.detections.push(detectionData);
+robotSchema.methods.addDetection = async function(detectionData) {
+  const seq = await Robot.reserveDetectionSeq(this.unit_id, 1);
+  let detection;
+  try {
+    detection = await DetectionRecord.create({ ...detectionData, unit_id: this.unit_id, seq });
+  } finally {
+    await Robot.releaseDetectionSeq(this.unit_id, seq);
+  }
+  await DetectionStats.recordDetections(this.unit_id, [detection]);
   this.last_seen = new Date();
   this.status = 'online';
-  
-  // Update stats cache
-  this.updateStatsCache();
-  
-  return this.save();
+  await this.save();
+  return detection;
 };
 
 // Method to add multiple detections from a data package
-robotSchema.methods.addDetections = function(detectionsArray) {
-  detectionsArray.forEach(detection => {
-    this.detections.push(detection);
-  });
-  
+robotSchema.methods.addDetections = async function(detectionsArray) {
+  const start = await Robot.reserveDetectionSeq(this.unit_id, detectionsArray.length);
+  let detections;
+  try {
+    detections = await DetectionRecord.insertMany(
+      detectionsArray.map((detection, index) => ({ ...detection, unit_id: this.unit_id, seq: start + index }))
+    );
+  } finally {
+    await Robot.releaseDetectionSeq(this.unit_id, start);
+  }
+  await DetectionStats.recordDetections(this.unit_id, detections);
   this.last_seen = new Date();
   this.status = 'online';
-  
-  // Update stats cache
-  this.updateStatsCache();
-  
-  return this.save();
-};
-
-// Method to update statistics cache
-robotSchema.methods.updateStatsCache = function() {
-  const twentyFourHoursAgo = new Date(Date.now() - 24 * 60 * 60 * 1000);
-  const recentDetections = this.detections.filter(det => new Date(det.timestamp) > twentyFourHoursAgo);
-  
-  // Calculate statistics
-  const actionCounts = {};
-  let totalConfidence = 0;
-  
-  recentDetections.forEach(detection => {
-    if (!actionCounts[detection.action_type]) {
-      actionCounts[detection.action_type] = 0;
-    }
-    actionCounts[detection.action_type]++;
-    totalConfidence += detection.confidence;
-  });
-  
-  // Find most common action
-  let mostCommonAction = 'unknown';
-  let maxCount = 0;
-  
-  Object.entries(actionCounts).forEach(([action, count]) => {
-    if (count > maxCount) {
-      maxCount = count;
-      mostCommonAction = action;
-    }
-  });
-  
-  // Update cache
-  this.stats_cache = {
-    total_detections: this.detections.length,
-    last_24h_detections: recentDetections.length,
-    most_common_action: mostCommonAction,
-    avg_confidence: recentDetections.length > 0 ? totalConfidence / recentDetections.length : 0,
-    last_updated: new Date()
-  };
+  await this.save();
+  return detections;
 };
 
 // Method to get detection statistics
 robotSchema.methods.getStats = function() {
-  const twentyFourHoursAgo = new Date(Date.now() - 24 * 60 * 60 * 1000);
-  const oneHourAgo = new Date(Date.now() - 60 * 60 * 1000);
-  
-  const allDetections = this.detections;
-  const last24hDetections = allDetections.filter(det => new Date(det.timestamp) > twentyFourHoursAgo);
-  const lastHourDetections = allDetections.filter(det => new Date(det.timestamp) > oneHourAgo);
-  
-  const stats = {
-    total_detections: allDetections.length,
-    last_24h_detections: last24hDetections.length,
-    last_hour_detections: lastHourDetections.length,
-    action_counts: {},
-    hourly_breakdown: {},
-    avg_confidence: 0,
-    confidence_distribution: { low: 0, medium: 0, high: 0 }
-  };
-
-  let totalConfidence = 0;
-  
-  last24hDetections.forEach(detection => {
-    // Count actions
-    if (!stats.action_counts[detection.action_type]) {
-      stats.action_counts[detection.action_type] = 0;
-    }
-    stats.action_counts[detection.action_type]++;
-    
-    // Calculate confidence stats
-    totalConfidence += detection.confidence;
-    
-    if (detection.confidence < 0.6) {
-      stats.confidence_distribution.low++;
-    } else if (detection.confidence < 0.8) {
-      stats.confidence_distribution.medium++;
-    } else {
-      stats.confidence_distribution.high++;
-    }
-    
-    // Hourly breakdown
-    const hour = new Date(detection.timestamp).getHours();
-    if (!stats.hourly_breakdown[hour]) {
-      stats.hourly_breakdown[hour] = 0;
-    }
-    stats.hourly_breakdown[hour]++;
-  });
-
-  stats.avg_confidence = last24hDetections.length > 0 ? totalConfidence / last24hDetections.length : 0;
-  
-  return stats;
+  return DetectionStats.getUnitStats(this.unit_id);
 };
 
-// Method to get detections by time range
+// Method to get detections by time range (newest first)
 robotSchema.methods.getDetectionsByTimeRange = function(startTime, endTime, actionType = null) {
-  let detections = this.detections.filter(det => {
-    const detTime = new Date(det.timestamp);
-    return detTime >= startTime && detTime <= endTime;
-  });
-  
+  const query = { unit_id: this.unit_id, timestamp: { $gte: startTime, $lte: endTime } };
   if (actionType) {
-    detections = detections.filter(det => det.action_type === actionType);
+    query.action_type = actionType;
   }
-  
-  return detections.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp));
+  return DetectionRecord.find(query).sort({ timestamp: -1, _id: -1 }).lean();
 };
 
-// Static method to get all active robots
+// Static method to get all active robots (lean, listing fields only)
 robotSchema.statics.getActiveRobots = function(minutesThreshold = 5) {
   const thresholdTime = new Date(Date.now() - minutesThreshold * 60 * 1000);
-  return this.find({ last_seen: { $gte: thresholdTime } }).sort({ last_seen: -1 });
+  return this.find({ last_seen: { $gte: thresholdTime } }, LIST_PROJECTION).sort({ last_seen: -1 }).lean();
+};
+
+// Static method to get a page of robots for listing (lean, listing fields only)
+robotSchema.statics.listRobots = function(query = {}, skip = 0, limit = 10) {
+  return this.find(query, LIST_PROJECTION).sort({ last_seen: -1 }).skip(skip).limit(limit).lean();
 };
 
+robotSchema.statics.isActive = isActive;
+robotSchema.statics.LIST_PROJECTION = LIST_PROJECTION;
+
 // Static method to get robot by unit_id with better error handling
 robotSchema.statics.findByUnitId = function(unitId) {
   if (!unitId) {
@@ -263,6 +183,56 @@ robotSchema.statics.findByUnitId = function(unitId) {
   return this.findOne({ unit_id: unitId });
 };
 
+// Static method to reserve `count` delta sync numbers for a unit's detections; returns the first.
+// The numbers come from one atomic update, so they are unique across workers and hosts, and
+// stay listed in seq_pending until releaseDetectionSeq once the detections are inserted.
+robotSchema.statics.reserveDetectionSeq = async function(unitId, count) {
+  const robot = await this.findOneAndUpdate(
+    { unit_id: unitId },
+    [{
+      $set: {
+        detection_seq: { $add: [{ $ifNull: ['$detection_seq', 0] }, count] },
+        seq_pending: {
+          $concatArrays: [
+            { $ifNull: ['$seq_pending', []] },
+            [{ seq: { $add: [{ $ifNull: ['$detection_seq', 0] }, 1] }, at: '$$NOW' }]
+          ]
+        }
+      }
+    }],
+    { new: true, projection: { detection_seq: 1 } }
+  ).lean();
+  if (!robot) {
+    throw new Error(`Robot unit ${unitId} not found`);
+  }
+  return robot.detection_seq - count + 1;
+};
+
+// Static method to release a reservation once its write is over (inserted or failed);
+// also drops reservations of writers that died before releasing theirs
+robotSchema.statics.releaseDetectionSeq = function(unitId, start) {
+  const stale = new Date(Date.now() - SEQ_PENDING_TIMEOUT_MS);
+  return this.updateOne(
+    { unit_id: unitId },
+    { $pull: { seq_pending: { $or: [{ seq: start }, { at: { $lt: stale } }] } } }
+  );
+};
+
+// Static method to get the delta sync watermark of a unit: every detection numbered at or
+// below it has been inserted. Writes still in flight hold it just below their first number;
+// reservations past SEQ_PENDING_TIMEOUT_MS no longer do, so a crashed writer cannot stall sync.
+robotSchema.statics.getSyncWatermark = async function(unitId) {
+  const robot = await this.findOne({ unit_id: unitId }, { detection_seq: 1, seq_pending: 1 }).lean();
+  if (!robot) {
+    return 0;
+  }
+  const cutoff = Date.now() - SEQ_PENDING_TIMEOUT_MS;
+  const pending = (robot.seq_pending || []).filter(entry => new Date(entry.at).getTime() > cutoff);
+  return pending.length > 0
+    ? Math.min(...pending.map(entry => entry.seq)) - 1
+    : robot.detection_seq || 0;
+};
+
 // Static method to safely upsert robot
 robotSchema.statics.upsertByUnitId = function(unitId, robotData) {
   if (!unitId) {
@@ -321,14 +291,6 @@ robotSchema.statics.cleanupDatabase = async function() {
   }
 };
 
-// Pre-save middleware to update stats cache
-robotSchema.pre('save', function(next) {
-  if (this.isModified('detections')) {
-    this.updateStatsCache();
-  }
-  next();
-});
-
 const Robot = mongoose.model('Robot', robotSchema);
 
 module.exports = Robot;
\ No newline at end of file
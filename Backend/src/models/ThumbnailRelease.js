@@ -0,0 +1,23 @@
+const mongoose = require('mongoose');
+
+// A thumbnail blob that lost its last reference. The blob is only removed once it has stayed
+// unreferenced for a grace period (see utils/retentionCompaction.js): an ingest may have found
+// the blob in the store already and not yet inserted the detection that references it.
+const thumbnailReleaseSchema = new mongoose.Schema({
+  key: {
+    type: String,
+    required: true,
+    unique: true
+  },
+  released_at: {
+    type: Date,
+    required: true
+  }
+}, {
+  collection: 'thumbnail_releases',
+  versionKey: false
+});
+
+thumbnailReleaseSchema.index({ released_at: 1 });
+
+module.exports = mongoose.model('ThumbnailRelease', thumbnailReleaseSchema);
@@ -0,0 +1,12 @@
+const express = require('express');
+const { getDashboardSummary } = require('../controllers/dashboardController');
+const auth = require('../middleware/auth');
+
+const router = express.Router();
+
+// @route   GET /api/dashboard/summary
+// @desc    Get precomputed dashboard counters (units, streams, detections)
+// @access  Private
+router.get('/summary', auth, getDashboardSummary);
+
+module.exports = router;
@@ -4,13 +4,29 @@ const router = express.Router();
 
 const {
   receiveDetections,
+  receiveSummaries,
+  receiveTracks,
   getDetectionsByUnit,
+  getDetectionsSince,
+  getDetectionPage,
+  getThumbnail,
   getDetectionSummary,
-  getActiveUnits
+  getSummariesByUnit,
+  getTracksByUnit,
+  getActiveUnits,
+  streamEvents
 } = require('../controllers/detectionController');
 
 const auth = require('../middleware/auth');
 
+// Robots send UTC epoch milliseconds; ISO 8601 strings are still accepted
+const isTimestamp = (value) => {
+  if (typeof value === 'number') {
+    return Number.isFinite(value) && value > 0;
+  }
+  return typeof value === 'string' && !isNaN(Date.parse(value));
+};
+
 // Validation middleware for robot detection data
 const robotDetectionValidation = [
   body('unit_id')
@@ -25,13 +41,21 @@ const robotDetectionValidation = [
     .isLength({ min: 3, max: 100 })
     .withMessage('Unit name must be between 3 and 100 characters'),
   
+  body('package_id')
+    .optional()
+    .isString()
+    .isLength({ min: 8, max: 100 })
+    .withMessage('Package ID must be a string of 8 to 100 characters'),
+  
   body('detections')
     .isArray({ min: 1 })
     .withMessage('Detections must be a non-empty array'),
   
   body('detections.*.timestamp')
     .notEmpty()
-    .withMessage('Detection timestamp is required'),
+    .withMessage('Detection timestamp is required')
+    .custom(isTimestamp)
+    .withMessage('Detection timestamp must be epoch milliseconds or an ISO 8601 date'),
   
   body('detections.*.action_type')
     .notEmpty()
@@ -72,6 +96,72 @@ const robotDetectionValidation = [
     .withMessage('Bounding box confidence must be between 0 and 1')
 ];
 
+// Validation middleware for robot summary data (aggregation mode)
+const robotSummaryValidation = [
+  body('unit_id')
+    .notEmpty()
+    .withMessage('Unit ID is required')
+    .isLength({ min: 3, max: 50 })
+    .withMessage('Unit ID must be between 3 and 50 characters'),
+  
+  body('unit_name')
+    .notEmpty()
+    .withMessage('Unit name is required'),
+  
+  body('summaries')
+    .isArray({ min: 1 })
+    .withMessage('Summaries must be a non-empty array'),
+  
+  body('summaries.*.bucket_start')
+    .custom(isTimestamp)
+    .withMessage('Summary bucket_start must be epoch milliseconds or an ISO 8601 date'),
+  
+  body('summaries.*.bucket_end')
+    .custom(isTimestamp)
+    .withMessage('Summary bucket_end must be epoch milliseconds or an ISO 8601 date'),
+  
+  body('summaries.*.frames')
+    .isInt({ min: 0 })
+    .withMessage('Summary frames must be a non-negative integer')
+];
+
+// Validation middleware for consolidated person track records (track mode)
+const robotTrackValidation = [
+  body('unit_id')
+    .notEmpty()
+    .withMessage('Unit ID is required')
+    .isLength({ min: 3, max: 50 })
+    .withMessage('Unit ID must be between 3 and 50 characters'),
+  
+  body('unit_name')
+    .notEmpty()
+    .withMessage('Unit name is required'),
+  
+  body('tracks')
+    .isArray({ min: 1 })
+    .withMessage('Tracks must be a non-empty array'),
+  
+  body('tracks.*.track_id')
+    .notEmpty()
+    .withMessage('Track ID is required'),
+  
+  body('tracks.*.person_id')
+    .isInt({ min: 0 })
+    .withMessage('Person ID must be a non-negative integer'),
+  
+  body('tracks.*.status')
+    .isIn(['active', 'ended'])
+    .withMessage('Track status must be active or ended'),
+  
+  body('tracks.*.first_seen')
+    .custom(isTimestamp)
+    .withMessage('Track first_seen must be epoch milliseconds or an ISO 8601 date'),
+  
+  body('tracks.*.last_seen')
+    .custom(isTimestamp)
+    .withMessage('Track last_seen must be epoch milliseconds or an ISO 8601 date')
+];
+
 // Unit ID validation
 const unitIdValidation = [
   param('unitId')
@@ -98,7 +188,56 @@ const timeRangeValidation = [
   query('action_type')
     .optional()
     .isIn(['sitting_down', 'getting_up', 'sitting', 'standing', 'walking', 'jumping', 'unknown'])
-    .withMessage('Invalid action type filter')
+    .withMessage('Invalid action type filter'),
+  
+  query('include_thumbnails')
+    .optional()
+    .isBoolean()
+    .withMessage('include_thumbnails must be true or false')
+];
+
+// Query parameter validation for incremental sync
+const sinceValidation = [
+  query('since')
+    .optional()
+    .isString()
+    .isLength({ max: 64 })
+    .withMessage('Since must be a sync cursor')
+];
+
+// Query parameter validation for paged listing
+const isQueryTimestamp = (value) => /^\d+$/.test(value) || !isNaN(Date.parse(value));
+
+const pageValidation = [
+  query('page_size')
+    .optional()
+    .isInt({ min: 1, max: 500 })
+    .withMessage('Page size must be between 1 and 500'),
+  
+  query('cursor')
+    .optional()
+    .matches(/^\d+_[0-9a-f]{24}$/)
+    .withMessage('Cursor must be a next_cursor value from a previous page'),
+  
+  query('min_confidence')
+    .optional()
+    .isFloat({ min: 0, max: 1 })
+    .withMessage('Minimum confidence must be between 0 and 1'),
+  
+  query('person_id')
+    .optional()
+    .isInt({ min: 0 })
+    .withMessage('Person ID must be a non-negative integer'),
+  
+  query('from')
+    .optional()
+    .custom(isQueryTimestamp)
+    .withMessage('From must be epoch milliseconds or an ISO 8601 date'),
+  
+  query('to')
+    .optional()
+    .custom(isQueryTimestamp)
+    .withMessage('To must be epoch milliseconds or an ISO 8601 date')
 ];
 
 // Validation error handler middleware
@@ -137,6 +276,16 @@ router.post('/', robotDetectionValidation, (req, res, next) => {
   next();
 }, handleValidationErrors, receiveDetections);
 
+// @route   POST /api/detections/summaries
+// @desc    Receive time-bucketed pose summaries from robot units
+// @access  Public (secured with API key in production)
+router.post('/summaries', robotSummaryValidation, handleValidationErrors, receiveSummaries);
+
+// @route   POST /api/detections/tracks
+// @desc    Receive consolidated person track records from robot units
+// @access  Public (secured with API key in production)
+router.post('/tracks', robotTrackValidation, handleValidationErrors, receiveTracks);
+
 // @route   GET /api/detections/active
 // @desc    Get all active robot units
 // @access  Private
@@ -145,6 +294,14 @@ router.get('/active', auth, timeRangeValidation, (req, res, next) => {
   next();
 }, getActiveUnits);
 
+// @route   GET /api/detections/stream
+// @desc    Server-Sent Events stream of new robot data (optionally ?unit_id=)
+// @access  Private
+router.get('/stream', auth, (req, res, next) => {
+  console.log(' ROUTE HIT: GET /api/detections/stream');
+  next();
+}, streamEvents);
+
 // @route   GET /api/detections/:unitId
 // @desc    Get detection data for a specific robot unit
 // @access  Private
@@ -153,6 +310,31 @@ router.get('/:unitId', auth, unitIdValidation, timeRangeValidation, (req, res, n
   next();
 }, getDetectionsByUnit);
 
+// @route   GET /api/detections/:unitId/since
+// @desc    Get detections newer than a cursor for incremental refresh
+// @access  Private
+router.get('/:unitId/since', auth, unitIdValidation, timeRangeValidation, sinceValidation, handleValidationErrors, (req, res, next) => {
+  console.log(' ROUTE HIT: GET /api/detections/:unitId/since');
+  next();
+}, getDetectionsSince);
+
+// @route   GET /api/detections/:unitId/page
+// @desc    Get a page of detections (cursor, page_size, action_type, min_confidence, person_id, from/to or hours)
+// @access  Private
+router.get('/:unitId/page', auth, unitIdValidation, timeRangeValidation, pageValidation, handleValidationErrors, (req, res, next) => {
+  console.log(' ROUTE HIT: GET /api/detections/:unitId/page');
+  next();
+}, getDetectionPage);
+
+// @route   GET /api/detections/:unitId/thumbnails/:detectionId
+// @desc    Get one detection thumbnail as raw JPEG (cacheable)
+// @access  Private
+router.get('/:unitId/thumbnails/:detectionId', auth, unitIdValidation, [
+  param('detectionId')
+    .isMongoId()
+    .withMessage('Detection ID must be a valid id')
+], handleValidationErrors, getThumbnail);
+
 // @route   GET /api/detections/:unitId/summary
 // @desc    Get detection summary statistics for a robot unit
 // @access  Private
@@ -161,4 +343,20 @@ router.get('/:unitId/summary', auth, unitIdValidation, timeRangeValidation, (req
   next();
 }, getDetectionSummary);
 
+// @route   GET /api/detections/:unitId/summaries
+// @desc    Get time-bucketed pose summaries for a robot unit
+// @access  Private
+router.get('/:unitId/summaries', auth, unitIdValidation, timeRangeValidation, (req, res, next) => {
+  console.log(' ROUTE HIT: GET /api/detections/:unitId/summaries');
+  next();
+}, getSummariesByUnit);
+
+// @route   GET /api/detections/:unitId/tracks
+// @desc    Get consolidated person tracks for a robot unit
+// @access  Private
+router.get('/:unitId/tracks', auth, unitIdValidation, timeRangeValidation, (req, res, next) => {
+  console.log(' ROUTE HIT: GET /api/detections/:unitId/tracks');
+  next();
+}, getTracksByUnit);
+
 module.exports = router;
\ No newline at end of file
@@ -0,0 +1,28 @@
+const express = require('express');
+const { param, validationResult } = require('express-validator');
+const { getThumbnailBlob } = require('../controllers/thumbnailController');
+const { sendError } = require('../utils/response');
+const auth = require('../middleware/auth');
+
+const router = express.Router();
+
+const keyValidation = [
+  param('key')
+    .matches(/^[0-9a-f]{64}$/)
+    .withMessage('Thumbnail key must be a SHA-256 hex digest')
+];
+
+const handleValidationErrors = (req, res, next) => {
+  const errors = validationResult(req);
+  if (!errors.isEmpty()) {
+    return sendError(res, errors.array()[0].msg, 400);
+  }
+  next();
+};
+
+// @route   GET /api/thumbnails/:key
+// @desc    Get a thumbnail image by content hash (immutable, long-lived cache)
+// @access  Private
+router.get('/:key', auth, keyValidation, handleValidationErrors, getThumbnailBlob);
+
+module.exports = router;
@@ -0,0 +1,239 @@
+// Content-addressed blob store for detection thumbnails.
+// Blobs are keyed by the SHA-256 of their bytes, so identical thumbnails (a unit re-sending
+// the same crop, retried uploads) are stored once and a key never changes content.
+//
+// Backend is chosen with THUMBNAIL_STORE:
+//   gridfs (default) - MongoDB GridFS bucket "thumbnails"
+//   disk             - files under THUMBNAIL_DIR (default ./data/thumbnails)
+//   s3               - bucket S3_BUCKET via the optional @aws-sdk/client-s3 package;
+//                      S3_ENDPOINT points it at a compatible server (MinIO, scripts/s3StandIn.js)
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const mongoose = require('mongoose');
+const { sendError } = require('./response');
+
+const hashKey = (buffer) => crypto.createHash('sha256').update(buffer).digest('hex');
+
+const isBlobKey = (value) => typeof value === 'string' && /^[0-9a-f]{64}$/.test(value);
+
+const streamToBuffer = async (stream) => {
+  const chunks = [];
+  for await (const chunk of stream) {
+    chunks.push(chunk);
+  }
+  return Buffer.concat(chunks);
+};
+
+class GridFSBlobStore {
+  constructor(bucketName = 'thumbnails') {
+    this.name = 'gridfs';
+    this.bucketName = bucketName;
+  }
+
+  // The bucket needs a live connection, so it is created on first use
+  get bucket() {
+    if (!this._bucket) {
+      this._bucket = new mongoose.mongo.GridFSBucket(mongoose.connection.db, { bucketName: this.bucketName });
+    }
+    return this._bucket;
+  }
+
+  async stat(key) {
+    const [file] = await this.bucket.find({ filename: key }).limit(1).toArray();
+    return file ? { size: file.length } : null;
+  }
+
+  async put(key, buffer) {
+    await new Promise((resolve, reject) => {
+      this.bucket.openUploadStream(key)
+        .on('error', reject)
+        .on('finish', resolve)
+        .end(buffer);
+    });
+  }
+
+  async createReadStream(key) {
+    return this.bucket.openDownloadStreamByName(key);
+  }
+
+  async remove(key) {
+    const files = await this.bucket.find({ filename: key }).toArray();
+    await Promise.all(files.map(file => this.bucket.delete(file._id)));
+  }
+}
+
+class DiskBlobStore {
+  constructor(directory) {
+    this.name = 'disk';
+    this.directory = path.resolve(directory);
+  }
+
+  // Two-level fan-out keeps directories small
+  pathFor(key) {
+    return path.join(this.directory, key.slice(0, 2), key);
+  }
+
+  async stat(key) {
+    try {
+      const stats = await fs.promises.stat(this.pathFor(key));
+      return { size: stats.size };
+    } catch (error) {
+      if (error.code === 'ENOENT') {
+        return null;
+      }
+      throw error;
+    }
+  }
+
+  async put(key, buffer) {
+    const target = this.pathFor(key);
+    await fs.promises.mkdir(path.dirname(target), { recursive: true });
+    // Write then rename, so readers never see a partial file
+    const temp = `${target}.${process.pid}.${Date.now()}.tmp`;
+    await fs.promises.writeFile(temp, buffer);
+    await fs.promises.rename(temp, target);
+  }
+
+  async createReadStream(key) {
+    return fs.createReadStream(this.pathFor(key));
+  }
+
+  async remove(key) {
+    await fs.promises.rm(this.pathFor(key), { force: true });
+  }
+}
+
+class S3BlobStore {
+  constructor({ bucket, prefix, endpoint, region }) {
+    let s3;
+    try {
+      s3 = require('@aws-sdk/client-s3');
+    } catch (error) {
+      throw new Error('THUMBNAIL_STORE=s3 needs the optional @aws-sdk/client-s3 package (npm install @aws-sdk/client-s3)');
+    }
+    if (!bucket) {
+      throw new Error('THUMBNAIL_STORE=s3 needs S3_BUCKET');
+    }
+    this.name = 's3';
+    this.s3 = s3;
+    this.bucket = bucket;
+    this.prefix = prefix;
+    this.client = new s3.S3Client({
+      region: region || 'us-east-1',
+      endpoint: endpoint || undefined,
+      forcePathStyle: !!endpoint
+    });
+  }
+
+  objectKey(key) {
+    return `${this.prefix}${key}`;
+  }
+
+  async stat(key) {
+    try {
+      const head = await this.client.send(new this.s3.HeadObjectCommand({ Bucket: this.bucket, Key: this.objectKey(key) }));
+      return { size: head.ContentLength };
+    } catch (error) {
+      if (error.name === 'NotFound' || error.$metadata?.httpStatusCode === 404) {
+        return null;
+      }
+      throw error;
+    }
+  }
+
+  async put(key, buffer) {
+    await this.client.send(new this.s3.PutObjectCommand({
+      Bucket: this.bucket,
+      Key: this.objectKey(key),
+      Body: buffer,
+      ContentType: 'image/jpeg'
+    }));
+  }
+
+  async createReadStream(key) {
+    const object = await this.client.send(new this.s3.GetObjectCommand({ Bucket: this.bucket, Key: this.objectKey(key) }));
+    return object.Body;
+  }
+
+  async remove(key) {
+    await this.client.send(new this.s3.DeleteObjectCommand({ Bucket: this.bucket, Key: this.objectKey(key) }));
+  }
+}
+
+let store = null;
+
+// The configured store (created on first use)
+const getBlobStore = () => {
+  if (!store) {
+    const kind = (process.env.THUMBNAIL_STORE || 'gridfs').toLowerCase();
+    if (kind === 'disk') {
+      store = new DiskBlobStore(process.env.THUMBNAIL_DIR || path.join(process.cwd(), 'data', 'thumbnails'));
+    } else if (kind === 's3') {
+      store = new S3BlobStore({
+        bucket: process.env.S3_BUCKET,
+        prefix: process.env.S3_PREFIX || 'thumbnails/',
+        endpoint: process.env.S3_ENDPOINT,
+        region: process.env.S3_REGION
+      });
+    } else {
+      store = new GridFSBlobStore();
+    }
+    console.log(` BLOB STORE: Using ${store.name} store for thumbnails`);
+  }
+  return store;
+};
+
+// Store a base64 thumbnail and return its key; an existing blob with the same content is reused
+const putThumbnail = async (base64) => {
+  const buffer = Buffer.from(base64, 'base64');
+  const key = hashKey(buffer);
+  const blobStore = getBlobStore();
+  if (!(await blobStore.stat(key))) {
+    await blobStore.put(key, buffer);
+  }
+  return key;
+};
+
+// Read a blob back as base64 (for clients that ask for inline thumbnails)
+const readThumbnail = async (key) => {
+  const buffer = await streamToBuffer(await getBlobStore().createReadStream(key));
+  return buffer.toString('base64');
+};
+
+// Stream a blob as a JPEG response. Content never changes for a key, so it is cached for a year.
+const sendThumbnail = async (req, res, key) => {
+  const etag = `"${key}"`;
+  if (req.get('If-None-Match') === etag) {
+    return res.status(304).end();
+  }
+
+  const blobStore = getBlobStore();
+  const stat = await blobStore.stat(key);
+  if (!stat) {
+    return sendError(res, 'Thumbnail not found', 404);
+  }
+
+  res.set({
+    'Content-Type': 'image/jpeg',
+    'Content-Length': stat.size,
+    'Cache-Control': 'private, max-age=31536000, immutable',
+    'ETag': etag
+  });
+
+  const stream = await blobStore.createReadStream(key);
+  stream.on('error', (error) => {
+    console.error(` BLOB STORE: Error streaming ${key}:`, error.message);
+    res.destroy(error);
+  });
+  stream.pipe(res);
+};
+
+module.exports = {
+  getBlobStore,
+  hashKey,
+  isBlobKey,
+  putThumbnail,
+  readThumbnail,
+  sendThumbnail
+};
@@ -0,0 +1,111 @@
+// Dashboard summary: the fleet-wide counters the desktop dashboard shows, kept precomputed
+// in the shared store so every cluster worker serves (and refreshes) the same copy
+const Robot = require('../models/Robot');
+const DetectionRecord = require('../models/DetectionRecord');
+const { getSharedStore } = require('./sharedStore');
+
+const ACTIVE_WINDOW_MS = 24 * 60 * 60 * 1000; // Same window the dashboard uses for "active" units
+const RECOMPUTE_DELAY_MS = 2 * 1000;           // Coalesces bursts of ingest into one recompute
+const MAX_AGE_MS = 60 * 1000;                  // Activity windows move even without ingest
+const SUMMARY_KEY = 'dashboard:summary';
+
+let computing = null;
+let recomputeTimer = null;
+
+const compute = async () => {
+  const since = new Date(Date.now() - ACTIVE_WINDOW_MS);
+
+  const [[totals], actionTotals, recentActions] = await Promise.all([
+    Robot.aggregate([
+      {
+        $project: {
+          status: 1,
+          last_seen: 1,
+          detection_count: 1,
+          is_active: { $gte: ['$last_seen', since] },
+          stream_count: { $size: { $ifNull: ['$rtsp_uris', []] } }
+        }
+      },
+      {
+        $group: {
+          _id: null,
+          total_units: { $sum: 1 },
+          active_units: { $sum: { $cond: ['$is_active', 1, 0] } },
+          online_units: { $sum: { $cond: [{ $eq: ['$status', 'online'] }, 1, 0] } },
+          active_streams: { $sum: { $cond: ['$is_active', '$stream_count', 0] } },
+          total_detections: { $sum: { $ifNull: ['$detection_count', 0] } },
+          last_seen: { $max: '$last_seen' }
+        }
+      }
+    ]),
+    // Per-unit action counters, kept by ingest like detection_count
+    Robot.aggregate([
+      { $project: { actions: { $objectToArray: { $ifNull: ['$action_counts', {}] } } } },
+      { $unwind: '$actions' },
+      { $group: { _id: '$actions.k', count: { $sum: '$actions.v' } } }
+    ]),
+    DetectionRecord.aggregate([
+      { $match: { timestamp: { $gte: since } } },
+      { $group: { _id: '$action_type', count: { $sum: 1 } } }
+    ])
+  ]);
+
+  const byAction = (rows) => Object.fromEntries(rows.filter(row => row.count > 0).map(row => [row._id, row.count]));
+
+  const summary = {
+    total_units: totals?.total_units || 0,
+    active_units: totals?.active_units || 0,
+    online_units: totals?.online_units || 0,
+    active_streams: totals?.active_streams || 0,
+    // Per-unit counters, which keep counting detections that retention has rolled up
+    total_detections: totals?.total_detections || 0,
+    last_24h_detections: recentActions.reduce((sum, row) => sum + row.count, 0),
+    action_counts: byAction(actionTotals),
+    last_24h_action_counts: byAction(recentActions),
+    last_seen: totals?.last_seen || null,
+    active_window_hours: ACTIVE_WINDOW_MS / (60 * 60 * 1000),
+    computed_at: new Date()
+  };
+  console.log(` DASHBOARD: Summary recomputed (${summary.total_units} units, ${summary.total_detections} detections)`);
+  await getSharedStore().set(SUMMARY_KEY, summary, 10 * MAX_AGE_MS);
+  return summary;
+};
+
+// Run one computation at a time; concurrent callers share it
+const recompute = () => {
+  if (!computing) {
+    computing = compute().finally(() => {
+      computing = null;
+    });
+  }
+  return computing;
+};
+
+// Current summary; only the very first request waits for a computation
+const getSummary = async () => {
+  const summary = await getSharedStore().get(SUMMARY_KEY);
+  if (!summary) {
+    return recompute();
+  }
+  if (Date.now() - new Date(summary.computed_at).getTime() > MAX_AGE_MS) {
+    recompute().catch(error => console.error(' DASHBOARD: Error recomputing summary:', error.message));
+  }
+  return summary;
+};
+
+// Called after robot data changes; recomputes shortly after, once per burst
+const markDirty = () => {
+  if (recomputeTimer) {
+    return;
+  }
+  recomputeTimer = setTimeout(() => {
+    recomputeTimer = null;
+    recompute().catch(error => console.error(' DASHBOARD: Error recomputing summary:', error.message));
+  }, RECOMPUTE_DELAY_MS);
+  recomputeTimer.unref();
+};
+
+module.exports = {
+  getSummary,
+  markDirty
+};
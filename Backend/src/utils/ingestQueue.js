@@ -0,0 +1,296 @@
+// Write-behind queue for detection ingest, enabled with INGEST_MODE=queue.
+// POST /api/detections validates a package, queues it and answers 202; a writer drains the
+// queue in batches, so robots get flat ack latency under bursts while Mongo sees bulk inserts.
+// Depth is bounded by INGEST_QUEUE_MAX; a full queue answers 429 with a Retry-After estimated
+// from how fast the writer is draining.
+//
+// Queue is chosen with INGEST_QUEUE:
+//   memory (default) - in this process. Packages acknowledged but not yet written are lost if
+//                      the process dies; a normal shutdown drains them first
+//   redis            - a Redis list at REDIS_URL via the optional ioredis package; survives restarts
+//                      and is shared by several API processes (scripts/redisStandIn.js locally).
+//                      Packages being written sit in a per-process processing list until they are
+//                      stored, and a restarted process puts whatever it left there back in the queue
+//
+// A failed batch is written again package by package, so one bad package is retried (and
+// eventually dropped) on its own instead of taking the rest of its batch with it.
+const os = require('os');
+const mongoose = require('mongoose');
+
+const MAX_DEPTH = parseInt(process.env.INGEST_QUEUE_MAX) || 5000;
+const BATCH_SIZE = parseInt(process.env.INGEST_BATCH_SIZE) || 100;
+const FLUSH_INTERVAL_MS = parseInt(process.env.INGEST_FLUSH_MS) || 200;
+const MAX_ATTEMPTS = 5;
+const MAX_RETRY_AFTER_SECONDS = 30;
+
+class MemoryQueue {
+  constructor() {
+    this.name = 'memory';
+    this.items = [];
+  }
+
+  async push(item) {
+    this.items.push(item);
+    return this.items.length;
+  }
+
+  async take(count) {
+    return this.items.splice(0, count);
+  }
+
+  // Taken items leave the array, so there is nothing to acknowledge
+  async ack() {}
+
+  // Failed packages go back to the front, keeping arrival order
+  async requeue(items) {
+    this.items.unshift(...items);
+  }
+
+  async size() {
+    return this.items.length;
+  }
+}
+
+class RedisQueue {
+  constructor(url, key) {
+    let Redis;
+    try {
+      Redis = require('ioredis');
+    } catch (error) {
+      throw new Error('INGEST_QUEUE=redis needs the optional ioredis package (npm install ioredis)');
+    }
+    this.name = 'redis';
+    this.key = key;
+    // Stable per host and cluster slot, so a restarted worker finds what its predecessor left
+    this.processingKey = `${key}:processing:${os.hostname()}:${process.env.WORKER_SLOT || 0}`;
+    // Serialized form of each taken item, to remove exactly that entry from the processing list
+    this.taken = new WeakMap();
+    // The ready check uses INFO, which Redis-compatible stand-ins need not implement
+    this.client = new Redis(url || 'redis://127.0.0.1:6379', { enableReadyCheck: false });
+  }
+
+  // Put packages a previous run took but never acknowledged back at the front of the queue
+  async recover() {
+    let recovered = 0;
+    while (await this.client.lmove(this.processingKey, this.key, 'RIGHT', 'LEFT')) {
+      recovered++;
+    }
+    if (recovered > 0) {
+      console.log(` INGEST QUEUE: Recovered ${recovered} packages left unwritten by a previous run`);
+    }
+  }
+
+  async push(item) {
+    return this.client.rpush(this.key, JSON.stringify(item));
+  }
+
+  // Move items to the processing list; they stay there until acknowledged or requeued
+  async take(count) {
+    const pipeline = this.client.pipeline();
+    for (let i = 0; i < count; i++) {
+      pipeline.lmove(this.key, this.processingKey, 'LEFT', 'RIGHT');
+    }
+    const results = await pipeline.exec();
+    return results
+      .filter(([error, raw]) => !error && raw !== null)
+      .map(([, raw]) => {
+        const item = JSON.parse(raw);
+        this.taken.set(item, raw);
+        return item;
+      });
+  }
+
+  async ack(items) {
+    if (items.length > 0) {
+      const pipeline = this.client.pipeline();
+      items.forEach(item => pipeline.lrem(this.processingKey, 1, this.taken.get(item)));
+      await pipeline.exec();
+    }
+  }
+
+  // Queue again (with the updated attempt count) before acknowledging the taken copy,
+  // so a crash in between repeats a package rather than losing it
+  async requeue(items) {
+    if (items.length > 0) {
+      await this.client.lpush(this.key, ...items.map(item => JSON.stringify(item)).reverse());
+      await this.ack(items);
+    }
+  }
+
+  async size() {
+    return this.client.llen(this.key);
+  }
+}
+
+let queue = null;
+let writer = null;
+let timer = null;
+let flushing = null;
+let recovering = Promise.resolve();
+
+const stats = {
+  enqueued: 0,
+  rejected: 0,
+  written: 0,
+  failed_batches: 0,
+  dropped: 0,
+  last_batch_ms: 0,
+  drain_rate: 0 // packages per second, smoothed
+};
+
+const enabled = () => (process.env.INGEST_MODE || 'sync').toLowerCase() === 'queue';
+
+// The configured queue (created on first use)
+const getQueue = () => {
+  if (!queue) {
+    const kind = (process.env.INGEST_QUEUE || 'memory').toLowerCase();
+    queue = kind === 'redis'
+      ? new RedisQueue(process.env.REDIS_URL, process.env.INGEST_QUEUE_KEY || 'cora:ingest')
+      : new MemoryQueue();
+    console.log(` INGEST QUEUE: Using ${queue.name} queue (max ${MAX_DEPTH} packages, batches of ${BATCH_SIZE})`);
+  }
+  return queue;
+};
+
+// Seconds until the writer should have made room, from the smoothed drain rate
+const retryAfter = (depth) => {
+  const rate = Math.max(stats.drain_rate, 1);
+  return Math.min(MAX_RETRY_AFTER_SECONDS, Math.max(1, Math.ceil((depth - MAX_DEPTH / 2) / rate)));
+};
+
+// Queue a validated package; returns { accepted, depth, retryAfter }
+const enqueue = async (pkg) => {
+  const depth = await getQueue().size();
+  if (depth >= MAX_DEPTH) {
+    stats.rejected++;
+    return { accepted: false, depth, retryAfter: retryAfter(depth) };
+  }
+  const newDepth = await getQueue().push({ ...pkg, attempts: 0 });
+  stats.enqueued++;
+  if (newDepth >= BATCH_SIZE) {
+    setImmediate(flush);
+  }
+  return { accepted: true, depth: newDepth };
+};
+
+// Write a failed batch package by package; returns the packages that still failed.
+// The writer is idempotent per package, so ones the batch already stored come back as duplicates.
+const writeSeparately = async (items) => {
+  const failed = [];
+  for (const item of items) {
+    try {
+      await writer([item]);
+    } catch (error) {
+      item.error = error.message;
+      failed.push(item);
+    }
+  }
+  return failed;
+};
+
+// Write one batch; packages that fail are queued again until they run out of attempts
+const writeBatch = async () => {
+  const items = await getQueue().take(BATCH_SIZE);
+  if (items.length === 0) {
+    return 0;
+  }
+
+  const started = Date.now();
+  let failed = [];
+  try {
+    await writer(items);
+  } catch (error) {
+    stats.failed_batches++;
+    console.error(` INGEST QUEUE: Batch of ${items.length} failed, writing its packages one by one:`, error.message);
+    failed = await writeSeparately(items);
+  }
+
+  await getQueue().ack(items.filter(item => !failed.includes(item)));
+  if (failed.length > 0) {
+    const retry = failed.filter(item => ++item.attempts < MAX_ATTEMPTS);
+    const dropped = failed.filter(item => !retry.includes(item));
+    stats.dropped += dropped.length;
+    dropped.forEach(item => console.error(` INGEST QUEUE: Dropping package ${item.package_id || '(no id)'} ` +
+      `from ${item.unit_id} after ${MAX_ATTEMPTS} attempts:`, item.error));
+    await getQueue().requeue(retry);
+    await getQueue().ack(dropped);
+    console.error(` INGEST QUEUE: ${failed.length} of ${items.length} packages failed (${retry.length} queued again)`);
+    if (failed.length === items.length) {
+      // Nothing got through (Mongo unavailable?); wait for the next interval
+      throw new Error(failed[0].error);
+    }
+  }
+
+  const written = items.length - failed.length;
+  const elapsed = Math.max(Date.now() - started, 1);
+  stats.written += written;
+  stats.last_batch_ms = elapsed;
+  stats.drain_rate = stats.drain_rate === 0
+    ? written * 1000 / elapsed
+    : 0.8 * stats.drain_rate + 0.2 * (written * 1000 / elapsed);
+  return items.length;
+};
+
+// Drain until the queue is empty or a batch fails (retried on the next tick)
+const flush = () => {
+  if (!flushing && writer && mongoose.connection.readyState === 1) {
+    flushing = (async () => {
+      try {
+        await recovering;
+        let written;
+        do {
+          written = await writeBatch();
+        } while (written > 0);
+      } catch (error) {
+        // Already logged; the batch waits for the next interval
+      } finally {
+        flushing = null;
+      }
+    })();
+  }
+  return flushing || Promise.resolve();
+};
+
+// Start the writer; writeFn stores an array of queued packages
+const start = (writeFn) => {
+  writer = writeFn;
+  if (enabled() && !timer) {
+    if (getQueue().recover) {
+      recovering = queue.recover()
+        .catch(error => console.error(' INGEST QUEUE: Could not recover unwritten packages:', error.message));
+    }
+    timer = setInterval(flush, FLUSH_INTERVAL_MS);
+    timer.unref();
+  }
+};
+
+// Stop the writer after writing what is queued (the memory queue would otherwise lose it)
+const stop = async () => {
+  clearInterval(timer);
+  timer = null;
+  if (!queue) {
+    return;
+  }
+  await flush();
+  if (queue.name === 'memory' && (await queue.size()) > 0) {
+    await flush();
+  }
+};
+
+const getStats = async () => ({
+  mode: enabled() ? 'queue' : 'sync',
+  queue: queue ? queue.name : null,
+  depth: queue ? await queue.size() : 0,
+  max_depth: MAX_DEPTH,
+  ...stats,
+  drain_rate: Math.round(stats.drain_rate * 10) / 10
+});
+
+module.exports = {
+  enabled,
+  enqueue,
+  flush,
+  getStats,
+  start,
+  stop
+};
@@ -0,0 +1,98 @@
+// Live event hub: pushes robot data notifications to connected clients over Server-Sent Events.
+// In a cluster, events go through the primary (see cluster.js), which numbers them once and
+// sends them to every worker, so a client sees the same ids whichever worker it reconnects to.
+const cluster = require('cluster');
+
+const HEARTBEAT_MS = 25 * 1000; // Keeps idle connections open through proxies (Render closes after ~55s)
+const REPLAY_SIZE = 200;        // Recent events kept for clients reconnecting with Last-Event-ID
+
+const clients = new Set();
+const recentEvents = [];
+let nextEventId = 1;
+
+const writeEvent = (client, event) => {
+  if (client.unitId && client.unitId !== event.unit_id) {
+    return;
+  }
+  client.res.write(`id: ${event.id}\nevent: ${event.type}\ndata: ${event.data}\n\n`);
+};
+
+// Register an SSE response; unitId limits the stream to one robot unit (optional)
+const subscribe = (req, res, unitId = null) => {
+  res.status(200);
+  res.set({
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache, no-transform',
+    'Connection': 'keep-alive',
+    'X-Accel-Buffering': 'no'
+  });
+  res.flushHeaders();
+
+  const client = { res, unitId };
+  clients.add(client);
+  console.log(` LIVE: Client subscribed${unitId ? ` to unit ${unitId}` : ''} (${clients.size} connected)`);
+
+  // Replay what a reconnecting client missed
+  const lastEventId = parseInt(req.get('Last-Event-ID'));
+  if (!isNaN(lastEventId)) {
+    recentEvents
+      .filter(event => event.id > lastEventId)
+      .forEach(event => writeEvent(client, event));
+  }
+
+  res.write(`retry: 2000\n: connected\n\n`);
+  const heartbeat = setInterval(() => res.write(': heartbeat\n\n'), HEARTBEAT_MS);
+
+  req.on('close', () => {
+    clearInterval(heartbeat);
+    clients.delete(client);
+    console.log(` LIVE: Client disconnected (${clients.size} connected)`);
+  });
+};
+
+// Deliver a numbered event to this process's clients
+const deliver = (event) => {
+  recentEvents.push(event);
+  if (recentEvents.length > REPLAY_SIZE) {
+    recentEvents.shift();
+  }
+
+  clients.forEach(client => {
+    try {
+      writeEvent(client, event);
+    } catch (error) {
+      console.error(' LIVE: Failed to write event:', error.message);
+    }
+  });
+};
+
+// Publish an event for a robot unit to every matching client
+const publish = (type, unitId, payload) => {
+  const event = {
+    type,
+    unit_id: unitId,
+    data: JSON.stringify({ unit_id: unitId, ...payload })
+  };
+
+  if (cluster.isWorker) {
+    process.send({ type: 'live-event', event });
+    return;
+  }
+  deliver({ id: nextEventId++, ...event });
+};
+
+if (cluster.isWorker) {
+  process.on('message', (message) => {
+    if (message && message.type === 'live-event' && message.event.id) {
+      deliver(message.event);
+    }
+  });
+}
+
+const getClientCount = () => clients.size;
+
+module.exports = {
+  subscribe,
+  publish,
+  getClientCount
+};
@@ -0,0 +1,112 @@
+// Per-process request metrics. Every cluster worker keeps its own and reports them to the
+// primary, which sends the collected set back so GET /metrics answers for the whole cluster
+// from whichever worker serves it.
+const cluster = require('cluster');
+const { monitorEventLoopDelay } = require('perf_hooks');
+const liveEvents = require('./liveEvents');
+const ingestQueue = require('./ingestQueue');
+
+const REPORT_INTERVAL_MS = 5 * 1000;
+const LATENCY_SAMPLES = 1024; // Most recent request latencies kept for percentiles
+
+const startedAt = Date.now();
+const counters = {
+  requests: 0,
+  ingest_requests: 0,
+  status_2xx: 0,
+  status_4xx: 0,
+  status_429: 0,
+  status_5xx: 0
+};
+const latencies = new Array(LATENCY_SAMPLES).fill(0);
+let latencyCount = 0;
+let clusterWorkers = {};
+let reporter = null;
+
+const loopDelay = monitorEventLoopDelay({ resolution: 20 });
+loopDelay.enable();
+
+// Express middleware: count the request and its latency once the response is sent
+const track = (req, res, next) => {
+  const started = process.hrtime.bigint();
+  res.on('finish', () => {
+    counters.requests++;
+    if (req.method === 'POST' && req.originalUrl.split('?')[0] === '/api/detections') {
+      counters.ingest_requests++;
+    }
+    if (res.statusCode >= 500) {
+      counters.status_5xx++;
+    } else if (res.statusCode >= 400) {
+      counters.status_4xx++;
+      if (res.statusCode === 429) {
+        counters.status_429++;
+      }
+    } else {
+      counters.status_2xx++;
+    }
+    latencies[latencyCount % LATENCY_SAMPLES] = Number(process.hrtime.bigint() - started) / 1e6;
+    latencyCount++;
+  });
+  next();
+};
+
+const percentile = (sorted, p) => {
+  if (sorted.length === 0) {
+    return 0;
+  }
+  return sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))];
+};
+
+// This process's metrics
+const snapshot = async () => {
+  const sorted = latencies.slice(0, Math.min(latencyCount, LATENCY_SAMPLES)).sort((a, b) => a - b);
+  const memory = process.memoryUsage();
+  const uptime = (Date.now() - startedAt) / 1000;
+  return {
+    pid: process.pid,
+    worker_id: cluster.isWorker ? cluster.worker.id : null,
+    uptime_seconds: Math.round(uptime),
+    ...counters,
+    requests_per_second: Math.round(counters.requests / Math.max(uptime, 1) * 10) / 10,
+    latency_ms: {
+      p50: Math.round(percentile(sorted, 0.5) * 10) / 10,
+      p99: Math.round(percentile(sorted, 0.99) * 10) / 10
+    },
+    event_loop_delay_ms: {
+      mean: Math.round(loopDelay.mean / 1e5) / 10,
+      max: Math.round(loopDelay.max / 1e5) / 10
+    },
+    rss_mb: Math.round(memory.rss / 1048576),
+    heap_used_mb: Math.round(memory.heapUsed / 1048576),
+    live_clients: liveEvents.getClientCount(),
+    ingest_queue_depth: (await ingestQueue.getStats().catch(() => ({ depth: null }))).depth
+  };
+};
+
+// Workers report to the primary on an interval and keep the cluster view it sends back
+const start = () => {
+  if (!cluster.isWorker || reporter) {
+    return;
+  }
+  process.on('message', (message) => {
+    if (message && message.type === 'cluster-metrics') {
+      clusterWorkers = message.workers;
+    }
+  });
+  reporter = setInterval(async () => {
+    process.send({ type: 'metrics', metrics: await snapshot() });
+    loopDelay.reset();
+  }, REPORT_INTERVAL_MS);
+  reporter.unref();
+};
+
+const getMetrics = async () => ({
+  worker: await snapshot(),
+  cluster: cluster.isWorker ? clusterWorkers : null
+});
+
+module.exports = {
+  track,
+  start,
+  getMetrics
+};
@@ -0,0 +1,30 @@
+// express-rate-limit store backed by the shared store, so every cluster worker
+// (or every host, with SHARED_STORE=redis) counts against the same per-client limit
+const { getSharedStore } = require('./sharedStore');
+
+class SharedRateLimitStore {
+  constructor(prefix = 'ratelimit:') {
+    this.prefix = prefix;
+    // Counts are not local to this process
+    this.localKeys = false;
+  }
+
+  init(options) {
+    this.windowMs = options.windowMs;
+  }
+
+  async increment(key) {
+    const { count, resetTime } = await getSharedStore().incr(this.prefix + key, this.windowMs);
+    return { totalHits: count, resetTime };
+  }
+
+  async decrement(key) {
+    await getSharedStore().decr(this.prefix + key);
+  }
+
+  async resetKey(key) {
+    await getSharedStore().del(this.prefix + key);
+  }
+}
+
+module.exports = SharedRateLimitStore;
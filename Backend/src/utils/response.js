@@ -1,5 +1,7 @@
 //Oleg Korobeyko
 // Response utility functions
+const crypto = require('crypto');
+
 const sendResponse = (res, statusCode, success, message, data = null) => {
   const response = {
     success,
@@ -26,9 +28,57 @@ const sendServerError = (res, message = 'Internal server error') => {
   return sendResponse(res, 500, false, message);
 };
 
+// Check the request's validators against the current representation.
+// If-None-Match takes precedence; If-Modified-Since is only used without it.
+const isNotModified = (req, etag, lastModified) => {
+  const ifNoneMatch = req.get('If-None-Match');
+  if (ifNoneMatch) {
+    return ifNoneMatch.split(',').some(tag => tag.trim().replace(/^W\//, '') === etag || tag.trim() === '*');
+  }
+
+  const ifModifiedSince = req.get('If-Modified-Since');
+  if (ifModifiedSince && lastModified) {
+    const since = Date.parse(ifModifiedSince);
+    // HTTP dates have second resolution
+    return !isNaN(since) && Math.floor(new Date(lastModified).getTime() / 1000) * 1000 <= since;
+  }
+  return false;
+};
+
+// Send a GET response that clients can revalidate with If-None-Match / If-Modified-Since.
+// The ETag is derived from the data only, so the per-response timestamp does not defeat it.
+const sendCacheable = (req, res, message, data, lastModified = null) => {
+  const etag = `"${crypto.createHash('sha1').update(JSON.stringify(data)).digest('base64')}"`;
+
+  res.set('ETag', etag);
+  res.set('Cache-Control', 'private, no-cache');
+  if (lastModified) {
+    res.set('Last-Modified', new Date(lastModified).toUTCString());
+  }
+
+  if (isNotModified(req, etag, lastModified)) {
+    return res.status(304).end();
+  }
+  return sendSuccess(res, message, data);
+};
+
+// Latest updatedAt of a set of documents, for Last-Modified
+const latestUpdate = (docs) => {
+  let latest = null;
+  docs.forEach(doc => {
+    const updated = doc && (doc.updatedAt || doc.last_seen);
+    if (updated && (!latest || updated > latest)) {
+      latest = updated;
+    }
+  });
+  return latest;
+};
+
 module.exports = {
   sendResponse,
   sendSuccess,
   sendError,
-  sendServerError
+  sendServerError,
+  sendCacheable,
+  latestUpdate
 };
\ No newline at end of file
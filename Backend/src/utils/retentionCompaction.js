@@ -0,0 +1,177 @@
+// Background job enforcing the detection retention tiers (see config/retention.js):
+//   - thumbnails older than THUMBNAIL_RETENTION_DAYS are dropped from their detections, and
+//     blobs nothing has referenced for THUMBNAIL_GC_GRACE_MS are removed from the blob store
+//   - whole hours of raw detections older than DETECTION_RETENTION_DAYS are rolled up into
+//     their exact hour buckets, then deleted
+// Rollups expire through the TTL index on detection_stats; the TTL on raw detections is a
+// backstop behind this job.
+const mongoose = require('mongoose');
+const DetectionRecord = require('../models/DetectionRecord');
+const DetectionStats = require('../models/DetectionStats');
+const ThumbnailRelease = require('../models/ThumbnailRelease');
+const retention = require('../config/retention');
+const { getBlobStore } = require('./blobStore');
+
+const INTERVAL_MS = parseInt(process.env.RETENTION_INTERVAL_MS) || 60 * 60 * 1000;
+const FIRST_RUN_DELAY_MS = 2 * 60 * 1000;
+const BATCH_SIZE = 500;
+const DAY_MS = 24 * 60 * 60 * 1000;
+// How long a blob must stay unreferenced before it is removed; far longer than an ingest
+// takes between finding a blob in the store and inserting the detection that uses it
+const GC_GRACE_MS = parseInt(process.env.THUMBNAIL_GC_GRACE_MS) || 60 * 60 * 1000;
+
+let timer = null;
+let running = false;
+let ttlSynced = false;
+
+// TTL indexes created before a retention setting changed keep their old expiry; collMod updates them
+// (and turns a plain index with the same key into a TTL index)
+const syncTtl = async (model, keyPattern, expireAfterSeconds) => {
+  try {
+    await mongoose.connection.db.command({
+      collMod: model.collection.collectionName,
+      index: { keyPattern, expireAfterSeconds }
+    });
+  } catch (error) {
+    console.error(` RETENTION: Could not set TTL on ${model.collection.collectionName}:`, error.message);
+  }
+};
+
+// Drop thumbnails from the matching detections, then mark blobs that are no longer referenced
+// for removal (see removeReleasedBlobs). A blob is shared by every detection with the same
+// image, so it goes only with its last reference.
+const releaseThumbnails = async (filter) => {
+  let released = 0;
+  for (;;) {
+    const detections = await DetectionRecord.find(
+      { ...filter, thumbnail_id: { $type: 'string' } },
+      { thumbnail_id: 1 }
+    ).limit(BATCH_SIZE).lean();
+    if (detections.length === 0) {
+      break;
+    }
+
+    await DetectionRecord.updateMany(
+      { _id: { $in: detections.map(detection => detection._id) } },
+      { $set: { thumbnail_id: null } }
+    );
+    released += detections.length;
+
+    const keys = new Set(detections.map(detection => detection.thumbnail_id));
+    const unreferenced = [];
+    for (const key of keys) {
+      if (!(await DetectionRecord.exists({ thumbnail_id: key }))) {
+        unreferenced.push(key);
+      }
+    }
+    if (unreferenced.length > 0) {
+      const now = new Date();
+      await ThumbnailRelease.bulkWrite(unreferenced.map(key => ({
+        updateOne: { filter: { key }, update: { $set: { released_at: now } }, upsert: true }
+      })), { ordered: false });
+    }
+
+    if (detections.length < BATCH_SIZE) {
+      break;
+    }
+  }
+
+  // Thumbnails never moved to the blob store are simply cleared
+  const inline = await DetectionRecord.updateMany(
+    { ...filter, thumbnail: { $type: 'string' } },
+    { $set: { thumbnail: null } }
+  );
+  return { released: released + inline.modifiedCount };
+};
+
+// Remove blobs released more than GC_GRACE_MS ago that are still unreferenced; a blob an
+// ingest has started using again in the meantime is kept
+const removeReleasedBlobs = async () => {
+  let removed = 0;
+  const releases = await ThumbnailRelease.find(
+    { released_at: { $lt: new Date(Date.now() - GC_GRACE_MS) } }
+  ).limit(BATCH_SIZE * 10).lean();
+  for (const release of releases) {
+    if (!(await DetectionRecord.exists({ thumbnail_id: release.key }))) {
+      try {
+        await getBlobStore().remove(release.key);
+        removed++;
+      } catch (error) {
+        console.error(` RETENTION: Could not remove thumbnail blob ${release.key}:`, error.message);
+        continue;
+      }
+    }
+    await ThumbnailRelease.deleteOne({ _id: release._id });
+  }
+  return removed;
+};
+
+// Roll up and delete raw detections before the cutoff hour, unit by unit
+const compactRaw = async (cutoff) => {
+  const unitIds = await DetectionRecord.distinct('unit_id', { timestamp: { $lt: cutoff } });
+  let deleted = 0;
+  for (const unitId of unitIds) {
+    const filter = { unit_id: unitId, timestamp: { $lt: cutoff } };
+    const oldest = await DetectionRecord.findOne(filter, { timestamp: 1 }).sort({ timestamp: 1 }).lean();
+    if (!oldest) {
+      continue;
+    }
+    // The counters are usually right already; rebuilding makes the rollups exact before the raw data goes
+    await DetectionStats.rebuildHours(unitId, DetectionStats.hourStart(oldest.timestamp), cutoff);
+    await releaseThumbnails(filter);
+    const result = await DetectionRecord.deleteMany(filter);
+    deleted += result.deletedCount;
+  }
+  return { units: unitIds.length, deleted };
+};
+
+const run = async () => {
+  if (running || mongoose.connection.readyState !== 1) {
+    return;
+  }
+  running = true;
+  try {
+    if (!ttlSynced) {
+      await syncTtl(DetectionRecord, { timestamp: -1 }, retention.rawTtlSeconds);
+      await syncTtl(DetectionStats, { hour: 1 }, retention.rollupTtlSeconds);
+      ttlSynced = true;
+    }
+
+    const now = Date.now();
+    const thumbnails = await releaseThumbnails({ timestamp: { $lt: new Date(now - retention.thumbnailDays * DAY_MS) } });
+    // Whole hours only, so a rolled-up hour never has raw detections left behind
+    const raw = await compactRaw(DetectionStats.hourStart(now - retention.rawDays * DAY_MS));
+    const removed = await removeReleasedBlobs();
+
+    if (thumbnails.released > 0 || raw.deleted > 0 || removed > 0) {
+      console.log(` RETENTION: Expired ${thumbnails.released} thumbnails (${removed} blobs removed), ` +
+        `rolled up and deleted ${raw.deleted} detections from ${raw.units} units`);
+    }
+  } catch (error) {
+    console.error(' RETENTION: Error:', error.message);
+  } finally {
+    running = false;
+  }
+};
+
+const start = () => {
+  if (!timer) {
+    console.log(` RETENTION: Raw detections ${retention.rawDays}d, thumbnails ${retention.thumbnailDays}d, ` +
+      `hourly rollups ${retention.rollupDays}d`);
+    setTimeout(run, FIRST_RUN_DELAY_MS).unref();
+    timer = setInterval(run, INTERVAL_MS);
+    timer.unref();
+  }
+};
+
+const stop = () => {
+  clearInterval(timer);
+  timer = null;
+};
+
+module.exports = {
+  run,
+  start,
+  stop,
+  releaseThumbnails
+};
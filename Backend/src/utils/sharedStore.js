@@ -0,0 +1,223 @@
+// Key-value store for state that every API process must see the same way: cached query
+// results, the dashboard summary and rate limit counters. Values are JSON and expire by TTL.
+//
+// Backend is chosen with SHARED_STORE:
+//   (unset)  - cluster workers share a store held by the cluster primary (over IPC, see cluster.js);
+//              a single process keeps it in memory
+//   memory   - in this process only, even in a cluster (tests, single-node deployments)
+//   redis    - REDIS_URL via the optional ioredis package, shared by several hosts
+//              (scripts/redisStandIn.js locally)
+const cluster = require('cluster');
+
+const REQUEST_TIMEOUT_MS = 5 * 1000;
+
+class MemoryStore {
+  constructor() {
+    this.name = 'memory';
+    this.entries = new Map();
+    // Expired entries are dropped when read; this sweep catches the ones never read again
+    this.sweeper = setInterval(() => this.sweep(), 60 * 1000);
+    this.sweeper.unref();
+  }
+
+  sweep() {
+    const now = Date.now();
+    this.entries.forEach((entry, key) => {
+      if (entry.expires && entry.expires <= now) {
+        this.entries.delete(key);
+      }
+    });
+  }
+
+  live(key) {
+    const entry = this.entries.get(key);
+    if (entry && entry.expires && entry.expires <= Date.now()) {
+      this.entries.delete(key);
+      return null;
+    }
+    return entry || null;
+  }
+
+  async get(key) {
+    const entry = this.live(key);
+    return entry ? JSON.parse(entry.value) : null;
+  }
+
+  async set(key, value, ttlMs) {
+    this.entries.set(key, { value: JSON.stringify(value), expires: ttlMs ? Date.now() + ttlMs : null });
+  }
+
+  async del(key) {
+    this.entries.delete(key);
+  }
+
+  // Count a hit in a fixed window that starts with the first hit
+  async incr(key, windowMs) {
+    const entry = this.live(key);
+    if (!entry) {
+      const expires = Date.now() + windowMs;
+      this.entries.set(key, { value: '1', expires });
+      return { count: 1, resetTime: new Date(expires) };
+    }
+    entry.value = String(parseInt(entry.value) + 1);
+    return { count: parseInt(entry.value), resetTime: new Date(entry.expires) };
+  }
+
+  async decr(key) {
+    const entry = this.live(key);
+    if (entry) {
+      entry.value = String(Math.max(0, parseInt(entry.value) - 1));
+    }
+  }
+}
+
+// Cluster worker side: every operation runs in the primary's MemoryStore
+class ClusterStore {
+  constructor() {
+    this.name = 'cluster';
+    this.pending = new Map();
+    this.nextId = 1;
+    process.on('message', (message) => {
+      if (message && message.type === 'store-reply' && this.pending.has(message.id)) {
+        const { resolve, reject, timer } = this.pending.get(message.id);
+        clearTimeout(timer);
+        this.pending.delete(message.id);
+        if (message.error) {
+          reject(new Error(message.error));
+        } else {
+          resolve(message.result);
+        }
+      }
+    });
+  }
+
+  request(op, args) {
+    return new Promise((resolve, reject) => {
+      const id = this.nextId++;
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`Shared store ${op} timed out`));
+      }, REQUEST_TIMEOUT_MS);
+      this.pending.set(id, { resolve, reject, timer });
+      process.send({ type: 'store', id, op, args });
+    });
+  }
+
+  async get(key) {
+    return this.request('get', [key]);
+  }
+
+  async set(key, value, ttlMs) {
+    return this.request('set', [key, value, ttlMs]);
+  }
+
+  async del(key) {
+    return this.request('del', [key]);
+  }
+
+  async incr(key, windowMs) {
+    const result = await this.request('incr', [key, windowMs]);
+    return { count: result.count, resetTime: new Date(result.resetTime) };
+  }
+
+  async decr(key) {
+    return this.request('decr', [key]);
+  }
+}
+
+class RedisStore {
+  constructor(url) {
+    let Redis;
+    try {
+      Redis = require('ioredis');
+    } catch (error) {
+      throw new Error('SHARED_STORE=redis needs the optional ioredis package (npm install ioredis)');
+    }
+    this.name = 'redis';
+    this.client = new Redis(url || 'redis://127.0.0.1:6379', { enableReadyCheck: false });
+  }
+
+  async get(key) {
+    const value = await this.client.get(key);
+    return value === null ? null : JSON.parse(value);
+  }
+
+  async set(key, value, ttlMs) {
+    if (ttlMs) {
+      await this.client.set(key, JSON.stringify(value), 'PX', ttlMs);
+    } else {
+      await this.client.set(key, JSON.stringify(value));
+    }
+  }
+
+  async del(key) {
+    await this.client.del(key);
+  }
+
+  async incr(key, windowMs) {
+    const count = await this.client.incr(key);
+    if (count === 1) {
+      await this.client.pexpire(key, windowMs);
+    }
+    const ttl = await this.client.pttl(key);
+    return { count, resetTime: new Date(Date.now() + Math.max(ttl, 0)) };
+  }
+
+  async decr(key) {
+    await this.client.decr(key);
+  }
+}
+
+let store = null;
+
+// The configured store (created on first use)
+const getSharedStore = () => {
+  if (!store) {
+    const kind = (process.env.SHARED_STORE || '').toLowerCase();
+    if (kind === 'redis') {
+      store = new RedisStore(process.env.REDIS_URL);
+    } else if (kind !== 'memory' && cluster.isWorker) {
+      store = new ClusterStore();
+    } else {
+      store = new MemoryStore();
+    }
+    console.log(` SHARED STORE: Using ${store.name} store`);
+  }
+  return store;
+};
+
+const STORE_OPS = ['get', 'set', 'del', 'incr', 'decr'];
+
+// Reply to a worker unless it has gone away meanwhile (crashed or retired in a rolling
+// restart); a send on a closed channel fails asynchronously, so it gets a callback
+const reply = (worker, message) => {
+  if (!worker.isConnected()) {
+    return;
+  }
+  worker.send(message, (error) => {
+    if (error) {
+      console.error(` SHARED STORE: Could not reply to worker ${worker.process.pid}:`, error.message);
+    }
+  });
+};
+
+// Primary side of the cluster store: answer a worker's store request
+const handleClusterRequest = async (primaryStore, worker, message) => {
+  let result;
+  try {
+    if (!STORE_OPS.includes(message.op)) {
+      throw new Error(`Unknown shared store operation ${message.op}`);
+    }
+    result = await primaryStore[message.op](...message.args);
+  } catch (error) {
+    reply(worker, { type: 'store-reply', id: message.id, error: error.message });
+    return;
+  }
+  reply(worker, { type: 'store-reply', id: message.id, result });
+};
+
+module.exports = {
+  MemoryStore,
+  getSharedStore,
+  handleClusterRequest
+};
@@ -0,0 +1,138 @@
+// Periodic job: recomputes the incremental detection counters from the detections themselves.
+// Counters can drift (a crash between storing detections and counting them, deletes,
+// migrated data that was never counted); this corrects each unit's total and the hour
+// buckets the statistics window reads, and logs how far they were off. Hours older than
+// raw retention only exist as rollups, so they count toward the total as they are.
+// The open hour is left to ingest: it is still being counted, and a recount would race it.
+const mongoose = require('mongoose');
+const Robot = require('../models/Robot');
+const DetectionRecord = require('../models/DetectionRecord');
+const DetectionStats = require('../models/DetectionStats');
+
+const INTERVAL_MS = parseInt(process.env.STATS_RECONCILE_INTERVAL_MS) || 60 * 60 * 1000;
+const FIRST_RUN_DELAY_MS = 30 * 1000;
+const WINDOW_HOURS = 25;
+
+let timer = null;
+let running = false;
+
+// Totals (overall and per action) are the raw detections before the open hour, plus the
+// rollups of hours whose raw data has already expired and the buckets of the open hour onward.
+// Those buckets are counted by the same ingest step as the robot's counters, so detections
+// being stored now are not drift.
+const countTotals = async (unitId, oldestRaw, openHour) => {
+  const rolledUpBefore = oldestRaw && oldestRaw.timestamp < openHour ? DetectionStats.hourStart(oldestRaw.timestamp) : openHour;
+  const [raw, rolledUp] = await Promise.all([
+    DetectionRecord.aggregate([
+      { $match: { unit_id: unitId, timestamp: { $lt: openHour } } },
+      { $group: { _id: '$action_type', count: { $sum: 1 } } }
+    ]),
+    DetectionStats.aggregate([
+      { $match: { unit_id: unitId, $or: [{ hour: { $lt: rolledUpBefore } }, { hour: { $gte: openHour } }] } },
+      { $project: { actions: { $objectToArray: '$actions' } } },
+      { $unwind: '$actions' },
+      { $group: { _id: '$actions.k', count: { $sum: '$actions.v' } } }
+    ])
+  ]);
+  const actions = {};
+  [...raw, ...rolledUp].forEach(row => {
+    actions[row._id] = (actions[row._id] || 0) + row.count;
+  });
+  return { total: Object.values(actions).reduce((sum, count) => sum + count, 0), actions };
+};
+
+const reconcileUnit = async (robot) => {
+  const since = new Date(DetectionStats.hourStart(Date.now()).getTime() - (WINDOW_HOURS - 1) * DetectionStats.HOUR_MS);
+
+  const [oldestRaw, newestRaw, oldestBucket] = await Promise.all([
+    DetectionRecord.findOne({ unit_id: robot.unit_id }, { timestamp: 1 }).sort({ timestamp: 1 }).lean(),
+    DetectionRecord.findOne({ unit_id: robot.unit_id }, { timestamp: 1 }).sort({ timestamp: -1 }).lean(),
+    DetectionStats.findOne({ unit_id: robot.unit_id }, { hour: 1 }).sort({ hour: 1 }).lean()
+  ]);
+
+  // Detections older than the unit's first bucket (migrated or stored before the counters
+  // existed) get their buckets once, so long-range statistics and rollups cover them
+  if (oldestRaw && (!oldestBucket || oldestRaw.timestamp < oldestBucket.hour)) {
+    const until = oldestBucket && oldestBucket.hour < since ? oldestBucket.hour : since;
+    const from = DetectionStats.hourStart(oldestRaw.timestamp);
+    if (from < until) {
+      await DetectionStats.rebuildHours(robot.unit_id, from, until);
+    }
+  }
+
+  const openHour = DetectionStats.hourStart(Date.now());
+  await DetectionStats.rebuildHours(robot.unit_id, since, openHour);
+  const [totals, current] = await Promise.all([
+    countTotals(robot.unit_id, oldestRaw, openHour),
+    Robot.findById(robot._id, { detection_count: 1, action_counts: 1 }).lean()
+  ]);
+
+  // Applied as increments, so counts ingest adds meanwhile are kept
+  const drift = totals.total - (current?.detection_count || 0);
+  const inc = {};
+  if (drift !== 0) {
+    inc.detection_count = drift;
+  }
+  const counted = current?.action_counts || {};
+  new Set([...Object.keys(totals.actions), ...Object.keys(counted)]).forEach(action => {
+    const delta = (totals.actions[action] || 0) - (counted[action] || 0);
+    if (delta !== 0) {
+      inc[`action_counts.${action}`] = delta;
+    }
+  });
+  const update = {
+    $set: { 'stats_cache.last_updated': new Date() },
+    // Counter from before detection_count existed
+    $unset: { 'stats_cache.total_detections': '' }
+  };
+  if (Object.keys(inc).length > 0) {
+    update.$inc = inc;
+  }
+  if (newestRaw) {
+    update.$max = { last_detection_at: newestRaw.timestamp };
+  }
+  await Robot.updateOne({ _id: robot._id }, update, { timestamps: false, strict: false });
+  return drift;
+};
+
+const run = async () => {
+  if (running || mongoose.connection.readyState !== 1) {
+    return;
+  }
+  running = true;
+  try {
+    const robots = await Robot.find({}, { unit_id: 1 }).lean();
+    let drifted = 0;
+    for (const robot of robots) {
+      const drift = await reconcileUnit(robot);
+      if (drift !== 0) {
+        drifted++;
+        console.log(` STATS RECONCILE: ${robot.unit_id} total was off by ${drift}`);
+      }
+    }
+    console.log(` STATS RECONCILE: Reconciled ${robots.length} units (${drifted} with drift)`);
+  } catch (error) {
+    console.error(' STATS RECONCILE: Error:', error.message);
+  } finally {
+    running = false;
+  }
+};
+
+const start = () => {
+  if (!timer) {
+    setTimeout(run, FIRST_RUN_DELAY_MS).unref();
+    timer = setInterval(run, INTERVAL_MS);
+    timer.unref();
+  }
+};
+
+const stop = () => {
+  clearInterval(timer);
+  timer = null;
+};
+
+module.exports = {
+  run,
+  start,
+  stop
+};
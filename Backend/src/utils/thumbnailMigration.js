@@ -0,0 +1,82 @@
+// Background job: moves thumbnails still stored inline (base64 on the detection document)
+// into the blob store. Those come from before the blob store existed, from migrated
+// embedded arrays and from ingest while the store was unavailable.
+const mongoose = require('mongoose');
+const DetectionRecord = require('../models/DetectionRecord');
+const retention = require('../config/retention');
+const { putThumbnail } = require('./blobStore');
+
+const INTERVAL_MS = parseInt(process.env.THUMBNAIL_MIGRATION_INTERVAL_MS) || 60 * 1000;
+const BATCH_SIZE = parseInt(process.env.THUMBNAIL_MIGRATION_BATCH) || 200;
+
+let timer = null;
+let running = false;
+
+// Move one batch; returns how many thumbnails were moved
+const migrateBatch = async () => {
+  // Thumbnails past their retention are left for the retention job to clear
+  const expired = new Date(Date.now() - retention.thumbnailDays * 24 * 60 * 60 * 1000);
+  const detections = await DetectionRecord.find(
+    { thumbnail: { $type: 'string' }, timestamp: { $gte: expired } },
+    { thumbnail: 1 }
+  ).sort({ timestamp: 1 }).limit(BATCH_SIZE).lean();
+
+  let moved = 0;
+  for (const detection of detections) {
+    try {
+      const key = await putThumbnail(detection.thumbnail);
+      // Only clear the inline copy if nobody changed it meanwhile
+      const result = await DetectionRecord.updateOne(
+        { _id: detection._id, thumbnail: detection.thumbnail },
+        { $set: { thumbnail_id: key, thumbnail: null } }
+      );
+      moved += result.modifiedCount;
+    } catch (error) {
+      console.error(` THUMBNAIL MIGRATION: Could not move thumbnail of ${detection._id}:`, error.message);
+    }
+  }
+  return { found: detections.length, moved };
+};
+
+// Drain the backlog batch by batch, then wait for the next interval
+const run = async () => {
+  if (running || mongoose.connection.readyState !== 1) {
+    return;
+  }
+  running = true;
+  let total = 0;
+  try {
+    for (;;) {
+      const { found, moved } = await migrateBatch();
+      total += moved;
+      if (found < BATCH_SIZE || moved === 0) {
+        break;
+      }
+    }
+    if (total > 0) {
+      console.log(` THUMBNAIL MIGRATION: Moved ${total} inline thumbnails to the blob store`);
+    }
+  } catch (error) {
+    console.error(' THUMBNAIL MIGRATION: Error:', error.message);
+  } finally {
+    running = false;
+  }
+};
+
+const start = () => {
+  if (!timer) {
+    timer = setInterval(run, INTERVAL_MS);
+    timer.unref();
+  }
+};
+
+const stop = () => {
+  clearInterval(timer);
+  timer = null;
+};
+
+module.exports = {
+  run,
+  start,
+  stop
+};
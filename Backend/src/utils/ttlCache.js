@@ -0,0 +1,43 @@
+// Short-lived cache for computed query results (statistics, aggregations).
+// Entries expire after their TTL rather than being invalidated on writes, so a busy unit's
+// statistics are recomputed at most once per TTL however often they are asked for.
+// Values live in the shared store, so cluster workers reuse each other's results; concurrent
+// misses for the same key within a process share one computation.
+const { getSharedStore } = require('./sharedStore');
+
+const pending = new Map();
+
+const cached = async (key, ttlMs, compute) => {
+  const storeKey = `cache:${key}`;
+  if (pending.has(key)) {
+    return pending.get(key);
+  }
+
+  const lookup = (async () => {
+    try {
+      const value = await getSharedStore().get(storeKey);
+      if (value !== null) {
+        return value;
+      }
+    } catch (error) {
+      // An unreachable store only costs a recompute
+      console.error(' SHARED STORE: Cache read failed:', error.message);
+    }
+    const value = await compute();
+    getSharedStore().set(storeKey, value, ttlMs)
+      .catch(error => console.error(' SHARED STORE: Cache write failed:', error.message));
+    // Callers get the same JSON round trip they would on a hit
+    return JSON.parse(JSON.stringify(value));
+  })();
+
+  pending.set(key, lookup);
+  try {
+    return await lookup;
+  } finally {
+    pending.delete(key);
+  }
+};
+
+module.exports = {
+  cached
+};
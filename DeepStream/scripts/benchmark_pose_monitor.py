@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for pose_monitor upload modes
+Replays synthetic shared memory frames (N persons x FPS x pipelines) through PoseMonitor
+and compares the single-process path with the multi-process encoder/uploader pool
+"""
+
+import os
+import sys
+import time
+import json
+import random
+import struct
+import argparse
+import multiprocessing
+from ctypes import memmove, addressof
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pose_monitor import (PoseMonitor, ServerConfig, SharedMemoryData, POSE_CLASSES,
+                          MAX_PERSONS)
+
+# Local stand-in for the backend detections endpoint
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive so the uploader's session is reused
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes
+    received = None
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        with StandInHandler.received.get_lock():
+            StandInHandler.received.value += 1
+
+        body = json.dumps({"success": True, "message": "ok"}).encode("utf-8")
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def run_stand_in_server(port, received):
+    StandInHandler.received = received
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInHandler)
+    server.daemon_threads = True
+    server.serve_forever()
+
+def build_frame(num_persons, thumb_width, thumb_height, frame_width=1920, frame_height=1080):
+    """Build a SharedMemoryData snapshot with num_persons detections carrying RGB thumbnails"""
+    data = SharedMemoryData()
+    data.num_persons = num_persons
+    data.pipeline_active = True
+    data.frame_width = frame_width
+    data.frame_height = frame_height
+
+    pixels = os.urandom(thumb_width * thumb_height * 3)
+    header = struct.pack('8I', 0, thumb_width, thumb_height, 0, 0, thumb_width, thumb_height, 1)
+    thumbnail = header + pixels
+
+    for i in range(num_persons):
+        person = data.persons[i]
+        person.person_id = i + 1
+        person.bbox.left = 100.0 + i * 150
+        person.bbox.top = 200.0
+        person.bbox.width = 120.0
+        person.bbox.height = 360.0
+        person.bbox.confidence = 0.95
+        person.pose_confidence = 0.9
+        person.is_tracked = True
+        person.has_classification = True
+        person.has_thumbnail = True
+        person.thumbnail_width = thumb_width
+        person.thumbnail_height = thumb_height
+        person.thumbnail_size = len(thumbnail)
+        memmove(addressof(person.thumbnail_data), thumbnail, len(thumbnail))
+    return data
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def run_pipeline(index, args, server_url, workers, results):
+    """One monitor per pipeline, as deployed; feeds frames at a fixed rate and measures reader latency"""
+    if not args.verbose:
+        sys.stdout = open(os.devnull, "w")
+
+    server_config = ServerConfig(
+        server_url=server_url,
+        unit_id=f"bench_unit_{index:02d}",
+        unit_name=f"Benchmark Pipeline {index}",
+        send_thumbnails=not args.no_thumbnails
+    )
+    monitor = PoseMonitor(server_config, workers=workers, queue_size=args.queue_size)
+
+    # Disable cooldowns so every person in every frame is uploaded (worst case)
+    for class_id in POSE_CLASSES:
+        monitor.duplicate_filter.set_class_cooldown(class_id, 0.0)
+    monitor.duplicate_filter.default_cooldown = 0.0
+    monitor.start_server_communication()
+
+    frame = build_frame(args.persons, args.thumb_width, args.thumb_height)
+    frame_interval = 1.0 / args.fps
+    latencies = []
+    late_frames = 0
+
+    start = time.monotonic()
+    next_frame = start
+    frame_number = 0
+    while time.monotonic() - start < args.duration:
+        frame_number += 1
+        timestamp_us = int(time.time() * 1000000)
+        frame.sequence_id = frame_number
+        frame.frame_number = frame_number
+        frame.timestamp_us = timestamp_us
+        for i in range(args.persons):
+            person = frame.persons[i]
+            person.frame_number = frame_number
+            person.timestamp_us = timestamp_us
+            person.pose_class = random.randrange(len(POSE_CLASSES))
+            person.bbox.left += random.uniform(-2.0, 2.0)
+
+        frame_start = time.perf_counter()
+        monitor.process_frame(frame)
+        monitor.flush_aggregates()
+        latencies.append(time.perf_counter() - frame_start)
+
+        next_frame += frame_interval
+        delay = next_frame - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            late_frames += 1
+    elapsed = time.monotonic() - start
+
+    # Let queued uploads finish so throughput counts delivered detections
+    drain_start = time.time()
+    if monitor.worker_pool:
+        monitor.worker_pool.stop(timeout=args.drain_timeout)
+    else:
+        monitor._drain_queue(timeout=args.drain_timeout)
+    drain_seconds = time.time() - drain_start
+    monitor.running = False
+
+    stats = monitor.get_stats()
+    results.put({
+        "pipeline": index,
+        "frames": frame_number,
+        "elapsed": elapsed,
+        "late_frames": late_frames,
+        "queued": stats["total_detections"],
+        "sent": stats["sent_packages"],
+        "errors": stats["send_errors"],
+        "dropped": stats.get("dropped_items", 0),
+        "restarts": stats.get("worker_restarts", 0),
+        "drain_seconds": drain_seconds,
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        "latency_max_ms": max(latencies) * 1000 if latencies else 0.0
+    })
+
+def run_mode(args, server_url, workers, received):
+    """Run all pipelines concurrently in one upload mode and print a report"""
+    label = f"multi-process ({workers} encoder(s))" if workers > 0 else "single process"
+    print(f"\n=== {label}: {args.pipelines} pipeline(s) x {args.persons} persons x {args.fps} FPS "
+          f"for {args.duration}s ===")
+
+    if received is not None:
+        received.value = 0
+    results = multiprocessing.Queue()
+    pipelines = [multiprocessing.Process(target=run_pipeline, args=(i, args, server_url, workers, results))
+                 for i in range(args.pipelines)]
+    for process in pipelines:
+        process.start()
+    reports = [results.get() for _ in pipelines]
+    for process in pipelines:
+        process.join()
+
+    offered = args.persons * args.fps
+    print(f"{'pipe':>4} {'frames':>7} {'late':>5} {'queued':>7} {'sent':>7} {'err':>4} {'drop':>5} "
+          f"{'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'drain s':>7} {'det/s':>7}")
+    total_sent = 0
+    for report in sorted(reports, key=lambda r: r["pipeline"]):
+        rate = report["sent"] / (report["elapsed"] + report["drain_seconds"])
+        total_sent += report["sent"]
+        print(f"{report['pipeline']:>4} {report['frames']:>7} {report['late_frames']:>5} {report['queued']:>7} "
+              f"{report['sent']:>7} {report['errors']:>4} {report['dropped']:>5} "
+              f"{report['latency_p50_ms']:>7.2f} {report['latency_p99_ms']:>7.2f} {report['latency_max_ms']:>7.2f} "
+              f"{report['drain_seconds']:>7.2f} {rate:>7.1f}")
+
+    wall = max(r["elapsed"] + r["drain_seconds"] for r in reports)
+    print(f"Offered load: {offered * args.pipelines} detections/s; delivered {total_sent} in {wall:.1f}s "
+          f"({total_sent / wall:.1f} detections/s)")
+    if received is not None:
+        print(f"Stand-in server received {received.value} requests")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pose_monitor upload throughput with synthetic frames")
+    parser.add_argument("--pipelines", type=int, default=2, help="Concurrent pipelines, one monitor each (default: 2)")
+    parser.add_argument("--persons", type=int, default=MAX_PERSONS, help=f"Persons per frame (default: {MAX_PERSONS})")
+    parser.add_argument("--fps", type=float, default=30.0, help="Frames per second per pipeline (default: 30)")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of frames to replay (default: 20)")
+    parser.add_argument("--workers", type=int, default=2, help="Encoder processes per monitor in multi-process mode (default: 2)")
+    parser.add_argument("--queue-size", type=int, default=1000, help="Inter-process queue bound (default: 1000)")
+    parser.add_argument("--mode", choices=["single", "multi", "both"], default="both", help="Upload mode(s) to run (default: both)")
+    parser.add_argument("--thumb-width", type=int, default=160, help="Thumbnail width in pixels (default: 160)")
+    parser.add_argument("--thumb-height", type=int, default=120, help="Thumbnail height in pixels (default: 120)")
+    parser.add_argument("--no-thumbnails", action="store_true", help="Upload detections without thumbnails")
+    parser.add_argument("--drain-timeout", type=float, default=30.0, help="Seconds allowed to flush queued uploads (default: 30)")
+    parser.add_argument("--server-url", default=None, help="Detections endpoint to upload to (default: local stand-in server)")
+    parser.add_argument("--port", type=int, default=18080, help="Port for the local stand-in server (default: 18080)")
+    parser.add_argument("--verbose", action="store_true", help="Keep per-detection monitor output")
+    args = parser.parse_args()
+
+    args.persons = max(1, min(args.persons, MAX_PERSONS))
+
+    server = None
+    received = None
+    server_url = args.server_url
+    if not server_url:
+        received = multiprocessing.Value('L', 0)
+        server = multiprocessing.Process(target=run_stand_in_server, args=(args.port, received), daemon=True)
+        server.start()
+        time.sleep(0.5)
+        server_url = f"http://127.0.0.1:{args.port}/api/detections"
+        print(f"Started stand-in server at {server_url}")
+
+    try:
+        if args.mode in ("single", "both"):
+            run_mode(args, server_url, 0, received)
+        if args.mode in ("multi", "both"):
+            run_mode(args, server_url, max(1, args.workers), received)
+    finally:
+        if server:
+            server.terminate()
+
+if __name__ == "__main__":
+    main()
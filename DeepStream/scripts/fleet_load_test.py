@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Load test for the backend ingest path with a simulated robot fleet
+Runs N units x M persons through realistic pose sequences, uploads their detections the way
+pose_monitor does (DetectionItem packages with thumbnails, retries honouring Retry-After) and
+reports ingest throughput, latency, error rates and MongoDB document growth per scenario phase
+
+Scenarios are JSON files in load_scenarios/ (steady_state, burst, reconnect_storm):
+    python3 fleet_load_test.py load_scenarios/steady_state.json
+    python3 fleet_load_test.py load_scenarios/burst.json --units 50 --mongo-uri mongodb://127.0.0.1:27017/cora
+
+Every detection is one POST from this host, so the backend's per-IP rate limit (100 requests
+per 15 minutes by default) throttles a run within seconds. Start the backend under test with
+the limit lifted, as Backend/scripts/loadTest.js does for the servers it starts:
+    RATE_LIMIT_MAX_REQUESTS=1000000000 npm start
+Phases dominated by 429 responses are flagged in the report and their throughput and latency
+are left out, since they would measure the rate limiter rather than ingest.
+"""
+
+import os
+import sys
+import time
+import json
+import random
+import base64
+import argparse
+import threading
+import multiprocessing
+from collections import deque, Counter
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pose_monitor import (DetectionItem, ServerConfig, PersonDetection, POSE_CLASSES,
+                          MAX_PERSONS, RETRYABLE_STATUS, MAX_RETRY_AFTER, _retry_after_seconds)
+
+# pymongo is optional: without it the run reports everything except document growth
+try:
+    from pymongo import MongoClient
+    PYMONGO_AVAILABLE = True
+except ImportError:
+    PYMONGO_AVAILABLE = False
+
+FRAME_WIDTH = 1920
+FRAME_HEIGHT = 1080
+
+# Collections that grow with ingest (GridFS thumbnails are the default blob store)
+GROWTH_COLLECTIONS = ("detection_records", "detectionpackages", "detection_stats", "robots",
+                      "thumbnails.files", "thumbnails.chunks")
+
+# Share of a phase's requests answered 429 above which its figures measure the rate limiter
+RATE_LIMITED_SHARE = 0.05
+
+# Pose state machine: seconds spent in each class and where a person goes next (class -> weight).
+# Transitions (sitting_down, getting_up) are short and classified with lower confidence.
+POSE_NAMES = {name: class_id for class_id, name in POSE_CLASSES.items()}
+POSE_DWELL = {
+    "sitting": (20.0, 60.0),
+    "getting_up": (1.0, 2.0),
+    "standing": (3.0, 10.0),
+    "walking": (5.0, 20.0),
+    "sitting_down": (1.0, 2.0),
+    "jumping": (0.5, 1.5)
+}
+POSE_NEXT = {
+    "sitting": {"getting_up": 1.0},
+    "getting_up": {"standing": 1.0},
+    "standing": {"walking": 0.6, "sitting_down": 0.3, "jumping": 0.1},
+    "walking": {"standing": 1.0},
+    "sitting_down": {"sitting": 1.0},
+    "jumping": {"standing": 1.0}
+}
+TRANSITION_POSES = ("getting_up", "sitting_down", "jumping")
+
+DEFAULT_SCENARIO = {
+    "units": 10,
+    "persons": 3,
+    "detection_interval": 5.0,
+    "thumbnail_kb": [9.0, 3.0],
+    "thumbnail_ratio": 1.0,
+    "track_seconds": [30.0, 300.0],
+    "dwell_scale": 1.0,
+    "backlog_limit": 1000,
+    "retry_attempts": 5,
+    "timeout": 10.0
+}
+
+def load_scenario(path):
+    """Read a scenario file; phase settings fall back to the scenario's, then to the defaults"""
+    with open(path) as f:
+        scenario = json.load(f)
+    merged = dict(DEFAULT_SCENARIO)
+    merged.update({key: value for key, value in scenario.items() if key != "phases"})
+    merged["name"] = scenario.get("name", os.path.splitext(os.path.basename(path))[0])
+    merged["phases"] = []
+    for index, phase in enumerate(scenario.get("phases", [])):
+        settings = {key: merged[key] for key in DEFAULT_SCENARIO if key in merged}
+        settings.update(phase)
+        settings.setdefault("name", f"phase_{index + 1}")
+        settings.setdefault("offline", False)
+        settings["duration"] = float(settings.get("duration", 60.0))
+        merged["phases"].append(settings)
+    if not merged["phases"]:
+        raise ValueError(f"Scenario {path} has no phases")
+    names = [phase["name"] for phase in merged["phases"]]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Scenario {path} has phases with the same name")
+    return merged
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class SimulatedPerson:
+    """One tracked person: walks through pose classes, moves around the frame and eventually leaves"""
+    def __init__(self, person_id, rng, phase, now):
+        self.rng = rng
+        self.person_id = person_id
+        self.detection = PersonDetection()
+        self.detection.person_id = person_id
+        self.detection.is_tracked = True
+        self.detection.has_classification = True
+        self.tracking_age = 0
+        self.first_seen = now
+        self.x = rng.uniform(0.0, FRAME_WIDTH - 200.0)
+        self.y = rng.uniform(100.0, FRAME_HEIGHT - 500.0)
+        self.velocity = rng.choice((-1, 1)) * rng.uniform(40.0, 120.0)  # Pixels per second when walking
+        self.leaves_at = now + rng.uniform(*phase["track_seconds"])
+        self.pose = rng.choice(("sitting", "standing", "walking"))
+        self.pose_until = now + self._dwell(phase)
+        self.next_report = now + rng.uniform(0.0, phase["detection_interval"])
+        self.last_update = now
+
+    def _dwell(self, phase):
+        low, high = POSE_DWELL[self.pose]
+        return self.rng.uniform(low, high) * phase["dwell_scale"]
+
+    def advance(self, now, phase):
+        """Move the simulation to now; returns True when the pose changed (the monitor reports changes at once)"""
+        elapsed = now - self.last_update
+        self.last_update = now
+        if self.pose == "walking":
+            self.x += self.velocity * elapsed
+            if self.x < 0.0 or self.x > FRAME_WIDTH - 200.0:
+                self.velocity = -self.velocity
+                self.x = min(max(self.x, 0.0), FRAME_WIDTH - 200.0)
+
+        changed = False
+        while now >= self.pose_until:
+            choices = POSE_NEXT[self.pose]
+            self.pose = self.rng.choices(list(choices), weights=list(choices.values()))[0]
+            self.pose_until += self._dwell(phase)
+            changed = True
+        return changed
+
+    def snapshot(self, now):
+        """Fill the PersonDetection the pipeline would have written to shared memory"""
+        person = self.detection
+        self.tracking_age += 1
+        seated = self.pose in ("sitting", "sitting_down", "getting_up")
+        confidence = (self.rng.uniform(0.65, 0.85) if self.pose in TRANSITION_POSES
+                      else self.rng.uniform(0.8, 0.98))
+
+        person.timestamp_us = int(time.time() * 1000000)
+        person.frame_number = int((now - self.first_seen) * 30)  # 30 FPS pipeline
+        person.pose_class = POSE_NAMES[self.pose]
+        person.pose_confidence = confidence
+        person.tracking_age = self.tracking_age
+        person.bbox.left = self.x
+        person.bbox.top = self.y + (120.0 if seated else 0.0)
+        person.bbox.width = self.rng.uniform(150.0, 200.0)
+        person.bbox.height = 300.0 if seated else self.rng.uniform(400.0, 460.0)
+        person.bbox.confidence = self.rng.uniform(0.85, 0.99)
+        remaining = 1.0 - confidence
+        for class_id in range(len(POSE_CLASSES)):
+            person.pose_scores[class_id] = confidence if class_id == person.pose_class else remaining / (len(POSE_CLASSES) - 1)
+        return person
+
+class SimulatedUnit:
+    """A robot unit: its people, its upload session and the detections waiting to be sent"""
+    def __init__(self, index, server_url, prefix, seed):
+        self.rng = random.Random(seed)
+        self.server_config = ServerConfig(
+            server_url=server_url,
+            unit_id=f"{prefix}_{index:03d}",
+            unit_name=f"Load Test Unit {index}",
+            rtsp_uris=[f"rtsp://loadtest/{prefix.lower()}/{index:03d}"]
+        )
+        self.session = requests.Session()
+        self.persons = []
+        self.next_person_id = 1
+        self.backlog = deque()
+
+    def _thumbnail(self, phase):
+        """Random bytes of a sampled JPEG size, so the blob store sees one new image per detection"""
+        if self.rng.random() >= phase["thumbnail_ratio"]:
+            return None
+        mean_kb, stddev_kb = phase["thumbnail_kb"]
+        size = int(max(1.0, self.rng.gauss(mean_kb, stddev_kb)) * 1024)
+        return base64.b64encode(os.urandom(size)).decode("utf-8")
+
+    def _staff(self, phase, now):
+        """Replace people who left and match the phase's head count"""
+        self.persons = [person for person in self.persons if now < person.leaves_at]
+        while len(self.persons) < phase["persons"]:
+            self.persons.append(SimulatedPerson(self.next_person_id, self.rng, phase, now))
+            self.next_person_id += 1
+        del self.persons[phase["persons"]:]
+
+    def generate(self, phase, now, stats):
+        """Queue the detections due now; returns seconds until the next one is due"""
+        self._staff(phase, now)
+        next_due = now + phase["detection_interval"]
+        for person in self.persons:
+            changed = person.advance(now, phase)
+            if changed or now >= person.next_report:
+                item = DetectionItem(person.snapshot(now), self.server_config, thumbnail=self._thumbnail(phase))
+                item.normalize_bbox(FRAME_WIDTH, FRAME_HEIGHT)
+                self.backlog.append(item)
+                stats["generated"] += 1
+                person.next_report = now + phase["detection_interval"]
+                if len(self.backlog) > phase["backlog_limit"]:
+                    self.backlog.popleft()  # The monitor's bounded queue drops the oldest
+                    stats["dropped"] += 1
+            next_due = min(next_due, person.next_report, person.pose_until)
+        return max(0.0, next_due - now)
+
+    def reconnect(self):
+        """Drop pooled connections, as a robot coming back from a network outage or a reboot does"""
+        self.session.close()
+        self.session = requests.Session()
+
+    def send(self, item, phase, stats):
+        """POST one detection package with pose_monitor's retry policy, recording every attempt"""
+        payload = item.to_server_format()
+        for attempt in range(phase["retry_attempts"]):
+            response = None
+            sent = time.perf_counter()
+            try:
+                response = self.session.post(self.server_config.server_url, json=payload, timeout=phase["timeout"])
+                stats["latencies"].append((time.perf_counter() - sent) * 1000.0)
+                stats["status"][response.status_code] += 1
+                if response.status_code in (200, 201, 202):
+                    stats["accepted"] += 1
+                    stats["delivery_lag"].append(time.time() * 1000.0 - item.timestamp)
+                    return True
+                if response.status_code not in RETRYABLE_STATUS:
+                    break
+            except requests.exceptions.RequestException:
+                stats["network_errors"] += 1
+            if attempt < phase["retry_attempts"] - 1:
+                stats["retries"] += 1
+                retry_after = _retry_after_seconds(response)
+                time.sleep(min(retry_after, MAX_RETRY_AFTER) if retry_after is not None
+                           else min(0.5 * (2 ** attempt), 10.0))
+        stats["failed"] += 1
+        return False
+
+def new_phase_stats():
+    return {"generated": 0, "dropped": 0, "accepted": 0, "failed": 0, "retries": 0, "network_errors": 0,
+            "status": Counter(), "latencies": [], "delivery_lag": []}
+
+def run_unit(unit, scenario, start_time, stats_by_phase, lock):
+    """Drive one unit through every phase; the phase boundaries are shared wall-clock times"""
+    time.sleep(max(0.0, start_time - time.time()))
+    phase_start = start_time
+    for phase in scenario["phases"]:
+        phase_end = phase_start + phase["duration"]
+        stats = new_phase_stats()
+        was_offline = phase["offline"]
+        while time.time() < phase_end:
+            wait = unit.generate(phase, time.time(), stats)
+            if not phase["offline"] and unit.backlog:
+                unit.send(unit.backlog.popleft(), phase, stats)
+            else:
+                time.sleep(min(wait, max(0.0, phase_end - time.time()), 0.5))
+        if was_offline:
+            unit.reconnect()
+        phase_start = phase_end
+        with lock:
+            merge_stats(stats_by_phase[phase["name"]], stats)
+    # Whatever is still queued counts as not delivered
+    with lock:
+        stats_by_phase[scenario["phases"][-1]["name"]]["unsent"] = (
+            stats_by_phase[scenario["phases"][-1]["name"]].get("unsent", 0) + len(unit.backlog))
+
+def merge_stats(total, stats):
+    for key, value in stats.items():
+        if isinstance(value, list):
+            total.setdefault(key, []).extend(value)
+        elif isinstance(value, Counter):
+            total.setdefault(key, Counter()).update(value)
+        else:
+            total[key] = total.get(key, 0) + value
+
+def run_shard(unit_indices, scenario, args, start_time, results):
+    """One process simulating a share of the fleet, one thread per unit"""
+    stats_by_phase = {phase["name"]: {} for phase in scenario["phases"]}
+    lock = threading.Lock()
+    threads = []
+    for index in unit_indices:
+        unit = SimulatedUnit(index, args.server_url, args.unit_prefix, args.seed * 100003 + index)
+        thread = threading.Thread(target=run_unit, args=(unit, scenario, start_time, stats_by_phase, lock), daemon=True)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    for stats in stats_by_phase.values():
+        stats["status"] = dict(stats.get("status", {}))
+    results.put(stats_by_phase)
+
+def mongo_counts(database):
+    """Document counts of the ingest collections and the database's data size in bytes"""
+    counts = {name: database[name].estimated_document_count() for name in GROWTH_COLLECTIONS}
+    counts["data_size_bytes"] = int(database.command("dbStats").get("dataSize", 0))
+    return counts
+
+def print_report(scenario, merged, elapsed_by_phase, before, after):
+    print(f"\n=== {scenario['name']}: ingest results ===")
+    print(f"{'phase':<16} {'secs':>5} {'gen':>7} {'acked':>7} {'pkg/s':>7} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'lag p99 s':>9} {'429':>5} {'5xx':>5} {'net err':>7} {'failed':>6} {'dropped':>7} {'err %':>6}")
+    rate_limited = []
+    for phase in scenario["phases"]:
+        stats = merged[phase["name"]]
+        status = stats.get("status", {})
+        attempts = sum(status.values()) + stats.get("network_errors", 0)
+        errors = attempts - stats.get("accepted", 0)
+        server_errors = sum(count for code, count in status.items() if int(code) >= 500)
+        latencies = stats.get("latencies", [])
+        seconds = elapsed_by_phase[phase["name"]]
+        if attempts and status.get(429, 0) / attempts > RATE_LIMITED_SHARE:
+            rate_limited.append((phase["name"], 100.0 * status.get(429, 0) / attempts))
+            figures = f"{'-':>7} {'-':>8} {'-':>8} {'-':>9}"
+        else:
+            figures = (f"{stats.get('accepted', 0) / seconds:>7.1f} {percentile(latencies, 0.50):>8.1f} "
+                       f"{percentile(latencies, 0.99):>8.1f} "
+                       f"{percentile(stats.get('delivery_lag', []), 0.99) / 1000.0:>9.1f}")
+        print(f"{phase['name']:<16} {seconds:>5.0f} {stats.get('generated', 0):>7} {stats.get('accepted', 0):>7} "
+              f"{figures} {status.get(429, 0):>5} {server_errors:>5} {stats.get('network_errors', 0):>7} "
+              f"{stats.get('failed', 0):>6} {stats.get('dropped', 0):>7} "
+              f"{(100.0 * errors / attempts if attempts else 0.0):>6.2f}")
+
+    for name, share in rate_limited:
+        print(f"Warning: {share:.0f}% of requests in phase {name} were rate limited (429); its throughput "
+              "and latency measure the backend's rate limiter, not ingest. Restart the backend with "
+              "RATE_LIMIT_MAX_REQUESTS raised (e.g. RATE_LIMIT_MAX_REQUESTS=1000000000) and run again.")
+
+    unsent = merged[scenario["phases"][-1]["name"]].get("unsent", 0)
+    if unsent:
+        print(f"{unsent} detections were still queued on the units when the run ended")
+
+    if before is not None and after is not None:
+        accepted = sum(merged[phase["name"]].get("accepted", 0) for phase in scenario["phases"])
+        print("\n=== MongoDB growth ===")
+        for name in GROWTH_COLLECTIONS:
+            print(f"{name:<20} {before[name]:>10} -> {after[name]:>10} ({after[name] - before[name]:+d})")
+        growth = after["data_size_bytes"] - before["data_size_bytes"]
+        print(f"{'data size':<20} {before['data_size_bytes'] / 1048576:>9.1f}M -> {after['data_size_bytes'] / 1048576:>9.1f}M "
+              f"({growth / 1048576:+.1f}M, {growth / accepted / 1024 if accepted else 0.0:.1f} KB per acked detection)")
+        # With INGEST_MODE=queue the writer may still be draining, so these can lag the acks
+        records = after["detection_records"] - before["detection_records"]
+        if records < accepted:
+            print(f"Note: {accepted - records} acked detections not yet in detection_records "
+                  "(queued ingest still writing, or retention removed older ones)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the backend ingest endpoint with a simulated robot fleet")
+    parser.add_argument("scenario", help="Scenario JSON file (see load_scenarios/)")
+    parser.add_argument("--server-url", default="http://127.0.0.1:5001/api/detections",
+                        help="Detections endpoint (default: local backend)")
+    parser.add_argument("--units", type=int, default=None, help="Override the scenario's unit count")
+    parser.add_argument("--persons", type=int, default=None, help="Override persons per unit in every phase")
+    parser.add_argument("--processes", type=int, default=min(multiprocessing.cpu_count(), 8),
+                        help="Generator processes the units are spread over (default: CPU count, at most 8)")
+    parser.add_argument("--unit-prefix", default="LOADTEST", help="Unit id prefix, so test robots are easy to remove")
+    parser.add_argument("--mongo-uri", default=os.environ.get("MONGODB_URI"),
+                        help="MongoDB the backend writes to, for document growth (default: $MONGODB_URI)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the simulated fleet (default: 1)")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    if args.units is not None:
+        scenario["units"] = args.units
+    for phase in scenario["phases"]:
+        if args.persons is not None:
+            phase["persons"] = args.persons
+        phase["persons"] = max(0, min(int(phase["persons"]), MAX_PERSONS))
+
+    database = None
+    if args.mongo_uri:
+        if PYMONGO_AVAILABLE:
+            client = MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000)
+            database = client.get_default_database("test")
+        else:
+            print("Warning: pymongo not installed (pip install pymongo); skipping MongoDB growth")
+    else:
+        print("No --mongo-uri or MONGODB_URI set; skipping MongoDB growth")
+
+    total_seconds = sum(phase["duration"] for phase in scenario["phases"])
+    print(f"Scenario {scenario['name']}: {scenario['units']} units against {args.server_url}, "
+          f"{len(scenario['phases'])} phase(s), {total_seconds:.0f}s")
+    for phase in scenario["phases"]:
+        print(f"  {phase['name']:<16} {phase['duration']:>5.0f}s  {phase['persons']} persons/unit, "
+              f"detection every {phase['detection_interval']}s"
+              f"{', OFFLINE (buffering)' if phase['offline'] else ''}")
+
+    before = mongo_counts(database) if database is not None else None
+
+    # Shards start together a little in the future so phase boundaries line up across processes
+    processes = max(1, min(args.processes, scenario["units"]))
+    start_time = time.time() + 1.0
+    results = multiprocessing.Queue()
+    shards = [multiprocessing.Process(target=run_shard,
+                                      args=(list(range(shard, scenario["units"], processes)), scenario, args,
+                                            start_time, results))
+              for shard in range(processes)]
+    for process in shards:
+        process.start()
+    reports = [results.get() for _ in shards]
+    for process in shards:
+        process.join()
+
+    merged = {phase["name"]: {} for phase in scenario["phases"]}
+    for report in reports:
+        for name, stats in report.items():
+            merge_stats(merged[name], {key: Counter(value) if key == "status" else value
+                                       for key, value in stats.items()})
+    elapsed_by_phase = {phase["name"]: phase["duration"] for phase in scenario["phases"]}
+    # The last phase also covers the time units spent finishing their final request
+    elapsed_by_phase[scenario["phases"][-1]["name"]] += max(0.0, time.time() - start_time - total_seconds)
+
+    after = mongo_counts(database) if database is not None else None
+    print_report(scenario, merged, elapsed_by_phase, before, after)
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ import requests
 import cv2
 import numpy as np
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from ctypes import *
 from io import BytesIO
 # OpenCV is already imported above - check if it supports image encoding
@@ -34,6 +35,7 @@ except Exception as e:
 import threading
 from threading import Thread, Lock
 import queue
+import multiprocessing
 
 # Shared memory constants (must match C header)
 MAX_PERSONS = 10
@@ -51,6 +53,99 @@ POSE_CLASSES = {
     5: "jumping"
 }
 
+# Clock handling: monotonic time for intervals, backend-aligned UTC epoch milliseconds on the wire
+class MonitorClock:
+    # Offset samples from slow round trips are too uncertain to use
+    MAX_SAMPLE_RTT = 2.0
+    
+    def __init__(self, smoothing=0.2):
+        """
+        Initialize clock with no known offset to the backend
+        
+        Args:
+            smoothing: Weight of each new offset sample in the running estimate
+        """
+        self.smoothing = smoothing
+        # Backend minus robot wall clock in milliseconds; shared with forked worker processes
+        self._offset_ms = multiprocessing.Value('d', 0.0, lock=False)
+        self._samples = multiprocessing.Value('L', 0, lock=False)
+    
+    def monotonic(self):
+        """Seconds from a clock that NTP cannot step; use for cooldowns, timeouts and intervals"""
+        return time.monotonic()
+    
+    def epoch_ms(self, unix_seconds=None):
+        """
+        Convert robot wall-clock time to backend-aligned UTC epoch milliseconds
+        
+        Args:
+            unix_seconds: Robot wall-clock time in seconds (defaults to now)
+            
+        Returns:
+            int: Milliseconds since the Unix epoch on the backend's clock
+        """
+        unix_seconds = unix_seconds if unix_seconds is not None else time.time()
+        return int(round(unix_seconds * 1000.0 + self._offset_ms.value))
+    
+    def pipeline_ms(self, timestamp_us):
+        """Convert a pipeline timestamp (gettimeofday microseconds) to backend-aligned epoch milliseconds"""
+        return self.epoch_ms(timestamp_us / 1000000.0)
+    
+    def update_from_response(self, response, request_sent, response_received):
+        """
+        Refine the robot-to-backend clock offset from a server response
+        
+        Prefers the backend's X-Server-Time header (epoch milliseconds) and falls back
+        to the standard Date header, which only has one-second resolution.
+        
+        Args:
+            response: requests.Response from the backend
+            request_sent: Robot wall-clock seconds when the request was sent
+            response_received: Robot wall-clock seconds when the response arrived
+            
+        Returns:
+            bool: True if the response contributed an offset sample
+        """
+        round_trip = response_received - request_sent
+        if round_trip < 0 or round_trip > self.MAX_SAMPLE_RTT:
+            return False
+        
+        server_ms = None
+        coarse = False
+        try:
+            if response.headers.get("X-Server-Time"):
+                server_ms = float(response.headers["X-Server-Time"])
+            elif response.headers.get("Date"):
+                # Date truncates to the second; assume the middle of it
+                server_ms = parsedate_to_datetime(response.headers["Date"]).timestamp() * 1000.0 + 500.0
+                coarse = True
+        except (TypeError, ValueError):
+            return False
+        if server_ms is None:
+            return False
+        
+        # Assume the server stamped the response halfway through the round trip
+        sample = server_ms - (request_sent + round_trip / 2.0) * 1000.0
+        if coarse and abs(sample) < 1000.0:
+            # Sub-second skew is indistinguishable from Date rounding
+            sample = 0.0
+        
+        if self._samples.value == 0:
+            self._offset_ms.value = sample
+        else:
+            self._offset_ms.value += self.smoothing * (sample - self._offset_ms.value)
+        self._samples.value += 1
+        return True
+    
+    def get_stats(self):
+        """Get clock offset statistics"""
+        return {
+            "offset_ms": round(self._offset_ms.value, 1),
+            "offset_samples": self._samples.value
+        }
+
+CLOCK = MonitorClock()
+
 # Duplicate detection filter with per-class cooldowns
 class DuplicateFilter:
     def __init__(self, default_cooldown=60.0):
@@ -77,7 +172,7 @@ class DuplicateFilter:
         self.last_detections = {}
         
         # Cleanup old entries periodically
-        self.last_cleanup = time.time()
+        self.last_cleanup = CLOCK.monotonic()
         self.cleanup_interval = 300  # 5 minutes
         self.max_person_age = 600    # 10 minutes
     
@@ -93,7 +188,7 @@ class DuplicateFilter:
         Returns:
             bool: True if detection should be sent, False if filtered as duplicate
         """
-        current_time = time.time()
+        current_time = CLOCK.monotonic()
         
         # Periodic cleanup of old entries
         if current_time - self.last_cleanup > self.cleanup_interval:
@@ -122,6 +217,24 @@ class DuplicateFilter:
         person_detections[pose_class] = current_time
         return True
     
+    def is_in_cooldown(self, person_id, pose_class, current_time=None):
+        """
+        Check whether a detection would be filtered, without recording it
+        
+        Args:
+            person_id: Unique identifier for the person
+            pose_class: Pose class ID (0-5)
+            current_time: Monotonic time in seconds (defaults to now)
+            
+        Returns:
+            bool: True if this person/class is still inside its cooldown window
+        """
+        current_time = current_time if current_time is not None else CLOCK.monotonic()
+        last_detection_time = self.last_detections.get(person_id, {}).get(pose_class)
+        if last_detection_time is None:
+            return False
+        return current_time - last_detection_time < self.get_cooldown_for_class(pose_class)
+    
     def _cleanup_old_entries(self, current_time):
         """Remove old detection entries to prevent memory growth"""
         persons_to_remove = []
@@ -159,10 +272,521 @@ class DuplicateFilter:
             "last_cleanup": self.last_cleanup
         }
 
+# Edge-side aggregation of pose statistics into time-bucketed summaries
+class PoseAggregator:
+    # Confidence histogram uses fixed 0.1-wide bins over [0.0, 1.0]
+    CONFIDENCE_BINS = 10
+    
+    def __init__(self, bucket_seconds=60.0, track_timeout=5.0):
+        """
+        Initialize rolling per-action counters for one unit
+        
+        Args:
+            bucket_seconds: Length of each summary bucket in seconds (1 minute)
+            track_timeout: Seconds a person must be unseen before the track is closed
+        """
+        self.bucket_seconds = bucket_seconds
+        self.track_timeout = track_timeout
+        
+        # Open tracks survive bucket boundaries so dwell time spans buckets
+        # Structure: {person_id: {"first_seen": t, "last_seen": t, "pose_class": c}}
+        self.tracks = {}
+        
+        self.bucket_start = None
+        self._reset_bucket(CLOCK.monotonic())
+    
+    def _reset_bucket(self, bucket_start):
+        """Start a new empty bucket"""
+        self.bucket_start = bucket_start
+        self.bucket_start_ms = CLOCK.epoch_ms()
+        self.frames = 0
+        self.occupancy_sum = 0
+        self.occupancy_max = 0
+        # Structure: {action: {"count", "confidence_sum", "histogram", "persons"}}
+        self.actions = {}
+        # Structure: {"from->to": count}
+        self.transitions = {}
+        self.dwell = {"tracks_ended": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        self.raw_detections_sent = 0
+    
+    def record_frame(self, data, current_time=None):
+        """
+        Fold one updated shared memory frame into the current bucket
+        
+        Args:
+            data: SharedMemoryData snapshot
+            current_time: Monotonic observation time in seconds (defaults to now)
+        """
+        current_time = current_time if current_time is not None else CLOCK.monotonic()
+        num_persons = min(data.num_persons, MAX_PERSONS)
+        
+        self.frames += 1
+        self.occupancy_sum += num_persons
+        self.occupancy_max = max(self.occupancy_max, num_persons)
+        
+        for i in range(num_persons):
+            person = data.persons[i]
+            action = POSE_CLASSES.get(person.pose_class, "unknown")
+            confidence = float(person.pose_confidence)
+            
+            counters = self.actions.setdefault(action, {
+                "count": 0,
+                "confidence_sum": 0.0,
+                "histogram": [0] * self.CONFIDENCE_BINS,
+                "persons": set()
+            })
+            counters["count"] += 1
+            counters["confidence_sum"] += confidence
+            bin_index = min(max(int(confidence * self.CONFIDENCE_BINS), 0), self.CONFIDENCE_BINS - 1)
+            counters["histogram"][bin_index] += 1
+            counters["persons"].add(int(person.person_id))
+            
+            # Track lifetime and pose transitions
+            track = self.tracks.get(person.person_id)
+            if track is None:
+                self.tracks[person.person_id] = {
+                    "first_seen": current_time,
+                    "last_seen": current_time,
+                    "pose_class": person.pose_class
+                }
+            else:
+                if track["pose_class"] != person.pose_class:
+                    previous = POSE_CLASSES.get(track["pose_class"], "unknown")
+                    key = f"{previous}->{action}"
+                    self.transitions[key] = self.transitions.get(key, 0) + 1
+                    track["pose_class"] = person.pose_class
+                track["last_seen"] = current_time
+        
+        self._close_stale_tracks(current_time)
+    
+    def record_raw_sent(self):
+        """Count a raw detection that was forwarded alongside the summaries"""
+        self.raw_detections_sent += 1
+    
+    def _close_stale_tracks(self, current_time):
+        """Close tracks that have not been seen recently and record their dwell time"""
+        ended = [pid for pid, track in self.tracks.items()
+                 if current_time - track["last_seen"] > self.track_timeout]
+        
+        for person_id in ended:
+            track = self.tracks.pop(person_id)
+            dwell_seconds = track["last_seen"] - track["first_seen"]
+            self.dwell["tracks_ended"] += 1
+            self.dwell["total_seconds"] += dwell_seconds
+            self.dwell["max_seconds"] = max(self.dwell["max_seconds"], dwell_seconds)
+    
+    def flush(self, current_time=None, force=False):
+        """
+        Close the current bucket if its interval has elapsed
+        
+        Args:
+            current_time: Monotonic time in seconds (defaults to now)
+            force: Close the bucket even if the interval has not elapsed
+        
+        Returns:
+            dict: Summary of the closed bucket, or None if it is still open or empty
+        """
+        current_time = current_time if current_time is not None else CLOCK.monotonic()
+        if not force and current_time - self.bucket_start < self.bucket_seconds:
+            return None
+        
+        self._close_stale_tracks(current_time)
+        
+        summary = None
+        if self.frames > 0:
+            actions = {}
+            for action, counters in self.actions.items():
+                actions[action] = {
+                    "count": counters["count"],
+                    "persons": len(counters["persons"]),
+                    "avg_confidence": counters["confidence_sum"] / counters["count"],
+                    "confidence_histogram": counters["histogram"]
+                }
+            
+            tracks_ended = self.dwell["tracks_ended"]
+            summary = {
+                "bucket_start": self.bucket_start_ms,
+                "bucket_end": CLOCK.epoch_ms(),
+                "bucket_seconds": self.bucket_seconds,
+                "frames": self.frames,
+                "occupancy": {
+                    "avg": self.occupancy_sum / self.frames,
+                    "max": self.occupancy_max
+                },
+                "actions": actions,
+                "transitions": dict(self.transitions),
+                "dwell": {
+                    "tracks_ended": tracks_ended,
+                    "avg_seconds": self.dwell["total_seconds"] / tracks_ended if tracks_ended else 0.0,
+                    "max_seconds": self.dwell["max_seconds"],
+                    "open_tracks": len(self.tracks)
+                },
+                "raw_detections_sent": self.raw_detections_sent
+            }
+        
+        self._reset_bucket(current_time)
+        return summary
+
+class PoseSummaryItem:
+    """Time-bucketed pose summary for server transmission with robot context"""
+    def __init__(self, summary, server_config):
+        self.summary = summary
+        self.unit_id = server_config.unit_id
+        self.unit_name = server_config.unit_name
+        self.rtsp_uris = server_config.rtsp_uris.copy()
+    
+    def to_server_format(self):
+        """Convert to server expected format: robot info + summary array"""
+        return {
+            "unit_id": self.unit_id,
+            "unit_name": self.unit_name,
+            "rtsp_uris": self.rtsp_uris,
+            "timestamp": CLOCK.epoch_ms(),
+            "summaries": [self.summary]
+        }
+
+# Per-track consolidation: one evolving record per person track
+class TrackAggregator:
+    def __init__(self, track_timeout=5.0, checkpoint_interval=30.0,
+                 trajectory_interval=1.0, max_trajectory_points=120):
+        """
+        Initialize per-person track state
+        
+        Args:
+            track_timeout: Seconds a person must be unseen before the track ends
+            checkpoint_interval: Seconds between interim records for long-lived tracks
+            trajectory_interval: Minimum seconds between stored bbox trajectory points
+            max_trajectory_points: Trajectory is decimated once it grows past this length
+        """
+        self.track_timeout = track_timeout
+        self.checkpoint_interval = checkpoint_interval
+        self.trajectory_interval = trajectory_interval
+        self.max_trajectory_points = max_trajectory_points
+        
+        # Structure: {person_id: track state dict}
+        self.tracks = {}
+        
+        self.stats = {
+            "tracks_started": 0,
+            "tracks_ended": 0,
+            "checkpoints": 0
+        }
+    
+    def record_frame(self, data, current_time=None):
+        """
+        Fold every person in an updated shared memory frame into its track
+        
+        Args:
+            data: SharedMemoryData snapshot
+            current_time: Monotonic time in seconds used for timeouts (defaults to now)
+        """
+        current_time = current_time if current_time is not None else CLOCK.monotonic()
+        frame_width = data.frame_width or 1
+        frame_height = data.frame_height or 1
+        
+        for i in range(min(data.num_persons, MAX_PERSONS)):
+            person = data.persons[i]
+            seen_at = person.timestamp_us / 1000000.0
+            action = POSE_CLASSES.get(person.pose_class, "unknown")
+            confidence = float(person.pose_confidence)
+            
+            track = self.tracks.get(person.person_id)
+            if track is None:
+                track = {
+                    "track_id": str(uuid.uuid4()),
+                    "person_id": int(person.person_id),
+                    "first_seen": seen_at,
+                    "first_frame": int(person.frame_number),
+                    "observations": 0,
+                    "trajectory": [],
+                    "trajectory_interval": self.trajectory_interval,
+                    "timeline": [],
+                    "best_score": -1.0,
+                    "best_detection": None,
+                    "thumbnail_dirty": False,
+                    "last_emit": current_time
+                }
+                self.tracks[person.person_id] = track
+                self.stats["tracks_started"] += 1
+            
+            track["last_seen"] = seen_at
+            track["last_frame"] = int(person.frame_number)
+            track["last_update"] = current_time
+            track["observations"] += 1
+            
+            # Downsampled bbox trajectory (normalized to the frame)
+            trajectory = track["trajectory"]
+            if not trajectory or seen_at - trajectory[-1]["t"] >= track["trajectory_interval"]:
+                trajectory.append({
+                    "t": seen_at,
+                    "x": person.bbox.left / frame_width,
+                    "y": person.bbox.top / frame_height,
+                    "width": person.bbox.width / frame_width,
+                    "height": person.bbox.height / frame_height
+                })
+                if len(trajectory) > self.max_trajectory_points:
+                    # Keep every other point and halve the sampling rate from here on
+                    track["trajectory"] = trajectory[::2]
+                    track["trajectory_interval"] *= 2
+            
+            # Pose class timeline as contiguous segments
+            timeline = track["timeline"]
+            if timeline and timeline[-1]["action"] == action:
+                segment = timeline[-1]
+                segment["end"] = seen_at
+                segment["frames"] += 1
+                segment["confidence_sum"] += confidence
+            else:
+                timeline.append({
+                    "action": action,
+                    "start": seen_at,
+                    "end": seen_at,
+                    "frames": 1,
+                    "confidence_sum": confidence
+                })
+            
+            # Best-quality thumbnail by bbox area x confidence
+            score = (person.bbox.width * person.bbox.height) * confidence
+            if person.has_thumbnail and score > track["best_score"]:
+                track["best_score"] = score
+                track["best_detection"] = PersonDetection.from_buffer_copy(person)
+                track["thumbnail_dirty"] = True
+    
+    def collect(self, current_time=None, force=False):
+        """
+        Collect records for ended tracks and checkpoints of long-lived ones
+        
+        Args:
+            current_time: Monotonic time in seconds (defaults to now)
+            force: End every open track (used on shutdown)
+            
+        Returns:
+            list: (record, best_detection) tuples; best_detection is None when the
+                  thumbnail has not improved since the last record for the track
+        """
+        current_time = current_time if current_time is not None else CLOCK.monotonic()
+        records = []
+        
+        for person_id in list(self.tracks.keys()):
+            track = self.tracks[person_id]
+            ended = force or current_time - track["last_update"] > self.track_timeout
+            checkpoint = current_time - track["last_emit"] >= self.checkpoint_interval
+            
+            if not ended and not checkpoint:
+                continue
+            
+            best_detection = track["best_detection"] if track["thumbnail_dirty"] else None
+            records.append((self._build_record(track, "ended" if ended else "active"), best_detection))
+            track["thumbnail_dirty"] = False
+            track["last_emit"] = current_time
+            
+            if ended:
+                del self.tracks[person_id]
+                self.stats["tracks_ended"] += 1
+            else:
+                self.stats["checkpoints"] += 1
+        
+        return records
+    
+    def _build_record(self, track, status):
+        """Convert internal track state to the wire format"""
+        timeline = []
+        action_frames = {}
+        for segment in track["timeline"]:
+            timeline.append({
+                "action": segment["action"],
+                "start": CLOCK.epoch_ms(segment["start"]),
+                "end": CLOCK.epoch_ms(segment["end"]),
+                "frames": segment["frames"],
+                "avg_confidence": segment["confidence_sum"] / segment["frames"]
+            })
+            action_frames[segment["action"]] = action_frames.get(segment["action"], 0) + segment["frames"]
+        
+        trajectory = [{
+            "timestamp": CLOCK.epoch_ms(point["t"]),
+            "x": point["x"],
+            "y": point["y"],
+            "width": point["width"],
+            "height": point["height"]
+        } for point in track["trajectory"]]
+        
+        return {
+            "track_id": track["track_id"],
+            "person_id": track["person_id"],
+            "status": status,
+            "first_seen": CLOCK.epoch_ms(track["first_seen"]),
+            "last_seen": CLOCK.epoch_ms(track["last_seen"]),
+            "duration_seconds": track["last_seen"] - track["first_seen"],
+            "first_frame": track["first_frame"],
+            "last_frame": track["last_frame"],
+            "observations": track["observations"],
+            "dominant_action": max(action_frames, key=action_frames.get) if action_frames else "unknown",
+            "pose_timeline": timeline,
+            "trajectory": trajectory
+        }
+    
+    def get_stats(self):
+        """Get track statistics"""
+        stats = self.stats.copy()
+        stats["open_tracks"] = len(self.tracks)
+        return stats
+
+class PersonTrackItem:
+    """Consolidated person track record for server transmission with robot context"""
+    def __init__(self, record, server_config, thumbnail=None):
+        self.record = record
+        # Only attach a thumbnail when it improved since the last record
+        if thumbnail:
+            self.record["best_thumbnail"] = thumbnail
+        self.unit_id = server_config.unit_id
+        self.unit_name = server_config.unit_name
+        self.rtsp_uris = server_config.rtsp_uris.copy()
+    
+    def attach_thumbnail(self, thumbnail):
+        """Set the encoded best thumbnail once it is available"""
+        if thumbnail:
+            self.record["best_thumbnail"] = thumbnail
+    
+    def to_server_format(self):
+        """Convert to server expected format: robot info + track array"""
+        return {
+            "unit_id": self.unit_id,
+            "unit_name": self.unit_name,
+            "rtsp_uris": self.rtsp_uris,
+            "timestamp": CLOCK.epoch_ms(),
+            "tracks": [self.record]
+        }
+
+# Adaptive inspection rate driven by scene activity
+class AdaptiveScheduler:
+    def __init__(self, active_interval=0.01, idle_interval=0.5, backoff=2.0):
+        """
+        Initialize scheduler that slows frame inspection while nothing changes
+        
+        Args:
+            active_interval: Loop interval in seconds while the scene is changing (full rate)
+            idle_interval: Longest loop interval in seconds while the scene is stable
+            backoff: Factor the interval grows by per stable inspection
+        """
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.backoff = backoff
+        self.interval = active_interval
+        
+        # Last seen pose class per track
+        # Structure: {person_id: pose_class}
+        self.last_poses = {}
+        
+        self.stats = {
+            "inspections": 0,
+            "idle_inspections": 0,
+            "wakeups": 0
+        }
+    
+    def update(self, data, duplicate_filter=None, current_time=None):
+        """
+        Inspect a frame and adjust the loop interval
+        
+        The scene is stable when no persons are present, or when every tracked
+        person keeps the same pose class and is inside that class's cooldown.
+        New tracks, class changes or tracks leaving cooldown restore full rate.
+        
+        Args:
+            data: SharedMemoryData snapshot
+            duplicate_filter: DuplicateFilter used to check cooldowns (optional)
+            current_time: Monotonic time in seconds (defaults to now)
+            
+        Returns:
+            float: Seconds to sleep before the next inspection
+        """
+        current_time = current_time if current_time is not None else CLOCK.monotonic()
+        num_persons = min(data.num_persons, MAX_PERSONS)
+        
+        poses = {}
+        stable = True
+        for i in range(num_persons):
+            person = data.persons[i]
+            poses[person.person_id] = person.pose_class
+            
+            if self.last_poses.get(person.person_id) != person.pose_class:
+                stable = False
+            elif duplicate_filter and not duplicate_filter.is_in_cooldown(
+                    person.person_id, person.pose_class, current_time):
+                stable = False
+        
+        # Tracks that left the scene also count as a change
+        if set(poses) != set(self.last_poses):
+            stable = False
+        
+        self.last_poses = poses
+        self.stats["inspections"] += 1
+        
+        if stable:
+            self.stats["idle_inspections"] += 1
+            self.interval = min(self.interval * self.backoff, self.idle_interval)
+        else:
+            if self.interval > self.active_interval:
+                self.stats["wakeups"] += 1
+            self.interval = self.active_interval
+        
+        return self.interval
+    
+    @property
+    def is_idle(self):
+        """True while the scheduler is running below full rate"""
+        return self.interval > self.active_interval
+    
+    def build_control(self, data, duplicate_filter=None, send_thumbnails=True, current_time=None, lookahead=1.0):
+        """
+        Build the control block telling the pipeline which thumbnails are not needed
+        
+        Args:
+            data: SharedMemoryData snapshot the decision is based on
+            duplicate_filter: DuplicateFilter used to check cooldowns (optional)
+            send_thumbnails: False disables thumbnail capture entirely
+            current_time: Monotonic time in seconds (defaults to now)
+            lookahead: Only skip tracks still in cooldown this many seconds from now,
+                so a cooldown expiring before the next frame still gets a thumbnail
+            
+        Returns:
+            MonitorControl: Control block ready to be written to shared memory
+        """
+        current_time = current_time if current_time is not None else CLOCK.monotonic()
+        control = MonitorControl()
+        control.magic = MONITOR_CONTROL_MAGIC
+        # The pipeline compares this against its own CLOCK_MONOTONIC
+        control.updated_us = int(current_time * 1000000)
+        
+        if not send_thumbnails:
+            control.flags = MONITOR_FLAG_NO_THUMBNAILS
+            return control
+        
+        if not duplicate_filter:
+            return control
+        
+        num_skip = 0
+        for i in range(min(data.num_persons, MAX_PERSONS)):
+            person = data.persons[i]
+            if duplicate_filter.is_in_cooldown(person.person_id, person.pose_class, current_time + lookahead):
+                control.skip_person_ids[num_skip] = person.person_id
+                control.skip_pose_classes[num_skip] = person.pose_class
+                num_skip += 1
+        control.num_skip = num_skip
+        return control
+    
+    def get_stats(self):
+        """Get scheduling statistics"""
+        stats = self.stats.copy()
+        stats["interval"] = self.interval
+        stats["idle"] = self.is_idle
+        return stats
+
 # Server communication configuration
 class ServerConfig:
     def __init__(self, server_url=None, unit_id=None, unit_name=None, rtsp_uris=None, 
-                 send_thumbnails=True, send_interval=1.0, batch_size=10, retry_attempts=3, timeout=5.0):
+                 send_thumbnails=True, send_interval=1.0, batch_size=10, retry_attempts=5, timeout=5.0,
+                 aggregation_mode=False, summary_interval=60.0, raw_sample_every=100,
+                 track_mode=False, track_checkpoint_interval=30.0, max_in_flight=1, retry_backoff=0.5):
         self.server_url = server_url or "https://corabackend.onrender.com/api/detections"
         self.unit_id = unit_id or "JETSON_001"
         self.unit_name = unit_name or "DeepStream Pose Classifier"
@@ -172,7 +796,19 @@ class ServerConfig:
         self.send_interval = send_interval
         self.batch_size = batch_size
         self.retry_attempts = retry_attempts
+        self.retry_backoff = retry_backoff
         self.timeout = timeout
+        # Uploads sent concurrently; safe because the server dedupes retried packages
+        self.max_in_flight = max(1, int(max_in_flight))
+        # Aggregation mode: upload per-bucket summaries plus every Nth raw detection
+        self.aggregation_mode = aggregation_mode
+        self.summary_interval = summary_interval
+        self.raw_sample_every = max(1, int(raw_sample_every))
+        self.summary_url = self.server_url.rstrip('/') + "/summaries"
+        # Track mode: upload one consolidated record per person track instead of snapshots
+        self.track_mode = track_mode
+        self.track_checkpoint_interval = track_checkpoint_interval
+        self.tracks_url = self.server_url.rstrip('/') + "/tracks"
 
 class Joint3D(Structure):
     _fields_ = [
@@ -222,7 +858,21 @@ class PersonDetection(Structure):
         ("thumbnail_height", c_uint32),
         ("thumbnail_size", c_uint32),
         ("thumbnail_data", c_uint8 * (320 * 240 * 3)),  # THUMBNAIL_MAX_SIZE matching C structure
-        ("reserved", c_uint8 * 64)
+        ("reserved", c_uint8 * 32)
+    ]
+
+# Monitor -> pipeline control block (must match MonitorControl in shared_memory.h)
+MONITOR_CONTROL_MAGIC = 0x434F5241  # "CORA"
+MONITOR_FLAG_NO_THUMBNAILS = 0x1
+
+class MonitorControl(Structure):
+    _fields_ = [
+        ("magic", c_uint32),
+        ("flags", c_uint32),
+        ("updated_us", c_uint64),
+        ("num_skip", c_uint32),
+        ("skip_person_ids", c_uint32 * MAX_PERSONS),
+        ("skip_pose_classes", c_uint32 * MAX_PERSONS)
     ]
 
 class SharedMemoryData(Structure):
@@ -238,13 +888,110 @@ class SharedMemoryData(Structure):
         ("persons", PersonDetection * MAX_PERSONS),
         ("total_frames_processed", c_uint64),
         ("total_persons_detected", c_uint32),
-        ("reserved", c_uint8 * 256)
+        ("monitor_control", MonitorControl),
+        ("reserved", c_uint8 * (1024 - sizeof(MonitorControl)))
     ]
 
+# Thumbnail encoding (runs in the monitor process or in encoder pool workers)
+def extract_thumbnail_bytes(person_detection):
+    """Copy the raw native thumbnail out of a PersonDetection, or None if it has none"""
+    if not person_detection.has_thumbnail or person_detection.thumbnail_size == 0:
+        return None
+    size = min(person_detection.thumbnail_size, sizeof(person_detection.thumbnail_data))
+    return string_at(addressof(person_detection.thumbnail_data), size)
+
+def encode_thumbnail(thumbnail_bytes):
+    """Convert a raw native thumbnail (header + pixels) into a base64 JPEG"""
+    try:
+        # Parse native format header: [format][width][height][crop_x][crop_y][crop_w][crop_h][scale][data...]
+        if len(thumbnail_bytes) < 32:  # Need at least header size
+            print(f"Thumbnail data too small: {len(thumbnail_bytes)} bytes")
+            return None
+        
+        # Unpack header (8 uint32 values)
+        header = struct.unpack('8I', thumbnail_bytes[:32])
+        color_format, width, height, crop_x, crop_y, crop_w, crop_h, scale = header
+        
+        # Extract image data after header
+        image_data = thumbnail_bytes[32:]
+        
+        print(f"Processing native thumbnail: format={color_format}, {width}x{height}, crop=({crop_x},{crop_y},{crop_w},{crop_h}), scale={scale}, data_size={len(image_data)}")
+        
+        # Convert native format to displayable format using OpenCV
+        if OPENCV_AVAILABLE:
+            try:
+                # Handle different native formats
+                if color_format == 33:  # Format 33 (unknown format - treat as grayscale or RGB)
+                    # Calculate bytes per pixel based on data size
+                    total_pixels = width * height
+                    if total_pixels == 0:
+                        print("Invalid image dimensions")
+                        return None
+                    
+                    bytes_per_pixel = len(image_data) // total_pixels
+                    
+                    if bytes_per_pixel == 1:  # Grayscale
+                        gray_array = np.frombuffer(image_data[:total_pixels], dtype=np.uint8)
+                        gray_image = gray_array.reshape((height, width))
+                        # Convert grayscale to BGR for OpenCV
+                        bgr_image = cv2.cvtColor(gray_image, cv2.COLOR_GRAY2BGR)
+                    elif bytes_per_pixel >= 3:  # RGB or similar
+                        # Take first 3 channels as RGB
+                        rgb_size = width * height * 3
+                        if len(image_data) >= rgb_size:
+                            rgb_array = np.frombuffer(image_data[:rgb_size], dtype=np.uint8)
+                            rgb_image = rgb_array.reshape((height, width, 3))
+                            # Convert RGB to BGR for OpenCV
+                            bgr_image = cv2.cvtColor(rgb_image, cv2.COLOR_RGB2BGR)
+                        else:
+                            print(f"Insufficient RGB data: {len(image_data)} < {rgb_size}")
+                            return None
+                    else:
+                        print(f"Unsupported bytes per pixel: {bytes_per_pixel}")
+                        return None
+                
+                else:
+                    # For other known formats, assume RGB for now
+                    expected_size = width * height * 3
+                    if len(image_data) >= expected_size:
+                        rgb_array = np.frombuffer(image_data[:expected_size], dtype=np.uint8)
+                        rgb_image = rgb_array.reshape((height, width, 3))
+                        bgr_image = cv2.cvtColor(rgb_image, cv2.COLOR_RGB2BGR)
+                    else:
+                        print(f"Insufficient image data for format {color_format}: {len(image_data)} < {expected_size}")
+                        return None
+                
+                # Encode image as JPEG using OpenCV
+                encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 85]
+                result, encoded_img = cv2.imencode('.jpg', bgr_image, encode_param)
+                
+                if result:
+                    # Convert to base64
+                    jpeg_bytes = encoded_img.tobytes()
+                    print(f"Successfully converted native thumbnail to JPEG: {len(jpeg_bytes)} bytes")
+                    return base64.b64encode(jpeg_bytes).decode('utf-8')
+                else:
+                    print("Failed to encode image with OpenCV")
+                    # Fall through to raw data encoding
+            
+            except Exception as e:
+                print(f"Error converting native thumbnail to JPEG with OpenCV: {e}")
+                # Fall through to raw data encoding
+        
+        # Fallback: encode raw data (will not display properly but won't crash)
+        print("Using raw data encoding for native thumbnail (OpenCV encoding not available)")
+        return base64.b64encode(image_data).decode('utf-8')
+    
+    except Exception as e:
+        print(f"Error processing native thumbnail: {e}")
+        return None
+
 class DetectionItem:
     """Single detection item for server transmission with robot context"""
     def __init__(self, person_detection, server_config, thumbnail=None):
-        self.timestamp = datetime.fromtimestamp(person_detection.timestamp_us / 1000000.0).isoformat()
+        # Idempotency key: fixed for the item's lifetime, so every retry names the same upload
+        self.package_id = str(uuid.uuid4())
+        self.timestamp = CLOCK.pipeline_ms(person_detection.timestamp_us)
         self.action_type = POSE_CLASSES.get(person_detection.pose_class, "unknown")
         self.confidence = float(person_detection.pose_confidence)
         self.person_id = int(person_detection.person_id)
@@ -279,6 +1026,10 @@ class DetectionItem:
             class_name = POSE_CLASSES.get(i, f"class_{i}")
             self.pose_scores[class_name] = float(person_detection.pose_scores[i])
     
+    def attach_thumbnail(self, thumbnail):
+        """Set the encoded thumbnail once it is available"""
+        self.thumbnail = thumbnail if thumbnail else None
+    
     def normalize_bbox(self, frame_width, frame_height):
         """Normalize bounding box coordinates to 0.0-1.0 range"""
         if frame_width > 0 and frame_height > 0:
@@ -290,11 +1041,14 @@ class DetectionItem:
     def to_server_format(self):
         """Convert to server expected format: robot info + single detection"""
         return {
+            # Lets the server recognise a retried upload
+            "package_id": self.package_id,
+            
             # Robot context - needed to find/create robot
             "unit_id": self.unit_id,
             "unit_name": self.unit_name,
             "rtsp_uris": self.rtsp_uris,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": CLOCK.epoch_ms(),
             
             # Single detection in array format (server expects array)
             "detections": [{
@@ -310,8 +1064,371 @@ class DetectionItem:
             }]
         }
 
+# Responses worth retrying; other errors mean the payload itself was rejected
+RETRYABLE_STATUS = (408, 429, 500, 502, 503, 504)
+# Longest Retry-After honoured, so a confused server cannot park an upload thread for long
+MAX_RETRY_AFTER = 60.0
+
+def _retry_after_seconds(response):
+    """Seconds the server asked to wait (Retry-After as seconds or an HTTP date), or None"""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# HTTP upload of queued items (shared by the send threads and the uploader process)
+class DetectionUploader:
+    def __init__(self, server_config, stats=None, stats_lock=None):
+        """
+        Initialize the uploader
+        
+        Args:
+            server_config: ServerConfig with URLs, retry and timeout settings
+            stats: Statistics dict to update (a fresh one is created if omitted)
+            stats_lock: Lock guarding stats when several uploaders share it
+        """
+        self.server_config = server_config
+        self.stats_lock = stats_lock or threading.Lock()
+        self.stats = stats if stats is not None else {
+            "sent_packages": 0,
+            "send_errors": 0,
+            "sent_summaries": 0,
+            "sent_tracks": 0,
+            "last_send_time": None
+        }
+        # Keep-alive connection reuse across uploads (one session per uploader thread)
+        self.session = requests.Session()
+    
+    def send(self, item):
+        """Send any queued item to its endpoint"""
+        if isinstance(item, PoseSummaryItem):
+            self._send_summary(item)
+        elif isinstance(item, PersonTrackItem):
+            self._send_track(item)
+        else:
+            self._send_individual_detection(item)
+    
+    def _count(self, key, amount=1):
+        with self.stats_lock:
+            self.stats[key] += amount
+    
+    def _retry_delay(self, attempt, response=None):
+        """
+        Delay before the next attempt: the server's Retry-After when it sent one (backpressure
+        from a full ingest queue or the rate limiter), otherwise exponential backoff capped at 10 seconds
+        """
+        retry_after = _retry_after_seconds(response)
+        if retry_after is not None:
+            return min(retry_after, MAX_RETRY_AFTER)
+        return min(self.server_config.retry_backoff * (2 ** attempt), 10.0)
+    
+    def _post(self, url, payload, description):
+        """
+        POST a payload with retries and backoff
+        
+        Uploads carry their own idempotency keys (package_id, summary bucket, track_id),
+        so repeating a request whose response was lost never stores data twice.
+        
+        Returns:
+            The successful response, or None once all attempts failed
+        """
+        for attempt in range(self.server_config.retry_attempts):
+            response = None
+            try:
+                request_sent = time.time()
+                response = self.session.post(
+                    url,
+                    json=payload,  # Use json parameter for proper content-type
+                    timeout=self.server_config.timeout
+                )
+                CLOCK.update_from_response(response, request_sent, time.time())
+                
+                if response.status_code in [200, 201, 202]:  # 202: queued by the server for a batched write
+                    self.stats["last_send_time"] = datetime.now().isoformat()
+                    return response
+                
+                if response.status_code == 429:
+                    print(f"Server busy for {description} (attempt {attempt + 1}), "
+                          f"retrying in {self._retry_delay(attempt, response):.1f}s")
+                else:
+                    print(f"Server responded with status {response.status_code}: {response.text}")
+                if response.status_code not in RETRYABLE_STATUS:
+                    break  # The server would reject the same payload again
+            
+            except requests.exceptions.RequestException as e:
+                print(f"Network error for {description} (attempt {attempt + 1}): {e}")
+            
+            if attempt < self.server_config.retry_attempts - 1:
+                time.sleep(self._retry_delay(attempt, response))
+        
+        self._count("send_errors")
+        return None
+    
+    def _send_individual_detection(self, detection_item):
+        """Send individual detection to server with robot context"""
+        try:
+            response = self._post(self.server_config.server_url, detection_item.to_server_format(),
+                                  f"detection {detection_item.unit_id}-{detection_item.person_id}")
+            if response is not None:
+                self._count("sent_packages")
+                try:
+                    data = response.json().get("data", {})
+                except ValueError:
+                    data = {}
+                note = " [already stored]" if data.get("duplicate") else " [queued]" if data.get("queued") else ""
+                print(f"Successfully sent detection: Robot {detection_item.unit_id} - Person {detection_item.person_id} - "
+                      f"{detection_item.action_type} (conf: {detection_item.confidence:.3f}){note}")
+        
+        except Exception as e:
+            print(f"Error sending individual detection: {e}")
+            self._count("send_errors")
+    
+    def _post_with_retries(self, url, payload, description):
+        """POST a payload to the server with retries; returns True on success"""
+        return self._post(url, payload, description) is not None
+    
+    def _send_summary(self, summary_item):
+        """Send a time-bucketed pose summary to the server"""
+        try:
+            summary = summary_item.summary
+            if self._post_with_retries(self.server_config.summary_url, summary_item.to_server_format(),
+                                       f"summary {summary_item.unit_id}"):
+                self._count("sent_summaries")
+                print(f"Successfully sent summary: Robot {summary_item.unit_id} - "
+                      f"bucket {summary['bucket_start']} ({summary['frames']} frames)")
+        except Exception as e:
+            print(f"Error sending summary: {e}")
+            self._count("send_errors")
+    
+    def _send_track(self, track_item):
+        """Send a consolidated person track record to the server"""
+        try:
+            record = track_item.record
+            if self._post_with_retries(self.server_config.tracks_url, track_item.to_server_format(),
+                                       f"track {track_item.unit_id}-{record['person_id']}"):
+                self._count("sent_tracks")
+                print(f"Successfully sent track: Robot {track_item.unit_id} - Person {record['person_id']} - "
+                      f"{record['status']} ({record['duration_seconds']:.1f}s, {record['dominant_action']})")
+        except Exception as e:
+            print(f"Error sending track: {e}")
+            self._count("send_errors")
+
+# Multi-process upload pipeline: the monitor process reads shared memory and filters,
+# an encoder pool turns raw thumbnails into JPEG and an uploader process does HTTP
+WORKER_COUNTERS = ("sent_packages", "send_errors", "sent_summaries", "sent_tracks",
+                   "encoded_thumbnails", "dropped_items", "worker_restarts")
+
+def _add_counter(counters, key, amount=1):
+    with counters[key].get_lock():
+        counters[key].value += amount
+
+def _reset_worker_signals():
+    """Workers ignore Ctrl+C (the monitor coordinates shutdown) but must die on terminate()"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+def _encoder_worker(encode_queue, upload_queue, counters):
+    """Encoder pool process: attach encoded thumbnails and pass items to the uploader"""
+    _reset_worker_signals()
+    if OPENCV_AVAILABLE:
+        cv2.setNumThreads(1)  # One core per encoder process
+    
+    while True:
+        entry = encode_queue.get()
+        if entry is None:
+            break
+        item, thumbnail_bytes = entry
+        thumbnail = encode_thumbnail(thumbnail_bytes)
+        if thumbnail:
+            item.attach_thumbnail(thumbnail)
+            _add_counter(counters, "encoded_thumbnails")
+        upload_queue.put(item)
+
+def _upload_items(upload_queue, server_config, counters, last_send_time):
+    """Send items from the queue until a shutdown marker arrives"""
+    uploader = DetectionUploader(server_config)
+    
+    while True:
+        item = upload_queue.get()
+        if item is None:
+            break
+        before = dict(uploader.stats)
+        uploader.send(item)
+        for key in ("sent_packages", "send_errors", "sent_summaries", "sent_tracks"):
+            delta = uploader.stats[key] - before[key]
+            if delta:
+                _add_counter(counters, key, delta)
+        if uploader.stats["last_send_time"] != before["last_send_time"]:
+            last_send_time.value = time.time()
+
+def _uploader_worker(upload_queue, server_config, counters, last_send_time):
+    """Uploader process: send items with retries (max_in_flight at a time) and publish counters to the monitor"""
+    _reset_worker_signals()
+    threads = [threading.Thread(target=_upload_items, args=(upload_queue, server_config, counters, last_send_time),
+                                daemon=True)
+               for _ in range(server_config.max_in_flight)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+class WorkerPool:
+    def __init__(self, server_config, encoder_count=2, queue_size=1000, restart_limit=10):
+        """
+        Initialize the encoder pool and uploader processes (started by start())
+        
+        Args:
+            server_config: ServerConfig passed to the uploader process
+            encoder_count: Number of thumbnail encoder processes
+            queue_size: Bound of each inter-process queue; items are dropped when full
+            restart_limit: Restarts allowed per worker before it is given up on
+        """
+        self.server_config = server_config
+        self.encoder_count = max(1, int(encoder_count))
+        self.restart_limit = restart_limit
+        
+        # multiprocessing.Queue is a pipe plus feeder thread; items are pickled once per hop
+        self.encode_queue = multiprocessing.Queue(maxsize=queue_size)
+        self.upload_queue = multiprocessing.Queue(maxsize=queue_size)
+        self.counters = {key: multiprocessing.Value('L', 0) for key in WORKER_COUNTERS}
+        self.last_send_time = multiprocessing.Value('d', 0.0)
+        
+        self.encoders = [None] * self.encoder_count
+        self.uploader = None
+        self.restarts = {}
+        self.stopping = False
+    
+    def _start_encoder(self, index):
+        process = multiprocessing.Process(
+            target=_encoder_worker,
+            args=(self.encode_queue, self.upload_queue, self.counters),
+            name=f"pose-encoder-{index}",
+            daemon=True
+        )
+        process.start()
+        self.encoders[index] = process
+    
+    def _start_uploader(self):
+        self.uploader = multiprocessing.Process(
+            target=_uploader_worker,
+            args=(self.upload_queue, self.server_config, self.counters, self.last_send_time),
+            name="pose-uploader",
+            daemon=True
+        )
+        self.uploader.start()
+    
+    def start(self):
+        """Start the encoder and uploader processes"""
+        for index in range(self.encoder_count):
+            self._start_encoder(index)
+        self._start_uploader()
+        print(f"Started {self.encoder_count} encoder process(es) and 1 uploader process")
+    
+    def submit(self, item, thumbnail_bytes=None):
+        """
+        Hand an item to the workers without blocking the reader
+        
+        Args:
+            item: DetectionItem, PersonTrackItem or PoseSummaryItem
+            thumbnail_bytes: Raw native thumbnail to encode, or None to upload directly
+        
+        Returns:
+            bool: False if the queue was full and the item was dropped
+        """
+        try:
+            if thumbnail_bytes:
+                self.encode_queue.put_nowait((item, thumbnail_bytes))
+            else:
+                self.upload_queue.put_nowait(item)
+            return True
+        except queue.Full:
+            _add_counter(self.counters, "dropped_items")
+            return False
+    
+    def supervise(self):
+        """Restart workers that exited unexpectedly; call periodically from the reader loop"""
+        if self.stopping:
+            return
+        
+        for index, process in enumerate(self.encoders):
+            if process is not None and not process.is_alive():
+                if self._record_restart(process):
+                    self._start_encoder(index)
+                else:
+                    self.encoders[index] = None
+        
+        if self.uploader is not None and not self.uploader.is_alive():
+            if self._record_restart(self.uploader):
+                self._start_uploader()
+            else:
+                self.uploader = None
+    
+    def _record_restart(self, process):
+        """Count a crash and decide whether the worker may be restarted"""
+        count = self.restarts.get(process.name, 0) + 1
+        self.restarts[process.name] = count
+        _add_counter(self.counters, "worker_restarts")
+        if count > self.restart_limit:
+            print(f"Worker {process.name} exited with code {process.exitcode}; restart limit reached, giving up")
+            return False
+        print(f"Worker {process.name} exited with code {process.exitcode}; restarting ({count}/{self.restart_limit})")
+        return True
+    
+    def stop(self, timeout=10.0):
+        """Drain both queues and stop the workers, terminating any that do not exit in time"""
+        self.stopping = True
+        deadline = CLOCK.monotonic() + timeout
+        
+        # Encoders finish queued thumbnails first, then the uploader sends what they produced
+        encoders = [process for process in self.encoders if process is not None and process.is_alive()]
+        self._put_sentinels(self.encode_queue, len(encoders), deadline)
+        for process in encoders:
+            process.join(max(0.1, deadline - CLOCK.monotonic()))
+        
+        if self.uploader is not None and self.uploader.is_alive():
+            # One marker per upload thread in the uploader process
+            self._put_sentinels(self.upload_queue, self.server_config.max_in_flight, deadline)
+            self.uploader.join(max(0.1, deadline - CLOCK.monotonic()))
+        
+        terminated = False
+        for process in encoders + [self.uploader]:
+            if process is not None and process.is_alive():
+                print(f"Worker {process.name} did not stop in time, terminating")
+                process.terminate()
+                process.join(1.0)
+                terminated = True
+        
+        # Items left in the pipes are lost either way; do not block interpreter exit on them
+        if terminated:
+            self.encode_queue.cancel_join_thread()
+            self.upload_queue.cancel_join_thread()
+    
+    def _put_sentinels(self, target_queue, count, deadline):
+        """Queue shutdown markers, giving up at the deadline if the queue stays full"""
+        for _ in range(count):
+            try:
+                target_queue.put(None, timeout=max(0.1, deadline - CLOCK.monotonic()))
+            except queue.Full:
+                return
+    
+    def get_stats(self):
+        """Get counters published by the worker processes"""
+        stats = {key: counter.value for key, counter in self.counters.items()}
+        stats["last_send_time"] = (datetime.fromtimestamp(self.last_send_time.value).isoformat()
+                                   if self.last_send_time.value else None)
+        stats["alive_encoders"] = sum(1 for p in self.encoders if p is not None and p.is_alive())
+        stats["uploader_alive"] = bool(self.uploader is not None and self.uploader.is_alive())
+        return stats
+
 class PoseMonitor:
-    def __init__(self, server_config=None):
+    def __init__(self, server_config=None, adaptive_sampling=False, idle_interval=0.5, workers=0, queue_size=1000):
         self.running = True
         self.shm_id = None
         self.shm_data = None
@@ -320,7 +1437,7 @@ class PoseMonitor:
         # Server communication setup
         self.server_config = server_config
         self.detection_queue = queue.Queue() if server_config else None
-        self.send_thread = None
+        self.send_threads = []
         
         # Statistics
         self.stats = {
@@ -328,12 +1445,35 @@ class PoseMonitor:
             "sent_packages": 0,
             "send_errors": 0,
             "filtered_duplicates": 0,
+            "sampled_out": 0,
+            "sent_summaries": 0,
+            "sent_tracks": 0,
             "last_send_time": None
         }
+        self.uploader = DetectionUploader(server_config, self.stats) if server_config else None
+        
+        # Optional encoder/uploader processes so encoding and HTTP never stall shared memory reads
+        self.worker_pool = None
+        if server_config and workers > 0:
+            self.worker_pool = WorkerPool(server_config, encoder_count=workers, queue_size=queue_size)
         
         # Duplicate filtering with per-class cooldowns
         self.duplicate_filter = DuplicateFilter()
         
+        # Adaptive frame sampling driven by scene activity
+        self.scheduler = AdaptiveScheduler(idle_interval=idle_interval) if adaptive_sampling else None
+        
+        # Edge-side aggregation (only used in aggregation mode)
+        self.aggregator = None
+        self.raw_sample_counter = 0
+        if server_config and server_config.aggregation_mode:
+            self.aggregator = PoseAggregator(bucket_seconds=server_config.summary_interval)
+        
+        # Track-level record consolidation (only used in track mode)
+        self.track_aggregator = None
+        if server_config and server_config.track_mode:
+            self.track_aggregator = TrackAggregator(checkpoint_interval=server_config.track_checkpoint_interval)
+        
         # Set up signal handler for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -379,6 +1519,23 @@ class PoseMonitor:
             print(f"Error reading shared memory: {e}")
             return None
     
+    def read_sequence_id(self):
+        """Read only the sequence counter from shared memory"""
+        try:
+            raw = self.shm.read(sizeof(c_uint32), SharedMemoryData.sequence_id.offset)
+            return struct.unpack('I', raw)[0]
+        except Exception:
+            return None
+    
+    def write_monitor_control(self, control):
+        """Write the monitor control block that the pipeline reads before capturing thumbnails"""
+        try:
+            self.shm.write(bytes(control), SharedMemoryData.monitor_control.offset)
+            return True
+        except Exception as e:
+            print(f"Error writing monitor control block: {e}")
+            return False
+    
     def print_detection_summary(self, data):
         """Print a summary of detection data"""
         print(f"\n=== Frame {data.frame_number} (Seq: {data.sequence_id}) ===")
@@ -476,10 +1633,24 @@ class PoseMonitor:
             self.start_server_communication()
         
         last_update_time = 0
+        last_supervise_time = 0
         
         while self.running:
             try:
-                current_time = time.time()
+                current_time = CLOCK.monotonic()
+                loop_interval = self.scheduler.interval if self.scheduler else 0.01
+                
+                # Restart crashed encoder/uploader processes, also while the pipeline is idle
+                # (flush_aggregates keeps queueing summaries and track records for them)
+                if self.worker_pool and current_time - last_supervise_time >= 1.0:
+                    self.worker_pool.supervise()
+                    last_supervise_time = current_time
+                
+                # Peek at the sequence counter so unchanged frames skip the full segment copy
+                if self.read_sequence_id() == self.last_sequence_id:
+                    self.flush_aggregates()
+                    time.sleep(loop_interval)
+                    continue
                 
                 # Read detection data
                 data = self.read_detection_data()
@@ -490,15 +1661,7 @@ class PoseMonitor:
                 # Check if data has been updated
                 if data.sequence_id != self.last_sequence_id:
                     self.last_sequence_id = data.sequence_id
-                    
-                    # Send detections to server if configured
-                    if self.server_config and data.num_persons > 0:
-                        for i in range(data.num_persons):
-                            person = data.persons[i]
-                            # Generate per-object thumbnail from native format data
-                            thumbnail_data = self.generate_thumbnail(person)
-                            # Add detection to server queue with per-object thumbnail data
-                            self.add_detection_for_server(person, data.frame_width, data.frame_height, thumbnail_data)
+                    loop_interval = self.process_frame(data, current_time)
                     
                     # Print summary at specified rate
                     if current_time - last_update_time >= (1.0 / update_rate):
@@ -514,7 +1677,10 @@ class PoseMonitor:
                         
                         last_update_time = current_time
                 
-                time.sleep(0.01)  # Small sleep to prevent excessive CPU usage
+                # Upload summaries and track records that are due
+                self.flush_aggregates()
+                
+                time.sleep(loop_interval)  # Small sleep to prevent excessive CPU usage
                 
             except KeyboardInterrupt:
                 break
@@ -522,32 +1688,93 @@ class PoseMonitor:
                 print(f"Error in monitor loop: {e}")
                 time.sleep(1)
         
+        # Upload the partial bucket and open tracks so a shutdown does not lose them
+        if self.aggregator or self.track_aggregator:
+            self.flush_aggregates(force=True)
+            if not self.worker_pool:
+                self._drain_queue()
+        
+        if self.worker_pool:
+            self.worker_pool.stop()
+        
         print("Monitor stopped")
         return True
+    
+    def process_frame(self, data, current_time=None):
+        """
+        Feed one new shared memory frame through aggregation, filtering and upload queuing
+        
+        Args:
+            data: SharedMemoryData snapshot
+            current_time: Monotonic time in seconds (defaults to now)
+        
+        Returns:
+            float: Seconds to wait before inspecting shared memory again
+        """
+        current_time = current_time if current_time is not None else CLOCK.monotonic()
+        loop_interval = self.scheduler.interval if self.scheduler else 0.01
+        
+        # Fold frame into rolling summaries in aggregation mode
+        if self.aggregator:
+            self.aggregator.record_frame(data)
+        
+        # Track mode consolidates snapshots into per-track records
+        if self.track_aggregator:
+            self.track_aggregator.record_frame(data)
+        
+        elif self.server_config and data.num_persons > 0:
+            # Send detections to server if configured
+            # (thumbnails are only encoded for detections that pass the filter)
+            for i in range(data.num_persons):
+                person = data.persons[i]
+                self.add_detection_for_server(person, data.frame_width, data.frame_height)
+        
+        # Adjust inspection rate and tell the pipeline which thumbnails to skip
+        if self.scheduler:
+            duplicate_filter = self.duplicate_filter if self.server_config else None
+            loop_interval = self.scheduler.update(data, duplicate_filter, current_time)
+            self.write_monitor_control(self.scheduler.build_control(
+                data, duplicate_filter,
+                send_thumbnails=bool(self.server_config and self.server_config.send_thumbnails),
+                current_time=current_time
+            ))
+        
+        return loop_interval
 
     def start_server_communication(self):
         """Start the server communication thread"""
         if not self.server_config:
             print("No server configuration provided")
             return False
+        
+        if self.worker_pool:
+            self.worker_pool.start()
+            print(f"Started multi-process server communication to {self.server_config.server_url}")
+            return True
             
-        if self.send_thread and self.send_thread.is_alive():
+        if any(thread.is_alive() for thread in self.send_threads):
             print("Server communication thread already running")
             return False
-            
-        self.send_thread = threading.Thread(target=self._server_send_loop, daemon=True)
-        self.send_thread.start()
-        print(f"Started server communication to {self.server_config.server_url}")
+        
+        # Several uploads in flight at once; each thread has its own keep-alive session
+        uploaders = [self.uploader] + [DetectionUploader(self.server_config, self.stats, self.uploader.stats_lock)
+                                       for _ in range(self.server_config.max_in_flight - 1)]
+        self.send_threads = [threading.Thread(target=self._server_send_loop, args=(uploader,), daemon=True)
+                             for uploader in uploaders]
+        for thread in self.send_threads:
+            thread.start()
+        print(f"Started server communication to {self.server_config.server_url} "
+              f"({len(self.send_threads)} upload(s) in flight)")
         return True
     
-    def _server_send_loop(self):
+    def _server_send_loop(self, uploader):
         """Server communication thread loop - sends individual detections"""
         while self.running:
             try:
                 # Check for new detections with timeout
                 try:
                     detection_item = self.detection_queue.get(timeout=1.0)
-                    self._send_individual_detection(detection_item)
+                    uploader.send(detection_item)
                     self.detection_queue.task_done()
                 except queue.Empty:
                     pass
@@ -556,39 +1783,47 @@ class PoseMonitor:
                 print(f"Error in server send loop: {e}")
                 time.sleep(1)
     
-    def _send_individual_detection(self, detection_item):
-        """Send individual detection to server with robot context"""
-        try:
-            # Convert to server format
-            detection_data = detection_item.to_server_format()
-            
-            for attempt in range(self.server_config.retry_attempts):
-                try:
-                    response = requests.post(
-                        self.server_config.server_url,
-                        json=detection_data,  # Use json parameter for proper content-type
-                        timeout=self.server_config.timeout
-                    )
-                    
-                    if response.status_code in [200, 201]:  # Accept both 200 and 201
-                        self.stats["sent_packages"] += 1
-                        self.stats["last_send_time"] = datetime.now().isoformat()
-                        print(f"Successfully sent detection: Robot {detection_item.unit_id} - Person {detection_item.person_id} - {detection_item.action_type} (conf: {detection_item.confidence:.3f})")
-                        break
-                    else:
-                        print(f"Server responded with status {response.status_code}: {response.text}")
-                        if attempt == self.server_config.retry_attempts - 1:
-                            self.stats["send_errors"] += 1
-                        
-                except requests.exceptions.RequestException as e:
-                    print(f"Network error for detection {detection_item.unit_id}-{detection_item.person_id} (attempt {attempt + 1}): {e}")
-                    if attempt == self.server_config.retry_attempts - 1:
-                        self.stats["send_errors"] += 1
-                    time.sleep(1)  # Wait before retry
-                        
-        except Exception as e:
-            print(f"Error sending individual detection: {e}")
-            self.stats["send_errors"] += 1
+    def flush_aggregates(self, force=False):
+        """Queue closed summary buckets and due track records for upload"""
+        if not self.detection_queue:
+            return
+        
+        if self.aggregator:
+            summary = self.aggregator.flush(force=force)
+            if summary:
+                self._enqueue(PoseSummaryItem(summary, self.server_config))
+        
+        if self.track_aggregator:
+            for record, best_detection in self.track_aggregator.collect(force=force):
+                self._enqueue(PersonTrackItem(record, self.server_config), best_detection)
+    
+    def _enqueue(self, item, thumbnail_source=None):
+        """
+        Hand an item to the upload path
+        
+        Args:
+            item: DetectionItem, PersonTrackItem or PoseSummaryItem
+            thumbnail_source: PersonDetection whose thumbnail should be attached, if any
+        """
+        if self.worker_pool:
+            # Only the raw thumbnail bytes cross the process boundary, not the whole detection
+            thumbnail_bytes = None
+            if thumbnail_source is not None and self.server_config.send_thumbnails:
+                thumbnail_bytes = extract_thumbnail_bytes(thumbnail_source)
+            self.worker_pool.submit(item, thumbnail_bytes)
+        else:
+            if thumbnail_source is not None:
+                item.attach_thumbnail(self.generate_thumbnail(thumbnail_source))
+            self.detection_queue.put(item)
+    
+    def _drain_queue(self, timeout=10.0):
+        """Give the send thread a bounded amount of time to empty the queue"""
+        if not any(thread.is_alive() for thread in self.send_threads):
+            return
+        
+        deadline = CLOCK.monotonic() + timeout
+        while not self.detection_queue.empty() and CLOCK.monotonic() < deadline:
+            time.sleep(0.1)
     
     def add_detection_for_server(self, person_detection, frame_width=1920, frame_height=1080, thumbnail_data=None):
         """Add a detection to the server queue with duplicate filtering"""
@@ -607,14 +1842,22 @@ class PoseMonitor:
                 self.stats["filtered_duplicates"] += 1
                 return
             
+            # In aggregation mode only every Nth raw detection is uploaded
+            if self.aggregator:
+                self.raw_sample_counter += 1
+                if self.raw_sample_counter % self.server_config.raw_sample_every != 0:
+                    self.stats["sampled_out"] += 1
+                    return
+                self.aggregator.record_raw_sent()
+            
             # Create detection item with robot context
             detection_item = DetectionItem(person_detection, self.server_config, thumbnail_data)
             
             # Normalize bounding box coordinates
             detection_item.normalize_bbox(frame_width, frame_height)
             
-            # Add to queue
-            self.detection_queue.put(detection_item)
+            # Add to queue; the thumbnail is encoded only once the detection is known to be sent
+            self._enqueue(detection_item, person_detection if thumbnail_data is None else None)
             self.stats["total_detections"] += 1
             
             # Log detection with cooldown info
@@ -631,99 +1874,18 @@ class PoseMonitor:
         if not self.server_config.send_thumbnails:
             return None
             
-        try:
-            if not person_detection.has_thumbnail or person_detection.thumbnail_size == 0:
-                return None
-                
-            # Extract thumbnail data from person detection
-            thumbnail_bytes = bytes(person_detection.thumbnail_data[:person_detection.thumbnail_size])
-            
-            # Parse native format header: [format][width][height][crop_x][crop_y][crop_w][crop_h][scale][data...]
-            if len(thumbnail_bytes) < 32:  # Need at least header size
-                print(f"Thumbnail data too small: {len(thumbnail_bytes)} bytes")
-                return None
-                
-            # Unpack header (8 uint32 values)
-            header = struct.unpack('8I', thumbnail_bytes[:32])
-            color_format, width, height, crop_x, crop_y, crop_w, crop_h, scale = header
-            
-            # Extract image data after header
-            image_data = thumbnail_bytes[32:]
-            
-            print(f"Processing native thumbnail: format={color_format}, {width}x{height}, crop=({crop_x},{crop_y},{crop_w},{crop_h}), scale={scale}, data_size={len(image_data)}")
-            
-            # Convert native format to displayable format using OpenCV
-            if OPENCV_AVAILABLE:
-                try:
-                    # Handle different native formats
-                    if color_format == 33:  # Format 33 (unknown format - treat as grayscale or RGB)
-                        # Calculate bytes per pixel based on data size
-                        total_pixels = width * height
-                        if total_pixels == 0:
-                            print("Invalid image dimensions")
-                            return None
-                            
-                        bytes_per_pixel = len(image_data) // total_pixels
-                        
-                        if bytes_per_pixel == 1:  # Grayscale
-                            gray_array = np.frombuffer(image_data[:total_pixels], dtype=np.uint8)
-                            gray_image = gray_array.reshape((height, width))
-                            # Convert grayscale to BGR for OpenCV
-                            bgr_image = cv2.cvtColor(gray_image, cv2.COLOR_GRAY2BGR)
-                        elif bytes_per_pixel >= 3:  # RGB or similar
-                            # Take first 3 channels as RGB
-                            rgb_size = width * height * 3
-                            if len(image_data) >= rgb_size:
-                                rgb_array = np.frombuffer(image_data[:rgb_size], dtype=np.uint8)
-                                rgb_image = rgb_array.reshape((height, width, 3))
-                                # Convert RGB to BGR for OpenCV
-                                bgr_image = cv2.cvtColor(rgb_image, cv2.COLOR_RGB2BGR)
-                            else:
-                                print(f"Insufficient RGB data: {len(image_data)} < {rgb_size}")
-                                return None
-                        else:
-                            print(f"Unsupported bytes per pixel: {bytes_per_pixel}")
-                            return None
-                            
-                    else:
-                        # For other known formats, assume RGB for now
-                        expected_size = width * height * 3
-                        if len(image_data) >= expected_size:
-                            rgb_array = np.frombuffer(image_data[:expected_size], dtype=np.uint8)
-                            rgb_image = rgb_array.reshape((height, width, 3))
-                            bgr_image = cv2.cvtColor(rgb_image, cv2.COLOR_RGB2BGR)
-                        else:
-                            print(f"Insufficient image data for format {color_format}: {len(image_data)} < {expected_size}")
-                            return None
-                    
-                    # Encode image as JPEG using OpenCV
-                    encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 85]
-                    result, encoded_img = cv2.imencode('.jpg', bgr_image, encode_param)
-                    
-                    if result:
-                        # Convert to base64
-                        jpeg_bytes = encoded_img.tobytes()
-                        print(f"Successfully converted native thumbnail to JPEG: {len(jpeg_bytes)} bytes")
-                        return base64.b64encode(jpeg_bytes).decode('utf-8')
-                    else:
-                        print("Failed to encode image with OpenCV")
-                        # Fall through to raw data encoding
-                    
-                except Exception as e:
-                    print(f"Error converting native thumbnail to JPEG with OpenCV: {e}")
-                    # Fall through to raw data encoding
-            
-            # Fallback: encode raw data (will not display properly but won't crash)
-            print("Using raw data encoding for native thumbnail (OpenCV encoding not available)")
-            return base64.b64encode(image_data).decode('utf-8')
-            
-        except Exception as e:
-            print(f"Error processing native thumbnail: {e}")
+        thumbnail_bytes = extract_thumbnail_bytes(person_detection)
+        if thumbnail_bytes is None:
             return None
+        return encode_thumbnail(thumbnail_bytes)
     
     def get_stats(self):
         """Get communication statistics"""
-        return self.stats.copy()
+        stats = self.stats.copy()
+        if self.worker_pool:
+            # Upload counters live in the worker processes
+            stats.update(self.worker_pool.get_stats())
+        return stats
 
 def main():
     import argparse
@@ -740,6 +1902,25 @@ def main():
     parser.add_argument("--send-thumbnails", action="store_true", help="Send thumbnails with detections")
     parser.add_argument("--send-interval", type=float, default=5.0, help="Send interval in seconds")
     parser.add_argument("--batch-size", type=int, default=10, help="Batch size for sending detections")
+    parser.add_argument("--retry-attempts", type=int, default=5, help="Attempts per upload before it is counted as an error (default: 5)")
+    parser.add_argument("--max-in-flight", type=int, default=1, help="Uploads sent concurrently; retries are deduplicated by the server (default: 1)")
+    
+    # Track mode options
+    parser.add_argument("--track-records", action="store_true", help="Upload one consolidated record per person track instead of individual detections")
+    parser.add_argument("--track-checkpoint", type=float, default=30.0, help="Seconds between interim records for long-lived tracks (default: 30)")
+    
+    # Multi-process options
+    parser.add_argument("--workers", type=int, default=0, help="Thumbnail encoder processes; >0 moves encoding and uploads out of the reader process (default: 0, single process)")
+    parser.add_argument("--queue-size", type=int, default=1000, help="Bound of the inter-process queues in multi-process mode (default: 1000)")
+    
+    # Adaptive sampling options
+    parser.add_argument("--adaptive-sampling", action="store_true", help="Lower the inspection rate while the scene is stable and skip unneeded thumbnail capture")
+    parser.add_argument("--idle-interval", type=float, default=0.5, help="Longest inspection interval in seconds while idle (default: 0.5, keep below 2.0)")
+    
+    # Aggregation mode options
+    parser.add_argument("--aggregate", action="store_true", help="Upload time-bucketed pose summaries with a sampled raw detection stream")
+    parser.add_argument("--summary-interval", type=float, default=60.0, help="Summary bucket length in seconds (default: 60)")
+    parser.add_argument("--raw-sample-every", type=int, default=100, help="In aggregation mode, upload 1 of every N raw detections (default: 100)")
     
     # Duplicate filtering options
     parser.add_argument("--cooldown-sitting-down", type=float, default=30.0, help="Cooldown for sitting_down poses (seconds)")
@@ -760,7 +1941,14 @@ def main():
         rtsp_uris=args.rtsp_uris,
         send_thumbnails=args.send_thumbnails,
         send_interval=args.send_interval,
-        batch_size=args.batch_size
+        batch_size=args.batch_size,
+        retry_attempts=args.retry_attempts,
+        max_in_flight=args.max_in_flight,
+        aggregation_mode=args.aggregate,
+        summary_interval=args.summary_interval,
+        raw_sample_every=args.raw_sample_every,
+        track_mode=args.track_records,
+        track_checkpoint_interval=args.track_checkpoint
     )
     print(f"Server configuration:")
     print(f"  URL: {server_config.server_url}")
@@ -769,8 +1957,17 @@ def main():
     print(f"  Send thumbnails: {server_config.send_thumbnails}")
     print(f"  Send interval: {server_config.send_interval}s")
     print(f"  Batch size: {server_config.batch_size}")
+    print(f"  Retries: {server_config.retry_attempts} attempts, {server_config.max_in_flight} upload(s) in flight")
+    if server_config.track_mode:
+        print(f"  Track records: checkpoint every {server_config.track_checkpoint_interval}s")
+    if server_config.aggregation_mode:
+        print(f"  Aggregation: {server_config.summary_interval}s summaries, 1/{server_config.raw_sample_every} raw detections")
+    
+    if args.workers > 0:
+        print(f"  Multi-process: {args.workers} encoder(s) + 1 uploader, queue size {args.queue_size}")
     
-    monitor = PoseMonitor(server_config)
+    monitor = PoseMonitor(server_config, adaptive_sampling=args.adaptive_sampling, idle_interval=args.idle_interval,
+                          workers=args.workers, queue_size=args.queue_size)
     
     # Configure cooldown periods for server communication
     monitor.duplicate_filter.set_class_cooldown(0, args.cooldown_sitting_down)
@@ -796,7 +1993,22 @@ def main():
         print(f"  Filtered duplicates: {stats['filtered_duplicates']}")
         print(f"  Sent packages: {stats['sent_packages']}")
         print(f"  Send errors: {stats['send_errors']}")
+        if server_config.track_mode:
+            print(f"  Sent tracks: {stats['sent_tracks']}")
+        if server_config.aggregation_mode:
+            print(f"  Sent summaries: {stats['sent_summaries']}")
+            print(f"  Sampled out: {stats['sampled_out']}")
         print(f"  Tracked persons: {filter_stats['tracked_persons']}")
+        if monitor.worker_pool:
+            print(f"  Encoded thumbnails: {stats['encoded_thumbnails']}")
+            print(f"  Dropped (queue full): {stats['dropped_items']}")
+            print(f"  Worker restarts: {stats['worker_restarts']}")
+        if monitor.scheduler:
+            scheduler_stats = monitor.scheduler.get_stats()
+            print(f"  Inspections: {scheduler_stats['inspections']} ({scheduler_stats['idle_inspections']} idle, "
+                  f"{scheduler_stats['wakeups']} wakeups)")
+        clock_stats = CLOCK.get_stats()
+        print(f"  Backend clock offset: {clock_stats['offset_ms']} ms ({clock_stats['offset_samples']} samples)")
         print(f"  Last send: {stats['last_send_time']}")
 
 if __name__ == "__main__":
@@ -1240,7 +1240,11 @@ static void write_detections_to_shared_memory(GstBuffer *gst_buffer, NvDsBatchMe
                 detection->has_thumbnail = false;
                 uint32_t thumb_width = 0, thumb_height = 0, thumb_size = 0, color_format = 0;
                 
-                if (capture_object_thumbnail(gst_buffer, frame_meta, obj_meta, 
+                // Skip capture when the monitor has said it will not use this thumbnail
+                // (track in cooldown with an unchanged pose, or thumbnails disabled)
+                bool thumbnail_wanted = shm_thumbnail_wanted(&g_shm_manager, detection->person_id, detection->pose_class);
+                
+                if (thumbnail_wanted && capture_object_thumbnail(gst_buffer, frame_meta, obj_meta, 
                                            detection->thumbnail_data, 
                                            &thumb_width, &thumb_height, 
                                            &thumb_size, &color_format)) {
@@ -1251,7 +1255,7 @@ static void write_detections_to_shared_memory(GstBuffer *gst_buffer, NvDsBatchMe
                     
                     g_print("Captured thumbnail for object %lu: %dx%d, %u bytes, format %u\n", 
                             obj_meta->object_id, thumb_width, thumb_height, thumb_size, color_format);
-                } else {
+                } else if (thumbnail_wanted) {
                     g_print("Failed to capture thumbnail for object %lu\n", obj_meta->object_id);
                 }
                 
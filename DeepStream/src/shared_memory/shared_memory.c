@@ -5,6 +5,7 @@
 #include <unistd.h>
 #include <errno.h>
 #include <sys/time.h>
+#include <time.h>
 #include <fcntl.h>
 
 // Get current timestamp in microseconds
@@ -14,6 +15,13 @@ static uint64_t get_timestamp_us() {
     return (uint64_t)tv.tv_sec * 1000000 + tv.tv_usec;
 }
 
+// Monotonic clock shared with the Python monitor (time.monotonic); immune to NTP steps
+static uint64_t get_monotonic_us() {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000000 + ts.tv_nsec / 1000;
+}
+
 bool shm_init(SharedMemoryManager *shm_mgr) {
     if (!shm_mgr) {
         fprintf(stderr, "SharedMemoryManager pointer is NULL\n");
@@ -160,6 +168,41 @@ bool shm_read_detection_data(SharedMemoryManager *shm_mgr, SharedMemoryData *out
     return true;
 }
 
+// Check the monitor control block to see whether a thumbnail is needed for this track.
+// Defaults to true whenever the monitor has not written a fresh, valid control block.
+bool shm_thumbnail_wanted(SharedMemoryManager *shm_mgr, uint32_t person_id, uint32_t pose_class) {
+    if (!shm_mgr || !shm_mgr->initialized || !shm_mgr->data) {
+        return true;
+    }
+    
+    // Copy the block once; the monitor writes it without taking the semaphore
+    MonitorControl control;
+    memcpy(&control, &shm_mgr->data->monitor_control, sizeof(MonitorControl));
+    
+    if (control.magic != MONITOR_CONTROL_MAGIC) {
+        return true;
+    }
+    
+    // Stale hints mean the monitor stopped updating - capture everything
+    uint64_t now = get_monotonic_us();
+    if (now < control.updated_us || now - control.updated_us > MONITOR_CONTROL_STALE_US) {
+        return true;
+    }
+    
+    if (control.flags & MONITOR_FLAG_NO_THUMBNAILS) {
+        return false;
+    }
+    
+    uint32_t num_skip = control.num_skip < MAX_PERSONS ? control.num_skip : MAX_PERSONS;
+    for (uint32_t i = 0; i < num_skip; i++) {
+        if (control.skip_person_ids[i] == person_id && control.skip_pose_classes[i] == pose_class) {
+            return false;
+        }
+    }
+    
+    return true;
+}
+
 // Utility function to convert pose class enum to string
 const char* pose_class_to_string(PoseClass pose_class) {
     switch (pose_class) {
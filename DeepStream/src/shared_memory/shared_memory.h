@@ -90,6 +90,23 @@ typedef struct {
     uint8_t reserved[32];  // Reduced to account for thumbnail data
 } PersonDetection;
 
+// Monitor control flags
+#define MONITOR_CONTROL_MAGIC 0x434F5241        // "CORA" - set once the monitor has written the block
+#define MONITOR_FLAG_NO_THUMBNAILS 0x1          // Monitor is not uploading thumbnails at all
+#define MONITOR_CONTROL_STALE_US 2000000        // Ignore hints older than 2 seconds (monitor gone)
+
+// Control block written by pose_monitor.py and read by the pipeline.
+// Lets the monitor tell the pipeline which thumbnails it will not use so
+// capture can be skipped for tracks that are in cooldown with an unchanged pose.
+typedef struct {
+    uint32_t magic;                             // MONITOR_CONTROL_MAGIC when valid
+    uint32_t flags;                             // MONITOR_FLAG_* bits
+    uint64_t updated_us;                        // Monitor CLOCK_MONOTONIC update time in microseconds
+    uint32_t num_skip;                          // Valid entries in the skip arrays
+    uint32_t skip_person_ids[MAX_PERSONS];      // Tracks whose thumbnails are not needed...
+    uint32_t skip_pose_classes[MAX_PERSONS];    // ...while they keep this pose class
+} MonitorControl;
+
 // Shared memory data structure
 typedef struct {
     // Header information
@@ -113,8 +130,11 @@ typedef struct {
     uint64_t total_frames_processed;
     uint32_t total_persons_detected;
     
+    // Monitor -> pipeline hints (carved out of the reserved area)
+    MonitorControl monitor_control;
+    
     // Reserved for future use
-    uint8_t reserved[1024];  // Reasonable amount for future expansion
+    uint8_t reserved[1024 - sizeof(MonitorControl)];  // Reasonable amount for future expansion
 } SharedMemoryData;
 
 // Shared memory manager structure
@@ -131,6 +151,7 @@ void shm_cleanup(SharedMemoryManager *shm_mgr);
 bool shm_write_detection_data(SharedMemoryManager *shm_mgr, const PersonDetection *detections, 
                              uint32_t num_detections, uint32_t frame_number, uint64_t timestamp);
 bool shm_read_detection_data(SharedMemoryManager *shm_mgr, SharedMemoryData *output_data);
+bool shm_thumbnail_wanted(SharedMemoryManager *shm_mgr, uint32_t person_id, uint32_t pose_class);
 void shm_lock(SharedMemoryManager *shm_mgr);
 void shm_unlock(SharedMemoryManager *shm_mgr);
 
@@ -1,9 +1,10 @@
 # Reshma Shaik
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QPushButton
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt
 import datetime
 from icon_utils import IconManager
 from theme_manager import ThemeManager
+from refresh_scheduler import get_refresh_scheduler
 
 class ActivityPage(QWidget):
     def __init__(self, parent=None):
@@ -91,10 +92,8 @@ class ActivityPage(QWidget):
         self.load_logs()
 
         # Auto Refresh Every 10 Seconds
-        # Creates a timer that triggers `load_logs` automatically
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.load_logs)  # When timer times out, reload logs
-        self.timer.start(10000)  # Interval: 10000ms = 10 seconds
+        # The shared scheduler skips the refresh while this page is hidden or minimized
+        get_refresh_scheduler().register("activity_logs", self.load_logs, interval=10, page=self)
 
     def load_logs(self):
         """
@@ -1,7 +1,117 @@
 # Oleg Korobeyko
 import requests
 import json
-from typing import Dict, Any, Optional, Tuple
+import re
+import time
+import socket
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable, Iterator
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtWidgets import QWidget
+from datetime import datetime
+from local_cache import LocalCache
+
+# Freshness lifetime (seconds) of cached GET responses per endpoint; unlisted endpoints are not cached
+ENDPOINT_TTLS = [
+    (re.compile(r'^/api/robots$'), 30),
+    (re.compile(r'^/api/detections/active$'), 30),
+    (re.compile(r'^/api/detections/[^/]+/summary$'), 30),
+    (re.compile(r'^/api/detections/[^/]+$'), 15),
+    (re.compile(r'^/api/detections/[^/]+/page$'), 15),
+    (re.compile(r'^/api/dashboard/summary$'), 15),
+]
+
+
+class CacheEntry:
+    """One cached JSON response body with its validators"""
+    
+    def __init__(self, body: dict, etag: str = None, last_modified: str = None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.monotonic()
+
+
+class ResponseCache:
+    """
+    In-memory cache for GET responses
+    
+    Entries are fresh for their endpoint's TTL and are then served stale for up to
+    stale_window seconds while a background request revalidates them with
+    If-None-Match / If-Modified-Since. Older entries are revalidated before use.
+    """
+    
+    def __init__(self, max_entries: int = 128, stale_window: float = 120.0):
+        self.max_entries = max_entries
+        self.stale_window = stale_window
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # Bumped by invalidation so in-flight responses for old data are not stored
+        self.generation = 0
+        self.stats = {
+            'hits': 0,          # Served fresh from cache
+            'stale_hits': 0,    # Served stale while revalidating in the background
+            'revalidated': 0,   # Server answered 304 Not Modified
+            'misses': 0,        # Full response downloaded
+            'invalidations': 0
+        }
+    
+    @staticmethod
+    def ttl_for(path: str) -> float:
+        for pattern, ttl in ENDPOINT_TTLS:
+            if pattern.match(path):
+                return ttl
+        return 0
+    
+    @staticmethod
+    def make_key(path: str, params: Optional[dict]) -> str:
+        if not params:
+            return path
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params) if params[k] is not None)
+        return f"{path}?{query}"
+    
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry:
+                self.entries.move_to_end(key)
+            return entry
+    
+    def store(self, key: str, entry: CacheEntry, generation: int):
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def count(self, stat: str):
+        with self.lock:
+            self.stats[stat] += 1
+    
+    def invalidate(self, prefix: str = None):
+        """Drop cached responses whose key starts with prefix (all entries if None)"""
+        with self.lock:
+            if prefix is None:
+                self.entries.clear()
+            else:
+                for key in [k for k in self.entries if k.startswith(prefix)]:
+                    del self.entries[key]
+            # Either way, a fetch started before this must not store what it read
+            self.generation += 1
+            self.stats['invalidations'] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self.entries)
+        served = stats['hits'] + stats['stale_hits'] + stats['revalidated']
+        requests_total = served + stats['misses']
+        stats['hit_rate'] = served / requests_total if requests_total else 0.0
+        return stats
+
 
 class APIClient:
     """
@@ -12,17 +122,170 @@ class APIClient:
         self.base_url = base_url
         self.session = requests.Session()
         self.token = None
+        self.cache = ResponseCache()
+        self.revalidating = set()
+        # Persistent cache on disk (opt-in, see enable_local_cache)
+        self.local_cache = None
         
     def set_auth_token(self, token: str):
         """Set the JWT token for authenticated requests"""
         self.token = token
         self.session.headers.update({'Authorization': f'Bearer {token}'})
+        # Cached responses belong to the previous session
+        self.cache.invalidate()
         
     def clear_auth_token(self):
         """Clear the JWT token"""
         self.token = None
         if 'Authorization' in self.session.headers:
             del self.session.headers['Authorization']
+        self.cache.invalidate()
+        # Nothing of the signed-out account stays on disk
+        self._store_locally('clear')
+    
+    def invalidate_cache(self, path: str = None):
+        """
+        Drop cached GET responses after a write
+        
+        Args:
+            path: Endpoint prefix to invalidate, e.g. "/api/robots" (default: everything)
+        """
+        self.cache.invalidate(path)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache hit/miss counters"""
+        return self.cache.get_stats()
+    
+    def enable_local_cache(self, path: str = None, max_bytes: int = 256 * 1024 * 1024) -> Optional[LocalCache]:
+        """
+        Keep robots, detections and thumbnails on disk so pages can show them before the server answers
+        
+        Args:
+            path: SQLite database file (default: cache.sqlite3 in the user config directory)
+            max_bytes: Size budget; older entries are evicted beyond it
+            
+        Returns:
+            The LocalCache, or None if it could not be opened (the client then works without it)
+        """
+        try:
+            self.local_cache = LocalCache(path, max_bytes)
+        except Exception as e:
+            print(f" API: Local cache disabled: {type(e).__name__}: {str(e)}")
+            self.local_cache = None
+        return self.local_cache
+    
+    def _store_locally(self, method: str, *args, **kwargs):
+        """Write through to the local cache; a failing cache never fails the API call"""
+        if not self.local_cache:
+            return
+        try:
+            getattr(self.local_cache, method)(*args, **kwargs)
+        except Exception as e:
+            print(f" API: Local cache {method} failed: {type(e).__name__}: {str(e)}")
+    
+    def get_cached_robots(self) -> list:
+        """Robots from the last session (empty without a local cache)"""
+        return self.local_cache.get_robots() if self.local_cache else []
+    
+    def get_cached_detections(self, unit_id: str, limit: int = 200) -> Tuple[list, Optional[str]]:
+        """
+        Newest locally cached detections of a unit and the sync cursor they are current up to
+        
+        Returns:
+            Tuple of (detections newest first, cursor for get_unit_detections_since or None)
+        """
+        if not self.local_cache:
+            return [], None
+        detections = self.local_cache.get_detections(unit_id, limit)
+        return detections, (self.local_cache.get_sync_cursor(unit_id) if detections else None)
+    
+    @staticmethod
+    def make_page_cursor(detection: dict) -> Optional[str]:
+        """get_detection_page cursor that continues after the given detection"""
+        try:
+            timestamp = datetime.fromisoformat(str(detection['timestamp']).replace('Z', '+00:00'))
+            return f"{int(timestamp.timestamp() * 1000)}_{detection['_id']}"
+        except (KeyError, ValueError):
+            return None
+    
+    def _cached_get(self, path: str, params: dict = None, timeout: int = 10) -> Tuple[int, dict]:
+        """
+        GET a JSON endpoint through the response cache
+        
+        Args:
+            path: Endpoint path, e.g. "/api/robots"
+            params: Query parameters (optional)
+            timeout: Request timeout in seconds
+            
+        Returns:
+            Tuple of (status_code: int, body: dict); revalidated entries report 200
+        """
+        ttl = self.cache.ttl_for(path)
+        key = self.cache.make_key(path, params)
+        entry = self.cache.get(key) if ttl else None
+        
+        if entry:
+            age = time.monotonic() - entry.stored_at
+            if age < ttl:
+                self.cache.count('hits')
+                return 200, entry.body
+            if age < ttl + self.cache.stale_window:
+                self.cache.count('stale_hits')
+                self._revalidate_in_background(path, params, timeout, key, entry)
+                return 200, entry.body
+        
+        return self._fetch(path, params, timeout, key, entry)
+    
+    def _fetch(self, path: str, params: Optional[dict], timeout: int, key: str,
+               entry: Optional[CacheEntry]) -> Tuple[int, dict]:
+        """Send a (conditional) GET and update the cache with the result"""
+        generation = self.cache.generation
+        headers = {'Content-Type': 'application/json'}
+        if entry:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        
+        response = self.session.get(
+            f"{self.base_url}{path}",
+            params=params,
+            headers=headers,
+            timeout=timeout
+        )
+        
+        if response.status_code == 304 and entry:
+            print(f" API: {path} not modified, using cached response")
+            self.cache.count('revalidated')
+            self.cache.store(key, CacheEntry(entry.body, entry.etag, entry.last_modified), generation)
+            return 200, entry.body
+        
+        body = response.json()
+        if self.cache.ttl_for(path):
+            self.cache.count('misses')
+            if response.status_code == 200:
+                self.cache.store(key, CacheEntry(body, response.headers.get('ETag'),
+                                                 response.headers.get('Last-Modified')), generation)
+        return response.status_code, body
+    
+    def _revalidate_in_background(self, path: str, params: Optional[dict], timeout: int, key: str,
+                                  entry: CacheEntry):
+        """Refresh a stale entry without blocking the caller (one request per key at a time)"""
+        with self.cache.lock:
+            if key in self.revalidating:
+                return
+            self.revalidating.add(key)
+        
+        def revalidate():
+            try:
+                self._fetch(path, params, timeout, key, entry)
+            except Exception as e:
+                print(f" API: Background revalidation of {path} failed: {str(e)}")
+            finally:
+                with self.cache.lock:
+                    self.revalidating.discard(key)
+        
+        threading.Thread(target=revalidate, daemon=True).start()
     
     def register(self, first_name: str, last_name: str, email: str, password: str) -> Tuple[bool, str, Dict[str, Any]]:
         """
@@ -121,6 +384,8 @@ class APIClient:
                 if 'data' in data and 'token' in data['data']:
                     print(" API: Setting auth token")
                     self.set_auth_token(data['data']['token'])
+                # Locally cached data belongs to one account
+                self._store_locally('set_owner', email.lower())
                 return True, data.get('message', 'Login successful'), data.get('data', {})
             else:
                 print(f" API: Login failed with status {response.status_code}")
@@ -228,18 +493,13 @@ class APIClient:
                 
             print(" API: Getting robots with detection data...")
                 
-            response = self.session.get(
-                f"{self.base_url}/api/robots",
-                headers={'Content-Type': 'application/json'},
-                timeout=10
-            )
-            
-            data = response.json()
+            status_code, data = self._cached_get("/api/robots", timeout=10)
             
-            if response.status_code == 200:
+            if status_code == 200:
                 robots_data = data.get('data', {})
                 robots_list = robots_data.get('robots', [])
                 print(f" API: Found {len(robots_list)} robots")
+                self._store_locally('put_robots', robots_list)
                 
                 # Transform data to match frontend expectations
                 formatted_data = {
@@ -400,6 +660,41 @@ class APIClient:
             traceback.print_exc()
             return False, f"Unexpected error: {str(e)}", {}
 
+    def get_dashboard_summary(self) -> Tuple[bool, str, Dict[str, Any]]:
+        """
+        Get the fleet-wide dashboard counters in one request (precomputed on the server)
+        
+        Returns:
+            Tuple of (success: bool, message: str, data: dict) - data has total_units,
+            active_units, online_units, active_streams, total_detections,
+            last_24h_detections, action_counts and last_24h_action_counts (detections
+            per action type), last_seen and computed_at
+        """
+        try:
+            if not self.token:
+                return False, "Not authenticated", {}
+            
+            print(" API: Getting dashboard summary")
+            
+            status_code, data = self._cached_get("/api/dashboard/summary", timeout=10)
+            
+            if status_code == 200:
+                summary = dict(data.get('data', {}))
+                summary.setdefault('action_counts', {})
+                summary.setdefault('last_24h_action_counts', {})
+                return True, data.get('message', 'Success'), summary
+            else:
+                error_msg = data.get('message', f'HTTP {status_code}')
+                print(f" API: Failed to get dashboard summary - {error_msg}")
+                return False, error_msg, {'status_code': status_code}
+                
+        except requests.exceptions.Timeout:
+            return False, "Request timed out. Please try again.", {}
+        except requests.exceptions.RequestException as e:
+            return False, f"Network error: {str(e)}", {}
+        except Exception as e:
+            return False, f"Unexpected error: {str(e)}", {}
+
     def get_active_units(self, hours: int = 24) -> Tuple[bool, str, Dict[str, Any]]:
         """
         Get list of active robot units
@@ -413,21 +708,15 @@ class APIClient:
         try:
             print(f" API: Getting active units (last {hours} hours)")
             
-            response = self.session.get(
-                f"{self.base_url}/api/detections/active",
-                params={'hours': hours},
-                timeout=10
-            )
+            status_code, data = self._cached_get("/api/detections/active", params={'hours': hours}, timeout=10)
             
-            print(f" API: Response received - Status: {response.status_code}")
+            print(f" API: Response received - Status: {status_code}")
             
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
                 print(f" API: Found {data.get('data', {}).get('units_count', 0)} active units")
                 return True, data.get('message', 'Success'), data.get('data', {})
             else:
-                data = response.json()
-                error_msg = data.get('message', f'HTTP {response.status_code}')
+                error_msg = data.get('message', f'HTTP {status_code}')
                 print(f" API: Failed to get active units - {error_msg}")
                 return False, error_msg, {}
                 
@@ -461,23 +750,71 @@ class APIClient:
             if action_type:
                 params['action_type'] = action_type
             
+            status_code, data = self._cached_get(f"/api/detections/{unit_id}", params=params, timeout=15)
+            
+            print(f" API: Response received - Status: {status_code}")
+            
+            if status_code == 200:
+                total_detections = data.get('data', {}).get('total_detections', 0)
+                print(f" API: Found {total_detections} detections for unit {unit_id}")
+                return True, data.get('message', 'Success'), data.get('data', {})
+            else:
+                error_msg = data.get('message', f'HTTP {status_code}')
+                print(f" API: Failed to get unit detections - {error_msg}")
+                return False, error_msg, {}
+                
+        except requests.exceptions.Timeout:
+            print(" API: Request timed out")
+            return False, "Request timed out. Please try again.", {}
+        except requests.exceptions.RequestException as e:
+            print(f" API: Request exception: {str(e)}")
+            return False, f"Network error: {str(e)}", {}
+        except Exception as e:
+            print(f" API: Unexpected error: {type(e).__name__}: {str(e)}")
+            return False, f"Unexpected error: {str(e)}", {}
+
+    def get_unit_detections_since(self, unit_id: str, since: str = None, hours: int = 24,
+                                  limit: int = 50) -> Tuple[bool, str, Dict[str, Any]]:
+        """
+        Get only the detections a robot unit received after a cursor
+        
+        Args:
+            unit_id: Robot unit identifier
+            since: Cursor returned by the previous call (None for an initial load)
+            hours: Time range in hours for initial loads and resets (default: 24)
+            limit: Maximum number of detections to return (default: 50)
+            
+        Returns:
+            Tuple of (success: bool, message: str, data: dict). data['cursor'] is the
+            cursor for the next call; data['reset'] is True when the detections are a
+            fresh window that replaces the client's list rather than extending it.
+        """
+        try:
+            print(f" API: Getting detections for unit {unit_id} since {since}")
+            
+            params = {'hours': hours, 'limit': limit}
+            if since:
+                params['since'] = since
+            
             response = self.session.get(
-                f"{self.base_url}/api/detections/{unit_id}",
+                f"{self.base_url}/api/detections/{unit_id}/since",
                 params=params,
                 timeout=15
             )
             
             print(f" API: Response received - Status: {response.status_code}")
             
+            data = response.json()
             if response.status_code == 200:
-                data = response.json()
-                total_detections = data.get('data', {}).get('total_detections', 0)
-                print(f" API: Found {total_detections} detections for unit {unit_id}")
-                return True, data.get('message', 'Success'), data.get('data', {})
+                delta = data.get('data', {})
+                print(f" API: Found {delta.get('new_count', 0)} new detections for unit {unit_id}")
+                self._store_locally('put_detections', unit_id, delta.get('detections', []),
+                                    replace=delta.get('reset', True))
+                self._store_locally('set_sync_cursor', unit_id, delta.get('cursor'))
+                return True, data.get('message', 'Success'), delta
             else:
-                data = response.json()
                 error_msg = data.get('message', f'HTTP {response.status_code}')
-                print(f" API: Failed to get unit detections - {error_msg}")
+                print(f" API: Failed to get detection delta - {error_msg}")
                 return False, error_msg, {}
                 
         except requests.exceptions.Timeout:
@@ -490,6 +827,87 @@ class APIClient:
             print(f" API: Unexpected error: {type(e).__name__}: {str(e)}")
             return False, f"Unexpected error: {str(e)}", {}
 
+    def get_detection_page(self, unit_id: str, cursor: str = None, page_size: int = 50,
+                           action_type: str = None, min_confidence: float = None, person_id: int = None,
+                           start: Any = None, end: Any = None, hours: int = None) -> Tuple[bool, str, Dict[str, Any]]:
+        """
+        Get one page of a robot unit's detections, newest first, filtered on the server
+        
+        Args:
+            unit_id: Robot unit identifier
+            cursor: next_cursor of the previous page (None for the first page)
+            page_size: Detections per page (default: 50, max 500)
+            action_type: Only this action type (optional)
+            min_confidence: Only detections at or above this confidence (optional)
+            person_id: Only this tracked person (optional)
+            start, end: Time range as epoch milliseconds or ISO 8601 strings (optional)
+            hours: Only the last N hours when no start is given (optional)
+            
+        Returns:
+            Tuple of (success: bool, message: str, data: dict). data['next_cursor'] fetches
+            the following page and is None on the last one.
+        """
+        try:
+            print(f" API: Getting detection page for unit {unit_id} (cursor {cursor})")
+            
+            params = {'page_size': page_size}
+            optional = {'cursor': cursor, 'action_type': action_type, 'min_confidence': min_confidence,
+                        'person_id': person_id, 'from': start, 'to': end, 'hours': hours}
+            params.update({key: value for key, value in optional.items() if value is not None})
+            
+            status_code, data = self._cached_get(f"/api/detections/{unit_id}/page", params=params, timeout=15)
+            
+            print(f" API: Response received - Status: {status_code}")
+            
+            if status_code == 200:
+                page = data.get('data', {})
+                print(f" API: Got {len(page.get('detections', []))} detections for unit {unit_id}")
+                self._store_locally('put_detections', unit_id, page.get('detections', []))
+                return True, data.get('message', 'Success'), page
+            else:
+                error_msg = data.get('message', f'HTTP {status_code}')
+                print(f" API: Failed to get detection page - {error_msg}")
+                return False, error_msg, {}
+                
+        except requests.exceptions.Timeout:
+            print(" API: Request timed out")
+            return False, "Request timed out. Please try again.", {}
+        except requests.exceptions.RequestException as e:
+            print(f" API: Request exception: {str(e)}")
+            return False, f"Network error: {str(e)}", {}
+        except Exception as e:
+            print(f" API: Unexpected error: {type(e).__name__}: {str(e)}")
+            return False, f"Unexpected error: {str(e)}", {}
+    
+    def iter_detections(self, unit_id: str, page_size: int = 200, max_pages: int = None,
+                        **filters) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over a robot unit's detections page by page, newest first
+        
+        Args:
+            unit_id: Robot unit identifier
+            page_size: Detections fetched per request (default: 200)
+            max_pages: Stop after this many pages (default: all)
+            **filters: Same filters as get_detection_page
+            
+        Yields:
+            Detection dicts
+            
+        Raises:
+            RuntimeError: If a page request fails
+        """
+        cursor = None
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            success, message, page = self.get_detection_page(unit_id, cursor=cursor, page_size=page_size, **filters)
+            if not success:
+                raise RuntimeError(f"Failed to get detections for unit {unit_id}: {message}")
+            pages += 1
+            yield from page.get('detections', [])
+            cursor = page.get('next_cursor')
+            if not cursor:
+                return
+
     def get_unit_summary(self, unit_id: str, hours: int = 24) -> Tuple[bool, str, Dict[str, Any]]:
         """
         Get detection summary statistics for a robot unit
@@ -504,21 +922,16 @@ class APIClient:
         try:
             print(f" API: Getting summary for unit {unit_id}")
             
-            response = self.session.get(
-                f"{self.base_url}/api/detections/{unit_id}/summary",
-                params={'hours': hours},
-                timeout=10
-            )
+            status_code, data = self._cached_get(f"/api/detections/{unit_id}/summary",
+                                                 params={'hours': hours}, timeout=10)
             
-            print(f" API: Response received - Status: {response.status_code}")
+            print(f" API: Response received - Status: {status_code}")
             
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
                 print(f" API: Got summary for unit {unit_id}")
                 return True, data.get('message', 'Success'), data.get('data', {})
             else:
-                data = response.json()
-                error_msg = data.get('message', f'HTTP {response.status_code}')
+                error_msg = data.get('message', f'HTTP {status_code}')
                 print(f" API: Failed to get unit summary - {error_msg}")
                 return False, error_msg, {}
                 
@@ -531,6 +944,452 @@ class APIClient:
         except Exception as e:
             print(f" API: Unexpected error: {type(e).__name__}: {str(e)}")
             return False, f"Unexpected error: {str(e)}", {}
+    
+    def get_thumbnail(self, thumbnail_url: str) -> Tuple[bool, str, Dict[str, Any]]:
+        """
+        Download a detection thumbnail
+        
+        Thumbnails are immutable and served with long cache headers, so they are not
+        kept in the JSON response cache; ThumbnailStore keeps the decoded images.
+        
+        Args:
+            thumbnail_url: Path from a detection's thumbnail_url field
+            
+        Returns:
+            Tuple of (success: bool, message: str, data: dict with 'image' JPEG bytes)
+        """
+        try:
+            if self.local_cache:
+                image = self.local_cache.get_thumbnail(thumbnail_url)
+                if image:
+                    return True, "Cached", {'image': image}
+            
+            response = self.session.get(f"{self.base_url}{thumbnail_url}", timeout=10)
+            
+            if response.status_code == 200:
+                self._store_locally('put_thumbnail', thumbnail_url, response.content)
+                return True, "Success", {'image': response.content}
+            else:
+                print(f" API: Failed to get thumbnail {thumbnail_url} - HTTP {response.status_code}")
+                return False, f"HTTP {response.status_code}", {}
+                
+        except requests.exceptions.Timeout:
+            print(" API: Request timed out")
+            return False, "Request timed out. Please try again.", {}
+        except requests.exceptions.RequestException as e:
+            print(f" API: Request exception: {str(e)}")
+            return False, f"Network error: {str(e)}", {}
+        except Exception as e:
+            print(f" API: Unexpected error: {type(e).__name__}: {str(e)}")
+            return False, f"Unexpected error: {str(e)}", {}
+
+class APIRequest(QObject):
+    """
+    Handle for one asynchronous API call
+    
+    finished(success, message, data) is delivered on the GUI thread, and never
+    for a request that was cancelled before its result arrived.
+    """
+    
+    finished = pyqtSignal(bool, str, dict)
+    settled = pyqtSignal()
+    
+    def __init__(self, method_name: str, group: Any = None):
+        super().__init__()
+        self.method_name = method_name
+        self.group = group
+        self.cancelled = False
+        self.done = False
+    
+    def cancel(self):
+        """Drop the result; a call nobody is waiting for any more is skipped entirely"""
+        self.cancelled = True
+    
+    def _deliver(self, success: bool, message: str, data: dict):
+        self.done = True
+        if not self.cancelled:
+            self.finished.emit(success, message, data)
+        self.settled.emit()
+
+
+class _APICall(QObject):
+    """One execution of an APIClient method, shared by all requests coalesced onto it"""
+    
+    _completed = pyqtSignal(bool, str, dict)
+    
+    def __init__(self, method_name: str, key: Optional[tuple] = None):
+        super().__init__()
+        self.method_name = method_name
+        self.key = key
+        self.requests = []
+        self.release = None  # Called before delivery so callbacks can start a fresh call
+        # Results are emitted from a pool thread; hop to this object's (GUI) thread first
+        self._completed.connect(self._on_completed, Qt.QueuedConnection)
+    
+    def wanted(self) -> bool:
+        return any(not request.cancelled for request in self.requests)
+    
+    def _on_completed(self, success: bool, message: str, data: dict):
+        if self.release:
+            self.release()
+        for request in self.requests:
+            request._deliver(success, message, data)
+
+
+class _APIRunnable(QRunnable):
+    """Runs one blocking APIClient method on the thread pool"""
+    
+    def __init__(self, call: _APICall, func: Callable, args: tuple, kwargs: dict):
+        super().__init__()
+        self.call = call
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+    
+    def run(self):
+        if not self.call.wanted():
+            self.call._completed.emit(False, "Cancelled", {})
+            return
+        
+        try:
+            success, message, data = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            print(f" API: Unexpected error in {self.call.method_name}: {type(e).__name__}: {str(e)}")
+            success, message, data = False, f"Unexpected error: {str(e)}", {}
+        self.call._completed.emit(success, message, data or {})
+
+
+class AsyncAPIClient(QObject):
+    """
+    Non-blocking front end for APIClient
+    
+    Each call runs the synchronous APIClient method on a thread pool and returns an
+    APIRequest whose finished signal fires on the GUI thread. Requests can be tagged
+    with a group (usually the widget that owns them) so a page can cancel everything
+    it started when the user navigates away. Read requests are coalesced: asking for
+    the same method and arguments while a call is in flight joins that call instead
+    of sending another request.
+    """
+    
+    def __init__(self, client: APIClient, max_threads: int = 4):
+        super().__init__()
+        self.client = client
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        # Keeps request objects alive until their result has been delivered
+        self.pending = set()
+        # Coalescable calls currently running, by (method, args, kwargs)
+        self.in_flight = {}
+        self.coalesced_count = 0
+    
+    def request(self, method_name: str, *args, group: Any = None,
+                callback: Optional[Callable[[bool, str, dict], None]] = None,
+                coalesce: bool = False, **kwargs) -> APIRequest:
+        """
+        Run an APIClient method in the background
+        
+        Args:
+            method_name: Name of the APIClient method to call
+            *args, **kwargs: Arguments for that method
+            group: Owner used by cancel_group (optional)
+            callback: Called with (success, message, data) on the GUI thread (optional)
+            coalesce: Share an identical in-flight call instead of starting another (reads only)
+            
+        Returns:
+            APIRequest handle
+        """
+        request = APIRequest(method_name, group)
+        if callback:
+            request.finished.connect(callback)
+        request.settled.connect(lambda: self.pending.discard(request))
+        self.pending.add(request)
+        
+        key = (method_name, args, tuple(sorted(kwargs.items()))) if coalesce else None
+        call = self.in_flight.get(key) if key else None
+        if call is not None:
+            self.coalesced_count += 1
+            call.requests.append(request)
+            return request
+        
+        call = _APICall(method_name, key)
+        call.requests.append(request)
+        if key:
+            self.in_flight[key] = call
+            call.release = lambda: self.in_flight.pop(key, None)
+        
+        self.pool.start(_APIRunnable(call, getattr(self.client, method_name), args, kwargs))
+        return request
+    
+    def cancel_group(self, group: Any):
+        """
+        Cancel every pending request of a group
+        
+        For widget groups this includes requests owned by any child widget, so
+        passing a page cancels everything started from within that page.
+        """
+        cancelled = 0
+        for request in list(self.pending):
+            owner = request.group
+            if owner is None or request.cancelled:
+                continue
+            if owner is group or (isinstance(group, QWidget) and isinstance(owner, QWidget)
+                                  and group.isAncestorOf(owner)):
+                request.cancel()
+                cancelled += 1
+        if cancelled:
+            print(f" API: Cancelled {cancelled} pending request(s)")
+    
+    def cancel_all(self):
+        """Cancel every pending request (e.g. on logout)"""
+        for request in list(self.pending):
+            request.cancel()
+    
+    def login(self, email: str, password: str, **options) -> APIRequest:
+        return self.request('login', email, password, **options)
+    
+    def get_user_profile(self, **options) -> APIRequest:
+        options.setdefault('coalesce', True)
+        return self.request('get_user_profile', **options)
+    
+    def check_verification_status(self, email: str, **options) -> APIRequest:
+        return self.request('check_verification_status', email, **options)
+    
+    def resend_verification_email(self, email: str, **options) -> APIRequest:
+        return self.request('resend_verification_email', email, **options)
+    
+    def get_robots(self, **options) -> APIRequest:
+        options.setdefault('coalesce', True)
+        return self.request('get_robots', **options)
+    
+    def get_dashboard_summary(self, **options) -> APIRequest:
+        options.setdefault('coalesce', True)
+        return self.request('get_dashboard_summary', **options)
+    
+    def get_active_units(self, hours: int = 24, **options) -> APIRequest:
+        options.setdefault('coalesce', True)
+        return self.request('get_active_units', hours, **options)
+    
+    def get_unit_detections(self, unit_id: str, hours: int = 24, limit: int = 100,
+                            action_type: str = None, **options) -> APIRequest:
+        options.setdefault('coalesce', True)
+        return self.request('get_unit_detections', unit_id, hours, limit, action_type, **options)
+    
+    def get_unit_detections_since(self, unit_id: str, since: str = None, hours: int = 24,
+                                  limit: int = 50, **options) -> APIRequest:
+        options.setdefault('coalesce', True)
+        return self.request('get_unit_detections_since', unit_id, since, hours, limit, **options)
+    
+    def get_detection_page(self, unit_id: str, cursor: str = None, page_size: int = 50, **options) -> APIRequest:
+        """Filters (action_type, min_confidence, ...) are passed through to APIClient.get_detection_page"""
+        options.setdefault('coalesce', True)
+        return self.request('get_detection_page', unit_id, cursor, page_size, **options)
+    
+    def get_unit_summary(self, unit_id: str, hours: int = 24, **options) -> APIRequest:
+        options.setdefault('coalesce', True)
+        return self.request('get_unit_summary', unit_id, hours, **options)
+    
+    def get_thumbnail(self, thumbnail_url: str, **options) -> APIRequest:
+        options.setdefault('coalesce', True)
+        return self.request('get_thumbnail', thumbnail_url, **options)
+
+class UnitChannel(QObject):
+    """Per-unit endpoint for live events; widgets connect to the unit they display"""
+    
+    # (event type, payload)
+    event_received = pyqtSignal(str, dict)
+    detections_received = pyqtSignal(dict)
+
+
+class LiveUpdateSubscriber(QObject):
+    """
+    Background subscriber for the backend's Server-Sent Events stream
+    
+    A daemon thread holds GET /api/detections/stream open, parses the events and
+    re-emits them on the GUI thread: globally through event_received and per unit
+    through channel(unit_id). It reconnects with backoff and resumes from the last
+    event id, so no polling is needed while connected.
+    """
+    
+    # (unit_id, event type, payload)
+    event_received = pyqtSignal(str, str, dict)
+    connection_changed = pyqtSignal(bool)
+    _dispatch = pyqtSignal(str, str, dict)
+    _connection = pyqtSignal(bool)
+    
+    def __init__(self, client: APIClient, path: str = "/api/detections/stream"):
+        super().__init__()
+        self.client = client
+        self.path = path
+        self.channels = {}
+        self.connected = False
+        self.last_event_id = None
+        self.events_received = 0
+        # Each run has its own stop event, so a thread left over from a previous
+        # session can never deliver events alongside the current one
+        self.stop_event = None
+        self.thread = None
+        self.response = None
+        self._dispatch.connect(self._on_event, Qt.QueuedConnection)
+        self._connection.connect(self._on_connection, Qt.QueuedConnection)
+    
+    def channel(self, unit_id: str) -> UnitChannel:
+        """Get (creating if needed) the signal channel for one robot unit"""
+        if unit_id not in self.channels:
+            self.channels[unit_id] = UnitChannel(self)
+        return self.channels[unit_id]
+    
+    @property
+    def running(self) -> bool:
+        return self.stop_event is not None and not self.stop_event.is_set()
+    
+    def start(self):
+        """Start the background subscription (no-op if already running)"""
+        if self.running:
+            return
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(self.stop_event,), name="live-updates", daemon=True)
+        self.thread.start()
+    
+    def stop(self, timeout: float = 2.0):
+        """Stop the subscription, close the open stream and forget the resume position"""
+        if self.stop_event is not None:
+            self.stop_event.set()
+        response = self.response
+        if response is not None:
+            # Closing the response would wait on the reader thread; shutting the
+            # socket down unblocks its read instead
+            try:
+                response.raw.connection.sock.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+        if self.thread is not None and self.thread is not threading.current_thread():
+            # A thread still connecting may outlive the timeout; its stop event keeps it silent
+            self.thread.join(timeout)
+        self.thread = None
+        # The next session (possibly another account) starts from live events only
+        self.last_event_id = None
+        self._on_connection(False)
+    
+    def _run(self, stop_event: threading.Event):
+        backoff = 1.0
+        # Dedicated session: a streaming response would otherwise tie up the shared pool
+        session = requests.Session()
+        while not stop_event.is_set():
+            if not self.client.token:
+                stop_event.wait(1.0)
+                continue
+            
+            headers = {
+                'Accept': 'text/event-stream',
+                'Authorization': f'Bearer {self.client.token}'
+            }
+            if self.last_event_id:
+                headers['Last-Event-ID'] = self.last_event_id
+            
+            response = None
+            try:
+                # Read timeout comfortably above the server's 25 s heartbeat
+                response = session.get(f"{self.client.base_url}{self.path}", headers=headers,
+                                       stream=True, timeout=(10, 60))
+                self.response = response
+                if stop_event.is_set():
+                    pass  # Stopped while connecting
+                elif response.status_code != 200:
+                    print(f" LIVE: Stream refused with status {response.status_code}")
+                else:
+                    print(" LIVE: Connected to live update stream")
+                    self._connection.emit(True)
+                    backoff = 1.0
+                    self._read_events(response, stop_event)
+            except Exception as e:
+                if not stop_event.is_set():
+                    print(f" LIVE: Stream error: {type(e).__name__}: {str(e)}")
+            finally:
+                if response is not None:
+                    response.close()
+                    if self.response is response:
+                        self.response = None
+                if not stop_event.is_set():
+                    self._connection.emit(False)
+            
+            stop_event.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+        session.close()
+    
+    def _read_events(self, response, stop_event: threading.Event):
+        """Parse the text/event-stream format and dispatch complete events"""
+        event_type, data_lines, event_id = "message", [], None
+        # Chunked streams (Express) are delivered chunk by chunk; otherwise read bytewise
+        # so an event is never held back waiting for a full read buffer
+        chunk_size = None if getattr(response.raw, 'chunked', False) else 1
+        for raw_line in response.iter_lines(chunk_size=chunk_size, decode_unicode=True):
+            if stop_event.is_set():
+                return
+            line = raw_line or ""
+            if not line:
+                if data_lines:
+                    if stop_event.is_set():
+                        return
+                    if event_id:
+                        self.last_event_id = event_id
+                    try:
+                        payload = json.loads("\n".join(data_lines))
+                    except json.JSONDecodeError:
+                        payload = {}
+                    self._dispatch.emit(payload.get('unit_id', ''), event_type, payload)
+                event_type, data_lines, event_id = "message", [], None
+                continue
+            if line.startswith(':'):
+                continue  # Comment / heartbeat
+            field, _, value = line.partition(':')
+            value = value[1:] if value.startswith(' ') else value
+            if field == 'event':
+                event_type = value
+            elif field == 'data':
+                data_lines.append(value)
+            elif field == 'id':
+                event_id = value
+    
+    def _on_event(self, unit_id: str, event_type: str, payload: dict):
+        self.events_received += 1
+        # Cached GETs for this unit are out of date now
+        self.client.invalidate_cache("/api/robots")
+        self.client.invalidate_cache("/api/detections/active")
+        self.client.invalidate_cache("/api/dashboard")
+        if unit_id:
+            self.client.invalidate_cache(f"/api/detections/{unit_id}")
+        
+        self.event_received.emit(unit_id, event_type, payload)
+        channel = self.channels.get(unit_id)
+        if channel:
+            channel.event_received.emit(event_type, payload)
+            if event_type == 'detections':
+                channel.detections_received.emit(payload)
+    
+    def _on_connection(self, connected: bool):
+        if connected != self.connected:
+            self.connected = connected
+            self.connection_changed.emit(connected)
 
 # Global API client instance
-api_client = APIClient()
\ No newline at end of file
+api_client = APIClient()
+
+# Non-blocking wrapper for use from widgets (created lazily: needs a Qt application)
+_async_api_client = None
+
+def get_async_api_client() -> AsyncAPIClient:
+    """Get the shared AsyncAPIClient bound to the global api_client"""
+    global _async_api_client
+    if _async_api_client is None:
+        _async_api_client = AsyncAPIClient(api_client)
+    return _async_api_client
+
+# Live update stream (created lazily: needs a Qt application)
+_live_updates = None
+
+def get_live_updates() -> LiveUpdateSubscriber:
+    """Get the shared LiveUpdateSubscriber bound to the global api_client"""
+    global _live_updates
+    if _live_updates is None:
+        _live_updates = LiveUpdateSubscriber(api_client)
+    return _live_updates
@@ -1,9 +1,10 @@
 # Reshma Shaik
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFrame, QStackedWidget, QMessageBox, QComboBox, QDialog, QLineEdit, QDialogButtonBox, QScrollArea
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFrame, QStackedWidget, QMessageBox, QComboBox, QDialog, QLineEdit, QDialogButtonBox, QScrollArea, QApplication
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, QEvent
 from PyQt5.QtGui import QFont
+import time
 
 # Import robot components
 from robot_widgets import RobotGridWidget
@@ -13,9 +14,11 @@ from robot_detail_page import RobotDetailPage
 from icon_utils import IconManager
 
 # Import API client and resend verification dialog
-from api_client import api_client
+from api_client import api_client, get_async_api_client, get_live_updates
 from resend_verification_dialog import ResendVerificationDialog
 from theme_manager import theme_manager
+from refresh_scheduler import get_refresh_scheduler
+from thumbnail_store import get_thumbnail_store
 
 
 class Dashboard(QWidget):
@@ -86,6 +89,7 @@ class Dashboard(QWidget):
 
         # ------------------ Dashboard Page ------------------
         dashboard_page = QWidget()
+        self.dashboard_page = dashboard_page
         dashboard_layout = QVBoxLayout(dashboard_page)
         dashboard_layout.setSpacing(30)
         dashboard_layout.setContentsMargins(40, 30, 40, 30)
@@ -214,6 +218,28 @@ class Dashboard(QWidget):
         # Set default selected button
         self.select_button(self.btn_dashboard)
         
+        # Live updates: bursts of robot events are coalesced into one refresh
+        self.live_refresh_timer = QTimer(self)
+        self.live_refresh_timer.setSingleShot(True)
+        self.live_refresh_timer.setInterval(1000)
+        self.live_refresh_timer.timeout.connect(self.refresh_current_page)
+        get_live_updates().event_received.connect(self.on_live_event)
+        
+        # Periodic refresh: each job only runs while its page is on screen
+        scheduler = get_refresh_scheduler()
+        scheduler.set_default_interval(self.parse_duration(self.refresh_combo.currentText()))
+        scheduler.register("dashboard_stats", self.load_dashboard_stats, page=self.dashboard_page)
+        scheduler.register("robot_grid", self.robot_grid.load_robots, page=self.robots_page)
+        scheduler.register("robot_detail", self.robot_detail_page.refresh_data, page=self.robot_detail_page)
+        
+        # Session timeout: log out after a period without user input
+        self.session_active = False
+        self.session_timeout = self.parse_duration(self.session_combo.currentText())
+        self.last_activity = time.monotonic()
+        if QApplication.instance():
+            QApplication.instance().installEventFilter(self)
+        scheduler.register("session_timeout", self.check_session_timeout, interval=15)
+        
         # Load user data for welcome message
         self.load_user_data()
         
@@ -221,10 +247,30 @@ class Dashboard(QWidget):
         self.load_dashboard_stats()
 
     def load_dashboard_stats(self):
-        """Load real data for dashboard widgets"""
+        """Load real data for dashboard widgets (requests run off the GUI thread)"""
+        async_client = get_async_api_client()
+        # A refresh supersedes any stats request still in flight
+        async_client.cancel_group(self.dashboard_page)
+        async_client.get_dashboard_summary(group=self.dashboard_page, callback=self.on_dashboard_summary_loaded)
+
+    def on_dashboard_summary_loaded(self, success, message, summary):
+        """Update all stat cards from the precomputed server summary"""
+        if not success:
+            print(f"Failed to load dashboard summary: {message}")
+            if (summary or {}).get('status_code') != 404:
+                return
+            # Older backends have no summary endpoint: build the cards from the full lists
+            async_client = get_async_api_client()
+            async_client.get_active_units(24, group=self.dashboard_page, callback=self.on_active_units_loaded)
+            async_client.get_robots(group=self.dashboard_page, callback=self.on_dashboard_robots_loaded)
+            return
+        self.update_widget_value(self.active_units_card, str(summary.get('active_units', 0)))
+        self.update_widget_value(self.active_streams_card, str(summary.get('active_streams', 0)))
+        self.update_widget_value(self.total_detections_card, str(summary.get('total_detections', 0)))
+
+    def on_active_units_loaded(self, success, message, active_data):
+        """Update the active units and streams cards"""
         try:
-            # Load active units data
-            success, message, active_data = api_client.get_active_units(24)
             if success and active_data:
                 active_count = active_data.get('units_count', 0)
                 self.update_widget_value(self.active_units_card, str(active_count))
@@ -239,9 +285,13 @@ class Dashboard(QWidget):
                 self.update_widget_value(self.active_streams_card, str(total_streams))
             else:
                 print(f"Failed to load active units: {message}")
-                
-            # Load robots data to get total detections
-            success, message, robots_data = api_client.get_robots()
+        except Exception as e:
+            print(f"Error loading dashboard stats: {e}")
+            # Keep default values if there's an error
+
+    def on_dashboard_robots_loaded(self, success, message, robots_data):
+        """Update the total detections card"""
+        try:
             if success and robots_data:
                 robots_list = robots_data.get('robots', [])
                 total_detections = 0
@@ -277,9 +327,11 @@ class Dashboard(QWidget):
 
     def load_user_data(self):
         """Load user data to personalize the dashboard"""
+        get_async_api_client().get_user_profile(group=self, callback=self.on_user_data_loaded)
+
+    def on_user_data_loaded(self, success, message, user_data):
+        """Personalize the welcome message once the profile arrives"""
         try:
-            success, message, user_data = api_client.get_user_profile()
-            
             if success and user_data:
                 # Backend returns user data with a 'user' object containing firstName and lastName fields
                 user_info = user_data.get('user', {}) if 'user' in user_data else user_data
@@ -295,6 +347,9 @@ class Dashboard(QWidget):
 
     # ----------------- Page Switching -----------------
     def switch_page(self, index, title):
+        # Results for the page being left are no longer wanted
+        if self.pages.currentIndex() != index:
+            get_async_api_client().cancel_group(self.pages.currentWidget())
         self.pages.setCurrentIndex(index)
         self.title_label.setText(title)
         if index < len(self.sidebar_buttons):
@@ -311,12 +366,31 @@ class Dashboard(QWidget):
 
     def reset_to_dashboard(self):
         """Reset to the main dashboard welcome page"""
+        # Logged in: start receiving pushed robot updates
+        get_live_updates().start()
+        self.session_active = True
+        self.last_activity = time.monotonic()
         self.switch_page(0, "Dashboard Overview")
         # Refresh user data for personalized welcome
         self.load_user_data()
         # Refresh dashboard stats
         self.load_dashboard_stats()
 
+    def on_live_event(self, unit_id, event_type, payload):
+        """A robot posted new data; refresh whatever overview is on screen"""
+        if self.pages.currentIndex() in (0, 1) and not self.live_refresh_timer.isActive():
+            self.live_refresh_timer.start()
+
+    def refresh_current_page(self):
+        """Reload the data shown on the dashboard or robot grid page"""
+        scheduler = get_refresh_scheduler()
+        if self.pages.currentIndex() == 0:
+            self.load_dashboard_stats()
+            scheduler.touch("dashboard_stats")
+        elif self.pages.currentIndex() == 1:
+            self.robot_grid.load_robots()
+            scheduler.touch("robot_grid")
+
     # Highlight the selected sidebar button
     def select_button(self, button):
         for btn in self.sidebar_buttons:
@@ -845,14 +919,44 @@ class Dashboard(QWidget):
             self.notifications_btn.setChecked(True)
             QMessageBox.information(self, "Notifications", "Notifications have been enabled.")
     
+    @staticmethod
+    def parse_duration(text):
+        """Convert a settings choice such as "30 seconds" or "2 hours" to seconds (None for Disabled/Never)"""
+        units = {"second": 1, "minute": 60, "hour": 3600}
+        parts = text.split()
+        if len(parts) != 2 or not parts[0].isdigit():
+            return None
+        for unit, seconds in units.items():
+            if parts[1].startswith(unit):
+                return int(parts[0]) * seconds
+        return None
+
     def change_refresh_rate(self, rate):
         """Handle auto-refresh rate change"""
+        get_refresh_scheduler().set_default_interval(self.parse_duration(rate))
         QMessageBox.information(self, "Auto-refresh", f"Auto-refresh rate changed to: {rate}")
         
         
     def change_session_timeout(self, timeout):
         """Handle session timeout change"""
+        self.session_timeout = self.parse_duration(timeout)
+        self.last_activity = time.monotonic()
         QMessageBox.information(self, "Session Timeout", f"Session timeout changed to: {timeout}")
+
+    def eventFilter(self, obj, event):
+        """Track user input for the session timeout"""
+        if event.type() in (QEvent.MouseButtonPress, QEvent.KeyPress, QEvent.Wheel):
+            self.last_activity = time.monotonic()
+        return False
+
+    def check_session_timeout(self):
+        """Log out once the session has been idle longer than the chosen timeout"""
+        if not self.session_active or not self.session_timeout:
+            return
+        if time.monotonic() - self.last_activity >= self.session_timeout:
+            print("DASHBOARD: Session timed out, logging out")
+            self.perform_logout()
+            QMessageBox.information(self, "Session Expired", "You were logged out after a period of inactivity.")
         
         
     def show_system_info(self):
@@ -860,6 +964,18 @@ class Dashboard(QWidget):
         import platform
         import sys
         
+        cache_stats = api_client.get_cache_stats()
+        thumbnail_stats = get_thumbnail_store().get_stats()
+        if api_client.local_cache:
+            local_stats = api_client.local_cache.get_stats()
+            local_cache_info = (f"{local_stats['robots']} robots, {local_stats['detections']} detections, "
+                                f"{local_stats['thumbnails']} thumbnails ({local_stats['size_kb'] // 1024} of "
+                                f"{local_stats['budget_kb'] // 1024} MB)")
+        else:
+            local_cache_info = "Disabled"
+        live_updates = get_live_updates()
+        live_status = "Connected" if live_updates.connected else "Disconnected"
+        
         system_info = f"""
 System Information:
 
@@ -873,6 +989,17 @@ Version: 1.0.0
 Backend API: Node.js + MongoDB (Connected)
 UI Framework: PyQt5
 Icons: Font Awesome 5 Solid
+
+API Response Cache:
+Hits: {cache_stats['hits']} fresh, {cache_stats['stale_hits']} stale, {cache_stats['revalidated']} not modified
+Misses: {cache_stats['misses']}
+Hit Rate: {cache_stats['hit_rate'] * 100:.1f}%
+Cached Responses: {cache_stats['entries']}
+
+Local Cache: {local_cache_info}
+Thumbnails: {thumbnail_stats['decoded']} decoded, {thumbnail_stats['hit_rate'] * 100:.1f}% hit rate ({thumbnail_stats['budget_kb'] // 1024} MB budget)
+
+Live Updates: {live_status} ({live_updates.events_received} events received)
         """
         
         QMessageBox.information(self, "System Information", system_info.strip())
@@ -888,12 +1015,21 @@ Icons: Font Awesome 5 Solid
         reply = QMessageBox.question(self, "Logout", "Confirm logout?",
                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
-            # Find the parent stacked widget and go back to login
-            parent = self.parent()
-            while parent and not hasattr(parent, 'setCurrentIndex'):
-                parent = parent.parent()
-            if parent:
-                parent.setCurrentIndex(0)  # Go back to login page
+            self.perform_logout()
+
+    def perform_logout(self):
+        """End the session and return to the login page"""
+        self.session_active = False
+        get_async_api_client().cancel_all()
+        get_live_updates().stop()
+        api_client.clear_auth_token()
+        get_thumbnail_store().clear()
+        # Find the parent stacked widget and go back to login
+        parent = self.parent()
+        while parent and not hasattr(parent, 'setCurrentIndex'):
+            parent = parent.parent()
+        if parent:
+            parent.setCurrentIndex(0)  # Go back to login page
 
     # ----------------- Stylesheet -----------------
     def load_styles(self):
@@ -1060,8 +1196,12 @@ Icons: Font Awesome 5 Solid
 
     def check_email_verification_status(self):
         """Check if the current user's email is verified"""
+        get_async_api_client().get_user_profile(group=self.email_status_label,
+                                                callback=self.on_email_verification_status)
+
+    def on_email_verification_status(self, success, message, data):
+        """Update the email status label from the user profile"""
         try:
-            success, message, data = api_client.get_user_profile()
             if success:
                 user_info = data.get('user', {})
                 is_verified = user_info.get('isEmailVerified', False)
@@ -0,0 +1,424 @@
+from datetime import datetime
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt5.QtCore import (Qt, QAbstractListModel, QSortFilterProxyModel, QModelIndex,
+                          QRect, QRectF, QSize)
+from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QFontMetrics
+from thumbnail_store import get_thumbnail_store
+
+
+def detection_key(detection):
+    """Stable identity of a detection (server id, or its time and person for older rows)"""
+    return detection.get('_id') or (detection.get('timestamp'), detection.get('person_id'),
+                                    detection.get('frame_number'))
+
+
+def get_confidence_color(confidence):
+    """Get color based on confidence level (percent)"""
+    if confidence >= 80:
+        return "#27ae60"  # Green
+    elif confidence >= 60:
+        return "#f39c12"  # Orange
+    else:
+        return "#e74c3c"  # Red
+
+
+def format_timestamp(timestamp_str):
+    """Format timestamp for display"""
+    if not timestamp_str:
+        return "Unknown time"
+
+    try:
+        dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+        return dt.strftime("%H:%M:%S")
+    except ValueError:
+        return "Unknown time"
+
+
+class DetectionListModel(QAbstractListModel):
+    """
+    Detections of one robot unit, newest first
+
+    Rows are plain detection dicts; which rows are expanded is tracked by detection
+    key so it survives refreshes and rows being pushed down by new detections.
+    """
+
+    DetectionRole = Qt.UserRole + 1
+    ExpandedRole = Qt.UserRole + 2
+    ActionTypeRole = Qt.UserRole + 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.detections = []
+        self.expanded = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.detections)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.detections):
+            return None
+
+        detection = self.detections[index.row()]
+        if role == Qt.DisplayRole:
+            return detection.get('action_type', 'Unknown').replace('_', ' ').title()
+        if role == self.DetectionRole:
+            return detection
+        if role == self.ExpandedRole:
+            return detection_key(detection) in self.expanded
+        if role == self.ActionTypeRole:
+            return detection.get('action_type', '')
+        return None
+
+    def detection_at(self, index):
+        """
+        Detection dict for an index of this model or of a proxy on top of it
+
+        Delegates use this instead of data(DetectionRole), which hands out a
+        converted copy of the dict on every call.
+        """
+        model = index.model()
+        if isinstance(model, QSortFilterProxyModel):
+            index = model.mapToSource(index)
+        return self.detections[index.row()]
+
+    def set_detections(self, detections):
+        """Replace all rows"""
+        self.beginResetModel()
+        self.detections = list(detections)
+        keys = {detection_key(detection) for detection in self.detections}
+        self.expanded &= keys
+        self.endResetModel()
+
+    def prepend_detections(self, new_detections, max_rows=None):
+        """Insert newer detections at the top, dropping the oldest rows beyond max_rows"""
+        if new_detections:
+            self.beginInsertRows(QModelIndex(), 0, len(new_detections) - 1)
+            self.detections[0:0] = new_detections
+            self.endInsertRows()
+
+        if max_rows is not None and len(self.detections) > max_rows:
+            self.beginRemoveRows(QModelIndex(), max_rows, len(self.detections) - 1)
+            for detection in self.detections[max_rows:]:
+                self.expanded.discard(detection_key(detection))
+            del self.detections[max_rows:]
+            self.endRemoveRows()
+
+    def append_detections(self, older_detections, max_rows=None):
+        """Add older detections (the next page) at the bottom, up to max_rows in total"""
+        if max_rows is not None:
+            older_detections = older_detections[:max(0, max_rows - len(self.detections))]
+        if not older_detections:
+            return
+        first = len(self.detections)
+        self.beginInsertRows(QModelIndex(), first, first + len(older_detections) - 1)
+        self.detections.extend(older_detections)
+        self.endInsertRows()
+
+    def toggle_expanded(self, row):
+        key = detection_key(self.detections[row])
+        if key in self.expanded:
+            self.expanded.discard(key)
+        else:
+            self.expanded.add(key)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [self.ExpandedRole])
+
+
+class DetectionFilterProxyModel(QSortFilterProxyModel):
+    """
+    Filters detections by the action type chosen in the page's filter combo
+
+    Matches the server's action_type filter exactly, so rows already loaded can be
+    filtered at once while the page re-queries the server.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.filter_action = None
+
+    def set_action_filter(self, filter_text):
+        """Apply a filter combo entry ("All Actions" shows everything)"""
+        self.filter_action = None if filter_text == "All Actions" else filter_text.lower().replace(' ', '_')
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.filter_action is None:
+            return True
+        detection = self.sourceModel().detections[source_row]
+        return detection.get('action_type') == self.filter_action
+
+
+class DetectionItemDelegate(QStyledItemDelegate):
+    """
+    Paints a detection row as a card
+
+    Collapsed rows are a single header line. Expanded rows add the details
+    (person, frame, tracking, position, pose scores and thumbnail), laid out on
+    demand while painting, so no per-row widgets exist and only rows on screen
+    cost anything. Thumbnails come from ThumbnailStore, which fetches them the
+    first time an expanded row is painted.
+    """
+
+    MARGIN_X = 16
+    MARGIN_Y = 6
+    PADDING = 12
+    HEADER_HEIGHT = 36
+    LINE_HEIGHT = 22
+    THUMB_SIZE = QSize(80, 60)
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.header_font = QFont()
+        self.header_font.setPointSize(11)
+        self.header_font.setBold(True)
+        self.text_font = QFont()
+        self.text_font.setPointSize(9)
+        self.small_font = QFont()
+        self.small_font.setPointSize(8)
+
+    def pose_rows(self, detection):
+        """Pose scores worth showing, highest first"""
+        pose_scores = detection.get('pose_scores') or {}
+        return [(action, score) for action, score in sorted(pose_scores.items(), key=lambda x: x[1], reverse=True)
+                if score > 0.005]
+
+    def details_height(self, detection):
+        lines = 2
+        bbox = detection.get('normalized_bbox') or {}
+        if bbox.get('confidence', 0) > 0:
+            lines += 1
+        poses = self.pose_rows(detection)
+        if poses:
+            lines += 1 + (len(poses) + 1) // 2
+        text_height = lines * self.LINE_HEIGHT
+        return max(text_height, self.THUMB_SIZE.height() + 2 * self.LINE_HEIGHT) + self.PADDING
+
+    def sizeHint(self, option, index):
+        height = self.HEADER_HEIGHT + 2 * self.PADDING
+        if index.data(DetectionListModel.ExpandedRole):
+            height += self.details_height(self.model.detection_at(index))
+        return QSize(option.rect.width(), height + 2 * self.MARGIN_Y)
+
+    def paint(self, painter, option, index):
+        detection = self.model.detection_at(index)
+        expanded = bool(index.data(DetectionListModel.ExpandedRole))
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        card = option.rect.adjusted(self.MARGIN_X, self.MARGIN_Y, -self.MARGIN_X, -self.MARGIN_Y)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        painter.setPen(QPen(QColor("#3498db" if hovered else "#e1e8ed"), 1))
+        painter.setBrush(QColor("#f8f9fa" if hovered else "white"))
+        painter.drawRoundedRect(QRectF(card), 6, 6)
+
+        content = card.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        header = QRect(content.left(), content.top(), content.width(), self.HEADER_HEIGHT)
+        self.paint_header(painter, header, detection, expanded)
+
+        if expanded:
+            details = QRect(content.left(), header.bottom() + self.PADDING,
+                            content.width(), content.bottom() - header.bottom() - self.PADDING)
+            self.paint_details(painter, details, detection)
+
+        painter.restore()
+
+    def paint_header(self, painter, rect, detection, expanded):
+        # Expand/collapse icon
+        painter.setFont(self.text_font)
+        painter.setPen(QColor("#7f8c8d"))
+        painter.drawText(QRect(rect.left(), rect.top(), 20, rect.height()), Qt.AlignCenter,
+                         "▼" if expanded else "▶")
+
+        # Timestamp (right aligned)
+        painter.setFont(self.small_font)
+        timestamp_str = format_timestamp(detection.get('timestamp', ''))
+        timestamp_width = QFontMetrics(self.small_font).horizontalAdvance(timestamp_str)
+        timestamp_rect = QRect(rect.right() - timestamp_width, rect.top(), timestamp_width, rect.height())
+        painter.drawText(timestamp_rect, Qt.AlignVCenter | Qt.AlignRight, timestamp_str)
+
+        # Confidence pill
+        confidence = detection.get('confidence', 0) * 100
+        color = QColor(get_confidence_color(confidence))
+        confidence_text = f"{confidence:.1f}%"
+        painter.setFont(self.text_font)
+        pill_width = QFontMetrics(self.text_font).horizontalAdvance(confidence_text) + 16
+        pill = QRect(timestamp_rect.left() - 12 - pill_width, rect.center().y() - 11, pill_width, 22)
+        background = QColor(color)
+        background.setAlpha(32)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(QRectF(pill), 4, 4)
+        painter.setPen(color)
+        painter.drawText(pill, Qt.AlignCenter, confidence_text)
+
+        # Action type
+        painter.setFont(self.header_font)
+        painter.setPen(QColor("#2c3e50"))
+        action_text = detection.get('action_type', 'Unknown').replace('_', ' ').title()
+        painter.drawText(QRect(rect.left() + 28, rect.top(), pill.left() - rect.left() - 36, rect.height()),
+                         Qt.AlignVCenter | Qt.AlignLeft, action_text)
+
+    def paint_details(self, painter, rect, detection):
+        right_width = self.THUMB_SIZE.width() + 2 + self.PADDING
+        text_rect = QRect(rect.left(), rect.top(), rect.width() - right_width, self.LINE_HEIGHT)
+        column_width = text_rect.width() // 2
+
+        def draw_pair(label, value, x, y, value_color="#2c3e50"):
+            painter.setFont(self.text_font)
+            painter.setPen(QColor("#7f8c8d"))
+            label_width = QFontMetrics(self.text_font).horizontalAdvance(label) + 6
+            painter.drawText(QRect(x, y, label_width, self.LINE_HEIGHT), Qt.AlignVCenter, label)
+            painter.setPen(QColor(value_color))
+            painter.drawText(QRect(x + label_width, y, column_width - label_width, self.LINE_HEIGHT),
+                             Qt.AlignVCenter, value)
+
+        # Person and frame info
+        y = text_rect.top()
+        draw_pair("Person ID:", str(detection.get('person_id', 'N/A')), text_rect.left(), y, "#3498db")
+        draw_pair("Frame #:", str(detection.get('frame_number', 'N/A')), text_rect.left() + column_width, y)
+
+        # Tracking and position
+        y += self.LINE_HEIGHT
+        tracking_info = detection.get('tracking_info') or {}
+        if tracking_info.get('is_tracked', False):
+            draw_pair("Tracking:", f"Tracked ({tracking_info.get('tracking_age', 0)}f)", text_rect.left(), y, "#27ae60")
+        else:
+            draw_pair("Tracking:", "Not Tracked", text_rect.left(), y, "#95a5a6")
+        bbox = detection.get('normalized_bbox') or {}
+        position = f"({bbox.get('x', 0):.2f}, {bbox.get('y', 0):.2f})" if bbox else "No position data"
+        draw_pair("Position:", position, text_rect.left() + column_width, y)
+
+        # Bounding box confidence if available
+        bbox_conf = bbox.get('confidence', 0) if bbox else 0
+        if bbox_conf > 0:
+            y += self.LINE_HEIGHT
+            draw_pair("Detection Quality:", f"{bbox_conf * 100:.0f}%", text_rect.left(), y,
+                      get_confidence_color(bbox_conf * 100))
+
+        # Pose scores in two columns
+        poses = self.pose_rows(detection)
+        if poses:
+            y += self.LINE_HEIGHT
+            dominant_action, max_score = poses[0]
+            primary = f"Primary: {dominant_action.replace('_', ' ').title()}" if max_score > 0.1 else ""
+            draw_pair("Pose Analysis:", primary, text_rect.left(), y)
+            for i, (action, score) in enumerate(poses):
+                row_y = y + self.LINE_HEIGHT * (1 + i // 2)
+                x = text_rect.left() + (i % 2) * column_width
+                self.paint_score(painter, QRect(x, row_y, column_width, self.LINE_HEIGHT), action, score)
+
+        # Thumbnail and bounding box sketch on the right
+        thumb_rect = QRect(rect.right() - self.THUMB_SIZE.width() - 2, rect.top(),
+                           self.THUMB_SIZE.width() + 2, self.THUMB_SIZE.height() + 2)
+        self.paint_thumbnail(painter, thumb_rect, detection)
+        if bbox:
+            self.paint_bbox(painter, QRect(thumb_rect.left(), thumb_rect.bottom() + 6,
+                                           thumb_rect.width(), 40), bbox)
+
+    def paint_score(self, painter, rect, action, score):
+        painter.setFont(self.small_font)
+        painter.setPen(QColor("#2c3e50"))
+        painter.drawText(QRect(rect.left(), rect.top(), 80, rect.height()), Qt.AlignVCenter,
+                         action.replace('_', ' ').title())
+
+        # Color coding for pose confidence
+        if score >= 0.5:
+            color = "#27ae60"
+        elif score >= 0.2:
+            color = "#f39c12"
+        else:
+            color = "#95a5a6"
+        bar = QRect(rect.left() + 84, rect.center().y() - 6, 60, 12)
+        painter.setPen(QPen(QColor("#bdc3c7"), 1))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRoundedRect(QRectF(bar), 2, 2)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(color))
+        painter.drawRoundedRect(QRectF(bar.left() + 1, bar.top() + 1, (bar.width() - 2) * min(score, 1.0),
+                                       bar.height() - 2), 1, 1)
+        painter.setPen(QColor("#2c3e50"))
+        painter.drawText(bar, Qt.AlignCenter, f"{score:.2f}")
+
+    def paint_thumbnail(self, painter, rect, detection):
+        painter.setPen(QPen(QColor("#bdc3c7"), 1))
+        painter.setBrush(QColor("#f8f9fa"))
+        painter.drawRoundedRect(QRectF(rect), 3, 3)
+
+        store = get_thumbnail_store()
+        if not store.has_thumbnail(detection):
+            message = "No thumbnail"
+        else:
+            pixmap = store.get(detection)
+            if pixmap is not None:
+                scaled = pixmap.scaled(self.THUMB_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                painter.drawPixmap(rect.center().x() - scaled.width() // 2,
+                                   rect.center().y() - scaled.height() // 2, scaled)
+                return
+            message = "Unavailable" if store.key_for(detection) in store.failed else "Loading..."
+
+        painter.setFont(self.small_font)
+        painter.setPen(QColor("#95a5a6"))
+        painter.drawText(rect, Qt.AlignCenter, message)
+
+    def paint_bbox(self, painter, rect, bbox):
+        """Mini visualization of where the person is in the frame"""
+        painter.setPen(QPen(QColor("#bdc3c7"), 1))
+        painter.setBrush(QColor("#ecf0f1"))
+        painter.drawRoundedRect(QRectF(rect), 3, 3)
+        inner = rect.adjusted(5, 5, -5, -5)
+        painter.setPen(QPen(QColor("#e74c3c"), 2))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(int(inner.left() + bbox.get('x', 0) * inner.width()),
+                         int(inner.top() + bbox.get('y', 0) * inner.height()),
+                         int(bbox.get('width', 0) * inner.width()),
+                         int(bbox.get('height', 0) * inner.height()))
+
+
+class DetectionListView(QListView):
+    """
+    Scrollable detection list backed by DetectionListModel
+
+    Clicking a row expands or collapses its details. Rows are laid out in batches
+    and painted by DetectionItemDelegate, so the list stays responsive with tens
+    of thousands of detections.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.detection_model = DetectionListModel(self)
+        self.proxy_model = DetectionFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.detection_model)
+        self.setModel(self.proxy_model)
+
+        self.delegate = DetectionItemDelegate(self.detection_model, self)
+        self.setItemDelegate(self.delegate)
+
+        self.setUniformItemSizes(False)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(200)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+
+        self.clicked.connect(self.toggle_expansion)
+        # Repaint when a thumbnail for a visible row finishes loading
+        get_thumbnail_store().thumbnail_ready.connect(self.on_thumbnail_ready)
+
+    def on_thumbnail_ready(self, key):
+        self.viewport().update()
+
+    def toggle_expansion(self, index):
+        """Expand or collapse the clicked detection"""
+        source_index = self.proxy_model.mapToSource(index)
+        self.detection_model.toggle_expanded(source_index.row())
+        self.delegate.sizeHintChanged.emit(index)
+
+    def set_action_filter(self, filter_text):
+        self.proxy_model.set_action_filter(filter_text)
+
+    def visible_count(self):
+        return self.proxy_model.rowCount()
@@ -3,7 +3,7 @@ from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButt
 from PyQt5.QtGui import QFont, QPixmap
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from icon_utils import IconManager
-from api_client import api_client
+from api_client import get_async_api_client
 from theme_manager import ThemeManager
 
 class EmailConfirmationDialog(QDialog):
@@ -24,6 +24,7 @@ class EmailConfirmationDialog(QDialog):
         self.verification_timer.timeout.connect(self.check_verification_status)
         self.poll_interval = 5000  # 5 seconds
         self.is_verified = False
+        self.status_request = None  # Verification check currently in flight
         
         # Apply CORA styling
         self.setStyleSheet(self.load_styles())
@@ -168,11 +169,21 @@ class EmailConfirmationDialog(QDialog):
         """Stop polling for email verification status"""
         if self.verification_timer.isActive():
             self.verification_timer.stop()
+        if self.status_request:
+            self.status_request.cancel()
+            self.status_request = None
     
     def check_verification_status(self):
         """Check if the email has been verified"""
+        # Skip this tick if the previous check has not answered yet
+        if self.status_request and not self.status_request.done:
+            return
         print(f"Checking verification status for: {self.user_email}")
-        success, message, data = api_client.check_verification_status(self.user_email)
+        self.status_request = get_async_api_client().check_verification_status(
+            self.user_email, group=self, callback=self.on_verification_status)
+    
+    def on_verification_status(self, success, message, data):
+        """Handle a verification status result on the GUI thread"""
         print(f"Verification check result: success={success}, data={data}")
         
         if success and data.get('isEmailVerified', False):
@@ -212,12 +223,18 @@ class EmailConfirmationDialog(QDialog):
     def closeEvent(self, event):
         """Handle dialog close event"""
         self.stop_verification_polling()
+        get_async_api_client().cancel_group(self)
         super().closeEvent(event)
     
     def resend_verification(self):
         """Resend verification email"""
-        success, message, data = api_client.resend_verification_email(self.user_email)
-        
+        self.resend_button.setEnabled(False)
+        get_async_api_client().resend_verification_email(self.user_email, group=self,
+                                                         callback=self.on_resend_finished)
+    
+    def on_resend_finished(self, success, message, data):
+        """Update the resend button with the result"""
+        self.resend_button.setEnabled(True)
         if success:
             self.resend_button.setText("Email Sent!")
             self.resend_button.setStyleSheet("""
@@ -0,0 +1,208 @@
+"""
+Local stand-in for the backend's live update stream
+
+Serves GET /api/detections/stream as Server-Sent Events (same event format as the
+Node backend) and publishes an event for every POST /api/detections it receives,
+so the desktop client's LiveUpdateSubscriber can be exercised without MongoDB.
+
+Usage:
+    python live_stand_in_server.py --port 5055 --interval 2 --units robot_01 robot_02
+    (then point APIClient.base_url at http://127.0.0.1:5055)
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class EventHub:
+    """Keeps connected stream clients and a short replay buffer"""
+
+    def __init__(self, replay_size=200):
+        self.lock = threading.Lock()
+        self.clients = []
+        self.recent = []
+        self.replay_size = replay_size
+        self.next_id = 1
+
+    def publish(self, event_type, unit_id, payload):
+        with self.lock:
+            event = (self.next_id, event_type, unit_id, json.dumps({"unit_id": unit_id, **payload}))
+            self.next_id += 1
+            self.recent.append(event)
+            del self.recent[:-self.replay_size]
+            for client in list(self.clients):
+                client.put(event)
+        return event[0]
+
+    def add(self, client, last_event_id=None):
+        with self.lock:
+            self.clients.append(client)
+            if last_event_id is not None:
+                for event in self.recent:
+                    if event[0] > last_event_id:
+                        client.put(event)
+
+    def remove(self, client):
+        with self.lock:
+            if client in self.clients:
+                self.clients.remove(client)
+
+
+class StreamClient:
+    """Pending events for one connected stream"""
+
+    def __init__(self, unit_id=None):
+        self.unit_id = unit_id
+        self.events = []
+        self.condition = threading.Condition()
+
+    def put(self, event):
+        if self.unit_id and event[2] != self.unit_id:
+            return
+        with self.condition:
+            self.events.append(event)
+            self.condition.notify()
+
+    def take(self, timeout):
+        with self.condition:
+            if not self.events:
+                self.condition.wait(timeout)
+            events, self.events = self.events, []
+        return events
+
+
+def make_detection(person_id):
+    """Synthetic detection in the shape the backend stores"""
+    return {
+        "_id": uuid.uuid4().hex[:24],
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "action_type": random.choice(["sitting", "standing", "walking"]),
+        "confidence": round(random.uniform(0.6, 0.99), 3),
+        "person_id": person_id,
+        "frame_number": random.randint(1, 100000),
+        "has_thumbnail": False
+    }
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hub = None
+    heartbeat = 25.0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/api/detections/stream":
+            self.send_json(404, {"success": False, "message": f"Route GET {url.path} not found"})
+            return
+
+        unit_id = parse_qs(url.query).get("unit_id", [None])[0]
+        last_event_id = self.headers.get("Last-Event-ID")
+        client = StreamClient(unit_id)
+        self.hub.add(client, int(last_event_id) if last_event_id and last_event_id.isdigit() else None)
+
+        # Chunked like the Express backend's event stream
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            self.write_chunk("retry: 2000\n: connected\n\n")
+            while True:
+                events = client.take(self.heartbeat)
+                if not events:
+                    self.write_chunk(": heartbeat\n\n")
+                for event_id, event_type, _, data in events:
+                    self.write_chunk(f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.hub.remove(client)
+            self.close_connection = True
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self.send_json(400, {"success": False, "message": "Invalid JSON"})
+            return
+
+        if url.path != "/api/detections" or not body.get("unit_id"):
+            self.send_json(400, {"success": False, "message": "Expected POST /api/detections with unit_id"})
+            return
+
+        detections = [{k: v for k, v in det.items() if k != "thumbnail"} for det in body.get("detections", [])]
+        self.hub.publish("detections", body["unit_id"], {
+            "unit_name": body.get("unit_name", body["unit_id"]),
+            "count": len(detections),
+            "cursor": uuid.uuid4().hex[:24],
+            "detections": detections
+        })
+        self.send_json(201, {"success": True, "message": "Robot detection data processed successfully"})
+
+    def write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in_server(port=5055, host="127.0.0.1"):
+    """Start the stand-in in a background thread; returns (server, hub)"""
+    hub = EventHub()
+    handler = type("Handler", (StandInHandler,), {"hub": hub})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hub
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in server for the CORA live update stream")
+    parser.add_argument("--port", type=int, default=5055, help="Port to listen on (default: 5055)")
+    parser.add_argument("--interval", type=float, default=0, help="Seconds between synthetic events, 0 to only relay POSTs (default: 0)")
+    parser.add_argument("--units", nargs="+", default=["robot_01"], help="Unit ids for synthetic events")
+    args = parser.parse_args()
+
+    server, hub = start_stand_in_server(args.port)
+    print(f"Live stand-in server at http://127.0.0.1:{args.port}/api/detections/stream")
+    try:
+        while True:
+            if args.interval > 0:
+                time.sleep(args.interval)
+                unit_id = random.choice(args.units)
+                detections = [make_detection(i) for i in range(random.randint(1, 3))]
+                event_id = hub.publish("detections", unit_id, {
+                    "unit_name": unit_id,
+                    "count": len(detections),
+                    "cursor": detections[-1]["_id"],
+                    "detections": detections
+                })
+                print(f"Published event {event_id} for {unit_id} ({len(detections)} detections)")
+            else:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
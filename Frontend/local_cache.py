@@ -0,0 +1,265 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+def user_config_dir(app_name: str = "CORA") -> str:
+    """Per-user configuration directory for the application"""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~\\AppData\\Roaming")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base, app_name)
+
+
+class LocalCache:
+    """
+    On-disk cache of robots, detections and thumbnails (SQLite in WAL mode)
+
+    Lets the desktop client show the last known state immediately on start-up and
+    when opening a robot, then reconcile with the server: detections are append-only,
+    so the cached rows plus a delta fetched from the stored sync cursor are the
+    current list. The database stays under max_bytes by evicting the least recently
+    used thumbnails first, then the oldest detections. The cache belongs to one user
+    account and is wiped when a different account logs in.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS robots (
+            unit_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS detections (
+            id TEXT PRIMARY KEY,
+            unit_id TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            data TEXT NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS detections_unit_time ON detections (unit_id, timestamp DESC);
+        CREATE INDEX IF NOT EXISTS detections_time ON detections (timestamp);
+        CREATE TABLE IF NOT EXISTS thumbnails (
+            url TEXT PRIMARY KEY,
+            image BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS thumbnails_last_used ON thumbnails (last_used);
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path or os.path.join(user_config_dir(), "cache.sqlite3")
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        # One connection shared by the GUI thread and API worker threads
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(self.SCHEMA)
+        self.total_bytes = self._count_bytes()
+        self.stats = {'robot_hits': 0, 'detection_hits': 0, 'thumbnail_hits': 0, 'thumbnail_misses': 0, 'evicted': 0}
+        print(f" LOCAL CACHE: Opened {self.path} ({self.total_bytes // 1024} KB)")
+
+    def _count_bytes(self) -> int:
+        return sum(self.db.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+                   for table in ("robots", "detections", "thumbnails"))
+
+    def _stored_size(self, table: str, key: str, values: List[str]) -> int:
+        """Bytes currently stored for the given keys (rows about to be replaced)"""
+        total = 0
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            total += self.db.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table} WHERE {key} IN ({placeholders})",
+                                     chunk).fetchone()[0]
+        return total
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Optional[str]):
+        if value is None:
+            self.db.execute("DELETE FROM meta WHERE key = ?", (key,))
+        else:
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def set_owner(self, email: str):
+        """Bind the cache to a user account, wiping another account's data"""
+        with self.lock:
+            owner = self._get_meta("owner")
+            if owner == email:
+                return
+            if owner is not None:
+                print(" LOCAL CACHE: Different account logged in, clearing cache")
+            self._clear()
+            self._set_meta("owner", email)
+            self.db.commit()
+
+    def clear(self):
+        """Delete everything, overwriting it on disk (detections and thumbnails show people)"""
+        with self.lock:
+            self.db.execute("PRAGMA secure_delete = ON")
+            try:
+                self._clear()
+                self.db.commit()
+                # Deleted rows would otherwise survive in free pages and the write-ahead log
+                self.db.execute("PRAGMA incremental_vacuum")
+                self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                self.db.execute("PRAGMA secure_delete = OFF")
+            print(" LOCAL CACHE: Cleared")
+
+    def _clear(self):
+        for table in ("robots", "detections", "thumbnails", "meta"):
+            self.db.execute(f"DELETE FROM {table}")
+        self.total_bytes = 0
+
+    # Robots
+
+    def put_robots(self, robots: List[Dict[str, Any]]):
+        """Replace the cached robot list"""
+        now = time.time()
+        rows = []
+        for robot in robots:
+            data = json.dumps(robot)
+            rows.append((robot.get('unit_id'), data, len(data), now))
+        rows = [row for row in rows if row[0]]
+        with self.lock:
+            self.total_bytes -= self.db.execute("SELECT COALESCE(SUM(size), 0) FROM robots").fetchone()[0]
+            self.db.execute("DELETE FROM robots")
+            self.db.executemany("INSERT OR REPLACE INTO robots (unit_id, data, size, updated_at) VALUES (?, ?, ?, ?)", rows)
+            self.db.commit()
+            self.total_bytes += sum(row[2] for row in rows)
+
+    def get_robots(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.db.execute("SELECT data FROM robots ORDER BY unit_id").fetchall()
+        if rows:
+            self.stats['robot_hits'] += 1
+        return [json.loads(row[0]) for row in rows]
+
+    # Detections
+
+    def put_detections(self, unit_id: str, detections: List[Dict[str, Any]], replace: bool = False):
+        """
+        Store detections for a unit
+
+        Args:
+            unit_id: Robot unit identifier
+            detections: Detection dicts as returned by the API (need an _id)
+            replace: Drop the unit's cached detections first (after a sync reset)
+        """
+        rows = []
+        for detection in detections:
+            if not detection.get('_id'):
+                continue
+            data = json.dumps(detection)
+            rows.append((detection['_id'], unit_id, str(detection.get('timestamp', '')), data, len(data)))
+        with self.lock:
+            if replace:
+                self.total_bytes -= self.db.execute("SELECT COALESCE(SUM(size), 0) FROM detections WHERE unit_id = ?",
+                                                    (unit_id,)).fetchone()[0]
+                self.db.execute("DELETE FROM detections WHERE unit_id = ?", (unit_id,))
+            else:
+                self.total_bytes -= self._stored_size("detections", "id", [row[0] for row in rows])
+            self.db.executemany("INSERT OR REPLACE INTO detections (id, unit_id, timestamp, data, size) "
+                                "VALUES (?, ?, ?, ?, ?)", rows)
+            self.db.commit()
+            self.total_bytes += sum(row[4] for row in rows)
+            self._evict()
+
+    def get_detections(self, unit_id: str, limit: int = 200) -> List[Dict[str, Any]]:
+        """Newest cached detections of a unit"""
+        with self.lock:
+            rows = self.db.execute("SELECT data FROM detections WHERE unit_id = ? ORDER BY timestamp DESC LIMIT ?",
+                                   (unit_id, limit)).fetchall()
+        if rows:
+            self.stats['detection_hits'] += 1
+        return [json.loads(row[0]) for row in rows]
+
+    def get_sync_cursor(self, unit_id: str) -> Optional[str]:
+        """Delta sync cursor the cached detections of a unit are current up to"""
+        with self.lock:
+            return self._get_meta(f"cursor:{unit_id}")
+
+    def set_sync_cursor(self, unit_id: str, cursor: Optional[str]):
+        with self.lock:
+            self._set_meta(f"cursor:{unit_id}", cursor)
+            self.db.commit()
+
+    # Thumbnails
+
+    def put_thumbnail(self, url: str, image: bytes):
+        with self.lock:
+            self.total_bytes -= self._stored_size("thumbnails", "url", [url])
+            self.db.execute("INSERT OR REPLACE INTO thumbnails (url, image, size, last_used) VALUES (?, ?, ?, ?)",
+                            (url, sqlite3.Binary(image), len(image), time.time()))
+            self.db.commit()
+            self.total_bytes += len(image)
+            self._evict()
+
+    def get_thumbnail(self, url: str) -> Optional[bytes]:
+        with self.lock:
+            row = self.db.execute("SELECT image FROM thumbnails WHERE url = ?", (url,)).fetchone()
+            if row:
+                self.db.execute("UPDATE thumbnails SET last_used = ? WHERE url = ?", (time.time(), url))
+                self.db.commit()
+        self.stats['thumbnail_hits' if row else 'thumbnail_misses'] += 1
+        return bytes(row[0]) if row else None
+
+    # Eviction
+
+    def _evict(self):
+        """Shrink to 90% of the budget: least recently used thumbnails first, then oldest detections"""
+        if self.total_bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+
+        for table, order in (("thumbnails", "last_used"), ("detections", "timestamp")):
+            key = "url" if table == "thumbnails" else "id"
+            while self.total_bytes > target:
+                rows = self.db.execute(f"SELECT {key}, size FROM {table} ORDER BY {order} LIMIT 500").fetchall()
+                if not rows:
+                    break
+                freed = 0
+                batch = []
+                for row_key, size in rows:
+                    batch.append((row_key,))
+                    freed += size
+                    if self.total_bytes - freed <= target:
+                        break
+                self.db.executemany(f"DELETE FROM {table} WHERE {key} = ?", batch)
+                self.total_bytes -= freed
+                evicted += len(batch)
+
+        self.db.commit()
+        self.db.execute("PRAGMA incremental_vacuum")
+        self.stats['evicted'] += evicted
+        print(f" LOCAL CACHE: Evicted {evicted} entries ({self.total_bytes // 1024} KB kept)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            counts = {table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                      for table in ("robots", "detections", "thumbnails")}
+        return {**self.stats, **counts, 'size_kb': self.total_bytes // 1024, 'budget_kb': self.max_bytes // 1024}
+
+    def close(self):
+        with self.lock:
+            self.db.close()
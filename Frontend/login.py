@@ -3,7 +3,7 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit
 from PyQt5.QtGui import QFont, QPixmap
 from PyQt5.QtCore import Qt
 from icon_utils import IconManager
-from api_client import api_client
+from api_client import api_client, get_async_api_client
 from theme_manager import ThemeManager
 
 class LoginPage(QWidget):
@@ -132,10 +132,21 @@ class LoginPage(QWidget):
             QMessageBox.warning(self, "Error", "Please fill all fields.")
             return
 
+        # Ignore repeated clicks while a login request is in flight
+        if not self.login_button.isEnabled():
+            return
+
         print(" LOGIN: About to call API client...")
+        self.login_button.setEnabled(False)
+        self.login_button.setText("Logging in...")
+        # Call backend API for login off the GUI thread
+        get_async_api_client().login(email, password, group=self, callback=self.on_login_finished)
+
+    def on_login_finished(self, success, message, data):
+        """Handle the login result on the GUI thread"""
+        self.login_button.setEnabled(True)
+        self.login_button.setText("Login")
         try:
-            # Call backend API for login
-            success, message, data = api_client.login(email, password)
             print(f" LOGIN: API call completed - Success: {success}, Message: {message}")
             
             if success:
@@ -5,6 +5,7 @@ from PyQt5.QtWidgets import QApplication, QStackedWidget
 from login import LoginPage
 from signup import SignUpPage
 from dashboard import Dashboard
+from api_client import api_client
 
 # -----------------------------
 # Main application entry point
@@ -13,6 +14,9 @@ from dashboard import Dashboard
 # Create the application object
 app = QApplication(sys.argv)
 
+# Keep robots, detections and thumbnails on disk between sessions
+api_client.enable_local_cache()
+
 # QStackedWidget allows stacking multiple pages
 main_window = QStackedWidget()
 main_window.setWindowTitle("CORA")
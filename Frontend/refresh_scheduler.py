@@ -0,0 +1,125 @@
+import time
+from typing import Callable, Optional
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QWidget
+
+
+class RefreshJob:
+    """A periodic refresh registered by a page"""
+
+    def __init__(self, name: str, callback: Callable[[], None], interval: Optional[float] = None,
+                 page: QWidget = None):
+        self.name = name
+        self.callback = callback
+        # None follows the auto-refresh rate chosen in settings
+        self.interval = interval
+        self.page = page
+        self.last_run = time.monotonic()
+        self.runs = 0
+        self.paused = False
+
+
+class RefreshScheduler(QObject):
+    """
+    Central timer for page auto-refresh
+
+    Pages register jobs instead of owning QTimers. A job only runs while its page is
+    actually on screen: the page (and every parent QStackedWidget page) is current
+    and the window is not minimized. A job that was paused and is overdue runs on
+    the first tick after its page comes back. Jobs without an interval of their own
+    follow the user's auto-refresh setting; request coalescing for overlapping
+    refreshes happens in AsyncAPIClient.
+    """
+
+    TICK_MS = 1000
+
+    def __init__(self, default_interval: Optional[float] = 30.0):
+        super().__init__()
+        self.default_interval = default_interval
+        self.jobs = {}
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(self.TICK_MS)
+
+    def register(self, name: str, callback: Callable[[], None], interval: Optional[float] = None,
+                 page: QWidget = None) -> RefreshJob:
+        """
+        Register (or replace) a refresh job
+
+        Args:
+            name: Unique job name
+            callback: Function that starts the refresh
+            interval: Seconds between runs (default: the user's auto-refresh rate)
+            page: Widget that must be visible for the job to run (None: always runs)
+
+        Returns:
+            The registered RefreshJob
+        """
+        job = RefreshJob(name, callback, interval, page)
+        self.jobs[name] = job
+        if page is not None:
+            page.destroyed.connect(lambda *_: self.unregister(name))
+        print(f" SCHEDULER: Registered job '{name}' ({self.describe_interval(job)})")
+        return job
+
+    def unregister(self, name: str):
+        self.jobs.pop(name, None)
+
+    def set_default_interval(self, seconds: Optional[float]):
+        """Apply the auto-refresh rate from settings (None disables rate-following jobs)"""
+        self.default_interval = seconds
+        print(f" SCHEDULER: Auto-refresh rate set to {seconds if seconds else 'disabled'}")
+
+    def interval_for(self, job: RefreshJob) -> Optional[float]:
+        return job.interval if job.interval is not None else self.default_interval
+
+    def describe_interval(self, job: RefreshJob) -> str:
+        interval = self.interval_for(job)
+        return f"every {interval:g}s" if interval else "disabled"
+
+    def is_on_screen(self, page: QWidget) -> bool:
+        """Hidden stack pages are not visible; minimized windows still are"""
+        if page is None:
+            return True
+        window = page.window()
+        return page.isVisible() and not (window and window.isMinimized())
+
+    def tick(self):
+        now = time.monotonic()
+        for job in list(self.jobs.values()):
+            interval = self.interval_for(job)
+            if not interval:
+                continue
+
+            if not self.is_on_screen(job.page):
+                job.paused = True
+                continue
+            job.paused = False
+
+            if now - job.last_run >= interval:
+                self.run(job, now)
+
+    def run(self, job: RefreshJob, now: float = None):
+        job.last_run = now if now is not None else time.monotonic()
+        job.runs += 1
+        try:
+            job.callback()
+        except Exception as e:
+            print(f" SCHEDULER: Job '{job.name}' failed: {type(e).__name__}: {str(e)}")
+
+    def touch(self, name: str):
+        """Mark a job as just refreshed (e.g. after a manual or pushed refresh)"""
+        job = self.jobs.get(name)
+        if job:
+            job.last_run = time.monotonic()
+
+
+# Shared scheduler (created lazily: needs a Qt application)
+_refresh_scheduler = None
+
+def get_refresh_scheduler() -> RefreshScheduler:
+    """Get the application's RefreshScheduler"""
+    global _refresh_scheduler
+    if _refresh_scheduler is None:
+        _refresh_scheduler = RefreshScheduler()
+    return _refresh_scheduler
@@ -4,7 +4,8 @@ from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from datetime import datetime, timedelta
 import json
-from api_client import api_client
+from api_client import api_client, get_async_api_client, get_live_updates
+from detection_list import DetectionListView
 import sys
 import platform
 from theme_manager import ThemeManager
@@ -467,516 +468,6 @@ class ExpandedStreamDialog(QDialog):
         event.accept()
 
 
-class DetectionItemWidget(QWidget):
-    """
-    Widget to display a single detection item
-    Can be expanded to show detailed information
-    """
-    
-    def __init__(self, detection_data, parent=None):
-        super().__init__(parent)
-        self.detection_data = detection_data
-        self.expanded = False
-        
-        self.setup_ui()
-        self.setup_style()
-        
-    def setup_ui(self):
-        """Setup the detection item UI"""
-        self.main_layout = QVBoxLayout(self)
-        self.main_layout.setSpacing(8)
-        self.main_layout.setContentsMargins(12, 8, 12, 8)
-        
-        # Header (always visible)
-        self.create_header()
-        
-        # Details (expandable)
-        self.details_widget = QWidget()
-        self.details_layout = QVBoxLayout(self.details_widget)
-        self.details_layout.setContentsMargins(0, 8, 0, 0)
-        self.create_details()
-        
-        self.details_widget.hide()
-        self.main_layout.addWidget(self.details_widget)
-        
-    def create_header(self):
-        """Create the header section (always visible)"""
-        header_layout = QHBoxLayout()
-        
-        # Expand/collapse icon
-        self.expand_icon = QLabel("▶")
-        self.expand_icon.setStyleSheet("font-size: 12px; color: #7f8c8d;")
-        self.expand_icon.setFixedSize(20, 20)
-        self.expand_icon.setAlignment(Qt.AlignCenter)
-        header_layout.addWidget(self.expand_icon)
-        
-        # Action type without emoji
-        action_text = self.detection_data.get('action_type', 'Unknown').replace('_', ' ').title()
-        
-        self.action_label = QLabel(action_text)
-        self.action_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #2c3e50;")
-        header_layout.addWidget(self.action_label)
-        
-        header_layout.addStretch()
-        
-        # Confidence
-        confidence = self.detection_data.get('confidence', 0) * 100
-        confidence_color = self.get_confidence_color(confidence)
-        
-        self.confidence_label = QLabel(f"{confidence:.1f}%")
-        self.confidence_label.setStyleSheet(f"font-weight: bold; color: {confidence_color}; background-color: {confidence_color}20; padding: 4px 8px; border-radius: 4px;")
-        header_layout.addWidget(self.confidence_label)
-        
-        # Timestamp
-        timestamp_str = self.format_timestamp(self.detection_data.get('timestamp', ''))
-        self.timestamp_label = QLabel(timestamp_str)
-        self.timestamp_label.setStyleSheet("font-size: 11px; color: #7f8c8d; margin-left: 12px;")
-        header_layout.addWidget(self.timestamp_label)
-        
-        self.main_layout.addLayout(header_layout)
-        
-    def create_details(self):
-        """Create the details section (expandable)"""
-        # Person and frame info
-        info_layout = QGridLayout()
-        
-        info_layout.addWidget(QLabel("Person ID:"), 0, 0)
-        person_id_label = QLabel(str(self.detection_data.get('person_id', 'N/A')))
-        person_id_label.setStyleSheet("font-weight: bold; color: #3498db;")
-        info_layout.addWidget(person_id_label, 0, 1)
-        
-        info_layout.addWidget(QLabel("Frame #:"), 0, 2)
-        frame_label = QLabel(str(self.detection_data.get('frame_number', 'N/A')))
-        frame_label.setStyleSheet("font-family: monospace;")
-        info_layout.addWidget(frame_label, 0, 3)
-        
-        # Enhanced tracking info
-        tracking_info = self.detection_data.get('tracking_info', {})
-        is_tracked = tracking_info.get('is_tracked', False)
-        tracking_age = tracking_info.get('tracking_age', 0)
-        
-        info_layout.addWidget(QLabel("Tracking:"), 1, 0)
-        tracking_widget = self.create_tracking_status_widget(is_tracked, tracking_age)
-        info_layout.addWidget(tracking_widget, 1, 1)
-        
-        # Enhanced bounding box info with visualization
-        bbox = self.detection_data.get('normalized_bbox', {})
-        info_layout.addWidget(QLabel("Position:"), 1, 2)
-        bbox_widget = self.create_bbox_widget(bbox)
-        info_layout.addWidget(bbox_widget, 1, 3)
-        
-        self.details_layout.addLayout(info_layout)
-        
-        # Add bounding box confidence if available
-        bbox_conf = bbox.get('confidence', 0) if bbox else 0
-        if bbox_conf > 0:
-            conf_layout = QHBoxLayout()
-            conf_layout.addWidget(QLabel("Detection Quality:"))
-            bbox_conf_bar = self.create_confidence_bar(bbox_conf, "Detection")
-            conf_layout.addWidget(bbox_conf_bar)
-            conf_layout.addStretch()
-            self.details_layout.addLayout(conf_layout)
-        
-        # Enhanced pose scores
-        pose_scores = self.detection_data.get('pose_scores', {})
-        if pose_scores:
-            # Add a separator
-            separator = QFrame()
-            separator.setFrameShape(QFrame.HLine)
-            separator.setStyleSheet("color: #bdc3c7; margin: 8px 0px;")
-            self.details_layout.addWidget(separator)
-            
-            # Header with total pose confidence
-            pose_header_layout = QHBoxLayout()
-            pose_header_layout.addWidget(QLabel("Pose Analysis:"))
-            
-            # Calculate dominant pose
-            max_score = max(pose_scores.values()) if pose_scores.values() else 0
-            dominant_action = max(pose_scores, key=pose_scores.get) if pose_scores else "unknown"
-            
-            if max_score > 0.1:
-                dominant_label = QLabel(f"Primary: {dominant_action.replace('_', ' ').title()}")
-                dominant_label.setStyleSheet("font-weight: bold; color: #2c3e50; font-size: 11px;")
-                pose_header_layout.addWidget(dominant_label)
-                
-            pose_header_layout.addStretch()
-            self.details_layout.addLayout(pose_header_layout)
-            
-            # Scores in a more compact layout
-            scores_layout = QGridLayout()
-            scores_widget = QWidget()
-            scores_widget.setLayout(scores_layout)
-            
-            row = 0
-            col = 0
-            
-            # Sort poses by score (highest first)
-            sorted_poses = sorted(pose_scores.items(), key=lambda x: x[1], reverse=True)
-            
-            for action, score in sorted_poses:
-                if score > 0.005:  # Show even smaller scores for completeness
-                    # Create a mini widget for each pose
-                    pose_widget = QWidget()
-                    pose_layout = QHBoxLayout(pose_widget)
-                    pose_layout.setContentsMargins(4, 2, 4, 2)
-                    
-                    # Action name without emoji
-                    action_label = QLabel(action.replace('_', ' ').title())
-                    action_label.setStyleSheet("font-size: 10px; min-width: 70px;")
-                    pose_layout.addWidget(action_label)
-                    
-                    # Mini score bar
-                    mini_score_bar = self.create_mini_score_bar(score)
-                    pose_layout.addWidget(mini_score_bar)
-                    
-                    scores_layout.addWidget(pose_widget, row, col)
-                    
-                    col += 1
-                    if col >= 2:  # 2 columns
-                        col = 0
-                        row += 1
-                        
-            self.details_layout.addWidget(scores_widget)
-        
-        # Enhanced thumbnail display
-        thumbnail_data = self.detection_data.get('thumbnail')
-        if thumbnail_data:
-            self.create_thumbnail_display(thumbnail_data)
-        else:
-            # Show message for missing thumbnail
-            thumbnail_placeholder = QLabel("No thumbnail available")
-            thumbnail_placeholder.setStyleSheet("color: #95a5a6; font-style: italic; font-size: 10px;")
-            self.details_layout.addWidget(thumbnail_placeholder)
-    
-    def create_thumbnail_display(self, thumbnail_data):
-        """Create thumbnail display widget"""
-        thumbnail_layout = QHBoxLayout()
-        
-        # Thumbnail label
-        thumb_label = QLabel("Detection Image:")
-        thumb_label.setStyleSheet("font-weight: bold; font-size: 11px;")
-        thumbnail_layout.addWidget(thumb_label)
-        
-        try:
-            # Try to decode and display the thumbnail
-            import base64
-            from io import BytesIO
-            
-            print(f"DEBUG: Thumbnail data length: {len(thumbnail_data)}")
-            print(f"DEBUG: Thumbnail data starts with: {thumbnail_data[:50]}")
-            
-            # Decode base64 image
-            image_data = base64.b64decode(thumbnail_data)
-            print(f"DEBUG: Decoded image data length: {len(image_data)}")
-            
-            # Try alternative loading methods
-            pixmap = QPixmap()
-            success = pixmap.loadFromData(image_data, "JPEG")
-            print(f"DEBUG: QPixmap.loadFromData success: {success}")
-            print(f"DEBUG: Pixmap size: {pixmap.size().width()}x{pixmap.size().height()}")
-            print(f"DEBUG: Pixmap isNull: {pixmap.isNull()}")
-            
-            if not pixmap.isNull():
-                # Scale the image to a reasonable thumbnail size
-                scaled_pixmap = pixmap.scaled(80, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                
-                image_label = QLabel()
-                image_label.setPixmap(scaled_pixmap)
-                image_label.setFixedSize(82, 62)  # Fixed size to prevent layout issues
-                image_label.setScaledContents(False)  # Don't scale contents automatically
-                image_label.setAlignment(Qt.AlignCenter)  # Center the image
-                image_label.setStyleSheet("""
-                    QLabel {
-                        border: 1px solid #bdc3c7;
-                        border-radius: 3px;
-                        background-color: #f8f9fa;
-                        padding: 1px;
-                    }
-                """)
-                thumbnail_layout.addWidget(image_label)
-                print("DEBUG: Successfully created thumbnail image")
-                
-                # Additional debug: save the scaled pixmap to verify it's correct
-                try:
-                    scaled_pixmap.save("/tmp/debug_scaled_thumbnail.png", "PNG")
-                    print("DEBUG: Saved scaled thumbnail to /tmp/debug_scaled_thumbnail.png")
-                except Exception as save_err:
-                    print(f"DEBUG: Error saving scaled thumbnail: {save_err}")
-            else:
-                # Try to save the raw data to see what we're getting
-                try:
-                    with open("/tmp/debug_thumbnail.jpg", "wb") as f:
-                        f.write(image_data)
-                    print("DEBUG: Saved raw image data to /tmp/debug_thumbnail.jpg")
-                except Exception as save_err:
-                    print(f"DEBUG: Error saving debug image: {save_err}")
-                
-                # Invalid image data
-                error_label = QLabel("Invalid image data - see console")
-                error_label.setStyleSheet("color: #e74c3c; font-style: italic; font-size: 10px;")
-                thumbnail_layout.addWidget(error_label)
-                
-        except Exception as e:
-            # Error decoding image
-            print(f"DEBUG: Exception in thumbnail creation: {e}")
-            import traceback
-            traceback.print_exc()
-            error_label = QLabel(f"Error loading image: {str(e)[:20]}...")
-            error_label.setStyleSheet("color: #e74c3c; font-style: italic; font-size: 10px;")
-            thumbnail_layout.addWidget(error_label)
-        
-        thumbnail_layout.addStretch()
-        self.details_layout.addLayout(thumbnail_layout)
-    
-    def create_score_bar(self, score):
-        """Create a visual score bar"""
-        widget = QWidget()
-        widget.setFixedSize(100, 16)
-        
-        progress = QProgressBar()
-        progress.setRange(0, 100)
-        progress.setValue(int(score * 100))
-        progress.setTextVisible(True)
-        progress.setFormat(f"{score:.2f}")
-        progress.setStyleSheet("""
-            QProgressBar {
-                border: 1px solid #bdc3c7;
-                border-radius: 3px;
-                text-align: center;
-                font-size: 10px;
-            }
-            QProgressBar::chunk {
-                background-color: #3498db;
-                border-radius: 2px;
-            }
-        """)
-        
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(progress)
-        
-        return widget
-    
-    def create_confidence_bar(self, confidence, label_text="Confidence"):
-        """Create a visual confidence bar with color coding"""
-        widget = QWidget()
-        widget.setFixedSize(120, 20)
-        
-        progress = QProgressBar()
-        progress.setRange(0, 100)
-        confidence_percent = int(confidence * 100)
-        progress.setValue(confidence_percent)
-        progress.setTextVisible(True)
-        progress.setFormat(f"{confidence:.2f}")
-        
-        # Color code based on confidence level
-        if confidence >= 0.8:
-            color = "#27ae60"  # Green
-        elif confidence >= 0.6:
-            color = "#f39c12"  # Orange
-        else:
-            color = "#e74c3c"  # Red
-            
-        progress.setStyleSheet(f"""
-            QProgressBar {{
-                border: 1px solid #bdc3c7;
-                border-radius: 3px;
-                text-align: center;
-                font-size: 10px;
-                font-weight: bold;
-            }}
-            QProgressBar::chunk {{
-                background-color: {color};
-                border-radius: 2px;
-            }}
-        """)
-        
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(progress)
-        
-        return widget
-    
-    def create_tracking_status_widget(self, is_tracked, tracking_age):
-        """Create a widget showing tracking status"""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        
-        if is_tracked:
-            status_label = QLabel("Active")
-            status_label.setStyleSheet("""
-                background-color: #27ae60;
-                color: white;
-                padding: 2px 6px;
-                border-radius: 3px;
-                font-size: 10px;
-                font-weight: bold;
-            """)
-            layout.addWidget(status_label)
-            
-            age_label = QLabel(f"{tracking_age}f")
-            age_label.setStyleSheet("font-size: 10px; color: #7f8c8d; margin-left: 4px;")
-            layout.addWidget(age_label)
-        else:
-            status_label = QLabel("Not Tracked")
-            status_label.setStyleSheet("""
-                background-color: #95a5a6;
-                color: white;
-                padding: 2px 6px;
-                border-radius: 3px;
-                font-size: 10px;
-                font-weight: bold;
-            """)
-            layout.addWidget(status_label)
-        
-        layout.addStretch()
-        return widget
-    
-    def create_bbox_widget(self, bbox):
-        """Create a widget showing bounding box information with mini visualization"""
-        widget = QWidget()
-        widget.setFixedSize(100, 60)
-        
-        if not bbox:
-            label = QLabel("No position data")
-            label.setStyleSheet("color: #7f8c8d; font-style: italic; font-size: 10px;")
-            layout = QVBoxLayout(widget)
-            layout.addWidget(label)
-            return widget
-        
-        # Mini bounding box visualization
-        viz_widget = QWidget()
-        viz_widget.setFixedSize(80, 40)
-        viz_widget.setStyleSheet("""
-            background-color: #ecf0f1;
-            border: 1px solid #bdc3c7;
-            border-radius: 3px;
-        """)
-        
-        # Paint the bounding box on the mini visualization
-        def paint_bbox(event):
-            painter = QPainter(viz_widget)
-            painter.setPen(QPen(QColor("#e74c3c"), 2))
-            
-            # Calculate position in mini widget
-            x = int(bbox.get('x', 0) * 70) + 5
-            y = int(bbox.get('y', 0) * 30) + 5
-            w = int(bbox.get('width', 0) * 70)
-            h = int(bbox.get('height', 0) * 30)
-            
-            painter.drawRect(x, y, w, h)
-            painter.end()
-        
-        viz_widget.paintEvent = paint_bbox
-        
-        # Text info
-        text_label = QLabel(f"({bbox.get('x', 0):.2f}, {bbox.get('y', 0):.2f})")
-        text_label.setStyleSheet("font-size: 9px; color: #2c3e50;")
-        text_label.setAlignment(Qt.AlignCenter)
-        
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(2, 2, 2, 2)
-        layout.addWidget(viz_widget)
-        layout.addWidget(text_label)
-        
-        return widget
-    
-    def create_mini_score_bar(self, score):
-        """Create a smaller score bar for pose scores"""
-        widget = QWidget()
-        widget.setFixedSize(60, 12)
-        
-        progress = QProgressBar()
-        progress.setRange(0, 100)
-        progress.setValue(int(score * 100))
-        progress.setTextVisible(True)
-        progress.setFormat(f"{score:.2f}")
-        
-        # Color coding for pose confidence
-        if score >= 0.5:
-            color = "#27ae60"
-        elif score >= 0.2:
-            color = "#f39c12"
-        else:
-            color = "#95a5a6"
-            
-        progress.setStyleSheet(f"""
-            QProgressBar {{
-                border: 1px solid #bdc3c7;
-                border-radius: 2px;
-                text-align: center;
-                font-size: 8px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {color};
-                border-radius: 1px;
-            }}
-        """)
-        
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(progress)
-        
-        return widget
-    
-
-    
-    def get_confidence_color(self, confidence):
-        """Get color based on confidence level"""
-        if confidence >= 80:
-            return "#27ae60"  # Green
-        elif confidence >= 60:
-            return "#f39c12"  # Orange
-        else:
-            return "#e74c3c"  # Red
-    
-    def format_timestamp(self, timestamp_str):
-        """Format timestamp for display"""
-        if not timestamp_str:
-            return "Unknown time"
-            
-        try:
-            dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            return dt.strftime("%H:%M:%S")
-        except:
-            return "Unknown time"
-    
-    def setup_style(self):
-        """Setup widget styling"""
-        self.setStyleSheet("""
-            DetectionItemWidget {
-                background-color: white;
-                border: 1px solid #e1e8ed;
-                border-radius: 6px;
-                margin: 2px;
-            }
-            DetectionItemWidget:hover {
-                background-color: #f8f9fa;
-                border-color: #3498db;
-            }
-        """)
-        
-        self.setCursor(Qt.PointingHandCursor)
-        
-    def mousePressEvent(self, event):
-        """Handle mouse press to toggle expansion"""
-        if event.button() == Qt.LeftButton:
-            self.toggle_expansion()
-        super().mousePressEvent(event)
-        
-    def toggle_expansion(self):
-        """Toggle the expanded state"""
-        self.expanded = not self.expanded
-        
-        if self.expanded:
-            self.details_widget.show()
-            self.expand_icon.setText("▼")
-        else:
-            self.details_widget.hide()
-            self.expand_icon.setText("▶")
-
-
 class RobotDetailPage(QWidget):
     """
     Detailed page for a specific robot unit
@@ -991,7 +482,20 @@ class RobotDetailPage(QWidget):
         self.unit_id = None
         self.unit_name = None
         self.unit_data = {}
-        self.detection_widgets = []
+        
+        # Incremental sync state: detections shown (newest first) and the server cursor
+        self.detections = []
+        self.detection_cursor = None
+        # The list view paints rows on demand, so it can keep a long history
+        self.max_detections = 20000
+        self.load_in_progress = False
+        
+        # Older detections are paged in from the server as the list scrolls, using the
+        # server-side action filter; page_cursor is None once the last page arrived
+        self.page_size = 100
+        self.page_cursor = None
+        self.page_request = None
+        self.action_filter = None
         
         self.setup_ui()
         
@@ -1191,14 +695,15 @@ class RobotDetailPage(QWidget):
         
         detections_section_layout.addLayout(detections_header_layout)
         
-        # Detections list with more spacing
-        self.detections_scroll = QScrollArea()
-        self.detections_scroll.setWidgetResizable(True)
-        self.detections_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.detections_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.detections_scroll.setMinimumHeight(400)
-        self.detections_scroll.setStyleSheet(f"""
-            QScrollArea {{
+        # Detections list (model/view: rows are painted, not widgets)
+        self.detections_view = DetectionListView()
+        self.detections_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.detections_view.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.detections_view.setMinimumHeight(400)
+        self.detections_view.verticalScrollBar().valueChanged.connect(self.maybe_load_more)
+        self.detections_view.verticalScrollBar().rangeChanged.connect(self.maybe_load_more)
+        self.detections_view.setStyleSheet(f"""
+            QListView {{
                 background-color: {self.theme_manager.get_color('background')};
                 border: none;
                 border-radius: 10px;
@@ -1222,13 +727,13 @@ class RobotDetailPage(QWidget):
             }}
         """)
         
-        self.detections_widget = QWidget()
-        self.detections_layout = QVBoxLayout(self.detections_widget)
-        self.detections_layout.setSpacing(12)  # More space between detections
-        self.detections_layout.setContentsMargins(16, 16, 16, 16)
+        self.no_detections_label = QLabel("No detections found")
+        self.no_detections_label.setStyleSheet("color: #7f8c8d; font-style: italic; padding: 20px;")
+        self.no_detections_label.setAlignment(Qt.AlignCenter)
+        self.no_detections_label.hide()
         
-        self.detections_scroll.setWidget(self.detections_widget)
-        detections_section_layout.addWidget(self.detections_scroll)
+        detections_section_layout.addWidget(self.no_detections_label)
+        detections_section_layout.addWidget(self.detections_view)
         
         content_layout.addWidget(detections_section)
         
@@ -1294,50 +799,39 @@ class RobotDetailPage(QWidget):
         
         return stats_widget
     
-    def update_statistics_panel(self, detections):
-        """Update the statistics panel with detection data"""
+    def request_statistics(self):
+        """Ask the server for the displayed unit's statistics over the last 24 hours"""
+        unit_id = self.unit_id
+        get_async_api_client().get_unit_summary(
+            unit_id, 24, group=self,
+            callback=lambda success, message, summary: self.on_statistics_loaded(unit_id, success, message, summary))
+        
+    def on_statistics_loaded(self, unit_id, success, message, summary):
+        if unit_id != self.unit_id:
+            return
+        if not success:
+            print(f"DEBUG: Failed to load statistics: {message}")
+            return
+        self.update_statistics_panel(summary.get('stats', {}))
+        
+    def update_statistics_panel(self, stats):
+        """Update the statistics panel with the server's statistics for the unit"""
         # Clear existing content
         while self.stats_content_layout.count():
             child = self.stats_content_layout.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
         
-        if not detections:
+        # Computed by the server over the whole window, not over the rows loaded here
+        total_detections = stats.get('window_detections', stats.get('last_24h_detections', 0))
+        if not total_detections:
             self.stats_panel.hide()
             return
         
-        # Calculate statistics
-        action_counts = {}
-        confidence_sum = 0
-        tracking_count = 0
-        total_detections = len(detections)
-        
-        confidence_levels = {"high": 0, "medium": 0, "low": 0}
-        
-        for detection in detections:
-            # Count actions
-            action = detection.get('action_type', 'unknown')
-            action_counts[action] = action_counts.get(action, 0) + 1
-            
-            # Sum confidence
-            conf = detection.get('confidence', 0)
-            confidence_sum += conf
-            
-            # Confidence levels
-            if conf >= 0.8:
-                confidence_levels["high"] += 1
-            elif conf >= 0.5:
-                confidence_levels["medium"] += 1
-            else:
-                confidence_levels["low"] += 1
-            
-            # Tracking stats
-            tracking_info = detection.get('tracking_info', {})
-            if tracking_info.get('is_tracked', False):
-                tracking_count += 1
-        
-        avg_confidence = confidence_sum / total_detections if total_detections > 0 else 0
-        tracking_rate = (tracking_count / total_detections * 100) if total_detections > 0 else 0
+        action_counts = stats.get('action_counts', {})
+        avg_confidence = stats.get('avg_confidence', 0)
+        confidence_levels = stats.get('confidence_distribution', {})
+        tracking_rate = stats.get('tracking_rate')  # Not kept in the hourly rollups
         
         # Create stats widgets
         
@@ -1350,7 +844,8 @@ class RobotDetailPage(QWidget):
         self.stats_content_layout.addWidget(conf_widget)
         
         # Tracking rate
-        track_widget = self.create_stat_widget("Tracking Rate", f"{tracking_rate:.1f}%", self.theme_manager.get_color('highlight'))
+        track_text = f"{tracking_rate:.1%}" if tracking_rate is not None else "n/a"
+        track_widget = self.create_stat_widget("Tracking Rate", track_text, self.theme_manager.get_color('highlight'))
         self.stats_content_layout.addWidget(track_widget)
         
         # Most common action
@@ -1425,7 +920,7 @@ class RobotDetailPage(QWidget):
         bars_layout = QHBoxLayout()
         
         colors = {"high": "#27ae60", "medium": "#f39c12", "low": "#e74c3c"}
-        labels = {"high": "High\n80%+", "medium": "Med\n50%+", "low": "Low\n<50%"}
+        labels = {"high": "High\n80%+", "medium": "Med\n60%+", "low": "Low\n<60%"}
         
         for level in ["high", "medium", "low"]:
             bar_widget = QWidget()
@@ -1460,28 +955,86 @@ class RobotDetailPage(QWidget):
         
     def load_robot_data(self, unit_id, unit_name):
         """Load data for a specific robot unit"""
+        if unit_id != self.unit_id:
+            # Different unit: start over with a full load
+            self.detections = []
+            self.detection_cursor = None
+            self.unit_data = {}
+            self.cancel_page_request()
+            self.page_cursor = None
+            self.subscribe_live_updates(unit_id)
+            self.unit_id = unit_id
+            self.stats_panel.hide()
+            self.show_cached_detections(unit_id)
+        elif self.load_in_progress:
+            # A load for this unit is already running; its result will cover this refresh
+            return
+        
         self.unit_id = unit_id
         self.unit_name = unit_name
         
         self.title_label.setText(f"Robot: {unit_name}")
-        self.loading_label.show()
+        if self.detection_cursor is None:
+            self.loading_label.show()
         
         # Load data in a separate thread to avoid blocking UI
+        self.load_in_progress = True
         self.load_thread = QThread()
-        self.load_worker = RobotDataLoader(unit_id)
+        self.load_worker = RobotDataLoader(unit_id, self.detection_cursor)
         self.load_worker.moveToThread(self.load_thread)
         
         self.load_thread.started.connect(self.load_worker.load_data)
         self.load_worker.data_loaded.connect(self.on_data_loaded)
         self.load_worker.error_occurred.connect(self.on_load_error)
+        self.load_worker.finished.connect(self.on_load_finished)
         self.load_worker.finished.connect(self.load_thread.quit)
         self.load_worker.finished.connect(self.load_worker.deleteLater)
         self.load_thread.finished.connect(self.load_thread.deleteLater)
         
         self.load_thread.start()
         
+    def show_cached_detections(self, unit_id):
+        """
+        Show the detections cached on disk right away
+        
+        The cached sync cursor then turns the server load into a delta fetch that
+        brings the list up to date (or a reset if the cache is too far behind).
+        """
+        cached, cursor = api_client.get_cached_detections(unit_id, self.page_size * 2)
+        if not cached:
+            self.clear_detections()
+            return
+        
+        print(f"DEBUG: Showing {len(cached)} cached detections for unit {unit_id}")
+        self.detections = cached
+        self.detection_cursor = cursor
+        self.setup_detections(cached, api_client.make_page_cursor(cached[-1]))
+        
+    def subscribe_live_updates(self, unit_id):
+        """Follow pushed detections for the displayed unit only"""
+        live_updates = get_live_updates()
+        if self.unit_id:
+            try:
+                live_updates.channel(self.unit_id).detections_received.disconnect(self.on_live_detections)
+            except TypeError:
+                pass  # Was not connected
+        live_updates.channel(unit_id).detections_received.connect(self.on_live_detections)
+        
+    def on_live_detections(self, payload):
+        """New detections were pushed for this unit; fetch just the delta"""
+        if self.isVisible() and payload.get('cursor') != self.detection_cursor:
+            self.refresh_data()
+        
+    def on_load_finished(self):
+        self.load_in_progress = False
+        
     def on_data_loaded(self, unit_data, detections_data):
         """Handle loaded robot data"""
+        # Ignore results for a unit the user has already navigated away from
+        if detections_data.get('unit_id', self.unit_id) != self.unit_id:
+            return
+        
+        previous_uris = self.unit_data.get('rtsp_uris')
         self.unit_data = unit_data
         self.loading_label.hide()
         
@@ -1489,6 +1042,18 @@ class RobotDetailPage(QWidget):
         # The API returns detections directly in the 'detections' field, not wrapped in packages
         all_detections = detections_data.get('detections', [])
         
+        is_delta = self.detection_cursor is not None and not detections_data.get('reset', True)
+        self.detection_cursor = detections_data.get('cursor')
+        self.request_statistics()
+        
+        if is_delta:
+            print(f"DEBUG: Received {len(all_detections)} new detections from API")
+            # Streams only need rebuilding if the unit's cameras changed
+            if unit_data.get('rtsp_uris') != previous_uris:
+                self.setup_streams(unit_data.get('rtsp_uris', []), all_detections + self.detections)
+            self.prepend_detections(all_detections)
+            return
+        
         print(f"DEBUG: Received {len(all_detections)} detections from API")
         print(f"DEBUG: Detection data keys: {list(detections_data.keys())}")
         if all_detections:
@@ -1499,7 +1064,8 @@ class RobotDetailPage(QWidget):
         self.setup_streams(detections_data.get('rtsp_uris', []), all_detections)
         
         # Setup detections
-        self.setup_detections(all_detections)
+        self.detections = all_detections
+        self.setup_detections(all_detections, detections_data.get('next_cursor'))
         
     def on_load_error(self, error_message):
         """Handle loading error"""
@@ -1539,60 +1105,92 @@ class RobotDetailPage(QWidget):
         if len(rtsp_uris) < 4:
             self.streams_layout.addStretch()
             
-    def setup_detections(self, detections):
-        """Setup detection widgets"""
-        # Clear existing detections
-        self.clear_detections()
-        
-        # Update statistics panel
-        self.update_statistics_panel(detections)
-        
-        if not detections:
-            no_detections_label = QLabel("No detections found")
-            no_detections_label.setStyleSheet("color: #7f8c8d; font-style: italic; padding: 20px;")
-            no_detections_label.setAlignment(Qt.AlignCenter)
-            self.detections_layout.addWidget(no_detections_label)
-            return
-        
+    def setup_detections(self, detections, next_cursor=None):
+        """Show a full set of detections (next_cursor continues the list with older pages)"""
         # Sort detections by timestamp (most recent first)
         detections.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
         
-        # Add detection widgets
-        for detection in detections:
-            detection_widget = DetectionItemWidget(detection)
-            self.detections_layout.addWidget(detection_widget)
-            self.detection_widgets.append(detection_widget)
+        self.cancel_page_request()
+        self.detections_view.detection_model.set_detections(detections[:self.max_detections])
+        self.no_detections_label.setVisible(not detections)
+        self.page_cursor = next_cursor
+        
+        if self.action_filter:
+            # The window is unfiltered; ask the server for the filtered list instead
+            self.load_first_page()
+            
+    def cancel_page_request(self):
+        if self.page_request:
+            self.page_request.cancel()
+            self.page_request = None
+            
+    def load_first_page(self):
+        """Reload the list from the server with the current action filter"""
+        self.cancel_page_request()
+        self.page_cursor = None
+        self.request_page(None)
+        
+    def maybe_load_more(self, *args):
+        """Fetch the next older page once the list is scrolled near its end"""
+        if not self.page_cursor or self.page_request:
+            return
+        if self.detections_view.detection_model.rowCount() >= self.max_detections:
+            return
+        scroll_bar = self.detections_view.verticalScrollBar()
+        if scroll_bar.maximum() - scroll_bar.value() < self.detections_view.viewport().height():
+            self.request_page(self.page_cursor)
+            
+    def request_page(self, cursor):
+        unit_id, action_filter = self.unit_id, self.action_filter
+        self.page_request = get_async_api_client().get_detection_page(
+            unit_id, cursor, self.page_size, action_type=action_filter, group=self,
+            callback=lambda success, message, page: self.on_page_loaded(unit_id, action_filter, cursor,
+                                                                        success, message, page))
+        
+    def on_page_loaded(self, unit_id, action_filter, cursor, success, message, page):
+        """Show a page of detections (the first page replaces the list, later ones extend it)"""
+        if unit_id != self.unit_id or action_filter != self.action_filter:
+            return
+        self.page_request = None
+        if not success:
+            print(f"DEBUG: Failed to load detection page: {message}")
+            return
+        
+        detections = page.get('detections', [])
+        model = self.detections_view.detection_model
+        if cursor is None:
+            model.set_detections(detections)
+            self.no_detections_label.setVisible(not detections)
+        else:
+            model.append_detections(detections, self.max_detections)
+        self.page_cursor = page.get('next_cursor')
+        
+        # Keep going if the page did not fill the view
+        self.maybe_load_more()
+        
+    def prepend_detections(self, new_detections):
+        """Add newly received detections to the top of the list without rebuilding it"""
+        if not new_detections:
+            return
+        
+        new_detections.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+        self.detections = (new_detections + self.detections)[:self.max_detections]
         
-        # Add stretch at the end
-        self.detections_layout.addStretch()
+        self.detections_view.detection_model.prepend_detections(new_detections, self.max_detections)
+        self.no_detections_label.hide()
         
     def clear_detections(self):
-        """Clear all detection widgets"""
-        for widget in self.detection_widgets:
-            widget.deleteLater()
-        self.detection_widgets.clear()
+        """Remove all detections from the list"""
+        self.cancel_page_request()
+        self.page_cursor = None
+        self.detections_view.detection_model.set_detections([])
         
-        while self.detections_layout.count():
-            child = self.detections_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-                
     def filter_detections(self, filter_text):
-        """Filter detections by action type"""
-        if filter_text == "All Actions":
-            # Show all detections  
-            for widget in self.detection_widgets:
-                widget.show()
-        else:
-            # Filter by action type
-            filter_action = filter_text.lower().replace(' ', '_')
-            
-            for widget in self.detection_widgets:
-                detection_action = widget.detection_data.get('action_type', '')
-                if filter_action in detection_action:
-                    widget.show()
-                else:
-                    widget.hide()
+        """Filter detections by action type (rows already loaded at once, then re-queried from the server)"""
+        self.detections_view.set_action_filter(filter_text)
+        self.action_filter = None if filter_text == "All Actions" else filter_text.lower().replace(' ', '_')
+        if self.unit_id:
+            self.load_first_page()
                     
     def refresh_data(self):
         """Refresh the robot data"""
@@ -1609,15 +1207,17 @@ class RobotDataLoader(QObject):
     error_occurred = pyqtSignal(str)
     finished = pyqtSignal()
     
-    def __init__(self, unit_id):
+    def __init__(self, unit_id, since=None):
         super().__init__()
         self.unit_id = unit_id
+        self.since = since
         
     def load_data(self):
         """Load robot data from API"""
         try:
-            # Get unit detections
-            success, message, detections_data = api_client.get_unit_detections(self.unit_id, hours=24, limit=50)
+            # Get unit detections newer than the cursor (the latest 50 on a first load)
+            success, message, detections_data = api_client.get_unit_detections_since(
+                self.unit_id, since=self.since, hours=24, limit=50)
             
             print(f"DEBUG: API call result - Success: {success}, Message: {message}")
             print(f"DEBUG: Detections data keys: {list(detections_data.keys()) if detections_data else 'None'}")
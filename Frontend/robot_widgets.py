@@ -4,7 +4,7 @@ from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from datetime import datetime, timedelta
 import sys
-from api_client import api_client
+from api_client import api_client, get_async_api_client
 from theme_manager import ThemeManager
 
 class RobotWidget(QWidget):
@@ -19,11 +19,12 @@ class RobotWidget(QWidget):
         super().__init__(parent)
         self.theme_manager = ThemeManager()
         self.unit_data = unit_data
-        self.unit_id = unit_data.get('_id', 'unknown')
+        # Active units carry unit_id only; /api/robots also sets _id to it
+        self.unit_id = unit_data.get('_id') or unit_data.get('unit_id', 'unknown')
         self.unit_name = unit_data.get('unit_name', 'Unknown Unit')
         self.last_seen = unit_data.get('last_seen', None)
         self.packages_count = unit_data.get('packages_count', 0)
-        self.total_detections = unit_data.get('total_detections', 0)
+        self.total_detections = unit_data.get('detection_count', unit_data.get('total_detections', 0))
         self.rtsp_uris = unit_data.get('rtsp_uris', [])
         
         self.setup_ui()
@@ -489,13 +490,24 @@ class RobotGridWidget(QScrollArea):
         self.grid_layout.addWidget(message_widget, 0, 0, Qt.AlignCenter)
         
     def load_robots(self):
-        """Load robots from API"""
+        """Load robots from API (requests run off the GUI thread)"""
         print(" Loading robot units...")
         
+        if not self.robots_data:
+            # Show the robots from the last session while the server is asked
+            cached_robots = api_client.get_cached_robots()
+            if cached_robots:
+                print(f" Showing {len(cached_robots)} cached robot units")
+                self.update_robots(cached_robots)
+        
+        async_client = get_async_api_client()
+        async_client.cancel_group(self)
+        # Try to get robots with full data first
+        async_client.get_robots(group=self, callback=self.on_robots_loaded)
+        
+    def on_robots_loaded(self, success, message, robots_data):
+        """Show robots from the robots endpoint, falling back to active units"""
         try:
-            # Try to get robots with full data first
-            success, message, robots_data = api_client.get_robots()
-            
             if success and robots_data.get('units'):
                 print(f" Loaded {len(robots_data['units'])} robot units from robots endpoint")
                 self.update_robots(robots_data['units'])
@@ -503,11 +515,20 @@ class RobotGridWidget(QScrollArea):
             
             # Fallback to active units endpoint
             print(" Falling back to active units endpoint...")
-            success, message, units_data = api_client.get_active_units()
+            get_async_api_client().get_active_units(group=self, callback=self.on_active_units_loaded)
+            
+        except Exception as e:
+            print(f" Error loading robots: {e}")
+            self.update_robots([])
             
+    def on_active_units_loaded(self, success, message, units_data):
+        """Show robots from the active units endpoint"""
+        try:
             if success and units_data.get('units'):
                 print(f" Loaded {len(units_data['units'])} robot units from detections endpoint")
                 self.update_robots(units_data['units'])
+            elif not success and self.robots_data:
+                print(f" Could not reach server, keeping cached robot units: {message}")
             else:
                 print(f" No robot units found: {message}")
                 self.update_robots([])
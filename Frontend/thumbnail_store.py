@@ -0,0 +1,135 @@
+import base64
+import time
+from typing import Optional
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QPixmap, QPixmapCache
+
+
+class ThumbnailStore(QObject):
+    """
+    Lazy loader for detection thumbnails
+
+    Detection lists only carry a thumbnail_url; the image is fetched and decoded the
+    first time a visible row asks for it. Decoded pixmaps live in QPixmapCache, which
+    evicts least recently used entries once the byte budget is exceeded, so scrolling
+    back to a row is free while memory stays bounded. Widgets call get() while
+    painting and redraw when thumbnail_ready fires for their key.
+    """
+
+    thumbnail_ready = pyqtSignal(str)
+    thumbnail_failed = pyqtSignal(str)
+
+    # Failures that will not go away by asking again; anything else is retried after a pause
+    PERMANENT_ERRORS = ("HTTP 404", "HTTP 410")
+    RETRY_DELAY = 10.0
+
+    def __init__(self, budget_bytes: int = 32 * 1024 * 1024):
+        super().__init__()
+        self.budget_bytes = budget_bytes
+        QPixmapCache.setCacheLimit(budget_bytes // 1024)
+        self.loading = set()
+        # Keys that cannot load (missing or undecodable), and keys waiting to retry a transient failure
+        self.failed = set()
+        self.retry_at = {}
+        self.stats = {'hits': 0, 'misses': 0, 'decoded': 0, 'errors': 0}
+
+    @staticmethod
+    def key_for(detection: dict) -> Optional[str]:
+        """Cache key of a detection's thumbnail (None when it has none)"""
+        if detection.get('thumbnail_url'):
+            return detection['thumbnail_url']
+        if detection.get('thumbnail') and detection.get('_id'):
+            return f"inline:{detection['_id']}"
+        return None
+
+    def get(self, detection: dict) -> Optional[QPixmap]:
+        """
+        Get a detection's thumbnail if it is already decoded, otherwise start loading it
+
+        Returns:
+            The QPixmap, or None while it is loading (or when there is no thumbnail)
+        """
+        key = self.key_for(detection)
+        if key is None or key in self.failed:
+            return None
+        if key in self.retry_at:
+            if time.monotonic() < self.retry_at[key]:
+                return None
+            del self.retry_at[key]
+
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None and not pixmap.isNull():
+            self.stats['hits'] += 1
+            return pixmap
+
+        self.stats['misses'] += 1
+        if detection.get('thumbnail'):
+            # Older responses and live events may still carry the image inline
+            try:
+                self._store(key, base64.b64decode(detection['thumbnail']))
+            except Exception as e:
+                self._fail(key, f"{type(e).__name__}: {str(e)}", permanent=True)
+            return QPixmapCache.find(key)
+
+        if key not in self.loading:
+            from api_client import get_async_api_client
+            self.loading.add(key)
+            get_async_api_client().get_thumbnail(
+                key, callback=lambda success, message, data: self._on_loaded(key, success, message, data))
+        return None
+
+    def has_thumbnail(self, detection: dict) -> bool:
+        return self.key_for(detection) is not None
+
+    def _on_loaded(self, key: str, success: bool, message: str, data: dict):
+        self.loading.discard(key)
+        if success:
+            self._store(key, data.get('image', b''))
+        else:
+            self._fail(key, message, permanent=message in self.PERMANENT_ERRORS)
+
+    def _store(self, key: str, image_data: bytes):
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(image_data, "JPEG"):
+            self._fail(key, "invalid image data", permanent=True)
+            return
+        QPixmapCache.insert(key, pixmap)
+        self.stats['decoded'] += 1
+        self.thumbnail_ready.emit(key)
+
+    def _fail(self, key: str, reason: str, permanent: bool = False):
+        print(f" THUMBNAILS: Could not load {key}: {reason}")
+        self.stats['errors'] += 1
+        if permanent:
+            self.failed.add(key)
+        else:
+            # Timeouts and server errors: the next get() after the pause asks again
+            self.retry_at[key] = time.monotonic() + self.RETRY_DELAY
+        self.thumbnail_failed.emit(key)
+
+    def clear(self):
+        """Drop decoded thumbnails (e.g. on logout)"""
+        QPixmapCache.clear()
+        self.loading.clear()
+        self.failed.clear()
+        self.retry_at.clear()
+
+    def get_stats(self) -> dict:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'pending': len(self.loading),
+            'budget_kb': QPixmapCache.cacheLimit(),
+            'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else 0.0
+        }
+
+
+# Shared store (created lazily: needs a Qt application)
+_thumbnail_store = None
+
+def get_thumbnail_store() -> ThumbnailStore:
+    """Get the application's ThumbnailStore"""
+    global _thumbnail_store
+    if _thumbnail_store is None:
+        _thumbnail_store = ThumbnailStore()
+    return _thumbnail_store